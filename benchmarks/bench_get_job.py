@@ -0,0 +1,72 @@
+"""
+Per-request CPU cost of GET /v1/jobs/{job_name}: hydrated Beanie read + response_model
+re-validation versus the raw projected read rendered by RawJSONResponse.
+
+Run from the repository root:
+    python -m benchmarks.bench_get_job
+"""
+import asyncio
+import time
+from beanie import init_beanie
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from mongomock_motor import AsyncMongoMockClient
+from starlette.responses import JSONResponse
+from models.db_schemas.jobs import BaseJob, GeneralJob, BlackboxJob, KubernetesJob, HttpJob, JobModel
+from repositories.job_repository import JobRepository
+from utils.responses import RawJSONResponse
+
+ITERATIONS = 2000
+JOB_NAME = "bench-job"
+MAAS_POOL = "maas-bench"
+COLLECTOR_CLUSTER = "ocp4-bench"
+
+
+async def _hydrated(repo: JobRepository, field) -> bytes:
+    job = await repo.get(JOB_NAME, MAAS_POOL, COLLECTOR_CLUSTER)
+    content = await serialize_response(field=field, response_content=job, exclude_none=True)
+    return JSONResponse(content).body
+
+
+async def _raw(repo: JobRepository) -> bytes:
+    job = await repo.get_raw(JOB_NAME, MAAS_POOL, COLLECTOR_CLUSTER)
+    return RawJSONResponse(job).body
+
+
+async def _measure(label: str, fn) -> float:
+    for _ in range(100):
+        await fn()
+
+    started = time.process_time()
+    for _ in range(ITERATIONS):
+        await fn()
+    per_request_us = (time.process_time() - started) / ITERATIONS * 1_000_000
+
+    print(f"{label:<10} {per_request_us:10.1f} us CPU/request")
+    return per_request_us
+
+
+async def main():
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client.bench, document_models=[BaseJob, GeneralJob, BlackboxJob, KubernetesJob, HttpJob])
+
+    await GeneralJob(
+        job_name=JOB_NAME,
+        maas_pool=MAAS_POOL,
+        collector_cluster=COLLECTOR_CLUSTER,
+        scrape_interval=60,
+        labels={f"label_{i}": f"value-{i}" for i in range(10)},
+        targets=[f"host-{i}.example.com:9100" for i in range(200)],
+    ).create()
+
+    repo = JobRepository()
+    field = create_model_field(name="response", type_=JobModel, mode="serialization")
+
+    # The mock client's own overhead is shared by both paths, so the delta is the hydration cost.
+    hydrated = await _measure("hydrated", lambda: _hydrated(repo, field))
+    raw = await _measure("raw", lambda: _raw(repo))
+    print(f"{'saved':<10} {hydrated - raw:10.1f} us CPU/request ({hydrated / raw:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+CPU cost of the Prometheus instrumentation on the hot paths, next to the cheapest repository
+call it wraps: the `job_version` read behind ETag revalidation.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics
+"""
+import asyncio
+import time
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+from models.db_schemas.jobs import BaseJob, GeneralJob, BlackboxJob, KubernetesJob, HttpJob
+from repositories.job_repository import JobRepository
+from utils.metrics import KAFKA_PRODUCE_DURATION, RequestMetricsMiddleware, render_metrics
+
+ITERATIONS = 20000
+JOB_NAME = "bench-job"
+MAAS_POOL = "maas-bench"
+COLLECTOR_CLUSTER = "ocp4-bench"
+
+
+def _measure(label: str, fn, iterations: int = ITERATIONS) -> float:
+    for _ in range(100):
+        fn()
+
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    per_call_us = (time.process_time() - started) / iterations * 1_000_000
+
+    print(f"{label:<28} {per_call_us:10.2f} us CPU/call")
+    return per_call_us
+
+
+async def _endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _send(message):
+    pass
+
+
+async def _time_request(app, iterations: int = ITERATIONS) -> float:
+    scope = {"type": "http", "method": "GET"}
+    started = time.process_time()
+    for _ in range(iterations):
+        await app(dict(scope), None, _send)
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+async def main():
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client.bench, document_models=[BaseJob, GeneralJob, BlackboxJob, KubernetesJob, HttpJob])
+    await GeneralJob(job_name=JOB_NAME, maas_pool=MAAS_POOL, collector_cluster=COLLECTOR_CLUSTER,
+                     targets=["host.example.com:9100"]).create()
+    repo = JobRepository()
+
+    produced = KAFKA_PRODUCE_DURATION.labels("ok")
+    # What the middleware adds to every request, over an endpoint that does nothing
+    request = await _time_request(RequestMetricsMiddleware(_endpoint)) - await _time_request(_endpoint)
+    print(f"{'request middleware':<28} {request:10.2f} us CPU/call")
+    observe = _measure("bound histogram observe", lambda: produced.observe(0.004))
+
+    started = time.process_time()
+    for _ in range(2000):
+        await repo.get_version(JOB_NAME, MAAS_POOL, COLLECTOR_CLUSTER)
+    read = (time.process_time() - started) / 2000 * 1_000_000
+    print(f"{'get_version (instrumented)':<28} {read:10.2f} us CPU/call")
+    print(f"{'observe share of the read':<28} {observe / read:10.2%}")
+
+    # A GET answered from one read: the request metrics plus one repository observation
+    print(f"{'per GET request':<28} {request + observe:10.2f} us CPU")
+    _measure("scrape of /metrics", render_metrics, iterations=200)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
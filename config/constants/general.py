@@ -1,2 +1,3 @@
 LOGGER_EVENT_FIELD = "event"
 LOGGER_JOB_FIELD = "job"
+DUPLICATE_KEY_ERROR = 11000
@@ -0,0 +1,7 @@
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+# A claim older than this is assumed to belong to a crashed request and may be taken over
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = 60
+IDEMPOTENCY_WAIT_SECONDS = 30.0
+IDEMPOTENCY_POLL_INTERVAL_SECONDS = 0.1
+IDEMPOTENCY_CACHE_SIZE = 10_000
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
@@ -0,0 +1,4 @@
+# Jobs validated, persisted and produced together; also how often an import checkpoints
+IMPORT_BATCH_SIZE = 500
+# The uploaded config is kept on the operation until it runs, well under MongoDB's 16MB document limit
+MAX_IMPORT_BYTES = 8 * 1024 * 1024
@@ -9,9 +9,11 @@ MIN_SCRAPE_TIMEOUT = 10
 MAX_SCRAPE_TIMEOUT = 30
 
 USERNAME_REGEX = r"^[a-zA-Z0-9#$_.-=]+$"
-PASSWORD_REGEX = r"^[A-Za-z0-9#$_.-=]+$"
+# `.-=` is a range; the trailing `-` admits Fernet tokens, which stored passwords are validated as too
+PASSWORD_REGEX = r"^[A-Za-z0-9#$_.-=-]+$"
 
-JOB_NAME_REGEX = r"^[~a-zA-Z0-9_-]+$"
+# No `~`: it is SHARD_NAME_SEPARATOR, so a job could otherwise be named like another job's shard
+JOB_NAME_REGEX = r"^[a-zA-Z0-9_-]+$"
 TARGETS_REGEX = r"^[a-zA-Z0-9_.:-]+$"
 METRICS_PATH_REGEX = r"^/[a-zA-Z0-9-/._:]*$"
 LABEL_REGEX = r"^[a-zA-Z0-9_]+$"
@@ -23,3 +25,30 @@ FORBIDDEN_LABELS = ["collector_cluster", "job", "instance", "maas_pool"]
 COLLECTOR_CLUSTER_REGEX = r"^ocp4-[a-zA-Z0-9_.-]+$"
 MAAS_POOL_NAME_REGEX = r"^maas-[A-Za-z0-9_.-]+$"
 
+
+DEFAULT_CHANGES_BATCH_SIZE = 500
+MAX_CHANGES_BATCH_SIZE = 1000
+TOMBSTONE_RETENTION_SECONDS = 7 * 24 * 60 * 60
+# Longer than any single job write with its retries; a lease left by a crashed writer stops holding the feed after it
+SEQUENCE_LEASE_SECONDS = 30
+DEFAULT_LIST_LIMIT = 100
+MAX_LIST_LIMIT = 1000
+NAME_NGRAM_SIZE = 3
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+SEARCH_CANDIDATE_FACTOR = 5
+POOL_TOTAL_KEY = "*"
+STATS_REBUILD_BATCH_SIZE = 1000
+SEARCH_BACKFILL_BATCH_SIZE = 1000
+SCRAPE_CONFIG_REVALIDATE_SECONDS = 1.0
+COLLECTOR_VIEW_CHUNKS = 16
+VIEW_REBUILD_BATCH_SIZE = 1000
+DEFAULT_PLACEMENT_STRATEGY = "least_loaded"
+SHARD_NAME_SEPARATOR = "~"
+MIN_SHARDS = 2
+MAX_SHARDS = 32
+DEFAULT_TARGET_LOOKUP_LIMIT = 100
+MAX_TARGET_LOOKUP_LIMIT = 1000
+DEFAULT_DUPLICATE_TARGETS_LIMIT = 100
+MAX_DUPLICATE_TARGETS_LIMIT = 1000
+TARGET_INDEX_REBUILD_BATCH_SIZE = 1000
@@ -0,0 +1,9 @@
+LOAD_WINDOW_SIZE = 240
+LOAD_PERCENTILES = (50, 95, 99)
+LOAD_QUERY_WINDOW_SECONDS = 300
+MAX_LOAD_QUERY_WINDOW_SECONDS = 3600
+LOAD_FLUSH_INTERVAL_SECONDS = 60.0
+LOAD_IDLE_EXPIRY_SECONDS = 3600
+LOAD_HISTORY_RETENTION_SECONDS = 7 * 24 * 3600
+DEFAULT_LOAD_HISTORY_LIMIT = 60
+MAX_LOAD_HISTORY_LIMIT = 1440
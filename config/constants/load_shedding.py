@@ -0,0 +1,12 @@
+LAG_SAMPLE_INTERVAL_SECONDS = 0.05
+# CoDel target and interval, applied to event-loop lag instead of queue sojourn time
+LAG_TARGET_SECONDS = 0.025
+SHEDDING_INTERVAL_SECONDS = 0.5
+MAX_IN_FLIGHT = 1000
+MIN_IN_FLIGHT = 32
+IN_FLIGHT_DECREASE_FACTOR = 0.8
+IN_FLIGHT_INCREASE_STEP = 2
+DROP_PROBABILITY_STEP = 0.05
+MAX_DROP_PROBABILITY = 0.95
+LOW_PRIORITY_IN_FLIGHT_SHARE = 0.5
+SHED_RETRY_AFTER_SECONDS = 1.0
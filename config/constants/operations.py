@@ -0,0 +1,9 @@
+DEFAULT_OPERATION_WORKERS = 4
+# A running operation whose owner stopped renewing this long ago is picked up by another worker
+OPERATION_LEASE_SECONDS = 60
+# Runs an operation may start; one that keeps crashing its worker or losing its lease is then failed
+MAX_OPERATION_ATTEMPTS = 5
+OPERATION_POLL_INTERVAL_SECONDS = 2.0
+OPERATION_RETENTION_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_OPERATION_ITEMS_LIMIT = 100
+MAX_OPERATION_ITEMS_LIMIT = 1000
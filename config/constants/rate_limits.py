@@ -0,0 +1,2 @@
+RATE_LIMIT_SYNC_INTERVAL_SECONDS = 1.0
+MAX_RATE_LIMIT_BUCKETS = 100_000
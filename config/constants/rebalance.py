@@ -0,0 +1,6 @@
+REBALANCE_TOLERANCE = 0.1
+MAX_REBALANCE_TOLERANCE = 1.0
+REBALANCE_MAX_MOVES = 50
+MAX_REBALANCE_MOVES = 1000
+REBALANCE_MOVE_INTERVAL_SECONDS = 1.0
+REBALANCE_SCAN_BATCH_SIZE = 1000
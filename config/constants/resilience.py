@@ -0,0 +1,7 @@
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT_SECONDS = 10.0
+RETRY_BASE_DELAY_SECONDS = 0.05
+RETRY_MAX_DELAY_SECONDS = 1.0
+PRODUCE_ATTEMPT_TIMEOUT_SECONDS = 5.0
+PRODUCE_RETRY_ATTEMPTS = 3
+MONGO_READ_RETRY_ATTEMPTS = 2
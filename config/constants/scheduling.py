@@ -0,0 +1,3 @@
+DEFAULT_WRITE_CONCURRENCY = 16
+DEFAULT_POOL_WRITE_WEIGHT = 1.0
+DEFAULT_WRITE_COST = 1.0
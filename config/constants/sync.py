@@ -0,0 +1,4 @@
+# Jobs deleted, replaced or created together when a desired-state plan is applied
+SYNC_BATCH_SIZE = 500
+# A desired set is one request body, validated and hashed in memory
+MAX_DESIRED_JOBS = 10000
@@ -0,0 +1,5 @@
+WATCH_POLL_INTERVAL_SECONDS = 1.0
+WATCH_HEARTBEAT_SECONDS = 15.0
+WATCH_CLIENT_BUFFER_SIZE = 256
+WATCH_HISTORY_SIZE = 4096
+WATCH_BATCH_SIZE = 500
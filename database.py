@@ -1,8 +1,16 @@
 import motor.motor_asyncio
 from beanie import init_beanie
 from models.db_schemas.api_keys import ApiKey
+from models.db_schemas.collector_loads import CollectorLoadSample
+from models.db_schemas.collector_views import CollectorView
+from models.db_schemas.idempotency_records import IdempotencyRecord
 from models.db_schemas.jobs import BaseJob, GeneralJob, BlackboxJob, KubernetesJob, HttpJob
+from models.db_schemas.job_stats import JobStats
+from models.db_schemas.job_targets import JobTarget
+from models.db_schemas.job_tombstones import JobTombstone
 from models.db_schemas.maas_pools import MaasPool
+from models.db_schemas.operations import Operation, OperationItem
+from models.db_schemas.pool_sequences import PoolSequence
 from config import config
 
 
@@ -11,4 +19,6 @@ async def init_db():
     client = motor.motor_asyncio.AsyncIoMotorClient(MONGO_CONNECTION_STRING)
     database = client.maas
 
-    await init_beanie(database=database, document_models=[ApiKey, MaasPool, BaseJob, GeneralJob, BlackboxJob, KubernetesJob, HttpJob])
\ No newline at end of file
+    await init_beanie(database=database, document_models=[ApiKey, MaasPool, BaseJob, GeneralJob, BlackboxJob, KubernetesJob, HttpJob,
+                                                        JobTombstone, PoolSequence, JobStats, CollectorView, CollectorLoadSample, JobTarget,
+                                                        IdempotencyRecord, Operation, OperationItem])
\ No newline at end of file
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ChangeType(str, Enum):
+    UPSERT = "upsert"
+    DELETE = "delete"
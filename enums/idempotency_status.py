@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class IdempotencyStatus(str, Enum):
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
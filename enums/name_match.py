@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class NameMatch(str, Enum):
+    EXACT = "exact"
+    PREFIX = "prefix"
+    SUBSTRING = "substring"
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class OperationKind(str, Enum):
+    REBUILD_STATS = "rebuild_stats"
+    REBUILD_VIEWS = "rebuild_views"
+    REBUILD_TARGETS = "rebuild_targets"
+    BACKFILL_SEARCH_FIELDS = "backfill_search_fields"
+    IMPORT_PROMETHEUS_CONFIG = "import_prometheus_config"
+    SYNC_COLLECTOR = "sync_collector"
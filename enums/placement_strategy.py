@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PlacementStrategy(str, Enum):
+    LEAST_LOADED = "least_loaded"
+    POWER_OF_TWO = "power_of_two"
+    CONSISTENT_HASH = "consistent_hash"
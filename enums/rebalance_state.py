@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class RebalanceState(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -0,0 +1,3 @@
+class IdempotencyKeyInProgressError(Exception):
+    def __init__(self, idempotency_key: str):
+        super().__init__(f"A request with idempotency key {idempotency_key} is still in progress")
@@ -0,0 +1,3 @@
+class IdempotencyKeyReusedError(Exception):
+    def __init__(self, idempotency_key: str):
+        super().__init__(f"Idempotency key {idempotency_key} was already used for a different request")
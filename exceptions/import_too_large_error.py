@@ -0,0 +1,3 @@
+class ImportTooLargeError(Exception):
+    def __init__(self, size: int, limit: int):
+        super().__init__(f"Import of {size} bytes exceeds the limit of {limit} bytes")
@@ -0,0 +1,3 @@
+class InvalidDesiredStateError(Exception):
+    def __init__(self, maas_pool: str, collector_cluster: str, reason: str):
+        super().__init__(f"Invalid desired jobs for collector {collector_cluster} of pool {maas_pool}: {reason}")
@@ -0,0 +1,3 @@
+class InvalidLabelSelectorError(Exception):
+    def __init__(self, selector: str, reason: str):
+        super().__init__(f"Invalid label selector {selector!r}: {reason}")
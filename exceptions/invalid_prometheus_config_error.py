@@ -0,0 +1,3 @@
+class InvalidPrometheusConfigError(Exception):
+    def __init__(self, reason: str):
+        super().__init__(f"Invalid Prometheus config: {reason}")
@@ -0,0 +1,3 @@
+class InvalidShardCountError(Exception):
+    def __init__(self, maas_pool: str, shards: int, collectors: int):
+        super().__init__(f"Cannot split a job into {shards} shards: pool {maas_pool} has {collectors} collector clusters")
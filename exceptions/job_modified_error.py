@@ -0,0 +1,3 @@
+class JobModifiedError(Exception):
+    def __init__(self, job_name: str):
+        super().__init__(f"Job {job_name} was modified by another request; reload it and retry")
@@ -0,0 +1,5 @@
+class JobQuotaExceededError(Exception):
+    def __init__(self, scope: str, limit: int, used: int, requested: int):
+        self.remaining = max(limit - used, 0)
+        super().__init__(f"{scope} job quota exceeded: {requested} more jobs requested, "
+                         f"{self.remaining} of {limit} left")
@@ -0,0 +1,3 @@
+class NoCollectorAvailableError(Exception):
+    def __init__(self, maas_pool: str):
+        super().__init__(f"Pool {maas_pool} has no collector cluster to place the job on")
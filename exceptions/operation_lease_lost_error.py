@@ -0,0 +1,3 @@
+class OperationLeaseLostError(Exception):
+    def __init__(self, operation_id: str):
+        super().__init__(f"Operation {operation_id} was taken over by another worker")
@@ -0,0 +1,7 @@
+from utils.token_bucket import RateLimitDecision
+
+
+class RateLimitExceededError(Exception):
+    def __init__(self, scope: str, decision: RateLimitDecision):
+        self.decision = decision
+        super().__init__(f"Rate limit of {scope} exceeded, retry in {decision.retry_after:.1f}s")
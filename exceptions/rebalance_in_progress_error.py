@@ -0,0 +1,3 @@
+class RebalanceInProgressError(Exception):
+    def __init__(self, maas_pool: str):
+        super().__init__(f"A rebalance is already running for pool {maas_pool}")
@@ -0,0 +1,3 @@
+class RebalanceNotFoundError(Exception):
+    def __init__(self, maas_pool: str):
+        super().__init__(f"No rebalance has run for pool {maas_pool}")
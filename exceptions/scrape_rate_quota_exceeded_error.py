@@ -0,0 +1,5 @@
+class ScrapeRateQuotaExceededError(Exception):
+    def __init__(self, scope: str, limit: float, used: float, requested: float):
+        self.remaining = max(limit - used, 0.0)
+        super().__init__(f"{scope} scrape rate quota exceeded: {requested:.2f} more samples/sec requested, "
+                         f"{self.remaining:.2f} of {limit:.2f} samples/sec left")
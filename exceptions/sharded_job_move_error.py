@@ -0,0 +1,3 @@
+class ShardedJobMoveError(Exception):
+    def __init__(self, job_name: str):
+        super().__init__(f"Job {job_name} is sharded over several collector clusters and cannot be moved")
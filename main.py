@@ -2,29 +2,148 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
-from starlette.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.responses import JSONResponse, Response
 from database import init_db
+from exceptions.circuit_open_error import CircuitOpenError
 from exceptions.collector_not_in_pool_error import CollectorNotInPoolError
+from exceptions.idempotency_key_in_progress_error import IdempotencyKeyInProgressError
+from exceptions.idempotency_key_reused_error import IdempotencyKeyReusedError
+from exceptions.import_too_large_error import ImportTooLargeError
+from exceptions.invalid_desired_state_error import InvalidDesiredStateError
+from exceptions.invalid_label_selector_error import InvalidLabelSelectorError
+from exceptions.invalid_prometheus_config_error import InvalidPrometheusConfigError
+from exceptions.invalid_shard_count_error import InvalidShardCountError
 from exceptions.job_not_found_error import JobNotFoundError
+from exceptions.job_modified_error import JobModifiedError
 from exceptions.job_name_exists_error import JobNameExistsError
+from exceptions.job_quota_exceeded_error import JobQuotaExceededError
+from exceptions.no_collector_available_error import NoCollectorAvailableError
 from exceptions.pool_not_exist_error import PoolNotFoundError
+from exceptions.operation_not_found_error import OperationNotFoundError
 from exceptions.produce_failure_error import ProduceFailureError
+from exceptions.rate_limit_exceeded_error import RateLimitExceededError
+from exceptions.rebalance_in_progress_error import RebalanceInProgressError
+from exceptions.rebalance_not_found_error import RebalanceNotFoundError
+from exceptions.scrape_rate_quota_exceeded_error import ScrapeRateQuotaExceededError
+from exceptions.sharded_job_move_error import ShardedJobMoveError
 from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
+from config import config
 from routers.v1 import router
+from services.load_service import load_tracker
+from services.load_shedder import load_shedder
+from services.operation_handlers import register_operation_handlers
+from services.operation_runner import operation_runner
+from services.rate_limiter import rate_limiter
+from services.rebalance_service import rebalancer
+from services.watch_hub import watch_hub
 from utils.logger import create_logger
+from utils.metrics import RequestMetricsMiddleware, render_metrics
+from utils.request_priority import request_priority
+from utils.token_bucket import RateLimitDecision, retry_after_header
+from utils.tracing import TracingMiddleware, configure_tracing
 
 logger = create_logger("main")
 
+LOAD_SHEDDING_ENABLED = config["load_shedding.enabled"]
+METRICS_ENABLED = config["metrics.enabled"]
+TRACING_ENABLED = config["tracing.enabled"]
+
+if TRACING_ENABLED:
+    tracer_provider = configure_tracing(
+        config["tracing.sample_ratio"], config["tracing.exporter"], config["tracing.file_path"])
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    register_operation_handlers(operation_runner)
+    # Picks up operations queued or interrupted before this process started
+    operation_runner.start()
     yield
     logger.info("Closing application")
+    await watch_hub.stop()
+    await rebalancer.stop()
+    await load_tracker.stop()
+    await rate_limiter.stop()
+    await load_shedder.stop()
+    await operation_runner.stop()
+    if TRACING_ENABLED:
+        # Flushes the spans still queued for export
+        tracer_provider.shutdown()
 
 
 app = FastAPI(title="MAAS", lifespan=lifespan)
 app.include_router(router)
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not METRICS_ENABLED:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+def rate_limit_headers(decision: RateLimitDecision) -> dict:
+    return {
+        "RateLimit-Limit": str(decision.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": retry_after_header(decision.reset),
+    }
+
+
+@app.middleware("http")
+async def add_rate_limit_headers(request: Request, call_next):
+    response = await call_next(request)
+    decision = getattr(request.state, "rate_limit", None)
+    if decision is not None:
+        response.headers.update(rate_limit_headers(decision))
+    return response
+
+
+# Plain ASGI middlewares: an `@app.middleware` one costs more CPU per request than everything these record
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
+
+# Registered last so it runs first: a shed request costs no other middleware, auth or database work
+@app.middleware("http")
+async def shed_load(request: Request, call_next):
+    if not LOAD_SHEDDING_ENABLED:
+        return await call_next(request)
+
+    priority = request_priority(request.method, request.url.path)
+    retry_after = load_shedder.admit(priority)
+    if retry_after is not None:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Service is overloaded, retry later"},
+            headers={"Retry-After": retry_after_header(retry_after)},
+        )
+    try:
+        return await call_next(request)
+    finally:
+        load_shedder.release(priority)
+
+
+@app.exception_handler(RateLimitExceededError)
+async def rate_limit_exception_handler(request: Request, exc: RateLimitExceededError):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={**rate_limit_headers(exc.decision), "Retry-After": retry_after_header(exc.decision.retry_after)},
+    )
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_exception_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": retry_after_header(exc.retry_after)},
+    )
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
@@ -41,10 +160,25 @@ def create_exception_handler(status_code: int):
     return handler
 
 app.add_exception_handler(CollectorNotInPoolError, create_exception_handler(status.HTTP_400_BAD_REQUEST))
+app.add_exception_handler(IdempotencyKeyInProgressError, create_exception_handler(status.HTTP_409_CONFLICT))
+app.add_exception_handler(IdempotencyKeyReusedError, create_exception_handler(status.HTTP_422_UNPROCESSABLE_ENTITY))
+app.add_exception_handler(ImportTooLargeError, create_exception_handler(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE))
+app.add_exception_handler(InvalidDesiredStateError, create_exception_handler(status.HTTP_400_BAD_REQUEST))
+app.add_exception_handler(InvalidLabelSelectorError, create_exception_handler(status.HTTP_400_BAD_REQUEST))
+app.add_exception_handler(InvalidPrometheusConfigError, create_exception_handler(status.HTTP_400_BAD_REQUEST))
+app.add_exception_handler(InvalidShardCountError, create_exception_handler(status.HTTP_400_BAD_REQUEST))
 app.add_exception_handler(JobNotFoundError, create_exception_handler(status.HTTP_404_NOT_FOUND))
+app.add_exception_handler(JobModifiedError, create_exception_handler(status.HTTP_409_CONFLICT))
 app.add_exception_handler(JobNameExistsError, create_exception_handler(status.HTTP_409_CONFLICT))
+app.add_exception_handler(JobQuotaExceededError, create_exception_handler(status.HTTP_403_FORBIDDEN))
+app.add_exception_handler(NoCollectorAvailableError, create_exception_handler(status.HTTP_409_CONFLICT))
+app.add_exception_handler(OperationNotFoundError, create_exception_handler(status.HTTP_404_NOT_FOUND))
 app.add_exception_handler(PoolNotFoundError, create_exception_handler(status.HTTP_404_NOT_FOUND))
 app.add_exception_handler(ProduceFailureError, create_exception_handler(status.HTTP_500_INTERNAL_SERVER_ERROR))
+app.add_exception_handler(RebalanceInProgressError, create_exception_handler(status.HTTP_409_CONFLICT))
+app.add_exception_handler(RebalanceNotFoundError, create_exception_handler(status.HTTP_404_NOT_FOUND))
+app.add_exception_handler(ScrapeRateQuotaExceededError, create_exception_handler(status.HTTP_429_TOO_MANY_REQUESTS))
+app.add_exception_handler(ShardedJobMoveError, create_exception_handler(status.HTTP_409_CONFLICT))
 app.add_exception_handler(UnauthorizedApiKeyError, create_exception_handler(status.HTTP_401_UNAUTHORIZED))
 
 
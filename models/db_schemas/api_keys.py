@@ -12,6 +12,9 @@ class ApiKey(Document):
     description: Optional[str] = Field(default=None)
     time_created: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     is_admin: bool = Field(default=False)
+    # Requests/sec and burst size of the key's bucket; None uses the defaults
+    rate_limit: Optional[float] = Field(default=None, gt=0)
+    rate_burst: Optional[int] = Field(default=None, ge=1)
 
     @model_validator(mode="after")
     def validate_maas_pools(self):
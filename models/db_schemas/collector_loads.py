@@ -0,0 +1,24 @@
+from typing import Dict
+from datetime import datetime
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+from config.constants.load import LOAD_HISTORY_RETENTION_SECONDS
+
+
+class CollectorLoadSample(Document):
+    """Load reports of one collector cluster downsampled over one flush interval."""
+    maas_pool: str
+    collector_cluster: str
+    time: datetime
+    reports: int
+    scrape_duration_seconds: Dict[str, float]
+    samples_per_second: Dict[str, float]
+    memory_bytes: Dict[str, float]
+
+    class Settings:
+        name = "collector_load_samples"
+        indexes = [
+            IndexModel([("maas_pool", ASCENDING), ("collector_cluster", ASCENDING), ("time", ASCENDING)],
+                       name="load_sample_key"),
+            IndexModel([("time", ASCENDING)], name="load_sample_ttl", expireAfterSeconds=LOAD_HISTORY_RETENTION_SECONDS),
+        ]
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class CollectorView(Document):
+    """
+    One chunk of a collector's materialized job set. `jobs` maps job_name to
+    `{'seq', 'job_type', 'job'}` where `job` is the event payload; an entry without `job`
+    marks a delete and only exists so a late, older write cannot resurrect the job.
+    """
+    maas_pool: str
+    collector_cluster: str
+    chunk: int
+    jobs: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    update_time: Optional[datetime] = Field(default=None)
+
+    class Settings:
+        name = "collector_views"
+        indexes = [
+            IndexModel([("maas_pool", ASCENDING), ("collector_cluster", ASCENDING), ("chunk", ASCENDING)],
+                       name="view_chunk", unique=True),
+        ]
@@ -0,0 +1,22 @@
+from typing import Any, Optional
+from datetime import datetime
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+from config.constants.idempotency import IDEMPOTENCY_TTL_SECONDS
+from enums.idempotency_status import IdempotencyStatus
+
+
+class IdempotencyRecord(Document):
+    """Outcome of one mutating request, keyed by the caller's API key and Idempotency-Key."""
+    key: str
+    fingerprint: str
+    status: IdempotencyStatus
+    response: Optional[Any] = None
+    created_at: datetime
+
+    class Settings:
+        name = "idempotency_records"
+        indexes = [
+            IndexModel([("key", ASCENDING)], name="idempotency_key", unique=True),
+            IndexModel([("created_at", ASCENDING)], name="idempotency_ttl", expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS),
+        ]
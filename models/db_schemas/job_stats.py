@@ -0,0 +1,21 @@
+from typing import Optional
+from datetime import datetime
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class JobStats(Document):
+    """Counters for one collector cluster; `collector_cluster == POOL_TOTAL_KEY` holds the pool totals."""
+    maas_pool: str
+    collector_cluster: str
+    job_count: int = Field(default=0)
+    target_count: int = Field(default=0)
+    scrape_rate: float = Field(default=0.0)
+    update_time: Optional[datetime] = Field(default=None)
+
+    class Settings:
+        name = "job_stats"
+        indexes = [
+            IndexModel([("maas_pool", ASCENDING), ("collector_cluster", ASCENDING)], name="stats_key", unique=True),
+        ]
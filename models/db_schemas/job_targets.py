@@ -0,0 +1,20 @@
+from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
+
+
+class JobTarget(Document):
+    """Reverse index entry: one normalized target of one job, on the collector that scrapes it."""
+    job_id: PydanticObjectId
+    maas_pool: str
+    collector_cluster: str
+    job_name: str
+    target: str
+
+    class Settings:
+        name = "job_targets"
+        indexes = [
+            IndexModel([("job_id", ASCENDING), ("target", ASCENDING)], name="job_target_key", unique=True),
+            IndexModel([("maas_pool", ASCENDING), ("target", ASCENDING)], name="target_lookup"),
+            IndexModel([("maas_pool", ASCENDING), ("collector_cluster", ASCENDING), ("target", ASCENDING),
+                        ("job_name", ASCENDING)], name="collector_targets"),
+        ]
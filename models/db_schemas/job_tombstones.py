@@ -0,0 +1,29 @@
+from typing import List, Optional
+from datetime import datetime, timezone
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+from config.constants.jobs import TOMBSTONE_RETENTION_SECONDS
+from enums.job_type import JobType
+
+
+class JobTombstone(Document):
+    job_name: str
+    maas_pool: str
+    collector_cluster: str
+    job_type: JobType
+    seq: int
+    shard_collectors: Optional[List[str]] = None
+    time_deleted: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "job_tombstones"
+        indexes = [
+            IndexModel([("maas_pool", ASCENDING), ("collector_cluster", ASCENDING), ("seq", ASCENDING)],
+                       name="tombstone_changes"),
+            IndexModel([("maas_pool", ASCENDING), ("seq", ASCENDING)], name="tombstone_pool_changes"),
+            IndexModel([("maas_pool", ASCENDING), ("shard_collectors", ASCENDING), ("seq", ASCENDING)],
+                       name="tombstone_shard_changes"),
+            IndexModel([("time_deleted", ASCENDING)], name="tombstone_ttl",
+                       expireAfterSeconds=TOMBSTONE_RETENTION_SECONDS),
+        ]
@@ -1,12 +1,17 @@
 from typing import List, Optional, Union, Annotated, Dict, Literal, Any
 from beanie import Document
 from pydantic import Field, ConfigDict
+from pymongo import ASCENDING, IndexModel
 from datetime import datetime, timezone
 from enums.blackbox_job_modules import BlackboxJobModules
 from enums.job_type import JobType
 from enums.kubernetes_roles import KubernetesRoles
 from models.general.jobs.basic_auth import BasicAuth
 
+# Storage and bookkeeping fields left out of the job payload sent to collectors
+EVENT_EXCLUDED_FIELDS = {'maas_pool', 'collector_cluster', 'time_created', 'update_time', 'id', 'job_type', 'revision',
+                         'seq', 'label_terms', 'job_name_lower', 'name_ngrams', 'shard_collectors', 'content_hash'}
+
 
 class BaseJob(Document):
     job_name: str
@@ -18,12 +23,38 @@ class BaseJob(Document):
     collector_cluster: str
     time_created: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     update_time: Optional[datetime] = Field(default=None)
+    revision: int = Field(default=0)
+    seq: int = Field(default=0)
+    label_terms: Optional[List[str]] = Field(default=None)
+    job_name_lower: Optional[str] = Field(default=None)
+    name_ngrams: Optional[List[str]] = Field(default=None)
+    content_hash: Optional[str] = Field(default=None)
 
     class Settings:
         name = "jobs"
         is_root = True
         allow_inheritance = True
         keep_nulls = False
+        indexes = [
+            # Covers the If-None-Match version lookup without touching the documents
+            IndexModel(
+                [("maas_pool", ASCENDING), ("collector_cluster", ASCENDING), ("job_name", ASCENDING),
+                 ("revision", ASCENDING), ("_id", ASCENDING)],
+                name="job_version",
+            ),
+            IndexModel([("maas_pool", ASCENDING), ("collector_cluster", ASCENDING), ("seq", ASCENDING)],
+                       name="job_changes"),
+            IndexModel([("maas_pool", ASCENDING), ("seq", ASCENDING)], name="job_pool_changes"),
+            # Second `$or` branch of a collector's change feed: sharded jobs it holds a shard of
+            IndexModel([("maas_pool", ASCENDING), ("shard_collectors", ASCENDING), ("seq", ASCENDING)],
+                       name="job_shard_changes"),
+            IndexModel([("maas_pool", ASCENDING), ("label_terms", ASCENDING)], name="job_label_terms"),
+            IndexModel([("maas_pool", ASCENDING), ("job_name_lower", ASCENDING)], name="job_name_prefix"),
+            IndexModel([("maas_pool", ASCENDING), ("name_ngrams", ASCENDING)], name="job_name_ngrams"),
+            # Covers a desired-state plan: every job of a collector with its content hash, no documents read
+            IndexModel([("maas_pool", ASCENDING), ("collector_cluster", ASCENDING), ("job_name", ASCENDING),
+                        ("content_hash", ASCENDING)], name="job_content"),
+        ]
 
     model_config = ConfigDict(
         populate_by_name=True
@@ -32,7 +63,7 @@ class BaseJob(Document):
     def to_event_data(self) -> Dict[str, Any]:
         return self.model_dump(
             mode="json",
-            exclude={'maas_pool', 'collector_cluster', 'time_created', 'update_time', 'id', 'job_type'},
+            exclude=EVENT_EXCLUDED_FIELDS,
             exclude_none=True
         )
 
@@ -50,6 +81,8 @@ class GeneralJob(BaseJob):
     targets: List[str] = Field(...)
     metrics_path: Optional[str] = None
     certs: Optional[bool] = None
+    # Set only for sharded jobs: the collectors its targets are hashed across, fixed at creation
+    shard_collectors: Optional[List[str]] = None
 
 class BlackboxJob(BaseJob):
     job_type: Literal[JobType.BLACKBOX] = JobType.BLACKBOX
@@ -57,6 +90,7 @@ class BlackboxJob(BaseJob):
     host: str
     module: BlackboxJobModules
     probe_path: Optional[str] = None
+    shard_collectors: Optional[List[str]] = None
 
 class KubernetesJob(BaseJob):
     job_type: Literal[JobType.KUBERNETES_SD] = JobType.KUBERNETES_SD
@@ -72,4 +106,11 @@ class HttpJob(BaseJob):
     certs: Optional[bool] = None
 
 
+JOB_MODELS = {
+    JobType.GENERAL: GeneralJob,
+    JobType.BLACKBOX: BlackboxJob,
+    JobType.KUBERNETES_SD: KubernetesJob,
+    JobType.HTTP_SD: HttpJob,
+}
+
 JobModel = Annotated[Union[GeneralJob, BlackboxJob, KubernetesJob, HttpJob], Field(discriminator="job_type")]
\ No newline at end of file
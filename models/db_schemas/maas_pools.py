@@ -2,6 +2,7 @@ from typing import Optional, List
 from datetime import datetime, timezone
 from pydantic import Field
 from beanie import Document
+from models.general.pools.quotas import PoolQuotas
 
 
 class MaasPool(Document):
@@ -10,6 +11,11 @@ class MaasPool(Document):
     clusters: List[str] = Field(default=[])
     time_created: datetime = Field(default_factory=datetime.now(timezone.utc))
     update_time: Optional[datetime] = Field(default=None)
+    quotas: Optional[PoolQuotas] = Field(default=None)
+
+    @property
+    def collector_clusters(self) -> List[str]:
+        return self.clusters
 
     class Settings:
         name = "maas_pools"
\ No newline at end of file
@@ -0,0 +1,57 @@
+from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
+from config.constants.operations import OPERATION_RETENTION_SECONDS
+from enums.operation_kind import OperationKind
+from enums.operation_state import OperationState
+
+
+class OperationProgress(BaseModel):
+    total: Optional[int] = None
+    done: int = 0
+    failed: int = 0
+
+
+class Operation(Document):
+    """A long-running request executed in the background; `checkpoint` is where a resumed run picks up."""
+    kind: OperationKind
+    maas_pool: Optional[str] = None
+    params: Dict[str, Any] = Field(default_factory=dict)
+    state: OperationState = OperationState.QUEUED
+    progress: OperationProgress = Field(default_factory=OperationProgress)
+    checkpoint: Optional[Any] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    owner: Optional[str] = None
+    # Runs started and not handed back, counting the current one
+    attempts: int = 0
+    lease_until: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "operations"
+        indexes = [
+            IndexModel([("state", ASCENDING), ("created_at", ASCENDING)], name="operation_queue"),
+            # Only finished operations carry `finished_at`, so queued and running ones never expire
+            IndexModel([("finished_at", ASCENDING)], name="operation_ttl", expireAfterSeconds=OPERATION_RETENTION_SECONDS),
+        ]
+
+
+class OperationItem(Document):
+    """Result of one item (job, target...) processed by an operation."""
+    operation_id: PydanticObjectId
+    key: str
+    status: str
+    detail: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "operation_items"
+        indexes = [
+            IndexModel([("operation_id", ASCENDING), ("key", ASCENDING)], name="operation_item_key", unique=True),
+            IndexModel([("created_at", ASCENDING)], name="operation_item_ttl", expireAfterSeconds=OPERATION_RETENTION_SECONDS),
+        ]
@@ -0,0 +1,14 @@
+from typing import Any, Dict
+from beanie import Document
+from pydantic import Field
+
+
+class PoolSequence(Document):
+    """Monotonic per-pool counter stamped on every job mutation; `id` is the pool name."""
+    id: str = Field(...)
+    seq: int = Field(default=0)
+    # Writes holding a seq they have not stamped yet: lease id -> {floor, expires}
+    leases: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+    class Settings:
+        name = "pool_sequences"
@@ -1,12 +1,12 @@
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from enums.event_actions import EventActions
 from enums.job_type import JobType
 
 class JobEvent(BaseModel):
     job_name: str
-    action: Literal[EventActions]
+    action: EventActions
     collector_name: str
     maas_pool_name: str
-    job_type: Literal[JobType]
+    job_type: JobType
     data: Optional[Dict[str, Any]] = None
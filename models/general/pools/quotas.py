@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class PoolQuotas(BaseModel):
+    """Admission limits of a pool; None leaves that dimension unlimited."""
+    max_jobs: Optional[int] = Field(default=None, ge=0)
+    max_scrape_rate: Optional[float] = Field(default=None, ge=0)
+    collector_max_jobs: Optional[int] = Field(default=None, ge=0)
+    collector_max_scrape_rate: Optional[float] = Field(default=None, ge=0)
@@ -7,4 +7,6 @@ class ApiKeyResponse(BaseModel):
     key: str
     maas_pools: List[str]
     description: Optional[str] = None
-    time_created: datetime
\ No newline at end of file
+    time_created: datetime
+    rate_limit: Optional[float] = None
+    rate_burst: Optional[int] = None
@@ -0,0 +1,13 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+from enums.circuit_state import CircuitState
+
+
+class CircuitBreakerResponse(BaseModel):
+    name: str
+    state: CircuitState
+    consecutive_failures: int
+    rejected: int
+    transitions: Dict[str, int]
+    last_error: Optional[str] = None
+    retry_after: float
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Dict
+from pydantic import BaseModel
+
+
+class MetricSummary(BaseModel):
+    mean: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+
+
+class CollectorLoad(BaseModel):
+    reports: int
+    last_report: datetime
+    scrape_duration_seconds: MetricSummary
+    samples_per_second: MetricSummary
+    memory_bytes: MetricSummary
+
+
+class PoolLoadResponse(BaseModel):
+    maas_pool: str
+    window_seconds: int
+    collectors: Dict[str, CollectorLoad]
+
+
+class CollectorLoadSampleResponse(BaseModel):
+    time: datetime
+    reports: int
+    scrape_duration_seconds: MetricSummary
+    samples_per_second: MetricSummary
+    memory_bytes: MetricSummary
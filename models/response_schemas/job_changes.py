@@ -0,0 +1,20 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from enums.change_types import ChangeType
+from enums.job_type import JobType
+
+
+class JobChange(BaseModel):
+    seq: int
+    action: ChangeType
+    job_name: str
+    collector_cluster: str
+    job_type: Optional[JobType] = None
+    shard_collectors: Optional[List[str]] = None
+    job: Optional[Dict[str, Any]] = None
+
+
+class JobChangesResponse(BaseModel):
+    changes: List[JobChange]
+    next_cursor: int
+    has_more: bool
@@ -0,0 +1,12 @@
+from typing import Optional
+from pydantic import BaseModel
+from enums.job_type import JobType
+from enums.name_match import NameMatch
+
+
+class JobSearchResult(BaseModel):
+    job_name: str
+    maas_pool: str
+    collector_cluster: str
+    job_type: Optional[JobType] = None
+    match: NameMatch
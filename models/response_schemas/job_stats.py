@@ -0,0 +1,14 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class LoadStats(BaseModel):
+    job_count: int
+    target_count: int
+    scrape_rate: float
+
+
+class PoolStatsResponse(BaseModel):
+    maas_pool: str
+    totals: LoadStats
+    collectors: Dict[str, LoadStats]
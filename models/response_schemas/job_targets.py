@@ -0,0 +1,24 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class TargetJob(BaseModel):
+    maas_pool: str
+    collector_cluster: str
+    job_name: str
+
+
+class TargetLookupResponse(BaseModel):
+    target: str
+    jobs: List[TargetJob]
+
+
+class DuplicateTarget(BaseModel):
+    target: str
+    jobs: List[str]
+
+
+class DuplicateTargetsResponse(BaseModel):
+    maas_pool: str
+    collector_cluster: str
+    duplicates: List[DuplicateTarget]
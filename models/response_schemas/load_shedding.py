@@ -0,0 +1,11 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class LoadSheddingResponse(BaseModel):
+    lag_ms: float
+    dropping: bool
+    drop_probability: float
+    in_flight_limit: int
+    in_flight: Dict[str, int]
+    shed: Dict[str, int]
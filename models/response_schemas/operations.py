@@ -0,0 +1,31 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+from enums.operation_kind import OperationKind
+from enums.operation_state import OperationState
+from models.db_schemas.operations import OperationProgress
+
+
+class OperationResponse(BaseModel):
+    id: str
+    kind: OperationKind
+    maas_pool: Optional[str] = None
+    state: OperationState
+    progress: OperationProgress
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class OperationItemResponse(BaseModel):
+    key: str
+    status: str
+    detail: Optional[str] = None
+
+
+class OperationItemsResponse(BaseModel):
+    items: List[OperationItemResponse]
+    next: Optional[str] = None
@@ -0,0 +1,22 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+from models.general.pools.quotas import PoolQuotas
+
+
+class QuotaBudget(BaseModel):
+    limit: float
+    used: float
+    remaining: float
+
+
+class CollectorQuotaUsage(BaseModel):
+    jobs: Optional[QuotaBudget] = None
+    scrape_rate: Optional[QuotaBudget] = None
+
+
+class PoolQuotaResponse(BaseModel):
+    maas_pool: str
+    quotas: Optional[PoolQuotas] = None
+    jobs: Optional[QuotaBudget] = None
+    scrape_rate: Optional[QuotaBudget] = None
+    collectors: Dict[str, CollectorQuotaUsage]
@@ -0,0 +1,28 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from enums.rebalance_state import RebalanceState
+
+
+class JobMoveResponse(BaseModel):
+    job_name: str
+    source: str
+    target: str
+    cost: float
+
+
+class RebalancePlanResponse(BaseModel):
+    maas_pool: str
+    tolerance: float
+    mean_load: float
+    loads_before: Dict[str, float]
+    loads_after: Dict[str, float]
+    moves: List[JobMoveResponse]
+
+
+class RebalanceStatusResponse(BaseModel):
+    maas_pool: str
+    state: RebalanceState
+    plan: RebalancePlanResponse
+    completed: int
+    skipped: int
+    error: Optional[str] = None
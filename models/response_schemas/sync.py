@@ -0,0 +1,11 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class SyncPlanResponse(BaseModel):
+    maas_pool: str
+    collector_cluster: str
+    create: List[str]
+    update: List[str]
+    delete: List[str]
+    unchanged: int
@@ -0,0 +1,18 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class PoolWriteQueueResponse(BaseModel):
+    weight: float
+    queued: int
+    running: int
+    admitted: int
+    average_wait_ms: float
+    max_wait_ms: float
+
+
+class WriteSchedulerResponse(BaseModel):
+    max_concurrency: int
+    running: int
+    queued: int
+    pools: Dict[str, PoolWriteQueueResponse]
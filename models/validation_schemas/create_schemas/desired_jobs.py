@@ -0,0 +1,9 @@
+from typing import List
+from pydantic import BaseModel, Field
+from config.constants.sync import MAX_DESIRED_JOBS
+from models.validation_schemas.create_schemas.jobs import JobCreate
+
+
+class DesiredJobSet(BaseModel):
+    # Every job the collector should have; stored jobs missing from it are deleted
+    jobs: List[JobCreate] = Field(..., max_length=MAX_DESIRED_JOBS)
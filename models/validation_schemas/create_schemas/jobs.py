@@ -1,9 +1,10 @@
-from typing import Optional, Literal
-from pydantic import BaseModel, Field
-from config.constants.jobs import JOB_NAME_REGEX, MIN_REFRESH_INTERVAL, MIN_SCRAPE_INTERVAL, MIN_SCRAPE_TIMEOUT, MAX_REFRESH_INTERVAL, MAX_SCRAPE_INTERVAL, MAX_SCRAPE_TIMEOUT, COLLECTOR_CLUSTER_REGEX, MAAS_POOL_NAME_REGEX, METRICS_PATH_REGEX, HOST_REGEX
+from typing import Annotated, Optional, Literal, Union
+from pydantic import AliasChoices, BaseModel, Field, model_validator
+from config.constants.jobs import DEFAULT_PLACEMENT_STRATEGY, JOB_NAME_REGEX, MIN_REFRESH_INTERVAL, MIN_SCRAPE_INTERVAL, MIN_SCRAPE_TIMEOUT, MAX_REFRESH_INTERVAL, MAX_SCRAPE_INTERVAL, MAX_SCRAPE_TIMEOUT, COLLECTOR_CLUSTER_REGEX, MAAS_POOL_NAME_REGEX, MIN_SHARDS, MAX_SHARDS, METRICS_PATH_REGEX, HOST_REGEX
 from enums.job_type import JobType
 from enums.blackbox_job_modules import BlackboxJobModules
 from enums.kubernetes_roles import KubernetesRoles
+from enums.placement_strategy import PlacementStrategy
 from models.general.jobs.basic_auth import BasicAuth
 from models.general.jobs.endpoints import JobEndpoints
 from models.general.jobs.labels import JobLabels
@@ -17,13 +18,25 @@ class BaseJobCreate(BaseModel):
     scrape_timeout: Optional[int] = Field(default=None, ge=MIN_SCRAPE_TIMEOUT, le=MAX_SCRAPE_TIMEOUT)
     basic_auth: Optional[BasicAuth] = Field(default=None)
     labels: Optional[JobLabels] = Field(default=None)
-    collector_cluster: str = Field(..., pattern=COLLECTOR_CLUSTER_REGEX)
+    collector_cluster: Optional[str] = Field(default=None, pattern=COLLECTOR_CLUSTER_REGEX)
     maas_pool: str = Field(..., pattern=MAAS_POOL_NAME_REGEX)
+    # Without collector_cluster the job is placed automatically; never stored or sent to collectors
+    placement: Optional[PlacementStrategy] = Field(default=None, exclude=True)
+
+    @model_validator(mode="after")
+    def validate_placement(self):
+        if self.collector_cluster is None and self.placement is None:
+            self.placement = PlacementStrategy(DEFAULT_PLACEMENT_STRATEGY)
+        elif self.collector_cluster is not None and self.placement is not None:
+            raise ValueError("placement can only be used when collector_cluster is not set")
+        return self
 
 
 class GeneralJobCreate(BaseJobCreate):
     job_type: Literal[JobType.GENERAL] = Field(default=JobType.GENERAL)
     targets: JobTargets = Field(...)
+    # Split the targets across this many collectors of the pool; never stored or sent to collectors
+    shards: Optional[int] = Field(default=None, ge=MIN_SHARDS, le=MAX_SHARDS, exclude=True)
     metrics_path: Optional[str] = Field(default=None, pattern=METRICS_PATH_REGEX)
     certs: Optional[bool] = Field(default=None)
 
@@ -31,6 +44,8 @@ class GeneralJobCreate(BaseJobCreate):
 class BlackboxJobCreate(BaseJobCreate):
     job_type: Literal[JobType.BLACKBOX] = Field(default=JobType.BLACKBOX)
     targets: JobTargets = Field(...)
+    # Split the targets across this many collectors of the pool; never stored or sent to collectors
+    shards: Optional[int] = Field(default=None, ge=MIN_SHARDS, le=MAX_SHARDS, exclude=True)
     module: BlackboxJobModules = Field(...)
     host: str = Field(..., pattern=HOST_REGEX)
     probe_path: str = Field(..., pattern=METRICS_PATH_REGEX)
@@ -38,7 +53,8 @@ class BlackboxJobCreate(BaseJobCreate):
 
 class KubernetesSDJobCreate(BaseJobCreate):
     job_type: Literal[JobType.KUBERNETES_SD] = Field(default=JobType.KUBERNETES_SD)
-    namespace: JobNamespaces = Field(...)
+    # Stored as `namespaces`; `namespace` is still accepted from existing clients
+    namespaces: JobNamespaces = Field(..., validation_alias=AliasChoices("namespaces", "namespace"))
     role: KubernetesRoles = Field(...)
     metrics_path: Optional[str] = Field(default=None, pattern=METRICS_PATH_REGEX)
 
@@ -49,4 +65,7 @@ class HttpJobCreate(BaseJobCreate):
     metrics_path: Optional[str] = Field(default=None, pattern=METRICS_PATH_REGEX)
     refresh_interval: Optional[int] = Field(default=None, ge=MIN_REFRESH_INTERVAL, le=MAX_REFRESH_INTERVAL)
     certs: Optional[bool] = Field(default=None)
-    
+
+
+JobCreate = Annotated[Union[GeneralJobCreate, BlackboxJobCreate, KubernetesSDJobCreate, HttpJobCreate],
+                      Field(discriminator="job_type")]
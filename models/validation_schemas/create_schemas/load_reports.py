@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class CollectorLoadReport(BaseModel):
+    scrape_duration_seconds: float = Field(..., ge=0)
+    samples_per_second: float = Field(..., ge=0)
+    memory_bytes: float = Field(..., ge=0)
@@ -1,16 +1,37 @@
-from typing import Dict, Any
-import json
+from typing import Any, Dict, List, Tuple
+import asyncio
+import time
 from aiokafka import AIOKafkaProducer
+from aiokafka.errors import KafkaError, RequestTimedOutError
+from opentelemetry.trace import SpanKind
 from config import config
+from config.constants.resilience import PRODUCE_ATTEMPT_TIMEOUT_SECONDS, PRODUCE_RETRY_ATTEMPTS
 from enums.job_type import JobType
 from exceptions.produce_failure_error import ProduceFailureError
 from models.events import JobEvent
+from utils.circuit_breaker import get_circuit_breaker
 from utils.logger import create_logger
+from utils.metrics import KAFKA_PRODUCE_DURATION, KAFKA_PRODUCE_IN_FLIGHT
+from utils.retry import retry_async
+from utils.tracing import kafka_headers, start_span
 
 KAFKA_CONFIG = config['kafka']
 logger = create_logger("producer")
 ENCODING_FORMAT = 'utf-8'
 
+kafka_breaker = get_circuit_breaker("kafka", failure_types=(KafkaError, asyncio.TimeoutError, OSError))
+produce_succeeded = KAFKA_PRODUCE_DURATION.labels("ok")
+produce_failed = KAFKA_PRODUCE_DURATION.labels("error")
+
+
+# The broker may have written the record before the attempt gave up; sending it again could duplicate the event
+AMBIGUOUS_FAILURES = (asyncio.TimeoutError, RequestTimedOutError)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Only failures that certainly wrote nothing are retried; the client retries the rest itself, idempotently."""
+    return isinstance(error, KafkaError) and error.retriable and not isinstance(error, AMBIGUOUS_FAILURES)
+
 
 class KafkaProducer:
     _instance = None
@@ -28,14 +49,18 @@ class KafkaProducer:
                 'bootstrap_servers': KAFKA_CONFIG['bootstrap_servers'],
                 'client_id': KAFKA_CONFIG['sasl_username'],
                 'acks': 'all',
+                # The client's own retries of a batch are then deduplicated by the broker
+                'enable_idempotence': True,
                 'security_protocol': KAFKA_CONFIG['security_protocol'],
                 'sasl_mechanism': KAFKA_CONFIG['sasl_mechanism'],
                 'sasl_plain_username': KAFKA_CONFIG['sasl_username'],
                 'sasl_plain_password': KAFKA_CONFIG['sasl_password']            
                 }
             
-            self._producer = AIOKafkaProducer(**params)
-            await self._producer.start()
+            # Only kept once started, so a failed start is retried on the next send
+            kafka_producer = AIOKafkaProducer(**params)
+            await kafka_producer.start()
+            self._producer = kafka_producer
             logger.info("Kafka producer started")
     
     async def stop(self):
@@ -43,19 +68,40 @@ class KafkaProducer:
             await self._producer.stop()
             logger.info("Kafka producer stopped")
 
-    async def send_event(self, action: str, maas_pool: str, collector_cluster: str, job_type: JobType, job_name: str, job_data: Dict[str, Any] = None):
+    def check_available(self):
+        """Raise `CircuitOpenError` while Kafka is known to be down, before the caller writes anything."""
+        kafka_breaker.raise_if_open()
+
+    async def _send(self, value_bytes: bytes, event_key: bytes, headers: List[Tuple[str, bytes]]):
         if not self._producer:
             await self.start()
-        
-        event = JobEvent(action=action, maas_pool=maas_pool, collector_cluster=collector_cluster, job_type=job_type, job_name=job_name, job_data=job_data)
-        value_bytes = json.dumps(event.model_dump()).encode(ENCODING_FORMAT)
+        # Bound each attempt well below the client's own timeout, the retries cover a slow broker
+        await asyncio.wait_for(self._producer.send_and_wait(KAFKA_CONFIG['topic'], value=value_bytes, key=event_key,
+                                                             headers=headers),
+                               PRODUCE_ATTEMPT_TIMEOUT_SECONDS)
+
+    async def send_event(self, action: str, maas_pool: str, collector_cluster: str, job_type: JobType, job_name: str, job_data: Dict[str, Any] = None):
+        event = JobEvent(action=action, maas_pool_name=maas_pool, collector_name=collector_cluster, job_type=job_type, job_name=job_name, data=job_data)
+        value_bytes = event.model_dump_json().encode(ENCODING_FORMAT)
         event_key = maas_pool.encode(ENCODING_FORMAT)
 
-        try:
-            await self._producer.send_and_wait(KAFKA_CONFIG['topic'], value=value_bytes, key=event_key)
-            logger.info(f"Event {event} sent successfully")
-        except Exception as e:
-            logger.error(f"Failed to send event {event}: {str(e)}")
-            raise ProduceFailureError(str(e))
+        started = time.perf_counter()
+        KAFKA_PRODUCE_IN_FLIGHT.inc()
+        with start_span(f"{KAFKA_CONFIG['topic']} publish", SpanKind.PRODUCER, {
+                "messaging.system": "kafka", "messaging.destination.name": KAFKA_CONFIG['topic'],
+                "messaging.operation.type": "publish", "maas.job_name": job_name, "maas.action": action}):
+            # Injected inside the span, so a consumer's span is a child of this produce
+            headers = kafka_headers()
+            try:
+                await retry_async(lambda: kafka_breaker.call(self._send, value_bytes, event_key, headers),
+                                  PRODUCE_RETRY_ATTEMPTS, _is_transient)
+                produce_succeeded.observe(time.perf_counter() - started)
+                logger.info(f"Event {event} sent successfully")
+            except Exception as e:
+                produce_failed.observe(time.perf_counter() - started)
+                logger.error(f"Failed to send event {event}: {str(e)}")
+                raise ProduceFailureError(str(e))
+            finally:
+                KAFKA_PRODUCE_IN_FLIGHT.dec()
     
-producer = KafkaProducer()
\ No newline at end of file
+producer = KafkaProducer()
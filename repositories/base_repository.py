@@ -1,14 +1,80 @@
+import functools
+import inspect
+import time
 from abc import ABC
+from contextvars import ContextVar
 from typing import List, Optional, Type, TypeVar, Generic, Dict, Any
 from beanie import Document
+from opentelemetry.trace import SpanKind
+from pymongo.errors import AutoReconnect, ConnectionFailure, ServerSelectionTimeoutError
+from config.constants.resilience import MONGO_READ_RETRY_ATTEMPTS
+from utils.circuit_breaker import get_circuit_breaker
+from utils.metrics import MONGO_OPERATION_DURATION
+from utils.retry import retry_async
+from utils.tracing import start_span
 
 
 T = TypeVar('T', bound=Document)
 
+mongo_breaker = get_circuit_breaker("mongo", failure_types=(ConnectionFailure,))
+
+# Reads are safe to repeat; writes rely on the driver's own single retryable-write attempt
+READ_METHOD_PREFIXES = ("get", "find", "search")
+
+# Set inside a guarded call, so repository methods calling each other count once
+_in_repository_call: ContextVar[bool] = ContextVar("in_repository_call", default=False)
+
+
+def _is_transient(error: Exception) -> bool:
+    # Server selection already waited out its own timeout; repeating it only doubles the wait
+    return isinstance(error, AutoReconnect) and not isinstance(error, ServerSelectionTimeoutError)
+
+
+def _guard(method):
+    attempts = MONGO_READ_RETRY_ATTEMPTS if method.__name__.startswith(READ_METHOD_PREFIXES) else 1
+    repository = method.__qualname__.split(".")[0]
+    span_name = f"{repository}.{method.__name__}"
+    span_attributes = {"db.system": "mongodb", "db.operation.name": method.__name__}
+    # Histogram children bound on first use, so only methods that ran are exported
+    latencies = {}
+
+    def observe(outcome: str, started: float):
+        latency = latencies.get(outcome)
+        if latency is None:
+            latency = latencies[outcome] = MONGO_OPERATION_DURATION.labels(repository, method.__name__, outcome)
+        latency.observe(time.perf_counter() - started)
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _in_repository_call.get():
+            return await method(*args, **kwargs)
+        token = _in_repository_call.set(True)
+        started = time.perf_counter()
+        try:
+            with start_span(span_name, SpanKind.CLIENT, span_attributes):
+                result = await retry_async(lambda: mongo_breaker.call(method, *args, **kwargs), attempts, _is_transient)
+        except Exception:
+            observe("error", started)
+            raise
+        finally:
+            _in_repository_call.reset(token)
+        observe("ok", started)
+        return result
+
+    return wrapper
+
+
 class BaseRepository(Generic[T], ABC):
     def __init__(self, model: Type[T]):
         self.model = model
 
+    def __init_subclass__(cls, **kwargs):
+        # Every public coroutine of a repository goes through the Mongo circuit breaker
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.iscoroutinefunction(attribute):
+                setattr(cls, name, _guard(attribute))
+
     async def get_all(self) -> List[T]:
         raise NotImplementedError
     
@@ -0,0 +1,58 @@
+from typing import Any, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError
+from config.constants.idempotency import IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+from enums.idempotency_status import IdempotencyStatus
+from models.db_schemas.idempotency_records import IdempotencyRecord
+from repositories.base_repository import BaseRepository
+
+RECORD_PROJECTION = {'_id': 0, 'key': 1, 'fingerprint': 1, 'status': 1, 'response': 1, 'created_at': 1}
+
+
+class IdempotencyRepository(BaseRepository[IdempotencyRecord]):
+    def __init__(self):
+        super().__init__(IdempotencyRecord)
+
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
+
+    async def claim(self, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Record `key` as in progress. Returns None when this caller now owns the key, otherwise
+        the existing record. An in-progress claim older than the lock timeout is taken over.
+        """
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.collection.insert_one({'key': key, 'fingerprint': fingerprint,
+                                                  'status': IdempotencyStatus.IN_PROGRESS.value, 'created_at': now})
+                return None
+            except DuplicateKeyError:
+                pass
+
+            stale_before = now - timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+            taken_over = await self.collection.update_one(
+                {'key': key, 'status': IdempotencyStatus.IN_PROGRESS.value, 'created_at': {'$lt': stale_before}},
+                {'$set': {'fingerprint': fingerprint, 'created_at': now}},
+            )
+            if taken_over.modified_count:
+                return None
+
+            existing = await self.get(key)
+            # Gone again if its owner failed and released it in between; try to claim it once more
+            if existing is not None:
+                return existing
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({'key': key}, RECORD_PROJECTION)
+
+    async def complete(self, key: str, response: Any):
+        await self.collection.update_one(
+            {'key': key},
+            {'$set': {'status': IdempotencyStatus.COMPLETED.value, 'response': response,
+                      'created_at': datetime.now(timezone.utc)}},
+        )
+
+    async def release(self, key: str):
+        await self.collection.delete_one({'key': key, 'status': IdempotencyStatus.IN_PROGRESS.value})
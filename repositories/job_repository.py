@@ -1,17 +1,61 @@
-from typing import Optional, Dict, Any
+import asyncio
+import re
+from typing import Optional, Dict, Any, List, Set, Tuple, AsyncIterator
 from datetime import datetime, timezone
+from beanie import PydanticObjectId, UpdateResponse
+from bson import ObjectId
+from beanie.odm.operators.update.general import Inc, Set as SetOperator
+from beanie.odm.utils.dump import get_dict
+from beanie.odm.utils.parsing import merge_models
+from cryptography.fernet import InvalidToken
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+from enums.change_types import ChangeType
+from exceptions.job_modified_error import JobModifiedError
 from repositories.base_repository import BaseRepository
+from repositories.sequence_repository import SequenceRepository
+from repositories.target_index_repository import TargetIndexRepository
+from repositories.view_repository import CollectorViewRepository, view_entries
 from models.db_schemas.jobs import BaseJob
+from models.db_schemas.job_tombstones import JobTombstone
+from utils.label_selector import label_terms
+from utils.content_hash import job_content_hash
+from utils.logger import create_logger
+from utils.name_search import name_ngrams, normalize_name
+from utils.security import security_manager
+from utils.target_index import target_placements
+
+logger = create_logger("job_repository")
+
+RAW_JOB_PROJECTION = {'_class_id': 0, 'label_terms': 0, 'job_name_lower': 0, 'name_ngrams': 0, 'content_hash': 0}
+CONTENT_HASH_PROJECTION = {'_id': 0, 'job_name': 1, 'content_hash': 1}
+VERSION_PROJECTION = {'_id': 1, 'revision': 1}
+TOMBSTONE_PROJECTION = {'_id': 0, 'job_name': 1, 'collector_cluster': 1, 'job_type': 1, 'seq': 1, 'shard_collectors': 1}
+IDENTITY_FIELDS = ('job_name', 'maas_pool', 'collector_cluster')
+LOAD_PROJECTION = {'_id': 1, 'maas_pool': 1, 'collector_cluster': 1, 'scrape_interval': 1,
+                   'targets': 1, 'endpoints': 1, 'namespaces': 1, 'shard_collectors': 1}
+SEARCH_PROJECTION = {'_id': 0, 'job_name': 1, 'maas_pool': 1, 'collector_cluster': 1, 'job_type': 1, 'job_name_lower': 1}
+# Query fields derived on every write; jobs stored before one existed get it from `backfill_search_fields`
+SEARCH_FIELDS = ('label_terms', 'job_name_lower', 'name_ngrams')
+SEARCH_SOURCE_PROJECTION = {'_id': 1, 'job_name': 1, 'labels': 1}
+MISSING_SEARCH_FIELDS = {'$or': [{field: {'$exists': False}} for field in SEARCH_FIELDS]}
 
 
 class JobRepository(BaseRepository[BaseJob]):
-    def __init__(self):
+    def __init__(self, sequences: Optional[SequenceRepository] = None,
+                 views: Optional[CollectorViewRepository] = None,
+                 targets: Optional[TargetIndexRepository] = None):
         super().__init__(BaseJob)
+        self.sequences = sequences or SequenceRepository()
+        self.views = views
+        self.targets = targets or TargetIndexRepository()
 
-    async def create(self, document: BaseJob) -> BaseJob:
-        return await document.create()
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
 
-    async def get(self, job_name: str, maas_pool: str, collector_cluster: str) -> Optional[BaseJob]:
+    @staticmethod
+    def _job_query(job_name: str, maas_pool: str, collector_cluster: str) -> Dict[str, Any]:
         query: Dict[str, Any] = {
             'job_name': job_name,
             'maas_pool': maas_pool,
@@ -21,17 +65,341 @@ class JobRepository(BaseRepository[BaseJob]):
         children_ids = list(BaseJob.get_child_class_ids())
         query['_class_id'] = {'$in': children_ids}
 
-        return await self.model.find_one(query)
+        return query
+
+    @staticmethod
+    def _collector_filter(collector_cluster: str) -> Dict[str, Any]:
+        """Jobs a collector scrapes: the ones placed on it and the sharded ones holding a shard there."""
+        return {'$or': [{'collector_cluster': collector_cluster}, {'shard_collectors': collector_cluster}]}
+
+    @staticmethod
+    def content_hash(job: Dict[str, Any]) -> Optional[str]:
+        """`job_content_hash` of a job in stored form, whose basic_auth password is encrypted."""
+        basic_auth = job.get('basic_auth')
+        try:
+            password = security_manager.decrypt(basic_auth['password']) if basic_auth else None
+        except InvalidToken:
+            # Unreadable with the current key; the job then always plans as an update
+            return None
+        return job_content_hash(job, password)
+
+    @staticmethod
+    def _search_fields(job_name: str, labels: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        return {'label_terms': label_terms(labels), 'job_name_lower': normalize_name(job_name),
+                'name_ngrams': name_ngrams(job_name)}
+
+    @classmethod
+    def _sync_derived_fields(cls, document: BaseJob):
+        for field, value in cls._search_fields(document.job_name, document.labels).items():
+            setattr(document, field, value)
+        document.content_hash = cls.content_hash(document.model_dump())
+
+    async def _replace_revision(self, document: BaseJob, revision: int):
+        """Store `document` over the job only while that is still at `revision`."""
+        result = await self.collection.replace_one({'_id': document.id, 'revision': revision},
+                                                   get_dict(document, to_db=True, keep_nulls=False))
+        if not result.matched_count:
+            raise JobModifiedError(document.job_name)
+
+    async def _tombstone(self, document: BaseJob) -> int:
+        async with self.sequences.reserve(document.maas_pool) as seq:
+            await JobTombstone(
+                job_name=document.job_name,
+                maas_pool=document.maas_pool,
+                collector_cluster=document.collector_cluster,
+                job_type=document.job_type,
+                seq=seq,
+                shard_collectors=getattr(document, 'shard_collectors', None)
+            ).create()
+        return seq
+
+    async def _view_put(self, document: BaseJob):
+        if self.views is None:
+            return
+        job = {**document.to_event_data(), 'job_type': document.job_type.value, 'seq': document.seq,
+               'collector_cluster': document.collector_cluster,
+               'shard_collectors': getattr(document, 'shard_collectors', None)}
+        try:
+            for collector_cluster, job_name, entry in view_entries(job):
+                await self.views.put(document.maas_pool, collector_cluster, job_name, entry)
+        except Exception as e:
+            # The view is derived data; `CollectorViewService.rebuild` repairs a missed write
+            logger.error(f"Failed to update collector view for job {document.job_name}: {str(e)}")
+
+    async def _view_remove(self, document: BaseJob, seq: int):
+        if self.views is None:
+            return
+        job = {'job_name': document.job_name, 'collector_cluster': document.collector_cluster, 'seq': seq,
+               'shard_collectors': getattr(document, 'shard_collectors', None)}
+        try:
+            for collector_cluster, job_name, entry in view_entries(job, deleted=True):
+                await self.views.put(document.maas_pool, collector_cluster, job_name, entry)
+        except Exception as e:
+            logger.error(f"Failed to remove job {document.job_name} from collector view: {str(e)}")
+
+    async def _index_targets(self, document: BaseJob):
+        try:
+            await self.targets.sync(document.id, document.maas_pool, document.job_name, target_placements(document))
+        except Exception as e:
+            # The target index is derived data; `TargetIndexService.rebuild` repairs a missed write
+            logger.error(f"Failed to update target index for job {document.job_name}: {str(e)}")
+
+    async def _unindex_targets(self, document: BaseJob):
+        try:
+            await self.targets.remove(document.id)
+        except Exception as e:
+            logger.error(f"Failed to remove job {document.job_name} from target index: {str(e)}")
+
+    async def create(self, document: BaseJob) -> BaseJob:
+        self._sync_derived_fields(document)
+        async with self.sequences.reserve(document.maas_pool) as seq:
+            document.seq = seq
+            await document.create()
+        await self._view_put(document)
+        await self._index_targets(document)
+        return document
+
+    async def create_many(self, maas_pool: str, documents: List[BaseJob]) -> Dict[int, str]:
+        """
+        Insert new jobs of one pool with one sequence reservation and one insert, in place of
+        `create` per job. Derived data is written as `create` would, the target index in bulk.
+        The insert is unordered, so a rejected job doesn't stop the others; returns the positions
+        of the jobs that were not inserted, with the reason.
+        """
+        if not documents:
+            return {}
+        failed: Dict[int, str] = {}
+        async with self.sequences.reserve(maas_pool, len(documents)) as last_seq:
+            for seq, document in enumerate(documents, start=last_seq - len(documents) + 1):
+                self._sync_derived_fields(document)
+                document.seq = seq
+                document.id = PydanticObjectId()
+            try:
+                await self.model.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                failed = {error['index']: error['errmsg'] for error in e.details.get('writeErrors', [])}
+                logger.error(f"{len(failed)} of {len(documents)} jobs of pool {maas_pool} were not inserted")
+
+        inserted = [document for index, document in enumerate(documents) if index not in failed]
+        for document in inserted:
+            await self._view_put(document)
+        try:
+            await self.targets.add_many([
+                {'job_id': document.id, 'maas_pool': maas_pool, 'collector_cluster': collector_cluster,
+                 'job_name': document.job_name, 'target': target}
+                for document in inserted for target, collector_cluster in target_placements(document).items()
+            ])
+        except Exception as e:
+            logger.error(f"Failed to update target index for {len(inserted)} jobs of pool {maas_pool}: {str(e)}")
+        return failed
+
+    async def get(self, job_name: str, maas_pool: str, collector_cluster: str) -> Optional[BaseJob]:
+        return await self.model.find_one(self._job_query(job_name, maas_pool, collector_cluster))
+
+    async def get_raw(self, job_name: str, maas_pool: str, collector_cluster: str,
+                      projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a job as the plain stored dict, skipping Beanie/pydantic hydration."""
+        query = self._job_query(job_name, maas_pool, collector_cluster)
+        return await self.collection.find_one(query, projection or RAW_JOB_PROJECTION)
+
+    async def get_version(self, job_name: str, maas_pool: str, collector_cluster: str) -> Optional[Dict[str, Any]]:
+        """Fetch only `_id` and `revision`, answered from the `job_version` index alone."""
+        query = {'maas_pool': maas_pool, 'collector_cluster': collector_cluster, 'job_name': job_name}
+        return await self.collection.find_one(query, VERSION_PROJECTION)
+
+    async def get_changes(self, maas_pool: str, collector_cluster: Optional[str], since: int, limit: int,
+                          projection: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Return up to `limit` live jobs and tombstones with `seq > since`, ordered by seq,
+        and whether more are pending. An idle pool is answered from the sequence counter alone.
+        Without `collector_cluster` the whole pool is returned. Changes above the committed
+        watermark are held back: a write still in flight may land below them.
+        """
+        watermark = await self.sequences.current(maas_pool)
+        if watermark <= since:
+            return [], False
+
+        query: Dict[str, Any] = {'maas_pool': maas_pool, 'seq': {'$gt': since, '$lte': watermark}}
+        if collector_cluster is not None:
+            query.update(self._collector_filter(collector_cluster))
+
+        jobs = await self.collection.find(query, projection or RAW_JOB_PROJECTION) \
+            .sort('seq', ASCENDING).limit(limit + 1).to_list(length=limit + 1)
+        tombstones = await JobTombstone.get_pymongo_collection().find(query, TOMBSTONE_PROJECTION) \
+            .sort('seq', ASCENDING).limit(limit + 1).to_list(length=limit + 1)
+
+        changes = [{'seq': job['seq'], 'action': ChangeType.UPSERT, 'job_name': job['job_name'],
+                    'collector_cluster': job['collector_cluster'], 'job_type': job.get('job_type'),
+                    'shard_collectors': job.get('shard_collectors'), 'job': job}
+                   for job in jobs]
+        changes.extend({'seq': tombstone['seq'], 'action': ChangeType.DELETE, 'job_name': tombstone['job_name'],
+                        'collector_cluster': tombstone['collector_cluster'], 'job_type': tombstone.get('job_type'),
+                        'shard_collectors': tombstone.get('shard_collectors'), 'job': None}
+                       for tombstone in tombstones)
+        changes.sort(key=lambda change: change['seq'])
+
+        return changes[:limit], len(changes) > limit
+
+    async def find_by_labels(self, maas_pool: str, selector_filter: Dict[str, Any],
+                             collector_cluster: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Raw jobs matching a filter built by `parse_label_selector`, served by the `job_label_terms` index."""
+        query: Dict[str, Any] = {'maas_pool': maas_pool, **selector_filter}
+        if collector_cluster is not None:
+            query['collector_cluster'] = collector_cluster
+
+        return await self.collection.find(query, RAW_JOB_PROJECTION) \
+            .sort('job_name', ASCENDING).limit(limit).to_list(length=limit)
+
+    async def find_by_collector(self, maas_pool: str, collector_cluster: str,
+                                projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Every raw job a collector scrapes, sharded ones included whole, in `job_name` order."""
+        query = {'maas_pool': maas_pool, **self._collector_filter(collector_cluster)}
+        return await self.collection.find(query, projection or RAW_JOB_PROJECTION) \
+            .sort('job_name', ASCENDING).to_list(length=None)
+
+    async def find_names(self, maas_pool: str, job_names: List[str]) -> Dict[str, str]:
+        """
+        Which of `job_names` already exist anywhere in the pool, and on which collector. Looked up
+        through the `job_name_prefix` index, which only holds normalized names.
+        """
+        names = set(job_names)
+        query = {'maas_pool': maas_pool, 'job_name_lower': {'$in': sorted({normalize_name(name) for name in names})}}
+        jobs = await self.collection.find(query, {'_id': 0, 'job_name': 1, 'collector_cluster': 1}) \
+            .to_list(length=None)
+        return {job['job_name']: job['collector_cluster'] for job in jobs if job['job_name'] in names}
+
+    async def get_content_hashes(self, maas_pool: str, collector_cluster: str) -> Dict[str, Optional[str]]:
+        """Name -> content hash of every job placed on a collector, answered from the `job_content` index alone."""
+        query = {'maas_pool': maas_pool, 'collector_cluster': collector_cluster}
+        jobs = await self.collection.find(query, CONTENT_HASH_PROJECTION).to_list(length=None)
+        return {job['job_name']: job.get('content_hash') for job in jobs}
+
+    async def find_by_names(self, maas_pool: str, collector_cluster: str, job_names: List[str]) -> List[BaseJob]:
+        query = {'maas_pool': maas_pool, 'collector_cluster': collector_cluster, 'job_name': {'$in': job_names}}
+        return await self.model.find(query, with_children=True).to_list()
+
+    async def set_content_hash(self, document: BaseJob):
+        """Backfill the hash of a job stored before content hashes existed; its content is unchanged."""
+        document.content_hash = self.content_hash(document.model_dump())
+        await self.collection.update_one({'_id': document.id}, {'$set': {'content_hash': document.content_hash}})
+
+    async def get_pools(self) -> List[str]:
+        return await self.collection.distinct('maas_pool')
+
+    async def search_by_name_prefix(self, maas_pools: List[str], prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """Anchored regex on the normalized name, resolved as a `job_name_prefix` index range."""
+        query = {'maas_pool': {'$in': maas_pools}, 'job_name_lower': {'$regex': f'^{re.escape(prefix)}'}}
+        return await self.collection.find(query, SEARCH_PROJECTION) \
+            .sort('job_name_lower', ASCENDING).limit(limit).to_list(length=limit)
+
+    async def search_by_name_ngrams(self, maas_pools: List[str], ngrams: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Candidates containing every n-gram of the query; callers still verify the actual substring."""
+        query = {'maas_pool': {'$in': maas_pools}, 'name_ngrams': {'$all': ngrams}}
+        return await self.collection.find(query, SEARCH_PROJECTION).limit(limit).to_list(length=limit)
+
+    async def iter_pool_batches(self, maas_pool: str, projection: Dict[str, Any],
+                                batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Page through a pool's raw jobs in `_id` order, one bounded batch at a time."""
+        query: Dict[str, Any] = {'maas_pool': maas_pool}
+        while True:
+            batch = await self.collection.find(query, {**projection, '_id': 1}) \
+                .sort('_id', ASCENDING).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            query['_id'] = {'$gt': batch[-1]['_id']}
+
+    async def existing_ids(self, maas_pool: str, job_ids: List[ObjectId]) -> Set[ObjectId]:
+        """Which of `job_ids` are jobs of the pool."""
+        found = await self.collection.find({'_id': {'$in': job_ids}, 'maas_pool': maas_pool}, {'_id': 1}) \
+            .to_list(length=len(job_ids))
+        return {job['_id'] for job in found}
+
+    async def backfill_search_fields(self, maas_pool: str, after: Optional[ObjectId],
+                                     batch_size: int) -> Tuple[Optional[ObjectId], int]:
+        """
+        Set the `SEARCH_FIELDS` of up to `batch_size` jobs of the pool past `after`, in `_id` order,
+        that were stored before those fields existed. Returns the last `_id` handled, None once none
+        are left, and how many jobs were set; a job rewritten meanwhile already has them and is skipped.
+        """
+        query: Dict[str, Any] = {'maas_pool': maas_pool, **MISSING_SEARCH_FIELDS}
+        if after is not None:
+            query['_id'] = {'$gt': after}
+        batch = await self.collection.find(query, SEARCH_SOURCE_PROJECTION) \
+            .sort('_id', ASCENDING).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return None, 0
+
+        results = await asyncio.gather(*(
+            self.collection.update_one({'_id': job['_id'], **MISSING_SEARCH_FIELDS},
+                                       {'$set': self._search_fields(job['job_name'], job.get('labels'))})
+            for job in batch
+        ))
+        return batch[-1]['_id'], sum(result.modified_count for result in results)
 
     async def update(self, document: BaseJob, data: Dict[str, Any]) -> BaseJob:
+        if any(field in data and data[field] != getattr(document, field) for field in IDENTITY_FIELDS):
+            # The job disappears under its old identity, so followers of that collector need a tombstone
+            seq = await self._tombstone(document)
+            await self._view_remove(document, seq)
+
+        # Set on every write, so a job stored before a search field existed gets it with its next update
+        data.update(self._search_fields(data.get('job_name', document.job_name), data.get('labels', document.labels)))
+        data['content_hash'] = self.content_hash({**document.model_dump(), **data})
+
         data['update_time'] = datetime.now(timezone.utc)
-        await document.set(data)
+        data.pop('revision', None)
+        async with self.sequences.reserve(data.get('maas_pool', document.maas_pool)) as seq:
+            data['seq'] = seq
+            # Applied only over the revision read, so a concurrent write is never silently overwritten
+            updated = await type(document).find_one({'_id': document.id, 'revision': document.revision}).update(
+                SetOperator(data), Inc({'revision': 1}), response_type=UpdateResponse.NEW_DOCUMENT
+            )
+            if updated is None:
+                raise JobModifiedError(document.job_name)
+            merge_models(document, updated)
+        await self._view_put(document)
+        await self._index_targets(document)
         return document
 
+    async def replace(self, document: BaseJob, replacement: BaseJob) -> BaseJob:
+        """
+        Store `replacement` as the whole new content of `document`, possibly of another job type;
+        fields it doesn't set are dropped. Id, creation time and identity are kept.
+        """
+        if getattr(replacement, 'shard_collectors', None) != getattr(document, 'shard_collectors', None):
+            # Collectors losing a shard need a tombstone, as for an identity change in `update`
+            seq = await self._tombstone(document)
+            await self._view_remove(document, seq)
+
+        replacement.id = document.id
+        replacement.time_created = document.time_created
+        replacement.update_time = datetime.now(timezone.utc)
+        replacement.revision = document.revision + 1
+        self._sync_derived_fields(replacement)
+        async with self.sequences.reserve(replacement.maas_pool) as seq:
+            replacement.seq = seq
+            # The whole stored document is swapped, class id included, so the job may change type
+            await self._replace_revision(replacement, document.revision)
+        await self._view_put(replacement)
+        await self._index_targets(replacement)
+        return replacement
+
     async def delete(self, document: BaseJob) -> BaseJob:
         await document.delete()
+        seq = await self._tombstone(document)
+        await self._view_remove(document, seq)
+        await self._unindex_targets(document)
 
-    @staticmethod
-    async def save(document: BaseJob) -> BaseJob:
+    async def save(self, document: BaseJob) -> BaseJob:
+        self._sync_derived_fields(document)
         document.update_time = datetime.now(timezone.utc)
-        return await document.save()
\ No newline at end of file
+        document.revision += 1
+        async with self.sequences.reserve(document.maas_pool) as seq:
+            document.seq = seq
+            await self._replace_revision(document, document.revision - 1)
+        await self._view_put(document)
+        await self._index_targets(document)
+        return document
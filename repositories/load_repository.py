@@ -0,0 +1,31 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pymongo import DESCENDING
+from models.db_schemas.collector_loads import CollectorLoadSample
+from repositories.base_repository import BaseRepository
+
+SAMPLE_PROJECTION = {'_id': 0, 'maas_pool': 0, 'collector_cluster': 0}
+
+
+class LoadRepository(BaseRepository[CollectorLoadSample]):
+    def __init__(self):
+        super().__init__(CollectorLoadSample)
+
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
+
+    async def insert_samples(self, samples: List[Dict[str, Any]]):
+        if samples:
+            await self.collection.insert_many(samples, ordered=False)
+
+    async def get_history(self, maas_pool: str, collector_cluster: str, since: Optional[datetime],
+                          limit: int) -> List[Dict[str, Any]]:
+        """The latest `limit` samples newer than `since`, oldest first."""
+        query: Dict[str, Any] = {'maas_pool': maas_pool, 'collector_cluster': collector_cluster}
+        if since is not None:
+            query['time'] = {'$gt': since}
+        cursor = self.collection.find(query, SAMPLE_PROJECTION).sort('time', DESCENDING).limit(limit)
+        samples = await cursor.to_list(length=limit)
+        samples.reverse()
+        return samples
@@ -0,0 +1,107 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+from config.constants.general import DUPLICATE_KEY_ERROR
+from enums.operation_state import OperationState
+from models.db_schemas.operations import Operation, OperationItem
+from repositories.base_repository import BaseRepository
+
+STATUS_PROJECTION = {'checkpoint': 0, 'params': 0}
+ITEM_PROJECTION = {'_id': 0, 'key': 1, 'status': 1, 'detail': 1}
+
+
+class OperationRepository(BaseRepository[Operation]):
+    def __init__(self):
+        super().__init__(Operation)
+
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
+
+    @property
+    def items(self):
+        return OperationItem.get_pymongo_collection()
+
+    async def create(self, document: Operation) -> Operation:
+        return await document.create()
+
+    async def get(self, operation_id: ObjectId) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({'_id': operation_id}, STATUS_PROJECTION)
+
+    async def claim_next(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest queued operation, or a running one whose owner's lease ran out (its
+        process died), and lease it to `owner`. Returns the operation as it was before the claim.
+        """
+        now = datetime.now(timezone.utc)
+        claimable = {'$or': [{'state': OperationState.QUEUED.value},
+                             {'state': OperationState.RUNNING.value, 'lease_until': {'$lt': now}}]}
+        operation = await self.collection.find_one_and_update(
+            claimable,
+            {'$set': {'state': OperationState.RUNNING.value, 'owner': owner,
+                      'lease_until': now + timedelta(seconds=lease_seconds)},
+             '$inc': {'attempts': 1}},
+            sort=[('created_at', ASCENDING)],
+        )
+        if operation is not None and operation.get('started_at') is None:
+            await self.collection.update_one({'_id': operation['_id']}, {'$set': {'started_at': now}})
+        return operation
+
+    @staticmethod
+    def _owned(operation_id: ObjectId, owner: str) -> Dict[str, Any]:
+        return {'_id': operation_id, 'owner': owner, 'state': OperationState.RUNNING.value}
+
+    async def renew(self, operation_id: ObjectId, owner: str, lease_seconds: float) -> bool:
+        lease_until = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+        result = await self.collection.update_one(self._owned(operation_id, owner), {'$set': {'lease_until': lease_until}})
+        return result.matched_count > 0
+
+    async def save_progress(self, operation_id: ObjectId, owner: str, checkpoint: Any, done: int, failed: int,
+                            total: Optional[int], lease_seconds: float) -> bool:
+        """Record a checkpoint and progress, only while `owner` still holds the operation."""
+        update: Dict[str, Any] = {
+            '$set': {'checkpoint': checkpoint,
+                     'lease_until': datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)},
+            '$inc': {'progress.done': done, 'progress.failed': failed},
+        }
+        if total is not None:
+            update['$set']['progress.total'] = total
+        result = await self.collection.update_one(self._owned(operation_id, owner), update)
+        return result.matched_count > 0
+
+    async def add_items(self, operation_id: ObjectId, items: List[Dict[str, Any]]):
+        if not items:
+            return
+        now = datetime.now(timezone.utc)
+        documents = [{'operation_id': operation_id, 'key': item['key'], 'status': item['status'],
+                      'detail': item.get('detail'), 'created_at': now} for item in items]
+        try:
+            await self.items.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # Items written before a crash are written again when the operation resumes
+            if any(error['code'] != DUPLICATE_KEY_ERROR for error in e.details.get('writeErrors', [])):
+                raise
+
+    async def get_items(self, operation_id: ObjectId, after: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        query: Dict[str, Any] = {'operation_id': operation_id}
+        if after is not None:
+            query['key'] = {'$gt': after}
+        return await self.items.find(query, ITEM_PROJECTION).sort('key', ASCENDING).limit(limit).to_list(length=limit)
+
+    async def finish(self, operation_id: ObjectId, owner: str, state: OperationState,
+                     result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> bool:
+        update = {'state': state.value, 'result': result, 'error': error, 'lease_until': None,
+                  'finished_at': datetime.now(timezone.utc)}
+        # Params are only input to the run; dropping them keeps uploaded payloads no longer than needed
+        outcome = await self.collection.update_one(self._owned(operation_id, owner),
+                                                   {'$set': update, '$unset': {'params': ''}})
+        return outcome.matched_count > 0
+
+    async def release(self, operation_id: ObjectId, owner: str):
+        """Hand an operation back to the queue, keeping its checkpoint, e.g. on shutdown; the run isn't counted."""
+        await self.collection.update_one(self._owned(operation_id, owner),
+                                         {'$set': {'state': OperationState.QUEUED.value, 'owner': None,
+                                                   'lease_until': None},
+                                          '$inc': {'attempts': -1}})
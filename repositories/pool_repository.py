@@ -12,3 +12,6 @@ class PoolRepository(BaseRepository):
 
     async def get(self, name: str) -> Optional[MaasPool]:
         return await self.model.find_one(MaasPool.name == name)
+
+    async def save(self, document: MaasPool) -> MaasPool:
+        return await document.save()
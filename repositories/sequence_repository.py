@@ -0,0 +1,82 @@
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from bson import ObjectId
+from pymongo import ReturnDocument
+from config.constants.jobs import SEQUENCE_LEASE_SECONDS
+from models.db_schemas.pool_sequences import PoolSequence
+from repositories.base_repository import BaseRepository
+from utils.logger import create_logger
+
+logger = create_logger("sequence_repository")
+
+# Highest counter value this process has seen per pool. Any value read before an allocation is
+# below the seqs it hands out, so it is a safe floor for that allocation's lease.
+_seen: Dict[str, int] = {}
+
+
+class SequenceRepository(BaseRepository[PoolSequence]):
+    def __init__(self):
+        super().__init__(PoolSequence)
+
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
+
+    @asynccontextmanager
+    async def reserve(self, maas_pool: str, count: int = 1) -> AsyncIterator[int]:
+        """
+        Reserve `count` consecutive sequence numbers and yield the last of them. They count as
+        in flight, holding back `current`, until the block exits with the write stamped or failed.
+        """
+        lease = str(ObjectId())
+        seq = await self.next(maas_pool, count, lease)
+        try:
+            yield seq
+        finally:
+            try:
+                await self.release(maas_pool, lease)
+            except Exception as e:
+                # The lease expires on its own; until then the change feed waits behind it
+                logger.error(f"Failed to release sequence lease {lease} of pool {maas_pool}: {str(e)}")
+
+    async def next(self, maas_pool: str, count: int, lease: str) -> int:
+        """Take `count` sequence numbers and register `lease` in the same update; return the last number."""
+        floor = _seen.get(maas_pool, 0)
+        document = await self.collection.find_one_and_update(
+            {'_id': maas_pool},
+            {'$inc': {'seq': count},
+             '$set': {f'leases.{lease}': {'floor': floor, 'expires': time.time() + SEQUENCE_LEASE_SECONDS}}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        seq = document['seq']
+        if floor > seq - count:
+            # Only after the counter went backwards, as when the database was restored
+            await self.collection.update_one({'_id': maas_pool}, {'$set': {f'leases.{lease}.floor': seq - count}})
+        _seen[maas_pool] = seq
+        return seq
+
+    async def release(self, maas_pool: str, lease: str):
+        await self.collection.update_one({'_id': maas_pool}, {'$unset': {f'leases.{lease}': ''}})
+
+    async def current(self, maas_pool: str) -> int:
+        """
+        The committed watermark: every write stamped with a seq at or below it has landed. A write
+        still in flight holds it below that write's seq, so readers never step past a change that
+        is about to appear behind them. Expired leases, left by a crashed writer, are dropped.
+        """
+        document = await self.collection.find_one({'_id': maas_pool}, {'seq': 1, 'leases': 1})
+        if not document:
+            return 0
+
+        seq = document['seq']
+        _seen[maas_pool] = max(_seen.get(maas_pool, 0), seq)
+        now = time.time()
+        leases = document.get('leases') or {}
+        expired = [lease for lease, held in leases.items() if held['expires'] <= now]
+        if expired:
+            await self.collection.update_one({'_id': maas_pool},
+                                             {'$unset': {f'leases.{lease}': '' for lease in expired}})
+        floors = [held['floor'] for held in leases.values() if held['expires'] > now]
+        return min([seq, *floors])
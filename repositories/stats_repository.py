@@ -0,0 +1,107 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from pymongo.errors import DuplicateKeyError
+from config.constants.jobs import POOL_TOTAL_KEY
+from models.db_schemas.job_stats import JobStats
+from repositories.base_repository import BaseRepository
+from utils.scrape_cost import JobLoad
+
+STATS_PROJECTION = {'_id': 0, 'collector_cluster': 1, 'job_count': 1, 'target_count': 1, 'scrape_rate': 1}
+
+
+class StatsRepository(BaseRepository[JobStats]):
+    def __init__(self):
+        super().__init__(JobStats)
+
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
+
+    async def _increment(self, maas_pool: str, collector_cluster: str, delta: JobLoad, now: datetime):
+        await self.collection.update_one(
+            {'maas_pool': maas_pool, 'collector_cluster': collector_cluster},
+            {
+                '$inc': {'job_count': delta.jobs, 'target_count': delta.targets, 'scrape_rate': delta.scrape_rate},
+                '$set': {'update_time': now}
+            },
+            upsert=True
+        )
+
+    async def increment(self, maas_pool: str, collector_cluster: str, delta: JobLoad):
+        """Apply `delta` to the collector's counters and to the pool totals."""
+        now = datetime.now(timezone.utc)
+        await asyncio.gather(
+            self._increment(maas_pool, collector_cluster, delta, now),
+            self._increment(maas_pool, POOL_TOTAL_KEY, delta, now),
+        )
+
+    async def _reserve(self, maas_pool: str, collector_cluster: str, delta: JobLoad,
+                       max_jobs: Optional[int], max_scrape_rate: Optional[float], now: datetime) -> bool:
+        query: Dict[str, Any] = {'maas_pool': maas_pool, 'collector_cluster': collector_cluster}
+        if max_jobs is not None and delta.jobs > 0:
+            query['job_count'] = {'$lte': max_jobs - delta.jobs}
+        if max_scrape_rate is not None and delta.scrape_rate > 0:
+            query['scrape_rate'] = {'$lte': max_scrape_rate - delta.scrape_rate}
+        try:
+            # Missing counters are created from the delta; existing ones that would overflow fail the
+            # filter and, being there, the upsert too
+            await self.collection.update_one(
+                query,
+                {
+                    '$inc': {'job_count': delta.jobs, 'target_count': delta.targets, 'scrape_rate': delta.scrape_rate},
+                    '$set': {'update_time': now}
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def reserve(self, maas_pool: str,
+                      bounds: List[Tuple[str, JobLoad, Optional[int], Optional[float]]]) -> bool:
+        """
+        Apply each (collector, delta, max_jobs, max_scrape_rate) only while the counters stay within
+        the limits, checked and incremented in one update. All or none are applied: when one no
+        longer fits, those already applied are taken back and False is returned.
+        """
+        now = datetime.now(timezone.utc)
+        applied = []
+        for collector_cluster, delta, max_jobs, max_scrape_rate in bounds:
+            if not await self._reserve(maas_pool, collector_cluster, delta, max_jobs, max_scrape_rate, now):
+                for reserved_collector, reserved in applied:
+                    await self._increment(maas_pool, reserved_collector, -reserved, now)
+                return False
+            applied.append((collector_cluster, delta))
+        return True
+
+    async def get(self, maas_pool: str, collector_cluster: str = POOL_TOTAL_KEY) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one(
+            {'maas_pool': maas_pool, 'collector_cluster': collector_cluster}, STATS_PROJECTION
+        )
+
+    async def get_collectors(self, maas_pool: str, collector_clusters: List[str]) -> List[Dict[str, Any]]:
+        query = {'maas_pool': maas_pool, 'collector_cluster': {'$in': collector_clusters}}
+        return await self.collection.find(query, STATS_PROJECTION).to_list(length=len(collector_clusters))
+
+    async def get_pool(self, maas_pool: str) -> List[Dict[str, Any]]:
+        return await self.collection.find({'maas_pool': maas_pool}, STATS_PROJECTION).to_list(length=None)
+
+    async def replace_pool(self, maas_pool: str, loads: Dict[str, JobLoad]):
+        """
+        Overwrite the pool's counters with `loads`, then drop the collectors no longer in it. Each
+        counter is replaced in place, so readers never find the pool without counters mid-rebuild.
+        """
+        now = datetime.now(timezone.utc)
+        totals = sum(loads.values(), JobLoad())
+        counters = {**loads, POOL_TOTAL_KEY: totals}
+        await asyncio.gather(*(
+            self.collection.replace_one(
+                {'maas_pool': maas_pool, 'collector_cluster': collector_cluster},
+                {'maas_pool': maas_pool, 'collector_cluster': collector_cluster, 'job_count': load.jobs,
+                 'target_count': load.targets, 'scrape_rate': load.scrape_rate, 'update_time': now},
+                upsert=True
+            )
+            for collector_cluster, load in counters.items()
+        ))
+        await self.collection.delete_many({'maas_pool': maas_pool, 'collector_cluster': {'$nin': list(counters)}})
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+from config.constants.general import DUPLICATE_KEY_ERROR
+from models.db_schemas.job_targets import JobTarget
+from repositories.base_repository import BaseRepository
+
+ENTRY_PROJECTION = {'_id': 0, 'target': 1, 'maas_pool': 1, 'collector_cluster': 1, 'job_name': 1}
+LOOKUP_PROJECTION = {'_id': 0, 'maas_pool': 1, 'collector_cluster': 1, 'job_name': 1}
+
+
+class TargetIndexRepository(BaseRepository[JobTarget]):
+    def __init__(self):
+        super().__init__(JobTarget)
+
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
+
+    async def sync(self, job_id: ObjectId, maas_pool: str, job_name: str, placements: Dict[str, str]):
+        """
+        Bring a job's entries in line with `placements` (normalized target -> collector),
+        writing only the targets that were added, removed or now point elsewhere.
+        """
+        await self.sync_many(maas_pool, {job_id: (job_name, placements)})
+
+    async def sync_many(self, maas_pool: str, jobs: Dict[ObjectId, Tuple[str, Dict[str, str]]]):
+        """`sync` for several jobs of a pool (job id -> (job name, placements)), with one read of their entries."""
+        current: Dict[ObjectId, Dict[str, Dict[str, Any]]] = {}
+        query = {'job_id': {'$in': list(jobs)}}
+        for entry in await self.collection.find(query, {**ENTRY_PROJECTION, 'job_id': 1}).to_list(length=None):
+            current.setdefault(entry['job_id'], {})[entry['target']] = entry
+
+        stale, added, moved = [], [], []
+        for job_id, (job_name, placements) in jobs.items():
+            entries = current.get(job_id, {})
+            removed = [target for target in entries if target not in placements]
+            if removed:
+                stale.append({'job_id': job_id, 'target': {'$in': removed}})
+            for target, collector_cluster in placements.items():
+                entry = {'job_id': job_id, 'maas_pool': maas_pool, 'collector_cluster': collector_cluster,
+                         'job_name': job_name, 'target': target}
+                if target not in entries:
+                    added.append(entry)
+                elif (entries[target]['collector_cluster'], entries[target]['job_name'], entries[target]['maas_pool']) \
+                        != (collector_cluster, job_name, maas_pool):
+                    moved.append(entry)
+
+        if stale:
+            await self.collection.delete_many({'$or': stale})
+        if added:
+            try:
+                await self.collection.insert_many(added, ordered=False)
+            except BulkWriteError as e:
+                # A concurrent write of the same job indexed the target first
+                if any(error['code'] != DUPLICATE_KEY_ERROR for error in e.details.get('writeErrors', [])):
+                    raise
+        await asyncio.gather(*(
+            self.collection.update_one({'job_id': entry['job_id'], 'target': entry['target']}, {'$set': entry})
+            for entry in moved
+        ))
+
+    async def add_many(self, entries: List[Dict[str, Any]]):
+        """Index jobs that have no entries yet, such as freshly inserted ones, in a single write."""
+        if entries:
+            await self.collection.insert_many(entries, ordered=False)
+
+    async def remove(self, job_id: ObjectId):
+        await self.collection.delete_many({'job_id': job_id})
+
+    async def find_jobs(self, maas_pools: List[str], target: str, limit: int) -> List[Dict[str, Any]]:
+        query = {'maas_pool': {'$in': maas_pools}, 'target': target}
+        return await self.collection.find(query, LOOKUP_PROJECTION) \
+            .sort([('maas_pool', ASCENDING), ('collector_cluster', ASCENDING), ('job_name', ASCENDING)]) \
+            .limit(limit).to_list(length=limit)
+
+    async def find_duplicates(self, maas_pool: str, collector_cluster: str, limit: int) -> List[Dict[str, Any]]:
+        """Targets of the collector held by more than one job, grouped over the `collector_targets` index."""
+        pipeline = [
+            {'$match': {'maas_pool': maas_pool, 'collector_cluster': collector_cluster}},
+            {'$sort': {'target': 1, 'job_name': 1}},
+            {'$group': {'_id': '$target', 'jobs': {'$push': '$job_name'}, 'count': {'$sum': 1}}},
+            {'$match': {'count': {'$gt': 1}}},
+            {'$sort': {'_id': 1}},
+            {'$limit': limit},
+            {'$project': {'_id': 0, 'target': '$_id', 'jobs': 1}},
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=limit)
+
+    async def iter_job_ids(self, maas_pool: str, batch_size: int) -> AsyncIterator[List[ObjectId]]:
+        """Page through the ids of the jobs holding entries in the pool, in order, one bounded batch at a time."""
+        after = None
+        while True:
+            match: Dict[str, Any] = {'maas_pool': maas_pool}
+            if after is not None:
+                match['job_id'] = {'$gt': after}
+            pipeline = [{'$match': match}, {'$group': {'_id': '$job_id'}}, {'$sort': {'_id': 1}}, {'$limit': batch_size}]
+            job_ids = [group['_id'] for group in await self.collection.aggregate(pipeline).to_list(length=batch_size)]
+            if not job_ids:
+                return
+            yield job_ids
+            if len(job_ids) < batch_size:
+                return
+            after = job_ids[-1]
+
+    async def remove_many(self, maas_pool: str, job_ids: List[ObjectId]):
+        if job_ids:
+            await self.collection.delete_many({'maas_pool': maas_pool, 'job_id': {'$in': job_ids}})
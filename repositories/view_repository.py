@@ -0,0 +1,108 @@
+import zlib
+from typing import Any, Dict, List, Tuple
+from datetime import datetime, timezone
+from urllib.parse import unquote
+from pymongo.errors import DuplicateKeyError
+from config.constants.jobs import COLLECTOR_VIEW_CHUNKS
+from models.db_schemas.collector_views import CollectorView
+from models.db_schemas.jobs import EVENT_EXCLUDED_FIELDS
+from repositories.base_repository import BaseRepository
+from utils.sharding import shard_job_name, shard_payloads
+
+# Raw-read counterpart of `BaseJob.to_event_data`; the bookkeeping fields kept here are needed to build entries
+VIEW_PROJECTION = {'_class_id': 0,
+                   **{field: 0 for field in EVENT_EXCLUDED_FIELDS - {'id', 'job_type', 'seq', 'collector_cluster',
+                                                                     'shard_collectors'}}}
+VIEW_BOOKKEEPING_FIELDS = ('_id', 'job_type', 'seq', 'collector_cluster', 'maas_pool', 'shard_collectors')
+
+
+def view_chunk(job_name: str) -> int:
+    return zlib.crc32(job_name.encode()) % COLLECTOR_VIEW_CHUNKS
+
+
+def view_key(job_name: str) -> str:
+    """
+    Key of a job in a chunk's `jobs` map. A shard name carries its collector's name, and a `.`
+    in it would make Mongo write a nested path instead of one key.
+    """
+    return job_name.replace('%', '%25').replace('.', '%2E').replace('$', '%24')
+
+
+def _payload(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in job.items() if key not in VIEW_BOOKKEEPING_FIELDS}
+
+
+def view_entries(job: Dict[str, Any], deleted: bool = False) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    `(collector_cluster, job_name, entry)` for every view a job appears in, from a job read
+    with VIEW_PROJECTION. A sharded job has one entry per shard collector under the shard name;
+    a deleted job, or a shard left without targets, gets a seq-only delete marker.
+    """
+    seq = job['seq']
+    shard_collectors = job.get('shard_collectors')
+    if not shard_collectors:
+        entry = {'seq': seq} if deleted else {'seq': seq, 'job_type': job['job_type'], 'job': _payload(job)}
+        return [(job['collector_cluster'], job['job_name'], entry)]
+
+    shards = {} if deleted else shard_payloads(job, shard_collectors)
+    entries = []
+    for collector_cluster in shard_collectors:
+        shard = shards.get(collector_cluster)
+        entry = {'seq': seq, 'job_type': job['job_type'], 'job': _payload(shard)} if shard else {'seq': seq}
+        entries.append((collector_cluster, shard_job_name(job['job_name'], collector_cluster), entry))
+    return entries
+
+
+class CollectorViewRepository(BaseRepository[CollectorView]):
+    def __init__(self):
+        super().__init__(CollectorView)
+
+    @property
+    def collection(self):
+        return self.model.get_pymongo_collection()
+
+    async def put(self, maas_pool: str, collector_cluster: str, job_name: str, entry: Dict[str, Any]):
+        """
+        Store `entry` unless the view already holds this job at a newer seq. The guard lives in
+        the filter, so an out-of-order write misses it and its upsert hits the unique chunk key.
+        """
+        field = f'jobs.{view_key(job_name)}'
+        query = {
+            'maas_pool': maas_pool,
+            'collector_cluster': collector_cluster,
+            'chunk': view_chunk(job_name),
+            '$or': [{field: {'$exists': False}}, {f'{field}.seq': {'$lt': entry['seq']}}],
+        }
+        try:
+            await self.collection.update_one(
+                query, {'$set': {field: entry, 'update_time': datetime.now(timezone.utc)}}, upsert=True
+            )
+        except DuplicateKeyError:
+            pass
+
+    async def remove(self, maas_pool: str, collector_cluster: str, job_name: str, seq: int):
+        await self.put(maas_pool, collector_cluster, job_name, {'seq': seq})
+
+    async def get_jobs(self, maas_pool: str, collector_cluster: str) -> List[Dict[str, Any]]:
+        chunks = await self.collection.find(
+            {'maas_pool': maas_pool, 'collector_cluster': collector_cluster}, {'_id': 0, 'jobs': 1}
+        ).to_list(length=None)
+
+        jobs = [{'job_name': unquote(key), 'job_type': entry['job_type'], **entry['job']}
+                for chunk in chunks for key, entry in chunk.get('jobs', {}).items() if 'job' in entry]
+        jobs.sort(key=lambda job: job['job_name'])
+        return jobs
+
+    async def replace_pool(self, maas_pool: str, chunks: Dict[Tuple[str, int], Dict[str, Dict[str, Any]]]):
+        """Overwrite every chunk of a pool in place and drop the chunks that no longer hold jobs."""
+        now = datetime.now(timezone.utc)
+        for (collector_cluster, chunk), jobs in chunks.items():
+            key = {'maas_pool': maas_pool, 'collector_cluster': collector_cluster, 'chunk': chunk}
+            entries = {view_key(job_name): entry for job_name, entry in jobs.items()}
+            await self.collection.replace_one(key, {**key, 'jobs': entries, 'update_time': now}, upsert=True)
+
+        stale = await self.collection.find({'maas_pool': maas_pool}, {'collector_cluster': 1, 'chunk': 1}) \
+            .to_list(length=None)
+        stale_ids = [chunk['_id'] for chunk in stale if (chunk['collector_cluster'], chunk['chunk']) not in chunks]
+        if stale_ids:
+            await self.collection.delete_many({'_id': {'$in': stale_ids}})
@@ -1,7 +1,13 @@
 from fastapi import APIRouter
 from .jobs import router as jobs_router
 from .admin import router as admin_router
+from .pools import router as pools_router
+from .collectors import router as collectors_router
+from .operations import router as operations_router
 
 router = APIRouter(prefix="/v1")
 router.include_router(jobs_router)
-router.include_router(admin_router)
\ No newline at end of file
+router.include_router(admin_router)
+router.include_router(pools_router)
+router.include_router(collectors_router)
+router.include_router(operations_router)
@@ -1,19 +1,45 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, Query, Response, status
 from models.db_schemas.api_keys import ApiKey
 from utils.authorization import get_admin_api_key, get_api_key_service
 from services.api_key_service import APIKeyService
 from models.response_schemas.api_keys import ApiKeyResponse
+from models.response_schemas.circuit_breakers import CircuitBreakerResponse
+from models.response_schemas.response_detail import ResponseDetail
+from enums.operation_kind import OperationKind
+from config.constants.rebalance import MAX_REBALANCE_MOVES, MAX_REBALANCE_TOLERANCE, REBALANCE_MAX_MOVES, REBALANCE_TOLERANCE
+from models.general.pools.quotas import PoolQuotas
+from models.response_schemas.quotas import PoolQuotaResponse
+from models.response_schemas.load_shedding import LoadSheddingResponse
+from models.response_schemas.operations import OperationResponse
+from models.response_schemas.rebalance import RebalancePlanResponse, RebalanceStatusResponse
+from models.response_schemas.write_scheduler import WriteSchedulerResponse
+from repositories.job_repository import JobRepository
+from services.job_service import JobService
+from services.load_shedder import load_shedder
+from services.operation_service import OperationService
+from services.rebalance_service import RebalanceService
+from services.write_scheduler import write_scheduler
+from utils.circuit_breaker import circuit_breaker_metrics
+from .jobs import get_job_repo, get_job_service
+from .operations import get_operation_service
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+
+async def get_rebalance_service(repo: JobRepository = Depends(get_job_repo), job_service: JobService = Depends(get_job_service)) -> RebalanceService:
+    return RebalanceService(repo, job_service)
+
+
 @router.post("/api-key", response_model=ApiKeyResponse)
 async def create_api_key(maas_pools: List[str] = Body(..., embed=True),
                         is_admin: bool = Body(..., embed=True),
                         description: Optional[str] = Body(None, embed=True),
+                        rate_limit: Optional[float] = Body(None, embed=True, gt=0),
+                        rate_burst: Optional[int] = Body(None, embed=True, ge=1),
                         service: APIKeyService = Depends(get_api_key_service),
                         admin_key: ApiKey = Depends(get_admin_api_key)):
-    return await service.create_key(maas_pools, description, is_admin)
+    return await service.create_key(maas_pools, description, is_admin, rate_limit, rate_burst)
 
 
 @router.post("/api-key/{key}/{maas_pool}")
@@ -28,9 +54,88 @@ async def revoke_key_from_pool(key: str, maas_pool: str, service: APIKeyService
     return await service.revoke_key_from_pool(key, maas_pool)
 
 
+@router.put("/api-key/{key}/rate-limit", response_model=ResponseDetail)
+async def set_key_rate_limit(key: str, rate_limit: Optional[float] = Body(None, embed=True, gt=0),
+                             rate_burst: Optional[int] = Body(None, embed=True, ge=1),
+                             service: APIKeyService = Depends(get_api_key_service),
+                             admin_key: ApiKey = Depends(get_admin_api_key)):
+    return await service.set_rate_limit(key, rate_limit, rate_burst)
+
+
 @router.delete("/api-key/{key}")
 async def revoke_key(key: str, service: APIKeyService = Depends(get_api_key_service),
                         admin_key: ApiKey = Depends(get_admin_api_key)):
     return await service.revoke_key(key)
 
-    
+
+@router.put("/pools/{maas_pool}/quotas", response_model=PoolQuotaResponse)
+async def set_pool_quotas(maas_pool: str, quotas: PoolQuotas, service: JobService = Depends(get_job_service),
+                          admin_key: ApiKey = Depends(get_admin_api_key)):
+    return await service.set_quotas(maas_pool, quotas)
+
+
+def _accepted(response: Response, operation: dict) -> dict:
+    response.headers["Location"] = f"/v1/operations/{operation['id']}"
+    return operation
+
+
+@router.post("/stats/{maas_pool}/rebuild", response_model=OperationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_pool_stats(maas_pool: str, response: Response, service: OperationService = Depends(get_operation_service),
+                        admin_key: ApiKey = Depends(get_admin_api_key)):
+    return _accepted(response, await service.submit(OperationKind.REBUILD_STATS, maas_pool))
+
+
+@router.post("/views/{maas_pool}/rebuild", response_model=OperationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_collector_views(maas_pool: str, response: Response, service: OperationService = Depends(get_operation_service),
+                                  admin_key: ApiKey = Depends(get_admin_api_key)):
+    return _accepted(response, await service.submit(OperationKind.REBUILD_VIEWS, maas_pool))
+
+
+@router.post("/targets/{maas_pool}/rebuild", response_model=OperationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_target_index(maas_pool: str, response: Response, service: OperationService = Depends(get_operation_service),
+                               admin_key: ApiKey = Depends(get_admin_api_key)):
+    return _accepted(response, await service.submit(OperationKind.REBUILD_TARGETS, maas_pool))
+
+
+@router.post("/jobs/{maas_pool}/search-fields/backfill", response_model=OperationResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+async def backfill_search_fields(maas_pool: str, response: Response, service: OperationService = Depends(get_operation_service),
+                                 admin_key: ApiKey = Depends(get_admin_api_key)):
+    return _accepted(response, await service.submit(OperationKind.BACKFILL_SEARCH_FIELDS, maas_pool))
+
+
+@router.post("/rebalance/{maas_pool}/plan", response_model=RebalancePlanResponse)
+async def plan_rebalance(maas_pool: str, tolerance: float = Query(default=REBALANCE_TOLERANCE, ge=0, le=MAX_REBALANCE_TOLERANCE),
+                         max_moves: int = Query(default=REBALANCE_MAX_MOVES, ge=1, le=MAX_REBALANCE_MOVES),
+                         service: RebalanceService = Depends(get_rebalance_service),
+                         admin_key: ApiKey = Depends(get_admin_api_key)):
+    return await service.plan(maas_pool, tolerance, max_moves)
+
+
+@router.post("/rebalance/{maas_pool}", response_model=RebalanceStatusResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_rebalance(maas_pool: str, tolerance: float = Query(default=REBALANCE_TOLERANCE, ge=0, le=MAX_REBALANCE_TOLERANCE),
+                          max_moves: int = Query(default=REBALANCE_MAX_MOVES, ge=1, le=MAX_REBALANCE_MOVES),
+                          service: RebalanceService = Depends(get_rebalance_service),
+                          admin_key: ApiKey = Depends(get_admin_api_key)):
+    return await service.start(maas_pool, tolerance, max_moves)
+
+
+@router.get("/rebalance/{maas_pool}", response_model=RebalanceStatusResponse)
+async def get_rebalance_status(maas_pool: str, service: RebalanceService = Depends(get_rebalance_service),
+                               admin_key: ApiKey = Depends(get_admin_api_key)):
+    return service.status(maas_pool)
+
+
+@router.get("/write-scheduler", response_model=WriteSchedulerResponse)
+async def get_write_scheduler_metrics(admin_key: ApiKey = Depends(get_admin_api_key)):
+    return write_scheduler.metrics()
+
+
+@router.get("/load-shedding", response_model=LoadSheddingResponse)
+async def get_load_shedding_state(admin_key: ApiKey = Depends(get_admin_api_key)):
+    return load_shedder.metrics()
+
+
+@router.get("/circuit-breakers", response_model=List[CircuitBreakerResponse])
+async def get_circuit_breakers(admin_key: ApiKey = Depends(get_admin_api_key)):
+    return circuit_breaker_metrics()
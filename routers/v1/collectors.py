@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from config.constants.jobs import DEFAULT_DUPLICATE_TARGETS_LIMIT, MAX_DUPLICATE_TARGETS_LIMIT
+from config.constants.load import DEFAULT_LOAD_HISTORY_LIMIT, MAX_LOAD_HISTORY_LIMIT
+from models.db_schemas.api_keys import ApiKey
+from models.response_schemas.collector_load import CollectorLoadSampleResponse
+from models.response_schemas.job_targets import DuplicateTargetsResponse
+from models.validation_schemas.create_schemas.load_reports import CollectorLoadReport
+from repositories.load_repository import LoadRepository
+from services.job_service import JobService
+from services.load_service import LoadService, load_tracker
+from utils.authorization import get_api_key, get_collector_api_key
+from utils.etag import etag_matches
+from utils.responses import RawJSONResponse
+from config import config
+from .jobs import get_job_service
+
+router = APIRouter(prefix="/collectors", tags=["Collectors"])
+
+SCRAPE_CONFIG_MEDIA_TYPE = "application/yaml"
+
+
+async def get_load_service() -> LoadService:
+    return LoadService(LoadRepository(), load_tracker, config["collector_load.persist"])
+
+
+@router.get("/{collector_cluster}/scrape_config", response_class=Response,
+            responses={200: {"content": {SCRAPE_CONFIG_MEDIA_TYPE: {}}}, 304: {"description": "Not Modified"}})
+async def get_scrape_config(collector_cluster: str, maas_pool: str, if_none_match: Optional[str] = Header(default=None),
+                            service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    rendered = await service.get_scrape_config(maas_pool, collector_cluster, api_key.maas_pools, api_key.is_admin)
+    headers = {"ETag": rendered.etag, "Cache-Control": "no-cache"}
+    if if_none_match and etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=rendered.body, media_type=SCRAPE_CONFIG_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/{collector_cluster}/jobs", response_model=List[Dict[str, Any]])
+async def get_collector_jobs(collector_cluster: str, maas_pool: str,
+                             service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    jobs = await service.get_collector_jobs(maas_pool, collector_cluster, api_key.maas_pools, api_key.is_admin)
+    return RawJSONResponse(jobs)
+
+
+@router.get("/{collector_cluster}/duplicate_targets", response_model=DuplicateTargetsResponse)
+async def get_duplicate_targets(collector_cluster: str, maas_pool: str,
+                                limit: int = Query(default=DEFAULT_DUPLICATE_TARGETS_LIMIT, ge=1, le=MAX_DUPLICATE_TARGETS_LIMIT),
+                                service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    report = await service.get_duplicate_targets(maas_pool, collector_cluster, limit, api_key.maas_pools, api_key.is_admin)
+    return RawJSONResponse(report)
+
+
+@router.post("/{collector_cluster}/load", status_code=status.HTTP_204_NO_CONTENT)
+async def report_collector_load(collector_cluster: str, maas_pool: str, report: CollectorLoadReport,
+                                service: LoadService = Depends(get_load_service),
+                                api_key: ApiKey = Depends(get_collector_api_key)):
+    service.report(maas_pool, collector_cluster, report, api_key.maas_pools, api_key.is_admin)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{collector_cluster}/load/history", response_model=List[CollectorLoadSampleResponse])
+async def get_collector_load_history(collector_cluster: str, maas_pool: str, since: Optional[datetime] = None,
+                                     limit: int = Query(default=DEFAULT_LOAD_HISTORY_LIMIT, ge=1, le=MAX_LOAD_HISTORY_LIMIT),
+                                     service: LoadService = Depends(get_load_service), api_key: ApiKey = Depends(get_api_key)):
+    samples = await service.get_history(maas_pool, collector_cluster, since, limit, api_key.maas_pools, api_key.is_admin)
+    return RawJSONResponse(samples)
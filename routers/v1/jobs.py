@@ -1,16 +1,44 @@
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from config.constants.idempotency import MAX_IDEMPOTENCY_KEY_LENGTH
+from config.constants.jobs import COLLECTOR_CLUSTER_REGEX, DEFAULT_CHANGES_BATCH_SIZE, DEFAULT_LIST_LIMIT, DEFAULT_SEARCH_LIMIT, DEFAULT_TARGET_LOOKUP_LIMIT, MAX_CHANGES_BATCH_SIZE, MAX_LIST_LIMIT, MAX_SEARCH_LIMIT, MAX_TARGET_LOOKUP_LIMIT
+from enums.operation_kind import OperationKind
+from enums.placement_strategy import PlacementStrategy
 from models.db_schemas.api_keys import ApiKey
 from models.general.jobs.labels import JobLabels
+from models.response_schemas.job_changes import JobChangesResponse
+from models.response_schemas.job_search import JobSearchResult
+from models.response_schemas.job_targets import TargetLookupResponse
+from models.response_schemas.operations import OperationResponse
 from models.response_schemas.response_detail import ResponseDetail
+from models.response_schemas.sync import SyncPlanResponse
+from models.validation_schemas.create_schemas.desired_jobs import DesiredJobSet
 from models.validation_schemas.create_schemas.jobs import GeneralJobCreate, BlackboxJobCreate, HttpJobCreate, KubernetesJobCreate
 from models.validation_schemas.update_schemas.jobs import GeneralJobUpdate, BlackboxJobUpdate, HttpJobUpdate, KubernetesJobUpdate
 from models.db_schemas.jobs import JobModel
+from repositories.idempotency_repository import IdempotencyRepository
 from repositories.job_repository import JobRepository
 from repositories.pool_repository import PoolRepository
+from repositories.stats_repository import StatsRepository
+from repositories.view_repository import CollectorViewRepository
+from services.idempotency_service import IdempotencyService, IdempotentRequest
 from services.job_service import JobService
+from services.operation_handlers import import_params, sync_params
+from services.operation_service import OperationService
+from services.stats_service import StatsService
+from services.sync_service import SyncService
+from services.target_index_service import TargetIndexService
+from services.view_service import CollectorViewService
 from utils.authorization import get_api_key
+from utils.etag import etag_matches, job_etag
+from utils.idempotency import request_fingerprint
+from utils.prometheus_config import decode_config
+from utils.responses import RawJSONResponse
 from utils.security import SecurityManager
 from config import config
+from .operations import get_operation_service
 
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
@@ -20,98 +48,222 @@ async def get_pool_repo() -> PoolRepository:
     return PoolRepository()
 
 
-async def get_job_repo() -> JobRepository:
-    return JobRepository()
+async def get_view_repo() -> Optional[CollectorViewRepository]:
+    return CollectorViewRepository() if config["collector_views.enabled"] else None
+
+
+async def get_job_repo(views: Optional[CollectorViewRepository] = Depends(get_view_repo)) -> JobRepository:
+    return JobRepository(views=views)
+
+
+async def get_stats_repo() -> StatsRepository:
+    return StatsRepository()
 
 
 async def get_security_manager() -> SecurityManager:
     return SecurityManager(config["security"]["secret_key"])
 
 
-async def get_job_service(repo: JobRepository = Depends(get_job_repo), pool_repo: PoolRepository = Depends(get_pool_repo), security_manager: SecurityManager = Depends(get_security_manager)) -> JobService:
-    return JobService(repo, pool_repo, security_manager)
+async def get_stats_service(stats_repo: StatsRepository = Depends(get_stats_repo), repo: JobRepository = Depends(get_job_repo)) -> StatsService:
+    return StatsService(stats_repo, repo)
+
+
+async def get_view_service(repo: JobRepository = Depends(get_job_repo)) -> CollectorViewService:
+    return CollectorViewService(repo.views or CollectorViewRepository(), repo)
+
+
+async def get_target_index_service(repo: JobRepository = Depends(get_job_repo)) -> TargetIndexService:
+    return TargetIndexService(repo.targets, repo)
+
+
+async def get_job_service(repo: JobRepository = Depends(get_job_repo), pool_repo: PoolRepository = Depends(get_pool_repo), stats_repo: StatsRepository = Depends(get_stats_repo)) -> JobService:
+    return JobService(repo, pool_repo, stats_repo)
+
+
+async def get_sync_service(repo: JobRepository = Depends(get_job_repo), service: JobService = Depends(get_job_service)) -> SyncService:
+    return SyncService(repo, service)
+
+
+async def get_idempotency_service() -> IdempotencyService:
+    return IdempotencyService(IdempotencyRepository())
+
+
+async def get_idempotent_request(request: Request, response: Response,
+                                 idempotency_key: Optional[str] = Header(default=None, max_length=MAX_IDEMPOTENCY_KEY_LENGTH),
+                                 service: IdempotencyService = Depends(get_idempotency_service),
+                                 api_key: ApiKey = Depends(get_api_key)) -> IdempotentRequest:
+    fingerprint = ""
+    if idempotency_key is not None:
+        fingerprint = request_fingerprint(request.method, request.url.path, request.query_params.multi_items(),
+                                          await request.body())
+    return IdempotentRequest(service, idempotency_key, api_key.key, fingerprint, response)
+
+
+@router.get("/", response_model=List[JobModel], response_model_exclude_none=True)
+async def list_jobs(maas_pool: str, selector: str, collector_cluster: Optional[str] = None,
+                    limit: int = Query(default=DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
+                    service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    jobs = await service.list_jobs(maas_pool, selector, collector_cluster, limit, api_key.maas_pools, api_key.is_admin)
+    return RawJSONResponse(jobs)
+
+
+@router.get("/search", response_model=List[JobSearchResult])
+async def search_jobs(q: str = Query(..., min_length=1), maas_pool: Optional[str] = None,
+                      limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+                      service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    results = await service.search(q, maas_pool, limit, api_key.maas_pools, api_key.is_admin)
+    return RawJSONResponse(results)
+
+
+@router.get("/by_target", response_model=TargetLookupResponse)
+async def find_jobs_by_target(target: str = Query(..., min_length=1), maas_pool: Optional[str] = None,
+                              limit: int = Query(default=DEFAULT_TARGET_LOOKUP_LIMIT, ge=1, le=MAX_TARGET_LOOKUP_LIMIT),
+                              service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    result = await service.find_jobs_by_target(target, maas_pool, limit, api_key.maas_pools, api_key.is_admin)
+    return RawJSONResponse(result)
+
+
+@router.get("/changes", response_model=JobChangesResponse)
+async def get_job_changes(maas_pool: str, collector_cluster: str, since: int = Query(default=0, ge=0),
+                          limit: int = Query(default=DEFAULT_CHANGES_BATCH_SIZE, ge=1, le=MAX_CHANGES_BATCH_SIZE),
+                          service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    changes = await service.get_changes(maas_pool, collector_cluster, since, limit, api_key.maas_pools, api_key.is_admin)
+    return RawJSONResponse(changes)
+
+
+@router.get("/watch")
+async def watch_jobs(maas_pool: str, collector_cluster: Optional[str] = None, last_event_id: Optional[int] = Header(default=None),
+                     service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    events = await service.watch(maas_pool, collector_cluster, last_event_id, api_key.maas_pools, api_key.is_admin)
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @router.get("/{job_name}", response_model=JobModel, response_model_exclude_none=True)
-async def get_job(job_name: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.get(job_name, maas_pool, collector_cluster, api_key.maas_pools, api_key.is_admin)
+async def get_job(job_name: str, maas_pool: str, collector_cluster: str, if_none_match: Optional[str] = Header(default=None),
+                  service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    if if_none_match:
+        etag = await service.get_etag(job_name, maas_pool, collector_cluster, api_key.maas_pools, api_key.is_admin)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    job = await service.get_raw(job_name, maas_pool, collector_cluster, api_key.maas_pools, api_key.is_admin)
+    etag = job_etag(job.pop("_id"), job.get("revision", 0))
+    return RawJSONResponse(job, headers={"ETag": etag})
 
 
 @router.delete("/{job_name}", response_model=ResponseDetail)
-async def delete_job(job_name: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.delete(job_name, maas_pool, collector_cluster, api_key.maas_pools, api_key.is_admin)
+async def delete_job(job_name: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.delete(job_name, maas_pool, collector_cluster, api_key.maas_pools, api_key.is_admin))
+
+
+@router.post(path="/import", response_model=OperationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_prometheus_config(request: Request, response: Response, maas_pool: str,
+                                   collector_cluster: Optional[str] = Query(default=None, pattern=COLLECTOR_CLUSTER_REGEX),
+                                   placement: Optional[PlacementStrategy] = None,
+                                   service: OperationService = Depends(get_operation_service),
+                                   idempotency: IdempotentRequest = Depends(get_idempotent_request),
+                                   api_key: ApiKey = Depends(get_api_key)):
+    """Import the `scrape_configs` of a prometheus.yml request body in the background."""
+    params = await run_in_threadpool(import_params, decode_config(await request.body()), collector_cluster,
+                                     placement.value if placement else None)
+    operation = await idempotency.run(lambda: service.submit_for_pool(
+        OperationKind.IMPORT_PROMETHEUS_CONFIG, maas_pool, params, api_key.maas_pools, api_key.is_admin))
+    response.headers["Location"] = f"/v1/operations/{operation['id']}"
+    return operation
+
+
+@router.post(path="/sync/plan", response_model=SyncPlanResponse)
+async def plan_job_sync(desired: DesiredJobSet, maas_pool: str, collector_cluster: str = Query(..., pattern=COLLECTOR_CLUSTER_REGEX),
+                        service: SyncService = Depends(get_sync_service), api_key: ApiKey = Depends(get_api_key)):
+    """Diff the complete desired job set of a collector against the stored jobs, without writing anything."""
+    return await service.plan(maas_pool, collector_cluster, desired.jobs, api_key.maas_pools, api_key.is_admin)
+
+
+@router.post(path="/sync/apply", response_model=OperationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def apply_job_sync(desired: DesiredJobSet, response: Response, maas_pool: str,
+                         collector_cluster: str = Query(..., pattern=COLLECTOR_CLUSTER_REGEX),
+                         service: OperationService = Depends(get_operation_service),
+                         idempotency: IdempotentRequest = Depends(get_idempotent_request),
+                         api_key: ApiKey = Depends(get_api_key)):
+    """Make a collector hold exactly the desired job set in the background, writing only the jobs that differ."""
+    params = await run_in_threadpool(sync_params, maas_pool, collector_cluster, desired.jobs)
+    operation = await idempotency.run(lambda: service.submit_for_pool(
+        OperationKind.SYNC_COLLECTOR, maas_pool, params, api_key.maas_pools, api_key.is_admin))
+    response.headers["Location"] = f"/v1/operations/{operation['id']}"
+    return operation
 
 
 @router.post(path="/general/", response_model=ResponseDetail)
-async def create_general_job(job: GeneralJobCreate, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.create(job, api_key.maas_pools, api_key.is_admin)
+async def create_general_job(job: GeneralJobCreate, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.create(job, api_key.maas_pools, api_key.is_admin))
 
 
 @router.put(path="/general/{job_name}", response_model=ResponseDetail)
-async def update_general_job(job_name: str, job: GeneralJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin)
+async def update_general_job(job_name: str, job: GeneralJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin))
 
 
 @router.post(path="/general/{job_name}/target", response_model=ResponseDetail)
-async def add_general_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.add_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin)
+async def add_general_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.add_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin))
 
 
 @router.delete(path="/general/{job_name}/target", response_model=ResponseDetail)
-async def remove_general_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.delete_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin)
+async def remove_general_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.delete_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin))
 
 
 @router.post(path="/blackbox/", response_model=ResponseDetail)
-async def create_blackbox_job(job: BlackboxJobCreate, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.create(job, api_key.maas_pools, api_key.is_admin)
+async def create_blackbox_job(job: BlackboxJobCreate, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.create(job, api_key.maas_pools, api_key.is_admin))
 
 
 @router.put(path="/blackbox/{job_name}", response_model=ResponseDetail)
-async def update_blackbox_job(job_name: str, job: BlackboxJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin)
+async def update_blackbox_job(job_name: str, job: BlackboxJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin))
 
 
 @router.post(path="/blackbox/{job_name}/target", response_model=ResponseDetail)
-async def add_blackbox_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.add_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin)
+async def add_blackbox_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.add_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin))
 
 
 @router.delete(path="/blackbox/{job_name}/target", response_model=ResponseDetail)
-async def remove_blackbox_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.delete_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin)
+async def remove_blackbox_job_target(job_name: str, target: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.delete_target(job_name, maas_pool, collector_cluster, target, api_key.maas_pools, api_key.is_admin))
 
 
 @router.post(path="/http/", response_model=ResponseDetail)
-async def create_http_job(job: HttpJobCreate, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.create(job, api_key.maas_pools, api_key.is_admin)
+async def create_http_job(job: HttpJobCreate, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.create(job, api_key.maas_pools, api_key.is_admin))
 
 
 @router.put(path="/http/{job_name}", response_model=ResponseDetail)
-async def update_http_job(job_name: str, job: HttpJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin)
+async def update_http_job(job_name: str, job: HttpJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin))
 
 
 @router.post(path="/kubernetes/", response_model=ResponseDetail)
-async def create_kubernetes_job(job: KubernetesJobCreate, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.create(job, api_key.maas_pools, api_key.is_admin)
+async def create_kubernetes_job(job: KubernetesJobCreate, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.create(job, api_key.maas_pools, api_key.is_admin))
 
 
 @router.put(path="/kubernetes/{job_name}", response_model=ResponseDetail)
-async def update_kubernetes_job(job_name: str, job: KubernetesJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin)
+async def update_kubernetes_job(job_name: str, job: KubernetesJobUpdate, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.update(job_name, maas_pool, job, collector_cluster, api_key.maas_pools, api_key.is_admin))
 
 
 @router.post(path="/{job_name}/labels", response_model=ResponseDetail)
-async def add_job_label(job_name: str, labels: JobLabels, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.add_label(job_name, maas_pool, collector_cluster, labels, api_key.maas_pools, api_key.is_admin)
+async def add_job_label(job_name: str, labels: JobLabels, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.add_label(job_name, maas_pool, collector_cluster, labels, api_key.maas_pools, api_key.is_admin))
 
 
 @router.put(path="/{job_name}/labels", response_model=ResponseDetail)
-async def update_job_label(job_name: str, label_key: str, label_value: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.update_label(job_name, maas_pool, collector_cluster, label_key, label_value, api_key.maas_pools, api_key.is_admin)
+async def update_job_label(job_name: str, label_key: str, label_value: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.update_label(job_name, maas_pool, collector_cluster, label_key, label_value, api_key.maas_pools, api_key.is_admin))
 
 
 @router.delete(path="/{job_name}/labels", response_model=ResponseDetail)
-async def delete_job_label(job_name: str, label_key: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
-    return await service.delete_label(job_name, maas_pool, collector_cluster, label_key, api_key.maas_pools, api_key.is_admin)
+async def delete_job_label(job_name: str, label_key: str, maas_pool: str, collector_cluster: str, service: JobService = Depends(get_job_service), idempotency: IdempotentRequest = Depends(get_idempotent_request), api_key: ApiKey = Depends(get_api_key)):
+    return await idempotency.run(lambda: service.delete_label(job_name, maas_pool, collector_cluster, label_key, api_key.maas_pools, api_key.is_admin))
@@ -0,0 +1,28 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from config.constants.operations import DEFAULT_OPERATION_ITEMS_LIMIT, MAX_OPERATION_ITEMS_LIMIT
+from models.db_schemas.api_keys import ApiKey
+from models.response_schemas.operations import OperationItemsResponse, OperationResponse
+from repositories.operation_repository import OperationRepository
+from services.operation_service import OperationService
+from utils.authorization import get_api_key
+
+router = APIRouter(prefix="/operations", tags=["Operations"])
+
+
+async def get_operation_service() -> OperationService:
+    return OperationService(OperationRepository())
+
+
+@router.get("/{operation_id}", response_model=OperationResponse)
+async def get_operation(operation_id: str, service: OperationService = Depends(get_operation_service),
+                        api_key: ApiKey = Depends(get_api_key)):
+    return await service.get(operation_id, api_key.maas_pools, api_key.is_admin)
+
+
+@router.get("/{operation_id}/items", response_model=OperationItemsResponse)
+async def get_operation_items(operation_id: str, after: Optional[str] = None,
+                              limit: int = Query(default=DEFAULT_OPERATION_ITEMS_LIMIT, ge=1, le=MAX_OPERATION_ITEMS_LIMIT),
+                              service: OperationService = Depends(get_operation_service),
+                              api_key: ApiKey = Depends(get_api_key)):
+    return await service.get_items(operation_id, after, limit, api_key.maas_pools, api_key.is_admin)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query
+from config.constants.load import LOAD_QUERY_WINDOW_SECONDS, MAX_LOAD_QUERY_WINDOW_SECONDS
+from models.db_schemas.api_keys import ApiKey
+from models.response_schemas.collector_load import PoolLoadResponse
+from models.response_schemas.job_stats import PoolStatsResponse
+from models.response_schemas.quotas import PoolQuotaResponse
+from services.job_service import JobService
+from services.load_service import LoadService
+from utils.authorization import get_api_key
+from .collectors import get_load_service
+from .jobs import get_job_service
+
+router = APIRouter(prefix="/pools", tags=["Pools"])
+
+
+@router.get("/{maas_pool}/stats", response_model=PoolStatsResponse)
+async def get_pool_stats(maas_pool: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    return await service.get_pool_stats(maas_pool, api_key.maas_pools, api_key.is_admin)
+
+
+@router.get("/{maas_pool}/quotas", response_model=PoolQuotaResponse)
+async def get_pool_quotas(maas_pool: str, service: JobService = Depends(get_job_service), api_key: ApiKey = Depends(get_api_key)):
+    return await service.get_quotas(maas_pool, api_key.maas_pools, api_key.is_admin)
+
+
+@router.get("/{maas_pool}/load", response_model=PoolLoadResponse)
+async def get_pool_load(maas_pool: str, window: int = Query(default=LOAD_QUERY_WINDOW_SECONDS, ge=1, le=MAX_LOAD_QUERY_WINDOW_SECONDS),
+                        service: LoadService = Depends(get_load_service), api_key: ApiKey = Depends(get_api_key)):
+    return service.get_pool_load(maas_pool, window, api_key.maas_pools, api_key.is_admin)
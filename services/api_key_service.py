@@ -13,21 +13,28 @@ API_KEY_LENGTH = 32
 logger = create_logger("api_key_service")
 
 
+def hash_api_key(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
 class APIKeyService:
     def __init__(self, repo: ApiKeyRepository):
         self.repo = repo
 
     def _hash(self, key: str) -> str:
-        return hashlib.sha256(key.encode()).hexdigest()
+        return hash_api_key(key)
 
-    async def create_key(self, maas_pools: List[str], description: Optional[str] = None, is_admin: bool = False) -> Tuple[ApiKey, str]:
+    async def create_key(self, maas_pools: List[str], description: Optional[str] = None, is_admin: bool = False,
+                         rate_limit: Optional[float] = None, rate_burst: Optional[int] = None) -> Tuple[ApiKey, str]:
         raw_key = secrets.token_urlsafe(API_KEY_LENGTH)
         hashed_key = self._hash(raw_key)
         
-        api_key = ApiKey(key=hashed_key, maas_pools=maas_pools, description=description, is_admin=is_admin)
+        api_key = ApiKey(key=hashed_key, maas_pools=maas_pools, description=description, is_admin=is_admin,
+                         rate_limit=rate_limit, rate_burst=rate_burst)
         saved_key = await self.repo.create(api_key)
         
-        return ApiKeyResponse(key=raw_key, maas_pools=saved_key.maas_pools, time_created=saved_key.time_created)
+        return ApiKeyResponse(key=raw_key, maas_pools=saved_key.maas_pools, time_created=saved_key.time_created,
+                              rate_limit=saved_key.rate_limit, rate_burst=saved_key.rate_burst)
 
     async def validate_key(self, key: str) -> Optional[ApiKey]:
         hashed_key = self._hash(key)
@@ -66,3 +73,15 @@ class APIKeyService:
             logger.info("API key added to pool successfully")
 
         return ResponseDetail(detail="API key added to pool successfully")
+
+    async def set_rate_limit(self, key: str, rate_limit: Optional[float], rate_burst: Optional[int]) -> ResponseDetail:
+        db_key = await self.validate_key(key)
+
+        if not db_key:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="API key not found")
+
+        db_key.rate_limit = rate_limit
+        db_key.rate_burst = rate_burst
+        await self.repo.save(db_key)
+        logger.info("API key rate limit updated successfully")
+        return ResponseDetail(detail="API key rate limit updated successfully")
@@ -1,6 +1,8 @@
+import inspect
 from abc import ABC
 from typing import TypeVar, Generic, List, Optional, Dict, Any
 from repositories.base_repository import BaseRepository
+from utils.tracing import traced
 
 T = TypeVar('T')
 R = TypeVar('R', bound=BaseRepository)
@@ -10,6 +12,13 @@ class BaseService(Generic[T, R], ABC):
     def __init__(self, repo: R):
         self.repo = repo
 
+    def __init_subclass__(cls, **kwargs):
+        # A span per public service call, between the request's span and its repository and Kafka spans
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.iscoroutinefunction(attribute):
+                setattr(cls, name, traced(f"{cls.__name__}.{name}")(attribute))
+
     async def create(self, document: T) -> T:
         raise NotImplementedError
 
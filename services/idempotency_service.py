@@ -0,0 +1,159 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from config.constants.idempotency import (
+    IDEMPOTENCY_CACHE_SIZE,
+    IDEMPOTENCY_POLL_INTERVAL_SECONDS,
+    IDEMPOTENCY_TTL_SECONDS,
+    IDEMPOTENCY_WAIT_SECONDS,
+)
+from enums.idempotency_status import IdempotencyStatus
+from exceptions.idempotency_key_in_progress_error import IdempotencyKeyInProgressError
+from exceptions.idempotency_key_reused_error import IdempotencyKeyReusedError
+from models.db_schemas.idempotency_records import IdempotencyRecord
+from repositories.idempotency_repository import IdempotencyRepository
+from services.base_service import BaseService
+from utils.logger import create_logger
+
+logger = create_logger("idempotency_service")
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyCache:
+    """
+    Completed responses kept in front of Mongo (bounded, LRU), and the attempts running in this
+    process, so a duplicate arriving while the first is in flight waits on it without a round trip.
+    """
+
+    def __init__(self, max_size: int = IDEMPOTENCY_CACHE_SIZE, ttl: float = IDEMPOTENCY_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.lookups = {'hit': 0, 'miss': 0}
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.lookups['miss'] += 1
+            return None
+        expires, fingerprint, response = entry
+        if expires <= self.clock():
+            del self._entries[key]
+            self.lookups['miss'] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.lookups['hit'] += 1
+        return fingerprint, response
+
+    def put(self, key: str, fingerprint: str, response: Any):
+        self._entries[key] = (self.clock() + self.ttl, fingerprint, response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class IdempotencyService(BaseService[IdempotencyRecord, IdempotencyRepository]):
+    def __init__(self, repo: IdempotencyRepository, cache: Optional[IdempotencyCache] = None,
+                 wait_timeout: float = IDEMPOTENCY_WAIT_SECONDS):
+        super().__init__(repo)
+        self.cache = cache or idempotency_cache
+        self.wait_timeout = wait_timeout
+
+    async def run(self, idempotency_key: str, scope: str, fingerprint: str,
+                  operation: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run `operation` once per (scope, key): returns its result and False, or the stored response
+        of an earlier attempt and True. A failed attempt stores nothing, so a retry runs again.
+        """
+        key = f"{scope}:{idempotency_key}"
+        while True:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._replay(idempotency_key, fingerprint, *cached), True
+            pending = self.cache.in_flight.get(key)
+            if pending is None:
+                break
+            # Same process: wait for the first attempt, then look again (it may have failed)
+            await asyncio.shield(pending)
+
+        attempt = asyncio.get_running_loop().create_future()
+        self.cache.in_flight[key] = attempt
+        try:
+            return await self._run_claimed(key, idempotency_key, fingerprint, operation)
+        finally:
+            del self.cache.in_flight[key]
+            attempt.set_result(None)
+
+    @staticmethod
+    def _replay(idempotency_key: str, fingerprint: str, stored_fingerprint: str, response: Any) -> Any:
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError(idempotency_key)
+        return response
+
+    async def _run_claimed(self, key: str, idempotency_key: str, fingerprint: str,
+                           operation: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            existing = await self.repo.claim(key, fingerprint)
+            if existing is None:
+                break
+            if existing['status'] == IdempotencyStatus.COMPLETED.value:
+                self.cache.put(key, existing['fingerprint'], existing['response'])
+                return self._replay(idempotency_key, fingerprint, existing['fingerprint'], existing['response']), True
+            self._replay(idempotency_key, fingerprint, existing['fingerprint'], None)
+            # Another replica owns the key
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgressError(idempotency_key)
+            await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL_SECONDS)
+
+        try:
+            result = await operation()
+        except BaseException:
+            await self._release(key)
+            raise
+
+        response = jsonable_encoder(result)
+        try:
+            await self.repo.complete(key, response)
+        except Exception as e:
+            # The work is done; only a retry reaching another replica could repeat it
+            logger.error(f"Failed to store response for idempotency key {idempotency_key}: {str(e)}")
+        self.cache.put(key, fingerprint, response)
+        return result, False
+
+    async def _release(self, key: str):
+        try:
+            await self.repo.release(key)
+        except Exception as e:
+            # The claim expires after the lock timeout
+            logger.error(f"Failed to release idempotency key {key}: {str(e)}")
+
+
+class IdempotentRequest:
+    """What a mutating endpoint needs to run its work under the caller's Idempotency-Key, if it sent one."""
+
+    def __init__(self, service: IdempotencyService, idempotency_key: Optional[str], scope: str,
+                 fingerprint: str, response: Response):
+        self.service = service
+        self.idempotency_key = idempotency_key
+        self.scope = scope
+        self.fingerprint = fingerprint
+        self.response = response
+
+    async def run(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        if self.idempotency_key is None:
+            return await operation()
+        result, replayed = await self.service.run(self.idempotency_key, self.scope, self.fingerprint, operation)
+        if replayed:
+            self.response.headers[REPLAYED_HEADER] = "true"
+        return result
+
+
+idempotency_cache = IdempotencyCache()
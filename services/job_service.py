@@ -1,40 +1,86 @@
-from typing import List
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
 
+from config.constants.jobs import SEARCH_CANDIDATE_FACTOR
 from enums.event_actions import EventActions
-from enums.job_type import JobType
+from enums.write_status import WriteStatus
 from exceptions.collector_not_in_pool_error import CollectorNotInPoolError
+from exceptions.invalid_shard_count_error import InvalidShardCountError
 from exceptions.job_name_exists_error import JobNameExistsError
 from exceptions.job_not_exist_error import JobNotExistsError
+from exceptions.job_quota_exceeded_error import JobQuotaExceededError
+from exceptions.no_collector_available_error import NoCollectorAvailableError
 from exceptions.produce_failure_error import ProduceFailureError
+from exceptions.scrape_rate_quota_exceeded_error import ScrapeRateQuotaExceededError
+from exceptions.sharded_job_move_error import ShardedJobMoveError
 from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
-from models.db_schemas.jobs import (
-    BlackboxJob,
-    GeneralJob,
-    HttpJob,
-    JobModel,
-    KubernetesJob,
-)
+from models.db_schemas.jobs import JOB_MODELS, BaseJob, JobModel
+from models.db_schemas.maas_pools import MaasPool
 from models.general.jobs.labels import JobLabels
+from models.general.pools.quotas import PoolQuotas
 from models.response_schemas.response_detail import ResponseDetail
 from models.validation_schemas.create_schemas.jobs import BaseJobCreate
 from models.validation_schemas.update_schemas.jobs import BaseJobUpdate
 from producer import producer
 from repositories.job_repository import JobRepository
 from repositories.pool_repository import PoolRepository
+from repositories.view_repository import VIEW_PROJECTION, view_entries
+from repositories.stats_repository import StatsRepository
 from services.base_service import BaseService
+from services.placement_service import PlacementService
 from services.pool_service import PoolService
+from services.quota_service import QuotaService
+from services.scrape_config_service import RenderedScrapeConfig, ScrapeConfigService
+from services.stats_service import StatsService
+from services.target_index_service import TargetIndexService
+from services.view_service import CollectorViewService
+from services.watch_hub import watch_hub
+from services.write_scheduler import WriteScheduler, scheduled_write, write_scheduler
+from utils.etag import job_etag
+from utils.label_selector import parse_label_selector
 from utils.logger import create_logger
+from utils.metrics import JOB_BATCH_FAILURES, JOB_BATCH_SIZE
+from utils.name_search import name_ngrams, normalize_name, rank_name_matches
+from utils.scrape_cost import JobFootprint, JobLoad, footprint_deltas, job_footprints
 from utils.security import security_manager
+from utils.sharding import choose_shard_collectors, is_sharded, shard_payloads
 
 logger = create_logger("job_service")
 
+# Why `import_batch` can turn down a single job without failing the rest of the batch
+IMPORT_REJECTIONS = (CollectorNotInPoolError, InvalidShardCountError, JobQuotaExceededError,
+                     NoCollectorAvailableError, ScrapeRateQuotaExceededError)
+QUOTA_REJECTIONS = (JobQuotaExceededError, ScrapeRateQuotaExceededError)
+
+
+def _total(loads: List[Dict[str, JobLoad]]) -> Dict[str, JobLoad]:
+    total: Dict[str, JobLoad] = {}
+    for deltas in loads:
+        for collector_cluster, delta in deltas.items():
+            total[collector_cluster] = total.get(collector_cluster, JobLoad()) + delta
+    return total
+
 
 class JobService(BaseService[JobModel, JobRepository]):
-    def __init__(self, repo: JobRepository, pool_repo: PoolRepository):
+    def __init__(
+        self,
+        repo: JobRepository,
+        pool_repo: PoolRepository,
+        stats_repo: Optional[StatsRepository] = None,
+        scheduler: Optional[WriteScheduler] = None,
+    ):
         super().__init__(repo)
+        self.scheduler = scheduler or write_scheduler
         self.pool_service = PoolService(pool_repo)
+        self.stats_service = StatsService(stats_repo or StatsRepository(), repo)
+        self.placement_service = PlacementService(self.stats_service.repo)
+        self.scrape_config_service = ScrapeConfigService(repo)
+        self.view_service = CollectorViewService(repo.views, repo) if repo.views is not None else None
+        self.target_index_service = TargetIndexService(repo.targets, repo)
+        self.quota_service = QuotaService(self.stats_service.repo)
 
     @staticmethod
     def _check_if_authorized(
@@ -44,6 +90,169 @@ class JobService(BaseService[JobModel, JobRepository]):
             logger.warning(f"API key is not authorized for {maas_pool}")
             raise UnauthorizedApiKeyError(maas_pool=maas_pool)
 
+    @staticmethod
+    def _quota_deltas(before: List[JobFootprint], after: List[JobFootprint]) -> Dict[str, JobLoad]:
+        return {
+            collector_cluster: delta
+            for (_, collector_cluster), delta in footprint_deltas(before, after).items()
+            if delta.jobs > 0 or delta.scrape_rate > 0
+        }
+
+    async def _check_quotas(
+        self,
+        maas_pool: str,
+        before: List[JobFootprint],
+        after: List[JobFootprint],
+        pool: MaasPool,
+        quota_service: QuotaService,
+    ):
+        """Admit a batched change against the quotas of the batch's `StatsSnapshot`."""
+        deltas = self._quota_deltas(before, after)
+        if deltas:
+            await quota_service.check(pool, deltas)
+
+    @asynccontextmanager
+    async def _admit(
+        self,
+        maas_pool: str,
+        before: List[JobFootprint],
+        after: List[JobFootprint],
+        pool: Optional[MaasPool] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Admit a change only if the load it adds fits the pool's quotas, reserving that load up front,
+        and move the counters by the rest of the change once the block succeeds. If the block raises,
+        the reservation is handed back. The pool is read only when load grows.
+        """
+        deltas = self._quota_deltas(before, after)
+        reserved = await self.quota_service.reserve(pool or await self.pool_service.get(maas_pool), deltas) \
+            if deltas else {}
+        try:
+            yield
+        except BaseException:
+            await self.stats_service.release(maas_pool, reserved)
+            raise
+        await self.stats_service.apply_change(before, after, reserved)
+
+    async def _reserve_batch(
+        self, pool: MaasPool, changes: List[Tuple[List[JobFootprint], List[JobFootprint]]]
+    ) -> List[Any]:
+        """
+        Reserve the load of a batch's changes, already admitted against its `StatsSnapshot`, from the
+        stored counters as `_admit` does for one change, so concurrent batches and single writes
+        cannot together overshoot a quota. The whole batch is reserved at once when it fits, else
+        change by change. Returns per change the load reserved or the quota error rejecting it.
+        """
+        loads = [self._quota_deltas(before, after) for before, after in changes]
+        if pool.quotas is None:
+            return [{} for _ in loads]
+        try:
+            await self.quota_service.reserve(pool, _total(loads))
+            return loads
+        except QUOTA_REJECTIONS:
+            logger.info(f"Batch no longer fits the quotas of pool {pool.name}, reserving job by job")
+
+        reserved: List[Any] = []
+        for deltas in loads:
+            try:
+                reserved.append(await self.quota_service.reserve(pool, deltas))
+            except QUOTA_REJECTIONS as e:
+                reserved.append(e)
+        return reserved
+
+    @staticmethod
+    def _observe_batch(operation: str, results: List[Dict[str, Any]]):
+        JOB_BATCH_SIZE.labels(operation).observe(len(results))
+        failed = sum(result['status'] == WriteStatus.FAILED.value for result in results)
+        if failed:
+            JOB_BATCH_FAILURES.labels(operation).inc(failed)
+
+    @staticmethod
+    def _shard_snapshot(job: BaseJob) -> Optional[Dict[str, Any]]:
+        """Event payload of a sharded job before a mutation, to tell which shards it changed."""
+        return job.to_event_data() if is_sharded(job) else None
+
+    async def _send_event(
+        self,
+        action: EventActions,
+        job: BaseJob,
+        job_data: Dict[str, Any],
+        shard_before: Optional[Dict[str, Any]],
+    ):
+        if not is_sharded(job):
+            await producer.send_event(
+                action,
+                job.maas_pool,
+                job.collector_cluster,
+                job.job_type,
+                job.job_name,
+                job_data,
+            )
+            return
+
+        shard_after = None if action == EventActions.DELETE else job.to_event_data()
+        await self._emit_shards(job, shard_before, shard_after)
+
+    async def _emit_shards(
+        self,
+        job: BaseJob,
+        before: Optional[Dict[str, Any]],
+        after: Optional[Dict[str, Any]],
+    ):
+        """
+        Emit only the shards whose payload changed. If one fails, the shards already sent are
+        reverted so collectors are left with the previous version of the job.
+        """
+        old = shard_payloads(before, job.shard_collectors)
+        new = shard_payloads(after, job.shard_collectors)
+        changed = [
+            (collector_cluster, old.get(collector_cluster), new.get(collector_cluster))
+            for collector_cluster in job.shard_collectors
+            if old.get(collector_cluster) != new.get(collector_cluster)
+        ]
+
+        sent = []
+        try:
+            for collector_cluster, previous, current in changed:
+                await self._send_shard(job, collector_cluster, previous, current)
+                sent.append((collector_cluster, previous, current))
+        except ProduceFailureError:
+            for collector_cluster, previous, current in reversed(sent):
+                try:
+                    await self._send_shard(job, collector_cluster, current, previous)
+                except ProduceFailureError as e:
+                    logger.error(
+                        f"Failed to revert shard of job {job.job_name} on {collector_cluster}: {str(e)}"
+                    )
+            raise
+
+    @staticmethod
+    async def _send_shard(
+        job: BaseJob,
+        collector_cluster: str,
+        previous: Optional[Dict[str, Any]],
+        current: Optional[Dict[str, Any]],
+    ):
+        renamed = previous and current and previous["job_name"] != current["job_name"]
+        if previous and (current is None or renamed):
+            await producer.send_event(
+                EventActions.DELETE,
+                job.maas_pool,
+                collector_cluster,
+                job.job_type,
+                previous["job_name"],
+                previous,
+            )
+        if current:
+            await producer.send_event(
+                EventActions.UPDATE if previous and not renamed else EventActions.CREATE,
+                job.maas_pool,
+                collector_cluster,
+                job.job_type,
+                current["job_name"],
+                current,
+            )
+
     async def get(
         self,
         job_name: str,
@@ -66,14 +275,228 @@ class JobService(BaseService[JobModel, JobRepository]):
 
         return job
 
+    async def get_raw(
+        self,
+        job_name: str,
+        maas_pool: str,
+        collector_cluster: str,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> Dict[str, Any]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        job = await self.repo.get_raw(
+            job_name=job_name, maas_pool=maas_pool, collector_cluster=collector_cluster
+        )
+
+        if not job:
+            logger.warning(f"Job {job_name} not found")
+            raise JobNotExistsError(job_name=job_name, collector_name=collector_cluster)
+
+        if job.get("basic_auth"):
+            job["basic_auth"]["password"] = "*****"
+
+        return job
+
+    async def get_etag(
+        self,
+        job_name: str,
+        maas_pool: str,
+        collector_cluster: str,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> str:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        version = await self.repo.get_version(
+            job_name=job_name, maas_pool=maas_pool, collector_cluster=collector_cluster
+        )
+
+        if not version:
+            logger.warning(f"Job {job_name} not found")
+            raise JobNotExistsError(job_name=job_name, collector_name=collector_cluster)
+
+        return job_etag(version["_id"], version.get("revision", 0))
+
+    async def list_jobs(
+        self,
+        maas_pool: str,
+        selector: str,
+        collector_cluster: Optional[str],
+        limit: int,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> List[Dict[str, Any]]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        jobs = await self.repo.find_by_labels(
+            maas_pool=maas_pool,
+            selector_filter=parse_label_selector(selector),
+            collector_cluster=collector_cluster,
+            limit=limit,
+        )
+
+        for job in jobs:
+            job.pop("_id", None)
+            if job.get("basic_auth"):
+                job["basic_auth"]["password"] = "*****"
+
+        return jobs
+
+    async def search(
+        self,
+        query: str,
+        maas_pool: Optional[str],
+        limit: int,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> List[Dict[str, Any]]:
+        if maas_pool is not None:
+            self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+            pools = [maas_pool]
+        elif is_admin:
+            pools = await self.repo.get_pools()
+        else:
+            pools = authorized_pools
+
+        normalized = normalize_name(query)
+        if not normalized or not pools:
+            return []
+
+        candidate_limit = limit * SEARCH_CANDIDATE_FACTOR
+        candidates = await self.repo.search_by_name_prefix(pools, normalized, candidate_limit)
+
+        ngrams = name_ngrams(normalized)
+        if ngrams and len(candidates) < candidate_limit:
+            candidates.extend(
+                await self.repo.search_by_name_ngrams(pools, ngrams, candidate_limit)
+            )
+
+        return rank_name_matches(normalized, candidates, limit)
+
+    async def get_pool_stats(
+        self, maas_pool: str, authorized_pools: List[str], is_admin: bool
+    ) -> Dict[str, Any]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        return await self.stats_service.get_pool_stats(maas_pool)
+
+    async def get_quotas(
+        self, maas_pool: str, authorized_pools: List[str], is_admin: bool
+    ) -> Dict[str, Any]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        pool = await self.pool_service.get(maas_pool)
+        return await self.quota_service.get_usage(pool)
+
+    async def set_quotas(self, maas_pool: str, quotas: PoolQuotas) -> Dict[str, Any]:
+        pool = await self.pool_service.set_quotas(maas_pool, quotas)
+        logger.info(f"Quotas of pool {maas_pool} set to {quotas.model_dump()}")
+        return await self.quota_service.get_usage(pool)
+
+    async def get_scrape_config(
+        self,
+        maas_pool: str,
+        collector_cluster: str,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> RenderedScrapeConfig:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        return await self.scrape_config_service.render(maas_pool, collector_cluster)
+
+    async def find_jobs_by_target(
+        self,
+        target: str,
+        maas_pool: Optional[str],
+        limit: int,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> Dict[str, Any]:
+        if maas_pool is not None:
+            self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+            pools = [maas_pool]
+        elif is_admin:
+            pools = await self.repo.get_pools()
+        else:
+            pools = authorized_pools
+
+        return await self.target_index_service.find_jobs(pools, target, limit)
+
+    async def get_duplicate_targets(
+        self,
+        maas_pool: str,
+        collector_cluster: str,
+        limit: int,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> Dict[str, Any]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        return await self.target_index_service.get_duplicates(maas_pool, collector_cluster, limit)
+
+    async def get_collector_jobs(
+        self,
+        maas_pool: str,
+        collector_cluster: str,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> List[Dict[str, Any]]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        if self.view_service:
+            return await self.view_service.get_jobs(maas_pool, collector_cluster)
+
+        jobs = await self.repo.find_by_collector(maas_pool, collector_cluster, VIEW_PROJECTION)
+        return [
+            {"job_name": job_name, "job_type": entry["job_type"], **entry["job"]}
+            for job in jobs
+            for entry_collector, job_name, entry in view_entries(job)
+            if entry_collector == collector_cluster and "job" in entry
+        ]
+
+    async def get_changes(
+        self,
+        maas_pool: str,
+        collector_cluster: str,
+        since: int,
+        limit: int,
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> Dict[str, Any]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        changes, has_more = await self.repo.get_changes(
+            maas_pool=maas_pool, collector_cluster=collector_cluster, since=since, limit=limit
+        )
+
+        for change in changes:
+            job = change["job"]
+            if job is None:
+                continue
+            job.pop("_id", None)
+            if job.get("basic_auth"):
+                job["basic_auth"]["password"] = "*****"
+
+        next_cursor = changes[-1]["seq"] if changes else since
+        return {"changes": changes, "next_cursor": next_cursor, "has_more": has_more}
+
+    async def watch(
+        self,
+        maas_pool: str,
+        collector_cluster: Optional[str],
+        last_event_id: Optional[int],
+        authorized_pools: List[str],
+        is_admin: bool,
+    ) -> AsyncIterator[bytes]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        subscription = await watch_hub.subscribe(maas_pool, collector_cluster, last_event_id)
+        return watch_hub.stream(subscription)
+
+    @scheduled_write
     async def create(
         self, job: BaseJobCreate, authorized_pools: List[str], is_admin: bool
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, job.maas_pool, is_admin)
+        producer.check_available()
 
-        if not await self.pool_service.check_collector_in_pool(
-            job.maas_pool, job.collector_cluster
-        ):
+        pool = await self.pool_service.get(job.maas_pool)
+        if job.collector_cluster is None:
+            job.collector_cluster = await self.placement_service.place(
+                job.maas_pool, pool.collector_clusters, job.job_name, job.placement
+            )
+        elif job.collector_cluster not in pool.collector_clusters:
             logger.warning(
                 f"Collector {job.collector_cluster} not found in pool {job.maas_pool}"
             )
@@ -91,12 +514,26 @@ class JobService(BaseService[JobModel, JobRepository]):
                 job_name=job.job_name, collector_cluster=job.collector_cluster
             )
 
-        job_model = {
-            JobType.GENERAL: GeneralJob,
-            JobType.BLACKBOX: BlackboxJob,
-            JobType.KUBERNETES_SD: KubernetesJob,
-            JobType.HTTP_SD: HttpJob,
-        }.get(job.job_type)
+        db_job = self._to_document(job, pool)
+        async with self._admit(job.maas_pool, [], job_footprints(db_job), pool):
+            await self.repo.create(db_job)
+
+            try:
+                await self._send_event(
+                    EventActions.CREATE, db_job, job.model_dump(), None
+                )
+            except ProduceFailureError as e:
+                logger.error(f"Failed to create job {job.job_name}: {str(e)}")
+                await self.repo.delete(db_job)
+                raise e
+
+        logger.info(f"Job {job.job_name} created successfully")
+        return ResponseDetail(detail=f"Job {job.job_name} created successfully")
+
+    @classmethod
+    def _to_document(cls, job: BaseJobCreate, pool: MaasPool) -> BaseJob:
+        """The stored form of a placed create request: password encrypted, shards chosen."""
+        job_model = JOB_MODELS.get(job.job_type)
 
         if job_model is None:
             logger.warning(f"Job type {job.job_type} is not supported")
@@ -106,24 +543,225 @@ class JobService(BaseService[JobModel, JobRepository]):
             job.basic_auth.password = security_manager.encrypt(job.basic_auth.password)
 
         db_job = job_model(**job.model_dump())
-        await self.repo.create(db_job)
+        if getattr(job, "shards", None):
+            db_job.shard_collectors = cls._choose_shard_collectors(job, pool)
+        return db_job
+
+    @scheduled_write
+    async def import_batch(self, maas_pool: str, jobs: List[BaseJobCreate]) -> List[Dict[str, Any]]:
+        """
+        Create a batch of validated jobs of one pool the way `create` does one at a time: each job
+        is placed, quota checked and reported on its own, but the pool, its counters and the
+        existing names are read once, the jobs are inserted together and their events produced
+        concurrently. Returns one {status, detail} per job, in order; a job whose name already
+        exists anywhere in the pool is skipped, so importing the same config twice is harmless.
+        """
+        producer.check_available()
+
+        pool = await self.pool_service.get(maas_pool)
+        existing = await self.repo.find_names(maas_pool, [job.job_name for job in jobs])
+        snapshot = await self.stats_service.snapshot(maas_pool)
+        placement_service = PlacementService(snapshot, self.placement_service.policies)
+        quota_service = QuotaService(snapshot)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        admitted = []
+        for index, job in enumerate(jobs):
+            if job.job_name in existing:
+                results[index] = {'status': WriteStatus.SKIPPED.value,
+                                  'detail': f"Job {job.job_name} already exists on {existing[job.job_name]}"}
+                continue
+            try:
+                if job.collector_cluster is None:
+                    job.collector_cluster = await placement_service.place(
+                        maas_pool, pool.collector_clusters, job.job_name, job.placement
+                    )
+                elif job.collector_cluster not in pool.collector_clusters:
+                    raise CollectorNotInPoolError(maas_pool=maas_pool, collector_cluster=job.collector_cluster)
+                db_job = self._to_document(job, pool)
+                footprints = job_footprints(db_job)
+                await self._check_quotas(maas_pool, [], footprints, pool, quota_service)
+            except IMPORT_REJECTIONS as e:
+                results[index] = {'status': WriteStatus.FAILED.value, 'detail': getattr(e, "message", str(e))}
+                continue
+            snapshot.apply_change(None, footprints)
+            existing[job.job_name] = job.collector_cluster
+            admitted.append((index, job, db_job))
+
+        reservations = await self._reserve_batch(pool, [([], job_footprints(db_job)) for _, _, db_job in admitted])
+        for (index, _, _), reserved in zip(admitted, reservations):
+            if isinstance(reserved, Exception):
+                results[index] = {'status': WriteStatus.FAILED.value, 'detail': getattr(reserved, "message", str(reserved))}
+        admitted = [(*entry, reserved) for entry, reserved in zip(admitted, reservations)
+                    if not isinstance(reserved, Exception)]
+
+        failed = await self.repo.create_many(maas_pool, [db_job for _, _, db_job, _ in admitted])
+        for position, reason in failed.items():
+            results[admitted[position][0]] = {'status': WriteStatus.FAILED.value, 'detail': reason}
+        inserted = [entry for position, entry in enumerate(admitted) if position not in failed]
+        outcomes = await asyncio.gather(
+            *(self._send_event(EventActions.CREATE, db_job, job.model_dump(), None) for _, job, db_job, _ in inserted),
+            return_exceptions=True,
+        )
+
+        created, reserved, unused = [], [], [admitted[position][3] for position in failed]
+        for (index, job, db_job, reservation), outcome in zip(inserted, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to create job {job.job_name}: {str(outcome)}")
+                await self.repo.delete(db_job)
+                results[index] = {'status': WriteStatus.FAILED.value, 'detail': str(outcome)}
+                unused.append(reservation)
+                continue
+            created.extend(job_footprints(db_job))
+            reserved.append(reservation)
+            results[index] = {'status': WriteStatus.CREATED.value, 'detail': None}
+        await self.stats_service.release(maas_pool, _total(unused))
+        await self.stats_service.apply_change(None, created, _total(reserved))
+
+        logger.info(f"Imported {len(created)} of {len(jobs)} jobs into pool {maas_pool}")
+        self._observe_batch("import", results)
+        return results
+
+    @scheduled_write
+    async def replace_batch(
+        self, maas_pool: str, pairs: List[Tuple[BaseJob, BaseJobCreate]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Overwrite stored jobs of one pool with the full content of create requests for the same
+        job on the same collector, batched like `import_batch`. A job whose type or shards change
+        reaches collectors as a delete and a create; any other change as an update. A job whose
+        event fails is put back as it was. Returns one {status, detail} per pair, in order.
+        """
+        producer.check_available()
+
+        pool = await self.pool_service.get(maas_pool)
+        snapshot = await self.stats_service.snapshot(maas_pool)
+        quota_service = QuotaService(snapshot)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+        admitted = []
+        for index, (existing, job) in enumerate(pairs):
+            try:
+                replacement = self._to_document(job, pool)
+                before, after = job_footprints(existing), job_footprints(replacement)
+                await self._check_quotas(maas_pool, before, after, pool, quota_service)
+            except IMPORT_REJECTIONS as e:
+                results[index] = {'status': WriteStatus.FAILED.value, 'detail': getattr(e, "message", str(e))}
+                continue
+            snapshot.apply_change(before, after)
+            admitted.append((index, existing, job, replacement, self._shard_snapshot(existing)))
+
+        reservations = await self._reserve_batch(
+            pool, [(job_footprints(existing), job_footprints(replacement)) for _, existing, _, replacement, _ in admitted]
+        )
+        for (index, *_), reserved in zip(admitted, reservations):
+            if isinstance(reserved, Exception):
+                results[index] = {'status': WriteStatus.FAILED.value, 'detail': getattr(reserved, "message", str(reserved))}
+        admitted = [(*entry, reserved) for entry, reserved in zip(admitted, reservations)
+                    if not isinstance(reserved, Exception)]
+
+        written = await asyncio.gather(*(self.repo.replace(existing, replacement)
+                                         for _, existing, _, replacement, _, _ in admitted), return_exceptions=True)
+        unused = []
+        for (index, _, job, _, _, reservation), write in zip(admitted, written):
+            if isinstance(write, Exception):
+                logger.error(f"Failed to replace job {job.job_name}: {str(write)}")
+                results[index] = {'status': WriteStatus.FAILED.value, 'detail': str(write)}
+                unused.append(reservation)
+        replaced = [entry for entry, write in zip(admitted, written) if not isinstance(write, Exception)]
+        outcomes = await asyncio.gather(
+            *(self._send_replace(existing, replacement, job.model_dump(), shard_before)
+              for _, existing, job, replacement, shard_before, _ in replaced),
+            return_exceptions=True,
+        )
+
+        before, after, reserved = [], [], []
+        for (index, existing, job, replacement, _, reservation), outcome in zip(replaced, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to replace job {job.job_name}: {str(outcome)}")
+                await self.repo.replace(replacement, existing)
+                results[index] = {'status': WriteStatus.FAILED.value, 'detail': str(outcome)}
+                unused.append(reservation)
+                continue
+            before.extend(job_footprints(existing))
+            after.extend(job_footprints(replacement))
+            reserved.append(reservation)
+            results[index] = {'status': WriteStatus.UPDATED.value, 'detail': None}
+        await self.stats_service.release(maas_pool, _total(unused))
+        await self.stats_service.apply_change(before, after, _total(reserved))
+
+        logger.info(f"Replaced {len(after)} of {len(pairs)} jobs of pool {maas_pool}")
+        self._observe_batch("replace", results)
+        return results
+
+    async def _send_replace(
+        self,
+        existing: BaseJob,
+        replacement: BaseJob,
+        job_data: Dict[str, Any],
+        shard_before: Optional[Dict[str, Any]],
+    ):
+        if existing.job_type == replacement.job_type and \
+                getattr(existing, "shard_collectors", None) == getattr(replacement, "shard_collectors", None):
+            await self._send_event(EventActions.UPDATE, replacement, job_data, shard_before)
+            return
 
+        existing_data = existing.model_dump()
+        await self._send_event(EventActions.DELETE, existing, existing_data, shard_before)
         try:
-            await producer.send_event(
-                EventActions.CREATE,
-                job.maas_pool,
-                job.collector_cluster,
-                job.job_type,
-                job.job_name,
-                job.model_dump(),
+            await self._send_event(EventActions.CREATE, replacement, job_data, None)
+        except ProduceFailureError:
+            try:
+                await self._send_event(EventActions.CREATE, existing, existing_data, None)
+            except ProduceFailureError as e:
+                # The job is back in the database; the collector resyncs it from the change feed
+                logger.error(f"Failed to restore job {existing.job_name} on {existing.collector_cluster}: {str(e)}")
+            raise
+
+    @scheduled_write
+    async def delete_batch(self, maas_pool: str, jobs: List[BaseJob]) -> List[Dict[str, Any]]:
+        """
+        Delete stored jobs of one pool the way `delete` does, with their events produced
+        concurrently. A job whose event fails is restored. Returns one {status, detail} per job.
+        """
+        producer.check_available()
+
+        backups = [(job.model_dump(), self._shard_snapshot(job)) for job in jobs]
+        await asyncio.gather(*(self.repo.delete(job) for job in jobs))
+        outcomes = await asyncio.gather(
+            *(self._send_event(EventActions.DELETE, job, job_backup, shard_before)
+              for job, (job_backup, shard_before) in zip(jobs, backups)),
+            return_exceptions=True,
+        )
+
+        results, deleted = [], []
+        for job, (job_backup, _), outcome in zip(jobs, backups, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to delete job {job.job_name}: {str(outcome)}")
+                await self.repo.create(type(job)(**job_backup))
+                results.append({'status': WriteStatus.FAILED.value, 'detail': str(outcome)})
+                continue
+            deleted.extend(job_footprints(job))
+            results.append({'status': WriteStatus.DELETED.value, 'detail': None})
+        await self.stats_service.apply_change(deleted, None)
+
+        logger.info(f"Deleted {len(deleted)} of {len(jobs)} jobs of pool {maas_pool}")
+        self._observe_batch("delete", results)
+        return results
+
+    @staticmethod
+    def _choose_shard_collectors(job: BaseJobCreate, pool: MaasPool) -> List[str]:
+        if job.shards > len(pool.collector_clusters):
+            raise InvalidShardCountError(
+                maas_pool=job.maas_pool,
+                shards=job.shards,
+                collectors=len(pool.collector_clusters),
             )
-            logger.info(f"Job {job.job_name} created successfully")
-            return ResponseDetail(detail=f"Job {job.job_name} created successfully")
-        except ProduceFailureError as e:
-            logger.error(f"Failed to create job {job.job_name}: {str(e)}")
-            await self.repo.delete(db_job)
-            raise e
+        return choose_shard_collectors(
+            job.job_name, pool.collector_clusters, job.collector_cluster, job.shards
+        )
 
+    @scheduled_write
     async def update(
         self,
         job_name: str,
@@ -134,36 +772,39 @@ class JobService(BaseService[JobModel, JobRepository]):
         is_admin: bool,
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        producer.check_available()
 
         existing_job = await self.get(
             job_name, maas_pool, collector_cluster, authorized_pools, is_admin
         )
         original_dump = existing_job.model_dump()
+        footprint = job_footprints(existing_job)
+        shard_before = self._shard_snapshot(existing_job)
         update_data = job.model_dump(exclude_unset=True)
 
-        if update_data.get("basis_auth"):
-            update_data["basis_auth"]["password"] = security_manager.encrypt(
-                update_data["basis_auth"]["password"]
+        if update_data.get("basic_auth"):
+            update_data["basic_auth"]["password"] = security_manager.encrypt(
+                update_data["basic_auth"]["password"]
             )
 
-        await self.repo.update(existing_job, update_data)
+        async with self._admit(
+            maas_pool, footprint, job_footprints({**original_dump, **update_data})
+        ):
+            await self.repo.update(existing_job, update_data)
 
-        try:
-            await producer.send_event(
-                EventActions.UPDATE,
-                existing_job.maas_pool,
-                existing_job.collector_cluster,
-                existing_job.job_type,
-                existing_job.job_name,
-                update_data,
-            )
-            logger.info(f"Job {job.job_name} updated successfully")
-            return ResponseDetail(detail=f"Job {job.job_name} updated successfully")
-        except ProduceFailureError as e:
-            logger.error(f"Failed to update job {job.job_name}: {str(e)}")
-            await self.repo.update(existing_job, original_dump)
-            raise e
+            try:
+                await self._send_event(
+                    EventActions.UPDATE, existing_job, update_data, shard_before
+                )
+            except ProduceFailureError as e:
+                logger.error(f"Failed to update job {job.job_name}: {str(e)}")
+                await self.repo.update(existing_job, original_dump)
+                raise e
+
+        logger.info(f"Job {job.job_name} updated successfully")
+        return ResponseDetail(detail=f"Job {job.job_name} updated successfully")
 
+    @scheduled_write
     async def delete(
         self,
         job_name: str,
@@ -173,23 +814,21 @@ class JobService(BaseService[JobModel, JobRepository]):
         is_admin: bool,
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        producer.check_available()
 
         job = await self.get(
             job_name, maas_pool, collector_cluster, authorized_pools, is_admin
         )
         job_backup = job.model_dump()
+        shard_before = self._shard_snapshot(job)
         await self.repo.delete(job)
 
         try:
-            await producer.send_event(
-                EventActions.DELETE,
-                job.maas_pool,
-                job.collector_cluster,
-                job.job_type,
-                job.job_name,
-                job_backup,
+            await self._send_event(
+                EventActions.DELETE, job, job_backup, shard_before
             )
             logger.info(f"Job {job.job_name} deleted successfully")
+            await self.stats_service.apply_change(job_footprints(job), None)
             return ResponseDetail(detail=f"Job {job.job_name} deleted successfully")
         except ProduceFailureError as e:
             logger.error(f"Failed to delete job {job.job_name}: {str(e)}")
@@ -197,6 +836,75 @@ class JobService(BaseService[JobModel, JobRepository]):
             await self.repo.create(new_doc)
             raise e
 
+    @scheduled_write
+    async def move_job(self, job: BaseJob, target_collector: str) -> ResponseDetail:
+        """
+        Move a job to another collector of its pool. Collectors only see a delete on the
+        source and a create on the target, sent in that order so the job is never scraped twice.
+        """
+        producer.check_available()
+        if is_sharded(job):
+            raise ShardedJobMoveError(job_name=job.job_name)
+
+        source_collector = job.collector_cluster
+        if await self.repo.get_version(job.job_name, job.maas_pool, target_collector):
+            raise JobNameExistsError(job_name=job.job_name, collector_cluster=target_collector)
+
+        footprint = job_footprints(job)
+        job_backup = job.model_dump()
+        async with self._admit(
+            job.maas_pool,
+            footprint,
+            job_footprints({**job_backup, "collector_cluster": target_collector}),
+        ):
+            await self.repo.update(job, {"collector_cluster": target_collector})
+
+            deleted = False
+            try:
+                await producer.send_event(
+                    EventActions.DELETE,
+                    job.maas_pool,
+                    source_collector,
+                    job.job_type,
+                    job.job_name,
+                    job_backup,
+                )
+                deleted = True
+                await producer.send_event(
+                    EventActions.CREATE,
+                    job.maas_pool,
+                    target_collector,
+                    job.job_type,
+                    job.job_name,
+                    job.model_dump(),
+                )
+            except ProduceFailureError as e:
+                logger.error(
+                    f"Failed to move job {job.job_name} to {target_collector}: {str(e)}"
+                )
+                await self.repo.update(job, {"collector_cluster": source_collector})
+                if deleted:
+                    await self._restore_on_collector(job, job_backup)
+                raise e
+
+        logger.info(f"Job {job.job_name} moved from {source_collector} to {target_collector}")
+        return ResponseDetail(detail=f"Job {job.job_name} moved to {target_collector} successfully")
+
+    async def _restore_on_collector(self, job: BaseJob, job_data: Dict[str, Any]):
+        try:
+            await producer.send_event(
+                EventActions.CREATE,
+                job.maas_pool,
+                job.collector_cluster,
+                job.job_type,
+                job.job_name,
+                job_data,
+            )
+        except ProduceFailureError as e:
+            # The job is back in the database; the collector resyncs it from the change feed
+            logger.error(f"Failed to restore job {job.job_name} on {job.collector_cluster}: {str(e)}")
+
+    @scheduled_write
     async def add_target(
         self,
         job_name: str,
@@ -207,6 +915,7 @@ class JobService(BaseService[JobModel, JobRepository]):
         is_admin: bool,
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        producer.check_available()
 
         job = await self.get(
             job_name, maas_pool, collector_cluster, authorized_pools, is_admin
@@ -216,30 +925,33 @@ class JobService(BaseService[JobModel, JobRepository]):
             raise HTTPException(status_code=400, detail="Job does not support targets")
 
         if target not in job.targets:
-            job.targets.append(target)
-            await self.repo.save(job)
-
-            try:
-                await producer.send_event(
-                    EventActions.UPDATE,
-                    job.maas_pool,
-                    job.collector_cluster,
-                    job.job_type,
-                    job.job_name,
-                    job.model_dump(),
-                )
-                logger.info(f"Target {target} added to job {job.job_name} successfully")
-                return ResponseDetail(
-                    detail=f"Target {target} added to job {job.job_name} successfully"
-                )
-            except ProduceFailureError as e:
-                logger.error(
-                    f"Failed to add target {target} to job {job.job_name}: {str(e)}"
-                )
-                job.targets.remove(target)
+            async with self._admit(
+                maas_pool,
+                job_footprints(job),
+                job_footprints({**job.model_dump(), "targets": [*job.targets, target]}),
+            ):
+                shard_before = self._shard_snapshot(job)
+                job.targets.append(target)
                 await self.repo.save(job)
-                raise e
 
+                try:
+                    await self._send_event(
+                        EventActions.UPDATE, job, job.model_dump(), shard_before
+                    )
+                except ProduceFailureError as e:
+                    logger.error(
+                        f"Failed to add target {target} to job {job.job_name}: {str(e)}"
+                    )
+                    job.targets.remove(target)
+                    await self.repo.save(job)
+                    raise e
+
+            logger.info(f"Target {target} added to job {job.job_name} successfully")
+            return ResponseDetail(
+                detail=f"Target {target} added to job {job.job_name} successfully"
+            )
+
+    @scheduled_write
     async def delete_target(
         self,
         job_name: str,
@@ -250,6 +962,7 @@ class JobService(BaseService[JobModel, JobRepository]):
         is_admin: bool,
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        producer.check_available()
 
         job = await self.get(
             job_name, maas_pool, collector_cluster, authorized_pools, is_admin
@@ -259,21 +972,19 @@ class JobService(BaseService[JobModel, JobRepository]):
             raise HTTPException(status_code=400, detail="Job does not support targets")
 
         if target in job.targets:
+            footprint = job_footprints(job)
+            shard_before = self._shard_snapshot(job)
             job.targets.remove(target)
             await self.repo.save(job)
 
             try:
-                await producer.send_event(
-                    EventActions.UPDATE,
-                    job.maas_pool,
-                    job.collector_cluster,
-                    job.job_type,
-                    job.job_name,
-                    job.model_dump(),
+                await self._send_event(
+                    EventActions.UPDATE, job, job.model_dump(), shard_before
                 )
                 logger.info(
                     f"Target {target} deleted from job {job.job_name} successfully"
                 )
+                await self.stats_service.apply_change(footprint, job_footprints(job))
                 return ResponseDetail(
                     detail=f"Target {target} deleted from job {job.job_name} successfully"
                 )
@@ -285,6 +996,7 @@ class JobService(BaseService[JobModel, JobRepository]):
                 await self.repo.save(job)
                 raise e
 
+    @scheduled_write
     async def add_label(
         self,
         job_name: str,
@@ -295,6 +1007,7 @@ class JobService(BaseService[JobModel, JobRepository]):
         is_admin: bool,
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        producer.check_available()
 
         job = await self.get(
             job_name, maas_pool, collector_cluster, authorized_pools, is_admin
@@ -304,17 +1017,13 @@ class JobService(BaseService[JobModel, JobRepository]):
             job.labels = {}
 
         original_labels = job.labels.copy()
+        shard_before = self._shard_snapshot(job)
         job.labels.update(labels)
         await self.repo.save(job)
 
         try:
-            await producer.send_event(
-                EventActions.UPDATE,
-                job.maas_pool,
-                job.collector_cluster,
-                job.job_type,
-                job.job_name,
-                job.model_dump(),
+            await self._send_event(
+                EventActions.UPDATE, job, job.model_dump(), shard_before
             )
             logger.info(f"Label {labels} added to job {job.job_name} successfully")
             return ResponseDetail(
@@ -328,6 +1037,7 @@ class JobService(BaseService[JobModel, JobRepository]):
             await self.repo.save(job)
             raise e
 
+    @scheduled_write
     async def update_label(
         self,
         job_name: str,
@@ -339,6 +1049,7 @@ class JobService(BaseService[JobModel, JobRepository]):
         is_admin: bool,
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        producer.check_available()
 
         job = await self.get(
             job_name, maas_pool, collector_cluster, authorized_pools, is_admin
@@ -348,17 +1059,13 @@ class JobService(BaseService[JobModel, JobRepository]):
             raise HTTPException(status_code=400, detail="Label not found")
 
         original_labels = job.labels.copy()
+        shard_before = self._shard_snapshot(job)
         job.labels[label_key] = label_value
         await self.repo.save(job)
 
         try:
-            await producer.send_event(
-                EventActions.UPDATE,
-                job.maas_pool,
-                job.collector_cluster,
-                job.job_type,
-                job.job_name,
-                job.model_dump(),
+            await self._send_event(
+                EventActions.UPDATE, job, job.model_dump(), shard_before
             )
             logger.info(f"Label {label_key} updated to job {job.job_name} successfully")
             return ResponseDetail(
@@ -372,6 +1079,7 @@ class JobService(BaseService[JobModel, JobRepository]):
             await self.repo.save(job)
             raise e
 
+    @scheduled_write
     async def delete_label(
         self,
         job_name: str,
@@ -382,6 +1090,7 @@ class JobService(BaseService[JobModel, JobRepository]):
         is_admin: bool,
     ) -> ResponseDetail:
         self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        producer.check_available()
 
         job = await self.get(
             job_name, maas_pool, collector_cluster, authorized_pools, is_admin
@@ -389,17 +1098,13 @@ class JobService(BaseService[JobModel, JobRepository]):
 
         if job.labels and label_key in job.labels:
             original_labels = job.labels.copy()
+            shard_before = self._shard_snapshot(job)
             del job.labels[label_key]
             await self.repo.save(job)
 
             try:
-                await producer.send_event(
-                    EventActions.UPDATE,
-                    job.maas_pool,
-                    job.collector_cluster,
-                    job.job_type,
-                    job.job_name,
-                    job.model_dump(),
+                await self._send_event(
+                    EventActions.UPDATE, job, job.model_dump(), shard_before
                 )
                 logger.info(
                     f"Label {label_key} deleted from job {job.job_name} successfully"
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config.constants.load import LOAD_FLUSH_INTERVAL_SECONDS, LOAD_IDLE_EXPIRY_SECONDS, LOAD_PERCENTILES, LOAD_WINDOW_SIZE
+from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
+from models.db_schemas.collector_loads import CollectorLoadSample
+from models.validation_schemas.create_schemas.load_reports import CollectorLoadReport
+from repositories.load_repository import LoadRepository
+from services.base_service import BaseService
+from utils.load_window import LoadWindow
+from utils.logger import create_logger
+
+logger = create_logger("load_service")
+
+
+def _as_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class LoadTracker:
+    """
+    Process-wide store of collector load reports. Each collector cluster has a ring buffer, so
+    a report costs a dict lookup and a few array writes and never touches the database. A
+    background task expires idle collectors and, when persistence is on, downsamples every
+    buffer into one document per collector and flush interval.
+    """
+
+    def __init__(self, capacity: int = LOAD_WINDOW_SIZE, percentiles: Tuple[int, ...] = LOAD_PERCENTILES,
+                 flush_interval: float = LOAD_FLUSH_INTERVAL_SECONDS, idle_expiry: float = LOAD_IDLE_EXPIRY_SECONDS,
+                 clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.percentiles = percentiles
+        self.flush_interval = flush_interval
+        self.idle_expiry = idle_expiry
+        self.clock = clock
+        self._windows: Dict[str, Dict[str, LoadWindow]] = {}
+        self._flushed_until = clock()
+        self._repo: Optional[LoadRepository] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, maas_pool: str, collector_cluster: str, values: Dict[str, float]):
+        windows = self._windows.setdefault(maas_pool, {})
+        window = windows.get(collector_cluster)
+        if window is None:
+            window = windows[collector_cluster] = LoadWindow(self.capacity)
+        window.add(self.clock(), values)
+
+    def summarize(self, maas_pool: str, window_seconds: float) -> Dict[str, Dict[str, Any]]:
+        since = self.clock() - window_seconds
+        summaries = {}
+        for collector_cluster, window in self._windows.get(maas_pool, {}).items():
+            summary = window.summarize(since, self.percentiles)
+            if summary is not None:
+                summary['last_report'] = _as_datetime(summary['last_report'])
+                summaries[collector_cluster] = summary
+        return summaries
+
+    def downsample(self) -> List[Dict[str, Any]]:
+        """One sample per collector covering the reports received since the previous call."""
+        now = self.clock()
+        since, self._flushed_until = self._flushed_until, now
+        samples = []
+        for maas_pool, windows in self._windows.items():
+            for collector_cluster, window in windows.items():
+                summary = window.summarize(since, self.percentiles)
+                if summary is None:
+                    continue
+                del summary['last_report']
+                samples.append({'maas_pool': maas_pool, 'collector_cluster': collector_cluster,
+                                'time': _as_datetime(now), **summary})
+        return samples
+
+    def expire(self):
+        cutoff = self.clock() - self.idle_expiry
+        for maas_pool in list(self._windows):
+            windows = self._windows[maas_pool]
+            for collector_cluster in [name for name, window in windows.items() if window.last_report < cutoff]:
+                del windows[collector_cluster]
+            if not windows:
+                del self._windows[maas_pool]
+
+    def start(self, repo: Optional[LoadRepository]):
+        """Start the background flusher once; `repo` is None when history is not persisted."""
+        if self._task is None or self._task.done():
+            self._repo = repo
+            self._task = asyncio.create_task(self._run())
+
+    async def flush(self):
+        self.expire()
+        if self._repo is None:
+            return
+        samples = self.downsample()
+        try:
+            await self._repo.insert_samples(samples)
+        except Exception as e:
+            # History is best effort; the in-memory windows are unaffected
+            logger.error(f"Failed to persist {len(samples)} collector load samples: {str(e)}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            await self.flush()
+        self._task = None
+
+
+class LoadService(BaseService[CollectorLoadSample, LoadRepository]):
+    def __init__(self, repo: LoadRepository, tracker: Optional[LoadTracker] = None, persist: bool = False):
+        super().__init__(repo)
+        self.tracker = tracker or load_tracker
+        self.persist = persist
+
+    @staticmethod
+    def _check_if_authorized(authorized_pools: List[str], maas_pool: str, is_admin: bool):
+        if not is_admin and maas_pool not in authorized_pools:
+            logger.warning(f"API key is not authorized for {maas_pool}")
+            raise UnauthorizedApiKeyError(maas_pool=maas_pool)
+
+    def report(self, maas_pool: str, collector_cluster: str, report: CollectorLoadReport,
+               authorized_pools: List[str], is_admin: bool):
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        self.tracker.record(maas_pool, collector_cluster, report.model_dump())
+        self.tracker.start(self.repo if self.persist else None)
+
+    def get_pool_load(self, maas_pool: str, window_seconds: int, authorized_pools: List[str],
+                      is_admin: bool) -> Dict[str, Any]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        return {
+            'maas_pool': maas_pool,
+            'window_seconds': window_seconds,
+            'collectors': self.tracker.summarize(maas_pool, window_seconds),
+        }
+
+    async def get_history(self, maas_pool: str, collector_cluster: str, since: Optional[datetime], limit: int,
+                          authorized_pools: List[str], is_admin: bool) -> List[Dict[str, Any]]:
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        return await self.repo.get_history(maas_pool, collector_cluster, since, limit)
+
+
+load_tracker = LoadTracker()
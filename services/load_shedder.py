@@ -0,0 +1,135 @@
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+from config.constants.load_shedding import (
+    DROP_PROBABILITY_STEP,
+    IN_FLIGHT_DECREASE_FACTOR,
+    IN_FLIGHT_INCREASE_STEP,
+    LAG_SAMPLE_INTERVAL_SECONDS,
+    LAG_TARGET_SECONDS,
+    LOW_PRIORITY_IN_FLIGHT_SHARE,
+    MAX_DROP_PROBABILITY,
+    MAX_IN_FLIGHT,
+    MIN_IN_FLIGHT,
+    SHED_RETRY_AFTER_SECONDS,
+    SHEDDING_INTERVAL_SECONDS,
+)
+from enums.request_priority import RequestPriority
+from utils.logger import create_logger
+
+logger = create_logger("load_shedder")
+
+
+class LoadShedder:
+    """
+    Decides at the door whether a request is worth starting.
+
+    Event-loop lag is the overload signal: every queued request shows up as lag. Following
+    CoDel, lag above `target` is tolerated for one `interval` (a burst); if it stays above,
+    the shedder enters the dropping state, where low-priority requests are rejected outright
+    and normal ones are dropped with a probability that climbs on every lag sample still
+    above target and decays once lag is back under it. HTTP clients don't slow down on a
+    single drop the way TCP does, so CoDel's sqrt(count) drop schedule would be far too
+    gentle here. On top, the in-flight limit adapts AIMD-style: cut while dropping, grown
+    back on every healthy sample. Critical requests are only refused at the hard
+    `max_in_flight` ceiling.
+    """
+
+    def __init__(self, target: float = LAG_TARGET_SECONDS, interval: float = SHEDDING_INTERVAL_SECONDS,
+                 max_in_flight: int = MAX_IN_FLIGHT, min_in_flight: int = MIN_IN_FLIGHT,
+                 sample_interval: float = LAG_SAMPLE_INTERVAL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.target = target
+        self.interval = interval
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.sample_interval = sample_interval
+        self.clock = clock
+        self.limit = float(max_in_flight)
+        self.lag = 0.0
+        self.dropping = False
+        self.in_flight = 0
+        self.in_flight_by_priority: Dict[RequestPriority, int] = {priority: 0 for priority in RequestPriority}
+        self.shed: Dict[RequestPriority, int] = {priority: 0 for priority in RequestPriority}
+        self.drop_probability = 0.0
+        self._above_since: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def observe_lag(self, lag: float, now: Optional[float] = None):
+        now = self.clock() if now is None else now
+        self.lag = lag
+
+        if lag < self.target:
+            self._above_since = None
+            if self.dropping:
+                self.dropping = False
+                logger.info(f"Event-loop lag back under {self.target * 1000:.0f}ms, stopped shedding")
+            self.drop_probability = max(self.drop_probability - DROP_PROBABILITY_STEP, 0.0)
+            self.limit = min(self.max_in_flight, self.limit + IN_FLIGHT_INCREASE_STEP)
+            return
+
+        if self._above_since is None:
+            self._above_since = now
+        elif not self.dropping and now - self._above_since >= self.interval:
+            self.dropping = True
+            logger.warning(f"Event-loop lag {lag * 1000:.0f}ms above target for {self.interval}s, shedding load")
+
+        if self.dropping:
+            self.drop_probability = min(self.drop_probability + DROP_PROBABILITY_STEP, MAX_DROP_PROBABILITY)
+            self.limit = max(self.min_in_flight, min(self.limit, self.in_flight) * IN_FLIGHT_DECREASE_FACTOR)
+
+    def _should_shed(self, priority: RequestPriority) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return True
+        if priority == RequestPriority.CRITICAL:
+            return False
+        if priority == RequestPriority.LOW:
+            return self.dropping or self.drop_probability > 0 or \
+                self.in_flight >= self.limit * LOW_PRIORITY_IN_FLIGHT_SHARE
+        return self.in_flight >= self.limit or random.random() < self.drop_probability
+
+    def admit(self, priority: RequestPriority) -> Optional[float]:
+        """Count the request in and return None, or return the seconds the client should wait."""
+        self._ensure_monitoring()
+        if self._should_shed(priority):
+            self.shed[priority] += 1
+            # Jitter keeps rejected clients from coming back in lockstep
+            return SHED_RETRY_AFTER_SECONDS * (1 + random.random())
+
+        self.in_flight += 1
+        self.in_flight_by_priority[priority] += 1
+        return None
+
+    def release(self, priority: RequestPriority):
+        self.in_flight -= 1
+        self.in_flight_by_priority[priority] -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'lag_ms': self.lag * 1000,
+            'dropping': self.dropping,
+            'drop_probability': self.drop_probability,
+            'in_flight_limit': int(self.limit),
+            'in_flight': {priority.value: count for priority, count in self.in_flight_by_priority.items()},
+            'shed': {priority.value: count for priority, count in self.shed.items()},
+        }
+
+    def _ensure_monitoring(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._monitor())
+
+    async def _monitor(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.sample_interval)
+            self.observe_lag(max(loop.time() - started - self.sample_interval, 0.0))
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+load_shedder = LoadShedder()
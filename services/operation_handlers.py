@@ -0,0 +1,194 @@
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from bson import ObjectId
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from config import config
+from config.constants.imports import IMPORT_BATCH_SIZE
+from config.constants.jobs import SEARCH_BACKFILL_BATCH_SIZE
+from enums.write_status import WriteStatus
+from enums.operation_kind import OperationKind
+from models.validation_schemas.create_schemas.jobs import BaseJobCreate, JobCreate
+from repositories.job_repository import JobRepository
+from repositories.pool_repository import PoolRepository
+from repositories.stats_repository import StatsRepository
+from repositories.view_repository import CollectorViewRepository
+from services.job_service import JobService
+from services.operation_runner import OperationContext, OperationRunner
+from services.stats_service import StatsService
+from services.sync_service import SyncService
+from services.target_index_service import TargetIndexService
+from services.view_service import CollectorViewService
+from utils.prometheus_config import iter_scrape_configs, map_scrape_config
+from utils.security import security_manager
+
+JOB_CREATE_ADAPTER = TypeAdapter(JobCreate)
+DESIRED_JOBS_ADAPTER = TypeAdapter(List[JobCreate])
+
+# Rebuilds replace a pool's derived data wholesale, so an interrupted one simply runs again from scratch
+
+
+async def rebuild_stats(context: OperationContext) -> Optional[Dict[str, Any]]:
+    service = StatsService(StatsRepository(), JobRepository())
+    return (await service.rebuild(context.maas_pool)).model_dump()
+
+
+async def rebuild_views(context: OperationContext) -> Optional[Dict[str, Any]]:
+    repo = JobRepository(views=CollectorViewRepository() if config["collector_views.enabled"] else None)
+    service = CollectorViewService(repo.views or CollectorViewRepository(), repo)
+    return (await service.rebuild(context.maas_pool)).model_dump()
+
+
+async def rebuild_targets(context: OperationContext) -> Optional[Dict[str, Any]]:
+    repo = JobRepository()
+    service = TargetIndexService(repo.targets, repo)
+    return (await service.rebuild(context.maas_pool)).model_dump()
+
+
+async def backfill_search_fields(context: OperationContext) -> Optional[Dict[str, Any]]:
+    """
+    Set the search fields of a pool's jobs stored before those fields existed. The checkpoint is the
+    last `_id` handled, and a redone batch only finds the jobs still missing them.
+    """
+    repo = JobRepository()
+    after = ObjectId(context.checkpoint) if context.checkpoint else None
+    updated = 0
+    while True:
+        after, count = await repo.backfill_search_fields(context.maas_pool, after, SEARCH_BACKFILL_BATCH_SIZE)
+        if after is None:
+            return {'updated': updated}
+        updated += count
+        await context.save(str(after))
+
+
+def _describe(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'job'}: {e['msg']}" for e in error.errors())
+    return str(error)
+
+
+def _prepare(scrape_config: Any, index: int, context: OperationContext,
+             seen: Set[str]) -> Tuple[str, Optional[BaseJobCreate], Optional[str]]:
+    """Item key, create request and rejection reason of one `scrape_configs` entry."""
+    job_name = scrape_config.get('job_name') if isinstance(scrape_config, dict) else None
+    duplicate = isinstance(job_name, str) and job_name in seen
+    # Item keys are unique per operation; a repeated or missing name is told apart by its position
+    key = job_name if isinstance(job_name, str) and not duplicate else f"{job_name or ''}#{index}"
+    seen.add(key)
+    if duplicate:
+        return key, None, f"Duplicate job_name {job_name}"
+
+    try:
+        body = map_scrape_config(scrape_config)
+        body['maas_pool'] = context.maas_pool
+        body.update({field: context.params[field] for field in ('collector_cluster', 'placement')
+                     if context.params.get(field) is not None})
+        return key, JOB_CREATE_ADAPTER.validate_python(body), None
+    except ValueError as e:
+        return key, None, _describe(e)
+
+
+def _read_batch(entries: Iterator[Tuple[int, Any]], start: int, context: OperationContext, seen: Set[str],
+                position: int) -> Tuple[List[Tuple[str, Optional[BaseJobCreate], Optional[str]]], int, bool]:
+    """
+    The next IMPORT_BATCH_SIZE prepared entries past `start`, the position reached and whether
+    the document ended.
+    """
+    batch = []
+    for position, scrape_config in entries:
+        if position <= start:
+            continue
+        batch.append(_prepare(scrape_config, position - 1, context, seen))
+        if len(batch) == IMPORT_BATCH_SIZE:
+            return batch, position, False
+    return batch, position, True
+
+
+async def _import_batch(service: JobService, context: OperationContext,
+                        batch: List[Tuple[str, Optional[BaseJobCreate], Optional[str]]]) -> List[Dict[str, Any]]:
+    results = {key: {'key': key, 'status': WriteStatus.FAILED.value, 'detail': rejection}
+               for key, job, rejection in batch if job is None}
+    jobs = [(key, job) for key, job, _ in batch if job is not None]
+    if jobs:
+        outcomes = await service.import_batch(context.maas_pool, [job for _, job in jobs])
+        results.update({key: {'key': key, **outcome} for (key, _), outcome in zip(jobs, outcomes)})
+    return [results[key] for key, _, _ in batch]
+
+
+def import_params(config_text: str, collector_cluster: Optional[str], placement: Optional[str]) -> Dict[str, Any]:
+    """
+    Params of an IMPORT_PROMETHEUS_CONFIG operation. The file carries basic_auth passwords and
+    bearer tokens, so it is persisted encrypted, as job credentials are, until the operation finishes.
+    """
+    return {'config': security_manager.encrypt(config_text), 'collector_cluster': collector_cluster,
+            'placement': placement}
+
+
+async def import_prometheus_config(context: OperationContext) -> Optional[Dict[str, Any]]:
+    """
+    Import the `scrape_configs` of the uploaded prometheus.yml as jobs of the operation's pool,
+    reading entries as the document is parsed and creating them IMPORT_BATCH_SIZE at a time. The
+    checkpoint is the number of entries handled; a resumed run parses past them again and skips
+    existing jobs of the batch it redoes.
+    """
+    service = JobService(
+        JobRepository(views=CollectorViewRepository() if config["collector_views.enabled"] else None),
+        PoolRepository(),
+    )
+    start = context.checkpoint or 0
+    # Decrypting, parsing and validating are CPU-bound, so they run in a worker thread
+    config_text = await run_in_threadpool(security_manager.decrypt, context.params['config'])
+    entries = enumerate(iter_scrape_configs(config_text), start=1)
+    seen: Set[str] = set()
+    position = 0
+    while True:
+        batch, position, finished = await run_in_threadpool(_read_batch, entries, start, context, seen, position)
+        if finished:
+            await context.save(position, await _import_batch(service, context, batch), total=position)
+            return {'entries': position}
+        await context.save(position, await _import_batch(service, context, batch))
+
+
+def sync_params(maas_pool: str, collector_cluster: str, jobs: List[BaseJobCreate]) -> Dict[str, Any]:
+    """
+    Params of a SYNC_COLLECTOR operation, the desired set checked before it is queued. Its jobs
+    carry basic_auth passwords, so the set is persisted encrypted until the operation finishes.
+    """
+    SyncService.desired_jobs(maas_pool, collector_cluster, jobs)
+    return {'collector_cluster': collector_cluster,
+            'jobs': security_manager.encrypt(DESIRED_JOBS_ADAPTER.dump_json(jobs).decode())}
+
+
+def _desired_set(cipher_text: str) -> List[BaseJobCreate]:
+    return DESIRED_JOBS_ADAPTER.validate_json(security_manager.decrypt(cipher_text))
+
+
+async def sync_collector(context: OperationContext) -> Optional[Dict[str, Any]]:
+    """
+    Make a collector hold exactly the desired job set, recording each changed job as an item. The
+    plan is made against the current state, so a resumed run only redoes what had not landed; the
+    checkpoint is the number of jobs handled.
+    """
+    repo = JobRepository(views=CollectorViewRepository() if config["collector_views.enabled"] else None)
+    service = SyncService(repo, JobService(repo, PoolRepository()))
+    jobs = await run_in_threadpool(_desired_set, context.params['jobs'])
+    handled = 0
+
+    async def save(plan: Dict[str, Any], results: List[Dict[str, Any]]):
+        nonlocal handled
+        handled += len(results)
+        await context.save(handled, [{'key': result['job_name'], 'status': result['status'],
+                                      'detail': result.get('detail')} for result in results])
+
+    applied = await service.apply(context.maas_pool, context.params['collector_cluster'], jobs, [], True, save)
+    plan = {key: value for key, value in applied.items() if key != 'results'}
+    await context.save(handled, total=len(plan['create']) + len(plan['update']) + len(plan['delete']))
+    return plan
+
+
+def register_operation_handlers(runner: OperationRunner):
+    runner.register(OperationKind.REBUILD_STATS, rebuild_stats)
+    runner.register(OperationKind.REBUILD_VIEWS, rebuild_views)
+    runner.register(OperationKind.REBUILD_TARGETS, rebuild_targets)
+    runner.register(OperationKind.BACKFILL_SEARCH_FIELDS, backfill_search_fields)
+    runner.register(OperationKind.IMPORT_PROMETHEUS_CONFIG, import_prometheus_config)
+    runner.register(OperationKind.SYNC_COLLECTOR, sync_collector)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from bson import ObjectId
+from config import config
+from config.constants.operations import (DEFAULT_OPERATION_WORKERS, MAX_OPERATION_ATTEMPTS, OPERATION_LEASE_SECONDS,
+                                         OPERATION_POLL_INTERVAL_SECONDS)
+from enums.operation_kind import OperationKind
+from enums.operation_state import OperationState
+from exceptions.operation_lease_lost_error import OperationLeaseLostError
+from repositories.operation_repository import OperationRepository
+from utils.logger import create_logger
+
+logger = create_logger("operation_runner")
+
+
+class OperationContext:
+    """What a handler sees of its operation: its input, where to resume from, and how to report progress."""
+
+    def __init__(self, repo: OperationRepository, operation: Dict[str, Any], owner: str, lease_seconds: float):
+        self.repo = repo
+        self.id: ObjectId = operation['_id']
+        self.kind = OperationKind(operation['kind'])
+        self.maas_pool: Optional[str] = operation.get('maas_pool')
+        self.params: Dict[str, Any] = operation.get('params') or {}
+        self.checkpoint: Any = operation.get('checkpoint')
+        self.resumed = self.checkpoint is not None
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.lease_lost = False
+
+    async def save(self, checkpoint: Any, results: Optional[List[Dict[str, Any]]] = None,
+                   total: Optional[int] = None):
+        """
+        Persist per-item `results` ({key, status, detail}), then `checkpoint`. Work done after the last
+        checkpoint is repeated on resume, so handlers checkpoint after each batch they can safely redo.
+        """
+        results = results or []
+        await self.repo.add_items(self.id, results)
+        failed = sum(1 for result in results if result['status'] == 'failed')
+        if not await self.repo.save_progress(self.id, self.owner, checkpoint, len(results) - failed, failed,
+                                             total, self.lease_seconds):
+            raise OperationLeaseLostError(str(self.id))
+        self.checkpoint = checkpoint
+
+
+OperationHandler = Callable[[OperationContext], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class OperationRunner:
+    """
+    A bounded pool of workers executing queued operations. The queue is the `operations`
+    collection itself: workers claim the oldest queued operation with a lease and renew it while
+    running, so operations queued or interrupted by a restart are picked up by whichever replica
+    has a free worker, from their last checkpoint.
+    """
+
+    def __init__(self, handlers: Optional[Dict[OperationKind, OperationHandler]] = None,
+                 workers: int = DEFAULT_OPERATION_WORKERS, lease_seconds: float = OPERATION_LEASE_SECONDS,
+                 poll_interval: float = OPERATION_POLL_INTERVAL_SECONDS, repo: Optional[OperationRepository] = None):
+        self.handlers = handlers if handlers is not None else {}
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.repo = repo or OperationRepository()
+        self.owner = uuid.uuid4().hex
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, kind: OperationKind, handler: OperationHandler):
+        self.handlers[kind] = handler
+
+    def start(self):
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    def notify(self):
+        """A new operation was queued; wake an idle worker instead of waiting for the next poll."""
+        self.start()
+        self._wakeup.set()
+
+    async def _next(self) -> Dict[str, Any]:
+        while True:
+            try:
+                operation = await self.repo.claim_next(self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Failed to claim an operation: {str(e)}")
+                operation = None
+            if operation is not None:
+                return operation
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self):
+        while True:
+            operation = await self._next()
+            try:
+                await self._execute(operation)
+            except Exception as e:
+                # Recording the outcome failed; the lease runs out and the operation is claimed again
+                logger.error(f"Failed to record the outcome of operation {operation['_id']}: {str(e)}")
+
+    async def _keep_leased(self, context: OperationContext, work: asyncio.Task):
+        """
+        Renew the lease while the handler runs, retrying a failed renewal on the next beat. Once the
+        lease is lost, to another worker or by running out, the handler is cancelled so the operation
+        never runs on two workers at once.
+        """
+        renewed = time.monotonic()
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                lost = not await self.repo.renew(context.id, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Failed to renew the lease of operation {context.id}: {str(e)}")
+                lost = time.monotonic() - renewed >= self.lease_seconds
+            else:
+                renewed = time.monotonic()
+            if lost:
+                context.lease_lost = True
+                work.cancel()
+                return
+
+    async def _execute(self, operation: Dict[str, Any]):
+        context = OperationContext(self.repo, operation, self.owner, self.lease_seconds)
+        handler = self.handlers.get(context.kind)
+        if handler is None:
+            await self.repo.finish(context.id, self.owner, OperationState.FAILED,
+                                   error=f"No handler for operation kind {context.kind.value}")
+            return
+        attempt = operation.get('attempts', 0) + 1
+        if attempt > MAX_OPERATION_ATTEMPTS:
+            # Every earlier run died or lost its lease; another one would most likely do the same
+            await self.repo.finish(context.id, self.owner, OperationState.FAILED,
+                                   error=f"Gave up after {MAX_OPERATION_ATTEMPTS} interrupted attempts")
+            return
+
+        logger.info(f"{'Resuming' if context.resumed else 'Starting'} operation {context.id} ({context.kind.value})")
+        work = asyncio.create_task(handler(context))
+        renewal = asyncio.create_task(self._keep_leased(context, work))
+        try:
+            result = await work
+        except OperationLeaseLostError as e:
+            logger.warning(str(e))
+            return
+        except asyncio.CancelledError:
+            if context.lease_lost and not asyncio.current_task().cancelling():
+                logger.warning(f"Operation {context.id} stopped after losing its lease")
+                return
+            # Shutting down: hand it back so the next worker resumes from the checkpoint
+            await self.repo.release(context.id, self.owner)
+            raise
+        except Exception as e:
+            logger.error(f"Operation {context.id} failed: {str(e)}")
+            await self.repo.finish(context.id, self.owner, OperationState.FAILED, error=str(e))
+            return
+        finally:
+            renewal.cancel()
+        # Outside the handler's error handling: failing to record a success must not record a failure
+        await self.repo.finish(context.id, self.owner, OperationState.COMPLETED, result=result)
+        logger.info(f"Operation {context.id} completed")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+operation_runner = OperationRunner(workers=config["operations.workers"])
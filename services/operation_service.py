@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from enums.operation_kind import OperationKind
+from exceptions.operation_not_found_error import OperationNotFoundError
+from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
+from models.db_schemas.operations import Operation
+from repositories.operation_repository import OperationRepository
+from services.base_service import BaseService
+from services.operation_runner import OperationRunner, operation_runner
+
+
+def _as_status(operation: Dict[str, Any]) -> Dict[str, Any]:
+    return {**operation, 'id': str(operation['_id'])}
+
+
+class OperationService(BaseService[Operation, OperationRepository]):
+    def __init__(self, repo: OperationRepository, runner: Optional[OperationRunner] = None):
+        super().__init__(repo)
+        self.runner = runner or operation_runner
+
+    async def submit(self, kind: OperationKind, maas_pool: Optional[str] = None,
+                     params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        operation = await self.repo.create(Operation(kind=kind, maas_pool=maas_pool, params=params or {}))
+        self.runner.notify()
+        return _as_status({**operation.model_dump(exclude={'id', 'checkpoint', 'params'}), '_id': operation.id})
+
+    async def submit_for_pool(self, kind: OperationKind, maas_pool: str, params: Dict[str, Any],
+                              authorized_pools: List[str], is_admin: bool) -> Dict[str, Any]:
+        """Submit an operation on behalf of an API key that must be authorized for `maas_pool`."""
+        if not is_admin and maas_pool not in authorized_pools:
+            raise UnauthorizedApiKeyError(maas_pool=maas_pool)
+        return await self.submit(kind, maas_pool, params)
+
+    async def _get_authorized(self, operation_id: str, authorized_pools: List[str], is_admin: bool) -> Dict[str, Any]:
+        try:
+            operation = await self.repo.get(ObjectId(operation_id))
+        except InvalidId:
+            operation = None
+        # Operations not bound to a pool are admin work; don't reveal them to anyone else
+        if operation is None or (operation.get('maas_pool') is None and not is_admin):
+            raise OperationNotFoundError(operation_id=operation_id)
+        if not is_admin and operation['maas_pool'] not in authorized_pools:
+            raise UnauthorizedApiKeyError(maas_pool=operation['maas_pool'])
+        return operation
+
+    async def get(self, operation_id: str, authorized_pools: List[str], is_admin: bool) -> Dict[str, Any]:
+        return _as_status(await self._get_authorized(operation_id, authorized_pools, is_admin))
+
+    async def get_items(self, operation_id: str, after: Optional[str], limit: int,
+                        authorized_pools: List[str], is_admin: bool) -> Dict[str, Any]:
+        operation = await self._get_authorized(operation_id, authorized_pools, is_admin)
+        items = await self.repo.get_items(operation['_id'], after, limit)
+        return {'items': items, 'next': items[-1]['key'] if len(items) == limit else None}
@@ -0,0 +1,74 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from exceptions.no_collector_available_error import NoCollectorAvailableError
+from enums.placement_strategy import PlacementStrategy
+from models.db_schemas.job_stats import JobStats
+from repositories.stats_repository import StatsRepository
+from services.base_service import BaseService
+from utils.hash_ring import hash_ring
+from utils.logger import create_logger
+
+logger = create_logger("placement_service")
+
+
+class PlacementPolicy(ABC):
+    @abstractmethod
+    async def choose(self, maas_pool: str, collector_clusters: List[str], job_name: str,
+                     stats_repo: StatsRepository) -> str:
+        raise NotImplementedError
+
+
+async def _least_loaded_of(maas_pool: str, collector_clusters: List[str], stats_repo: StatsRepository) -> str:
+    """Lowest scrape rate (targets x scrape frequency) wins; collectors without counters are empty."""
+    loads = {stats['collector_cluster']: stats for stats in await stats_repo.get_collectors(maas_pool, collector_clusters)}
+
+    def cost(collector_cluster: str):
+        stats = loads.get(collector_cluster, {})
+        return stats.get('scrape_rate', 0.0), stats.get('job_count', 0), collector_cluster
+
+    return min(collector_clusters, key=cost)
+
+
+class LeastLoadedPlacement(PlacementPolicy):
+    """Reads one counter document per collector of the pool, independent of how many jobs exist."""
+
+    async def choose(self, maas_pool, collector_clusters, job_name, stats_repo) -> str:
+        return await _least_loaded_of(maas_pool, collector_clusters, stats_repo)
+
+
+class PowerOfTwoPlacement(PlacementPolicy):
+    """Compares two random collectors; close to least-loaded without every caller herding onto one collector."""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+
+    async def choose(self, maas_pool, collector_clusters, job_name, stats_repo) -> str:
+        candidates = self.rng.sample(collector_clusters, 2) if len(collector_clusters) > 2 else collector_clusters
+        return await _least_loaded_of(maas_pool, candidates, stats_repo)
+
+
+class ConsistentHashPlacement(PlacementPolicy):
+    """Same job name, same collector, with no counter reads at all."""
+
+    async def choose(self, maas_pool, collector_clusters, job_name, stats_repo) -> str:
+        return hash_ring(tuple(sorted(collector_clusters))).node_for(job_name)
+
+
+class PlacementService(BaseService[JobStats, StatsRepository]):
+    def __init__(self, repo: StatsRepository, policies: Optional[Dict[PlacementStrategy, PlacementPolicy]] = None):
+        super().__init__(repo)
+        self.policies = policies or {
+            PlacementStrategy.LEAST_LOADED: LeastLoadedPlacement(),
+            PlacementStrategy.POWER_OF_TWO: PowerOfTwoPlacement(),
+            PlacementStrategy.CONSISTENT_HASH: ConsistentHashPlacement(),
+        }
+
+    async def place(self, maas_pool: str, collector_clusters: List[str], job_name: str,
+                    strategy: PlacementStrategy) -> str:
+        if not collector_clusters:
+            raise NoCollectorAvailableError(maas_pool=maas_pool)
+
+        collector_cluster = await self.policies[strategy].choose(maas_pool, collector_clusters, job_name, self.repo)
+        logger.info(f"Placed job {job_name} on collector {collector_cluster} using {strategy.value}")
+        return collector_cluster
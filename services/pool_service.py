@@ -1,4 +1,6 @@
+from datetime import datetime, timezone
 from models.db_schemas.maas_pools import MaasPool
+from models.general.pools.quotas import PoolQuotas
 from repositories.pool_repository import PoolRepository
 from services.base_service import BaseService
 from exceptions.pool_not_exist_error import PoolNotExistsError
@@ -9,13 +11,16 @@ class PoolService(BaseService[MaasPool, PoolRepository]):
         pool = await self.repo.get(name=maas_pool)
 
         if not pool:
-            raise PoolNotExistsError(maas_pool=maas_pool)
+            raise PoolNotExistsError(pool_name=maas_pool)
 
         return pool
     
     async def check_collector_in_pool(self, maas_pool: str, collector_cluster: str) -> bool:
         pool = await self.get(maas_pool)
         return collector_cluster in pool.collector_clusters
-    
-
 
+    async def set_quotas(self, maas_pool: str, quotas: PoolQuotas) -> MaasPool:
+        pool = await self.get(maas_pool)
+        pool.quotas = quotas
+        pool.update_time = datetime.now(timezone.utc)
+        return await self.repo.save(pool)
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Optional
+from config.constants.jobs import POOL_TOTAL_KEY
+from exceptions.job_quota_exceeded_error import JobQuotaExceededError
+from exceptions.scrape_rate_quota_exceeded_error import ScrapeRateQuotaExceededError
+from models.db_schemas.job_stats import JobStats
+from models.db_schemas.maas_pools import MaasPool
+from repositories.stats_repository import StatsRepository
+from services.base_service import BaseService
+from utils.logger import create_logger
+from utils.scrape_cost import JobLoad
+
+logger = create_logger("quota_service")
+
+
+def _budget(limit: Optional[float], used: float) -> Optional[Dict[str, float]]:
+    if limit is None:
+        return None
+    return {'limit': limit, 'used': used, 'remaining': max(limit - used, 0)}
+
+
+def _check(scope: str, counters: Optional[Dict[str, Any]], delta: JobLoad,
+           max_jobs: Optional[int], max_scrape_rate: Optional[float]):
+    counters = counters or {}
+    used_jobs = counters.get('job_count', 0)
+    used_rate = counters.get('scrape_rate', 0.0)
+    if max_jobs is not None and delta.jobs > 0 and used_jobs + delta.jobs > max_jobs:
+        logger.warning(f"{scope} job quota exceeded")
+        raise JobQuotaExceededError(scope, max_jobs, used_jobs, delta.jobs)
+    if max_scrape_rate is not None and delta.scrape_rate > 0 and used_rate + delta.scrape_rate > max_scrape_rate:
+        logger.warning(f"{scope} scrape rate quota exceeded")
+        raise ScrapeRateQuotaExceededError(scope, max_scrape_rate, used_rate, delta.scrape_rate)
+
+
+class QuotaService(BaseService[JobStats, StatsRepository]):
+    """Admission checks of a pool's quotas against the counters `StatsService` maintains."""
+
+    async def check(self, pool: MaasPool, deltas: Dict[str, JobLoad]):
+        """
+        Raise if adding `deltas` (collector -> load change) would exceed the pool's quotas.
+        Only growing dimensions are checked, so shrinking an over-quota job is always allowed;
+        the counters of the pool and the touched collectors are read in a single query.
+        """
+        quotas = pool.quotas
+        if quotas is None or not deltas:
+            return
+
+        counters = {document['collector_cluster']: document
+                    for document in await self.repo.get_collectors(pool.name, [*deltas, POOL_TOTAL_KEY])}
+
+        _check(f"Pool {pool.name}", counters.get(POOL_TOTAL_KEY), sum(deltas.values(), JobLoad()),
+               quotas.max_jobs, quotas.max_scrape_rate)
+        for collector_cluster, delta in deltas.items():
+            _check(f"Collector {collector_cluster} of pool {pool.name}", counters.get(collector_cluster), delta,
+                   quotas.collector_max_jobs, quotas.collector_max_scrape_rate)
+
+    async def reserve(self, pool: MaasPool, deltas: Dict[str, JobLoad]) -> Dict[str, JobLoad]:
+        """
+        Admit `deltas` like `check` and take them from the quotas in the same step: the counters
+        are incremented only if they still fit, so concurrent writes cannot both take the last of a
+        quota. Returns the deltas reserved, to be handed back with `StatsService.release` if the
+        write does not happen; nothing is reserved for a pool without quotas.
+        """
+        quotas = pool.quotas
+        if quotas is None or not deltas:
+            return {}
+
+        bounds = [(collector_cluster, delta, quotas.collector_max_jobs, quotas.collector_max_scrape_rate)
+                  for collector_cluster, delta in deltas.items()]
+        bounds.append((POOL_TOTAL_KEY, sum(deltas.values(), JobLoad()), quotas.max_jobs, quotas.max_scrape_rate))
+        while True:
+            await self.check(pool, deltas)
+            if await self.repo.reserve(pool.name, bounds):
+                return deltas
+            # Another write took the headroom between the read and the increment; read again
+            logger.info(f"Quota reservation of pool {pool.name} raced another write, retrying")
+
+    async def get_usage(self, pool: MaasPool) -> Dict[str, Any]:
+        quotas = pool.quotas
+        counters = {document['collector_cluster']: document for document in await self.repo.get_pool(pool.name)}
+        totals = counters.get(POOL_TOTAL_KEY, {})
+
+        return {
+            'maas_pool': pool.name,
+            'quotas': quotas.model_dump() if quotas else None,
+            'jobs': _budget(quotas and quotas.max_jobs, totals.get('job_count', 0)),
+            'scrape_rate': _budget(quotas and quotas.max_scrape_rate, totals.get('scrape_rate', 0.0)),
+            'collectors': {
+                collector_cluster: {
+                    'jobs': _budget(quotas and quotas.collector_max_jobs, counters.get(collector_cluster, {}).get('job_count', 0)),
+                    'scrape_rate': _budget(quotas and quotas.collector_max_scrape_rate,
+                                           counters.get(collector_cluster, {}).get('scrape_rate', 0.0)),
+                }
+                for collector_cluster in pool.collector_clusters
+            },
+        }
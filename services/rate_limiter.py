@@ -0,0 +1,137 @@
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+from config.constants.rate_limits import MAX_RATE_LIMIT_BUCKETS, RATE_LIMIT_SYNC_INTERVAL_SECONDS
+from utils.logger import create_logger
+from utils.token_bucket import RateLimitDecision, TokenBucket
+
+logger = create_logger("rate_limiter")
+
+
+class RateLimitBackend(ABC):
+    """
+    Shared store that lets replicas see each other's consumption. Each replica periodically
+    reports the tokens it consumed per bucket and gets back what the other replicas consumed
+    since its previous exchange.
+    """
+
+    @abstractmethod
+    async def exchange(self, replica_id: str, consumed: Dict[str, float]) -> Dict[str, float]:
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Single-process stand-in for a shared backend, e.g. for tests or several limiters in one process."""
+
+    def __init__(self):
+        self._inboxes: Dict[str, Dict[str, float]] = {}
+
+    async def exchange(self, replica_id: str, consumed: Dict[str, float]) -> Dict[str, float]:
+        self._inboxes.setdefault(replica_id, {})
+        for other, inbox in self._inboxes.items():
+            if other == replica_id:
+                continue
+            for key, tokens in consumed.items():
+                inbox[key] = inbox.get(key, 0.0) + tokens
+        received, self._inboxes[replica_id] = self._inboxes[replica_id], {}
+        return received
+
+
+class RateLimiter:
+    """
+    In-process token buckets keyed by scope (an API key, a pool). A check is a dict lookup
+    and a little arithmetic; with a backend, consumption is exchanged with the other
+    replicas in the background so a key's budget is shared, give or take one sync interval.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None,
+                 sync_interval: float = RATE_LIMIT_SYNC_INTERVAL_SECONDS,
+                 max_buckets: int = MAX_RATE_LIMIT_BUCKETS, clock: Callable[[], float] = time.monotonic):
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self.max_buckets = max_buckets
+        self.clock = clock
+        self.replica_id = uuid.uuid4().hex
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._consumed: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def check(self, key: str, rate: float, burst: int) -> RateLimitDecision:
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._evict(now)
+            bucket = self._buckets[key] = TokenBucket(rate, burst, now)
+        elif bucket.rate != rate or bucket.capacity != burst:
+            bucket.reconfigure(rate, burst)
+
+        decision = bucket.consume(now)
+        if decision.allowed and self.backend is not None:
+            self._consumed[key] = self._consumed.get(key, 0.0) + 1
+            self._ensure_syncing()
+        return decision
+
+    def limits(self, key: str) -> Optional[Tuple[float, int]]:
+        bucket = self._buckets.get(key)
+        return (bucket.rate, bucket.capacity) if bucket is not None else None
+
+    def configure(self, key: str, rate: float, burst: int):
+        bucket = self._buckets.get(key)
+        if bucket is not None and (bucket.rate != rate or bucket.capacity != burst):
+            bucket.reconfigure(rate, burst)
+
+    def refund(self, key: str):
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.refund()
+            if key in self._consumed:
+                self._consumed[key] -= 1
+
+    def _evict(self, now: float):
+        """Drop buckets that refilled completely; a fresh bucket would behave the same."""
+        for key in [key for key, bucket in self._buckets.items() if bucket.is_full(now)]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_buckets:
+            logger.warning(f"Rate limiter holds {len(self._buckets)} active buckets, dropping the oldest")
+            for key in list(self._buckets)[:len(self._buckets) - self.max_buckets + 1]:
+                del self._buckets[key]
+
+    async def sync(self):
+        consumed, self._consumed = self._consumed, {}
+        try:
+            received = await self.backend.exchange(self.replica_id, consumed)
+        except Exception as e:
+            # Limits stay enforced locally; the consumption is reported again next time
+            logger.error(f"Failed to sync rate limits: {str(e)}")
+            for key, tokens in consumed.items():
+                self._consumed[key] = self._consumed.get(key, 0.0) + tokens
+            return
+
+        for key, tokens in received.items():
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.tokens = max(bucket.tokens - tokens, -bucket.capacity)
+
+    def _ensure_syncing(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self.sync()
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from config.constants.rebalance import REBALANCE_MOVE_INTERVAL_SECONDS, REBALANCE_SCAN_BATCH_SIZE
+from enums.rebalance_state import RebalanceState
+from exceptions.job_name_exists_error import JobNameExistsError
+from exceptions.job_quota_exceeded_error import JobQuotaExceededError
+from exceptions.rebalance_in_progress_error import RebalanceInProgressError
+from exceptions.rebalance_not_found_error import RebalanceNotFoundError
+from exceptions.scrape_rate_quota_exceeded_error import ScrapeRateQuotaExceededError
+from exceptions.sharded_job_move_error import ShardedJobMoveError
+from models.db_schemas.jobs import JobModel
+from repositories.job_repository import LOAD_PROJECTION, JobRepository
+from services.base_service import BaseService
+from services.job_service import JobService
+from utils.logger import create_logger
+from utils.rebalance import JobCost, JobMove, plan_moves
+from utils.scrape_cost import job_footprints
+from utils.sharding import is_sharded
+
+logger = create_logger("rebalance_service")
+
+REBALANCE_PROJECTION = {**LOAD_PROJECTION, 'job_name': 1}
+
+
+class RebalanceRunner:
+    """Keeps at most one running rebalance per pool and the status of the last one."""
+
+    def __init__(self):
+        self._statuses: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def status(self, maas_pool: str) -> Optional[Dict[str, Any]]:
+        return self._statuses.get(maas_pool)
+
+    def start(self, maas_pool: str, plan: Dict[str, Any],
+              execute: Callable[[Dict[str, Any]], Awaitable[None]]) -> Dict[str, Any]:
+        task = self._tasks.get(maas_pool)
+        if task and not task.done():
+            raise RebalanceInProgressError(maas_pool=maas_pool)
+
+        status = {'maas_pool': maas_pool, 'state': RebalanceState.RUNNING, 'plan': plan,
+                  'completed': 0, 'skipped': 0, 'error': None}
+        self._statuses[maas_pool] = status
+        self._tasks[maas_pool] = asyncio.create_task(self._run(status, execute))
+        return status
+
+    @staticmethod
+    async def _run(status: Dict[str, Any], execute: Callable[[Dict[str, Any]], Awaitable[None]]):
+        try:
+            await execute(status)
+            status['state'] = RebalanceState.COMPLETED
+        except asyncio.CancelledError:
+            status['state'] = RebalanceState.CANCELLED
+            raise
+        except Exception as e:
+            logger.error(f"Rebalance of pool {status['maas_pool']} failed: {str(e)}")
+            status['state'] = RebalanceState.FAILED
+            status['error'] = str(e)
+
+    async def stop(self):
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # A task cancelled before its first step never reaches `_run`'s handler
+        for status in self._statuses.values():
+            if status['state'] == RebalanceState.RUNNING:
+                status['state'] = RebalanceState.CANCELLED
+
+
+class RebalanceService(BaseService[JobModel, JobRepository]):
+    def __init__(self, repo: JobRepository, job_service: JobService, runner: Optional[RebalanceRunner] = None):
+        super().__init__(repo)
+        self.job_service = job_service
+        self.runner = runner or rebalancer
+
+    async def plan(self, maas_pool: str, tolerance: float, max_moves: int,
+                   batch_size: int = REBALANCE_SCAN_BATCH_SIZE) -> Dict[str, Any]:
+        pool = await self.job_service.pool_service.get(maas_pool)
+        collector_clusters = pool.collector_clusters
+
+        jobs: List[JobCost] = []
+        async for batch in self.repo.iter_pool_batches(maas_pool, REBALANCE_PROJECTION, batch_size):
+            jobs.extend(JobCost(job['job_name'], footprint.collector_cluster, footprint.load.scrape_rate, not is_sharded(job))
+                        for job in batch for footprint in job_footprints(job))
+
+        loads_before = {collector_cluster: 0.0 for collector_cluster in collector_clusters}
+        for job in jobs:
+            if job.collector_cluster in loads_before:
+                loads_before[job.collector_cluster] += job.cost
+
+        moves, loads_after = plan_moves(jobs, collector_clusters, tolerance, max_moves)
+        return {
+            'maas_pool': maas_pool,
+            'tolerance': tolerance,
+            'mean_load': sum(loads_before.values()) / len(loads_before) if loads_before else 0.0,
+            'loads_before': loads_before,
+            'loads_after': loads_after,
+            'moves': [move._asdict() for move in moves],
+        }
+
+    async def start(self, maas_pool: str, tolerance: float, max_moves: int,
+                    interval: float = REBALANCE_MOVE_INTERVAL_SECONDS) -> Dict[str, Any]:
+        plan = await self.plan(maas_pool, tolerance, max_moves)
+        logger.info(f"Starting rebalance of pool {maas_pool} with {len(plan['moves'])} moves")
+        return self.runner.start(maas_pool, plan, lambda status: self.execute(status, interval))
+
+    def status(self, maas_pool: str) -> Dict[str, Any]:
+        status = self.runner.status(maas_pool)
+        if status is None:
+            raise RebalanceNotFoundError(maas_pool=maas_pool)
+        return status
+
+    async def execute(self, status: Dict[str, Any], interval: float):
+        """
+        Apply a plan one move at a time, `interval` seconds apart. Each job is re-read first,
+        so a move that a concurrent edit made stale is skipped instead of applied blindly.
+        """
+        maas_pool = status['maas_pool']
+        for index, move in enumerate(JobMove(**move) for move in status['plan']['moves']):
+            if index:
+                await asyncio.sleep(interval)
+
+            job = await self.repo.get(move.job_name, maas_pool, move.source)
+            if job is None:
+                logger.warning(f"Skipping move of job {move.job_name}: no longer on {move.source}")
+                status['skipped'] += 1
+                continue
+
+            try:
+                await self.job_service.move_job(job, move.target)
+            except JobNameExistsError:
+                logger.warning(f"Skipping move of job {move.job_name}: name already taken on {move.target}")
+                status['skipped'] += 1
+                continue
+            except (JobQuotaExceededError, ScrapeRateQuotaExceededError, ShardedJobMoveError) as e:
+                logger.warning(f"Skipping move of job {move.job_name}: {str(e)}")
+                status['skipped'] += 1
+                continue
+            status['completed'] += 1
+
+
+rebalancer = RebalanceRunner()
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from cryptography.fernet import InvalidToken
+from config.constants.jobs import SCRAPE_CONFIG_REVALIDATE_SECONDS
+from models.db_schemas.jobs import JobModel
+from repositories.job_repository import JobRepository
+from services.base_service import BaseService
+from utils.etag import content_etag
+from utils.logger import create_logger
+from utils.scrape_config import dump_scrape_configs, render_scrape_config
+from utils.security import security_manager
+from utils.sharding import shard_for
+
+logger = create_logger("scrape_config_service")
+
+PROBE_PROJECTION = {'_id': 0, 'job_name': 1, 'collector_cluster': 1, 'job_type': 1, 'seq': 1}
+
+
+class RenderedScrapeConfig(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class _CacheEntry:
+    __slots__ = ("seq", "rendered", "validated_at")
+
+    def __init__(self, seq: int, rendered: RenderedScrapeConfig, validated_at: float):
+        self.seq = seq
+        self.rendered = rendered
+        self.validated_at = validated_at
+
+
+class ScrapeConfigCache:
+    """
+    Rendered scrape_configs per (pool, collector), tagged with the pool sequence they were
+    rendered at. One lock per collector makes concurrent misses wait for a single render.
+    """
+
+    def __init__(self, revalidate_interval: float = SCRAPE_CONFIG_REVALIDATE_SECONDS):
+        self.revalidate_interval = revalidate_interval
+        self._entries: Dict[Tuple[str, str], _CacheEntry] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        # Served as is, served after checking the pool didn't change, or rendered again
+        self.lookups = {'hit': 0, 'revalidated': 0, 'miss': 0}
+
+    def fresh(self, key: Tuple[str, str]) -> Optional[_CacheEntry]:
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry.validated_at < self.revalidate_interval:
+            return entry
+        return None
+
+    def get(self, key: Tuple[str, str]) -> Optional[_CacheEntry]:
+        return self._entries.get(key)
+
+    def put(self, key: Tuple[str, str], entry: _CacheEntry):
+        self._entries[key] = entry
+
+    def lock(self, key: Tuple[str, str]) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ScrapeConfigService(BaseService[JobModel, JobRepository]):
+    def __init__(self, repo: JobRepository, cache: Optional[ScrapeConfigCache] = None):
+        super().__init__(repo)
+        self.cache = cache or scrape_config_cache
+
+    async def render(self, maas_pool: str, collector_cluster: str) -> RenderedScrapeConfig:
+        key = (maas_pool, collector_cluster)
+        entry = self.cache.fresh(key)
+        if entry:
+            self.cache.lookups['hit'] += 1
+            return entry.rendered
+
+        async with self.cache.lock(key):
+            entry = self.cache.fresh(key)
+            if entry:
+                self.cache.lookups['hit'] += 1
+                return entry.rendered
+
+            seq = await self.repo.sequences.current(maas_pool)
+            entry = self.cache.get(key)
+            if entry and await self._unchanged_since(maas_pool, collector_cluster, entry.seq, seq):
+                entry.seq = seq
+                entry.validated_at = time.monotonic()
+                self.cache.lookups['revalidated'] += 1
+                return entry.rendered
+
+            self.cache.lookups['miss'] += 1
+            # `seq` is read before the jobs, so a write racing the render only forces one more render
+            rendered = await self._render(maas_pool, collector_cluster)
+            self.cache.put(key, _CacheEntry(seq, rendered, time.monotonic()))
+            return rendered
+
+    async def _unchanged_since(self, maas_pool: str, collector_cluster: str, cached_seq: int, seq: int) -> bool:
+        if seq == cached_seq:
+            return True
+        changes, _ = await self.repo.get_changes(maas_pool, collector_cluster, cached_seq, 1,
+                                                 projection=PROBE_PROJECTION)
+        return not changes
+
+    async def _render(self, maas_pool: str, collector_cluster: str) -> RenderedScrapeConfig:
+        jobs = [shard for shard in (shard_for(job, collector_cluster)
+                                    for job in await self.repo.find_by_collector(maas_pool, collector_cluster)) if shard]
+        body = dump_scrape_configs(render_scrape_config(job, self._password(job)) for job in jobs)
+        logger.info(f"Rendered scrape config for collector {collector_cluster} with {len(jobs)} jobs")
+        return RenderedScrapeConfig(body, content_etag(body))
+
+    @staticmethod
+    def _password(job: dict) -> Optional[str]:
+        if not job.get('basic_auth'):
+            return None
+        try:
+            return security_manager.decrypt(job['basic_auth']['password'])
+        except InvalidToken:
+            logger.error(f"Could not decrypt basic_auth password of job {job['job_name']}, rendering it without basic_auth")
+            return None
+
+
+scrape_config_cache = ScrapeConfigCache()
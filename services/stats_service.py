@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional, Union
+from config.constants.jobs import POOL_TOTAL_KEY, STATS_REBUILD_BATCH_SIZE
+from models.db_schemas.job_stats import JobStats
+from models.response_schemas.response_detail import ResponseDetail
+from repositories.job_repository import JobRepository, LOAD_PROJECTION
+from repositories.stats_repository import StatsRepository
+from services.base_service import BaseService
+from utils.logger import create_logger
+from utils.scrape_cost import JobFootprint, JobLoad, footprint_deltas, job_footprints
+
+logger = create_logger("stats_service")
+
+Footprints = Union[None, JobFootprint, List[JobFootprint]]
+
+
+def _as_list(footprints: Footprints) -> List[JobFootprint]:
+    if footprints is None:
+        return []
+    if isinstance(footprints, JobFootprint):
+        return [footprints]
+    return footprints
+
+
+def _as_stats(document: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    document = document or {}
+    return {
+        'job_count': document.get('job_count', 0),
+        'target_count': document.get('target_count', 0),
+        'scrape_rate': document.get('scrape_rate', 0.0),
+    }
+
+
+class StatsSnapshot:
+    """
+    A pool's counters read once and kept in memory, answering `get_collectors` like `StatsRepository`.
+    Placement and quota checks over a batch of jobs run against it, with each admitted change
+    applied before the next is placed, so a batch sees its own load without re-reading the counters.
+    """
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.counters = {document['collector_cluster']: _as_stats(document) for document in documents}
+
+    async def get_collectors(self, maas_pool: str, collector_clusters: List[str]) -> List[Dict[str, Any]]:
+        return [{'collector_cluster': collector_cluster, **self.counters[collector_cluster]}
+                for collector_cluster in collector_clusters if collector_cluster in self.counters]
+
+    def apply_change(self, before: Footprints, after: Footprints):
+        """Move the in-memory counters the way `StatsService.apply_change` moves the stored ones."""
+        for (_, collector_cluster), delta in footprint_deltas(_as_list(before), _as_list(after)).items():
+            for key in (collector_cluster, POOL_TOTAL_KEY):
+                stats = self.counters.setdefault(key, _as_stats(None))
+                stats['job_count'] += delta.jobs
+                stats['target_count'] += delta.targets
+                stats['scrape_rate'] += delta.scrape_rate
+
+
+class StatsService(BaseService[JobStats, StatsRepository]):
+    def __init__(self, repo: StatsRepository, job_repo: JobRepository):
+        super().__init__(repo)
+        self.job_repo = job_repo
+
+    async def apply_change(self, before: Footprints, after: Footprints,
+                           reserved: Optional[Dict[str, JobLoad]] = None):
+        """
+        Move the counters from a job's previous footprint(s) to its new one(s); either side may be
+        None. `reserved` (collector -> load) is the part `QuotaService.reserve` already applied.
+        Collectors whose net delta is zero are not written.
+        """
+        try:
+            for (maas_pool, collector_cluster), delta in footprint_deltas(_as_list(before), _as_list(after)).items():
+                delta = delta - (reserved or {}).get(collector_cluster, JobLoad())
+                if delta != JobLoad():
+                    await self.repo.increment(maas_pool, collector_cluster, delta)
+        except Exception as e:
+            # Counters are advisory; a failed increment is repaired by `rebuild`
+            logger.error(f"Failed to update job stats: {str(e)}")
+
+    async def release(self, maas_pool: str, reserved: Dict[str, JobLoad]):
+        """Hand back a quota reservation whose write did not happen."""
+        try:
+            for collector_cluster, delta in reserved.items():
+                await self.repo.increment(maas_pool, collector_cluster, -delta)
+        except Exception as e:
+            logger.error(f"Failed to release reserved job stats: {str(e)}")
+
+    async def snapshot(self, maas_pool: str) -> StatsSnapshot:
+        return StatsSnapshot(await self.repo.get_pool(maas_pool))
+
+    async def get_pool_stats(self, maas_pool: str) -> Dict[str, Any]:
+        documents = await self.repo.get_pool(maas_pool)
+        totals = next((d for d in documents if d['collector_cluster'] == POOL_TOTAL_KEY), None)
+        collectors = {
+            d['collector_cluster']: _as_stats(d) for d in documents if d['collector_cluster'] != POOL_TOTAL_KEY
+        }
+
+        return {'maas_pool': maas_pool, 'totals': _as_stats(totals), 'collectors': collectors}
+
+    async def rebuild(self, maas_pool: str, batch_size: int = STATS_REBUILD_BATCH_SIZE) -> ResponseDetail:
+        loads: Dict[str, JobLoad] = {}
+        async for batch in self.job_repo.iter_pool_batches(maas_pool, LOAD_PROJECTION, batch_size):
+            for job in batch:
+                for footprint in job_footprints(job):
+                    collector_cluster = footprint.collector_cluster
+                    loads[collector_cluster] = loads.get(collector_cluster, JobLoad()) + footprint.load
+
+        await self.repo.replace_pool(maas_pool, loads)
+        logger.info(f"Stats for pool {maas_pool} rebuilt from {sum(load.jobs for load in loads.values())} jobs")
+        return ResponseDetail(detail=f"Stats for pool {maas_pool} rebuilt successfully")
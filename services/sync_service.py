@@ -0,0 +1,153 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from config.constants.sync import SYNC_BATCH_SIZE
+from enums.event_actions import EventActions
+from exceptions.collector_not_in_pool_error import CollectorNotInPoolError
+from exceptions.invalid_desired_state_error import InvalidDesiredStateError
+from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
+from models.db_schemas.jobs import JOB_MODELS, BaseJob, JobModel
+from models.validation_schemas.create_schemas.jobs import BaseJobCreate
+from repositories.job_repository import JobRepository
+from services.base_service import BaseService
+from services.job_service import JobService
+from utils.content_hash import job_content_hash
+from utils.logger import create_logger
+
+logger = create_logger("sync_service")
+
+# Called with the plan and the results of each applied batch
+BatchReporter = Callable[[Dict[str, Any], List[Dict[str, Any]]], Awaitable[None]]
+
+
+class SyncService(BaseService[JobModel, JobRepository]):
+    """
+    Desired-state sync of one collector: the full set of jobs it should have is compared with the
+    stored jobs by content hash, and only the difference is written.
+    """
+
+    def __init__(self, repo: JobRepository, job_service: JobService):
+        super().__init__(repo)
+        self.job_service = job_service
+
+    @staticmethod
+    def _check_if_authorized(authorized_pools: List[str], maas_pool: str, is_admin: bool):
+        if not is_admin and maas_pool not in authorized_pools:
+            logger.warning(f"API key is not authorized for {maas_pool}")
+            raise UnauthorizedApiKeyError(maas_pool=maas_pool)
+
+    @staticmethod
+    def _desired_hash(job: BaseJobCreate) -> str:
+        """The content hash the job would be stored with; its password is still plaintext here."""
+        stored = JOB_MODELS[job.job_type](**job.model_dump()).model_dump()
+        password = job.basic_auth.password if job.basic_auth else None
+        return job_content_hash({**stored, 'shards': getattr(job, 'shards', None)}, password)
+
+    @staticmethod
+    def desired_jobs(maas_pool: str, collector_cluster: str,
+                      jobs: List[BaseJobCreate]) -> Dict[str, BaseJobCreate]:
+        desired = {}
+        for job in jobs:
+            if job.maas_pool != maas_pool:
+                raise InvalidDesiredStateError(maas_pool, collector_cluster,
+                                               f"job {job.job_name} belongs to pool {job.maas_pool}")
+            if job.collector_cluster not in (None, collector_cluster):
+                raise InvalidDesiredStateError(maas_pool, collector_cluster,
+                                               f"job {job.job_name} is placed on {job.collector_cluster}")
+            if job.job_name in desired:
+                raise InvalidDesiredStateError(maas_pool, collector_cluster, f"duplicate job_name {job.job_name}")
+            job.collector_cluster = collector_cluster
+            job.placement = None
+            desired[job.job_name] = job
+        return desired
+
+    async def _diff(self, maas_pool: str, collector_cluster: str,
+                    desired: Dict[str, BaseJobCreate]) -> Tuple[Dict[str, Any], List[BaseJob]]:
+        """
+        The plan, and the unchanged jobs stored before content hashes existed. Stored jobs are read
+        as name and hash only; whole documents are fetched just for jobs that have no hash yet.
+        """
+        pool = await self.job_service.pool_service.get(maas_pool)
+        if collector_cluster not in pool.collector_clusters:
+            raise CollectorNotInPoolError(maas_pool=maas_pool, collector_cluster=collector_cluster)
+
+        stored = await self.repo.get_content_hashes(maas_pool, collector_cluster)
+        unhashed = [job_name for job_name, content_hash in stored.items()
+                    if content_hash is None and job_name in desired]
+        legacy = await self.repo.find_by_names(maas_pool, collector_cluster, unhashed) if unhashed else []
+        for job in legacy:
+            stored[job.job_name] = self.repo.content_hash(job.model_dump())
+
+        create, update, unchanged = [], [], set()
+        for job_name, job in desired.items():
+            if job_name not in stored:
+                create.append(job_name)
+            elif stored[job_name] is None or stored[job_name] != self._desired_hash(job):
+                update.append(job_name)
+            else:
+                unchanged.add(job_name)
+
+        plan = {
+            'maas_pool': maas_pool,
+            'collector_cluster': collector_cluster,
+            'create': sorted(create),
+            'update': sorted(update),
+            'delete': sorted(job_name for job_name in stored if job_name not in desired),
+            'unchanged': len(unchanged),
+        }
+        backfill = [job for job in legacy if job.job_name in unchanged]
+        return plan, backfill
+
+    async def plan(self, maas_pool: str, collector_cluster: str, jobs: List[BaseJobCreate],
+                   authorized_pools: List[str], is_admin: bool) -> Dict[str, Any]:
+        """What `apply` would create, update and delete to make the collector hold exactly `jobs`; nothing is written."""
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        plan, _ = await self._diff(maas_pool, collector_cluster,
+                                   self.desired_jobs(maas_pool, collector_cluster, jobs))
+        return plan
+
+    async def apply(self, maas_pool: str, collector_cluster: str, jobs: List[BaseJobCreate],
+                    authorized_pools: List[str], is_admin: bool,
+                    on_batch: Optional[BatchReporter] = None) -> Dict[str, Any]:
+        """
+        Plan against the current state, then delete, replace and create the jobs of the plan in
+        batches of `SYNC_BATCH_SIZE`, one event per changed job. Each job gets its own result; a
+        failed job doesn't stop the others, and applying the same set again only retries failures.
+        """
+        self._check_if_authorized(authorized_pools, maas_pool, is_admin)
+        desired = self.desired_jobs(maas_pool, collector_cluster, jobs)
+        plan, backfill = await self._diff(maas_pool, collector_cluster, desired)
+        results = []
+
+        async def report(batch_results: List[Dict[str, Any]]):
+            results.extend(batch_results)
+            if on_batch is not None:
+                await on_batch(plan, batch_results)
+
+        for batch in _batches(plan['delete']):
+            stored = await self.repo.find_by_names(maas_pool, collector_cluster, batch)
+            outcomes = await self.job_service.delete_batch(maas_pool, stored)
+            await report(_results(EventActions.DELETE, [job.job_name for job in stored], outcomes))
+
+        for batch in _batches(plan['update']):
+            stored = await self.repo.find_by_names(maas_pool, collector_cluster, batch)
+            outcomes = await self.job_service.replace_batch(
+                maas_pool, [(job, desired[job.job_name]) for job in stored])
+            await report(_results(EventActions.UPDATE, [job.job_name for job in stored], outcomes))
+
+        for batch in _batches(plan['create']):
+            outcomes = await self.job_service.import_batch(maas_pool, [desired[job_name] for job_name in batch])
+            await report(_results(EventActions.CREATE, batch, outcomes))
+
+        for job in backfill:
+            await self.repo.set_content_hash(job)
+
+        logger.info(f"Synced collector {collector_cluster} of pool {maas_pool}: {len(plan['create'])} to create, "
+                    f"{len(plan['update'])} to update, {len(plan['delete'])} to delete")
+        return {**plan, 'results': results}
+
+
+def _batches(job_names: List[str]) -> List[List[str]]:
+    return [job_names[start:start + SYNC_BATCH_SIZE] for start in range(0, len(job_names), SYNC_BATCH_SIZE)]
+
+
+def _results(action: EventActions, job_names: List[str], outcomes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{'job_name': job_name, 'action': action.value, **outcome} for job_name, outcome in zip(job_names, outcomes)]
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List
+from config.constants.jobs import TARGET_INDEX_REBUILD_BATCH_SIZE
+from models.db_schemas.job_targets import JobTarget
+from models.response_schemas.response_detail import ResponseDetail
+from repositories.job_repository import JobRepository
+from repositories.target_index_repository import TargetIndexRepository
+from services.base_service import BaseService
+from utils.logger import create_logger
+from utils.target_index import normalize_target, target_placements
+
+logger = create_logger("target_index_service")
+
+TARGET_INDEX_PROJECTION = {'_id': 1, 'job_name': 1, 'collector_cluster': 1, 'targets': 1, 'shard_collectors': 1}
+
+
+class TargetIndexService(BaseService[JobTarget, TargetIndexRepository]):
+    def __init__(self, repo: TargetIndexRepository, job_repo: JobRepository):
+        super().__init__(repo)
+        self.job_repo = job_repo
+
+    async def find_jobs(self, maas_pools: List[str], target: str, limit: int) -> Dict[str, Any]:
+        normalized = normalize_target(target)
+        return {'target': normalized, 'jobs': await self.repo.find_jobs(maas_pools, normalized, limit)}
+
+    async def get_duplicates(self, maas_pool: str, collector_cluster: str, limit: int) -> Dict[str, Any]:
+        return {
+            'maas_pool': maas_pool,
+            'collector_cluster': collector_cluster,
+            'duplicates': await self.repo.find_duplicates(maas_pool, collector_cluster, limit),
+        }
+
+    async def rebuild(self, maas_pool: str, batch_size: int = TARGET_INDEX_REBUILD_BATCH_SIZE) -> ResponseDetail:
+        """
+        Bring the pool's index in line with its jobs one batch at a time, writing only what differs,
+        then drop the entries of jobs no longer in the pool. Lookups keep answering throughout.
+        """
+        targets = 0
+        async for batch in self.job_repo.iter_pool_batches(maas_pool, TARGET_INDEX_PROJECTION, batch_size):
+            jobs = {job['_id']: (job['job_name'], target_placements(job)) for job in batch}
+            await self.repo.sync_many(maas_pool, jobs)
+            targets += sum(len(placements) for _, placements in jobs.values())
+
+        async for job_ids in self.repo.iter_job_ids(maas_pool, batch_size):
+            existing = await self.job_repo.existing_ids(maas_pool, job_ids)
+            await self.repo.remove_many(maas_pool, [job_id for job_id in job_ids if job_id not in existing])
+
+        logger.info(f"Target index for pool {maas_pool} rebuilt with {targets} targets")
+        return ResponseDetail(detail=f"Target index for pool {maas_pool} rebuilt successfully")
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List, Tuple
+from config.constants.jobs import VIEW_REBUILD_BATCH_SIZE
+from enums.change_types import ChangeType
+from models.db_schemas.collector_views import CollectorView
+from models.response_schemas.response_detail import ResponseDetail
+from repositories.job_repository import JobRepository
+from repositories.view_repository import VIEW_PROJECTION, CollectorViewRepository, view_chunk, view_entries
+from services.base_service import BaseService
+from utils.logger import create_logger
+
+logger = create_logger("view_service")
+
+
+class CollectorViewService(BaseService[CollectorView, CollectorViewRepository]):
+    def __init__(self, repo: CollectorViewRepository, job_repo: JobRepository):
+        super().__init__(repo)
+        self.job_repo = job_repo
+
+    async def get_jobs(self, maas_pool: str, collector_cluster: str) -> List[Dict[str, Any]]:
+        return await self.repo.get_jobs(maas_pool, collector_cluster)
+
+    async def rebuild(self, maas_pool: str, batch_size: int = VIEW_REBUILD_BATCH_SIZE) -> ResponseDetail:
+        """
+        Rebuild a pool's views from `jobs` while writes continue: the scan starts from a sequence
+        snapshot, and every change committed after it is replayed through the seq-guarded writes.
+        """
+        since = await self.job_repo.sequences.current(maas_pool)
+
+        chunks: Dict[Tuple[str, int], Dict[str, Dict[str, Any]]] = {}
+        job_count = 0
+        async for batch in self.job_repo.iter_pool_batches(maas_pool, VIEW_PROJECTION, batch_size):
+            for job in batch:
+                for collector_cluster, job_name, entry in view_entries(job):
+                    if 'job' in entry:
+                        chunks.setdefault((collector_cluster, view_chunk(job_name)), {})[job_name] = entry
+            job_count += len(batch)
+
+        await self.repo.replace_pool(maas_pool, chunks)
+        replayed = await self._catch_up(maas_pool, since, batch_size)
+
+        logger.info(f"Collector views for pool {maas_pool} rebuilt from {job_count} jobs, {replayed} changes replayed")
+        return ResponseDetail(detail=f"Collector views for pool {maas_pool} rebuilt successfully")
+
+    async def _catch_up(self, maas_pool: str, since: int, batch_size: int) -> int:
+        replayed = 0
+        has_more = True
+        while has_more:
+            changes, has_more = await self.job_repo.get_changes(maas_pool, None, since, batch_size,
+                                                                projection=VIEW_PROJECTION)
+            for change in changes:
+                if change['action'] == ChangeType.UPSERT:
+                    entries = view_entries(change['job'])
+                else:
+                    entries = view_entries(change, deleted=True)
+                for collector_cluster, job_name, entry in entries:
+                    await self.repo.put(maas_pool, collector_cluster, job_name, entry)
+            if changes:
+                since = changes[-1]['seq']
+            replayed += len(changes)
+
+        return replayed
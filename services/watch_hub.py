@@ -0,0 +1,236 @@
+import asyncio
+import json
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set
+from config.constants.watch import (
+    WATCH_BATCH_SIZE,
+    WATCH_CLIENT_BUFFER_SIZE,
+    WATCH_HEARTBEAT_SECONDS,
+    WATCH_HISTORY_SIZE,
+    WATCH_POLL_INTERVAL_SECONDS,
+)
+from repositories.job_repository import JobRepository
+from utils.logger import create_logger
+
+logger = create_logger("watch_hub")
+
+NOTIFICATION_PROJECTION = {'_id': 0, 'job_name': 1, 'collector_cluster': 1, 'job_type': 1, 'seq': 1,
+                           'shard_collectors': 1}
+HEARTBEAT = b": heartbeat\n\n"
+OVERFLOW = b"event: overflow\ndata: {}\n\n"
+
+
+class WatchEvent:
+    __slots__ = ("seq", "action", "job_name", "collector_cluster", "job_type", "shard_collectors")
+
+    def __init__(self, seq: int, action: str, job_name: str, collector_cluster: str, job_type: Optional[str],
+                 shard_collectors: Optional[List[str]] = None):
+        self.seq = seq
+        self.action = action
+        self.job_name = job_name
+        self.collector_cluster = collector_cluster
+        self.job_type = job_type
+        self.shard_collectors = shard_collectors
+
+    def to_sse(self) -> bytes:
+        data = json.dumps({
+            "seq": self.seq,
+            "action": self.action,
+            "job_name": self.job_name,
+            "collector_cluster": self.collector_cluster,
+            "job_type": self.job_type,
+            "shard_collectors": self.shard_collectors,
+        })
+        return f"id: {self.seq}\nevent: {self.action}\ndata: {data}\n\n".encode()
+
+
+class WatchSubscription:
+    __slots__ = ("maas_pool", "collector_cluster", "queue", "backlog", "dropped")
+
+    def __init__(self, maas_pool: str, collector_cluster: Optional[str], buffer_size: int):
+        self.maas_pool = maas_pool
+        self.collector_cluster = collector_cluster
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.backlog: List[WatchEvent] = []
+        self.dropped = False
+
+    def matches(self, event: WatchEvent) -> bool:
+        # A sharded job concerns every collector holding one of its shards, as in the change feed
+        return self.collector_cluster is None or self.collector_cluster == event.collector_cluster \
+            or self.collector_cluster in (event.shard_collectors or ())
+
+
+class _PoolFeed:
+    __slots__ = ("maas_pool", "cursor", "history", "history_floor", "subscribers", "task")
+
+    def __init__(self, maas_pool: str, cursor: int, history_size: int):
+        self.maas_pool = maas_pool
+        self.cursor = cursor
+        self.history: Deque[WatchEvent] = deque(maxlen=history_size)
+        # Every pool change with seq > history_floor is still in `history`
+        self.history_floor = cursor
+        self.subscribers: Set[WatchSubscription] = set()
+        self.task: Optional[asyncio.Task] = None
+
+
+class JobWatchHub:
+    """
+    In-process fan-out of the job change feed. Each watched pool has exactly one poller
+    reading the change feed; every client is only a bounded queue, so idle watchers cost
+    no database work and a client that falls behind is dropped instead of buffering forever.
+    """
+
+    def __init__(self, repo: Optional[JobRepository] = None,
+                 poll_interval: float = WATCH_POLL_INTERVAL_SECONDS,
+                 heartbeat_interval: float = WATCH_HEARTBEAT_SECONDS,
+                 buffer_size: int = WATCH_CLIENT_BUFFER_SIZE,
+                 history_size: int = WATCH_HISTORY_SIZE,
+                 batch_size: int = WATCH_BATCH_SIZE):
+        self._repo = repo
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.buffer_size = buffer_size
+        self.history_size = history_size
+        self.batch_size = batch_size
+        self._feeds: Dict[str, _PoolFeed] = {}
+
+    @property
+    def repo(self) -> JobRepository:
+        if self._repo is None:
+            self._repo = JobRepository()
+        return self._repo
+
+    def subscriber_count(self, maas_pool: Optional[str] = None) -> int:
+        if maas_pool is not None:
+            feed = self._feeds.get(maas_pool)
+            return len(feed.subscribers) if feed else 0
+        return sum(len(feed.subscribers) for feed in self._feeds.values())
+
+    async def subscribe(self, maas_pool: str, collector_cluster: Optional[str] = None,
+                        last_event_id: Optional[int] = None) -> WatchSubscription:
+        feed = self._feeds.get(maas_pool)
+        if feed is None:
+            cursor = await self.repo.sequences.current(maas_pool)
+            feed = self._feeds.get(maas_pool)
+            if feed is None:
+                feed = _PoolFeed(maas_pool, cursor, self.history_size)
+                self._feeds[maas_pool] = feed
+                feed.task = asyncio.create_task(self._poll(feed))
+
+        subscription = WatchSubscription(maas_pool, collector_cluster, self.buffer_size)
+        snapshot = feed.cursor
+        feed.subscribers.add(subscription)
+
+        if last_event_id is not None and last_event_id < snapshot:
+            subscription.backlog = await self._backfill(feed, subscription, last_event_id, snapshot)
+
+        return subscription
+
+    def unsubscribe(self, subscription: WatchSubscription):
+        feed = self._feeds.get(subscription.maas_pool)
+        if feed:
+            feed.subscribers.discard(subscription)
+
+    async def stream(self, subscription: WatchSubscription) -> AsyncIterator[bytes]:
+        last_seq = -1
+        try:
+            for event in subscription.backlog:
+                last_seq = event.seq
+                yield event.to_sse()
+            subscription.backlog = []
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+
+                if event is None:
+                    yield OVERFLOW
+                    return
+                if event.seq <= last_seq:
+                    continue
+                last_seq = event.seq
+                yield event.to_sse()
+        finally:
+            self.unsubscribe(subscription)
+
+    async def stop(self):
+        feeds = list(self._feeds.values())
+        self._feeds.clear()
+        for feed in feeds:
+            feed.subscribers.clear()
+            if feed.task:
+                feed.task.cancel()
+
+    async def _backfill(self, feed: _PoolFeed, subscription: WatchSubscription,
+                        since: int, until: int) -> List[WatchEvent]:
+        if since >= feed.history_floor:
+            return [event for event in feed.history
+                    if since < event.seq <= until and subscription.matches(event)]
+
+        backlog: List[WatchEvent] = []
+        has_more = True
+        while has_more and since < until:
+            changes, has_more = await self.repo.get_changes(
+                feed.maas_pool, subscription.collector_cluster, since, self.batch_size,
+                projection=NOTIFICATION_PROJECTION
+            )
+            if not changes:
+                break
+            backlog.extend(self._to_event(change) for change in changes if change['seq'] <= until)
+            since = changes[-1]['seq']
+
+        return backlog
+
+    async def _poll(self, feed: _PoolFeed):
+        try:
+            while feed.subscribers:
+                try:
+                    changes, has_more = await self.repo.get_changes(
+                        feed.maas_pool, None, feed.cursor, self.batch_size, projection=NOTIFICATION_PROJECTION
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to poll changes for pool {feed.maas_pool}: {str(e)}")
+                    changes, has_more = [], False
+
+                for change in changes:
+                    self._publish(feed, self._to_event(change))
+
+                if not has_more:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            if self._feeds.get(feed.maas_pool) is feed:
+                del self._feeds[feed.maas_pool]
+
+    def _publish(self, feed: _PoolFeed, event: WatchEvent):
+        if len(feed.history) == feed.history.maxlen:
+            feed.history_floor = feed.history[0].seq
+        feed.history.append(event)
+        feed.cursor = event.seq
+
+        for subscription in list(feed.subscribers):
+            if not subscription.matches(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(feed, subscription)
+
+    @staticmethod
+    def _drop(feed: _PoolFeed, subscription: WatchSubscription):
+        logger.warning(f"Dropping slow watcher on pool {feed.maas_pool}")
+        feed.subscribers.discard(subscription)
+        subscription.dropped = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    @staticmethod
+    def _to_event(change: dict) -> WatchEvent:
+        return WatchEvent(change['seq'], change['action'].value, change['job_name'],
+                          change['collector_cluster'], change.get('job_type'), change.get('shard_collectors'))
+
+
+watch_hub = JobWatchHub()
@@ -0,0 +1,164 @@
+import asyncio
+import functools
+import heapq
+import inspect
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from config import config
+from config.constants.scheduling import DEFAULT_POOL_WRITE_WEIGHT, DEFAULT_WRITE_CONCURRENCY, DEFAULT_WRITE_COST
+from utils.logger import create_logger
+
+logger = create_logger("write_scheduler")
+
+# Set while a task holds a slot, so a scheduled call nested in another one doesn't queue behind itself
+_holding_slot: ContextVar[bool] = ContextVar("holding_write_slot", default=False)
+
+
+class _PoolQueue:
+    __slots__ = ("weight", "finish", "queued", "running", "admitted", "wait_total", "wait_max")
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.finish = 0.0
+        self.queued = 0
+        self.running = 0
+        self.admitted = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class WriteScheduler:
+    """
+    Admits write work under a global concurrency limit, dequeueing fairly across pools.
+
+    Start-time fair queueing: each request gets a virtual start tag of
+    max(virtual time, its pool's last finish tag) and advances the pool's finish tag by
+    cost / weight. Waiters are dispatched in start-tag order, so a pool with a thousand queued
+    writes only gets its weighted share of the slots while a quiet pool's next write goes
+    to the head of the line.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_WRITE_CONCURRENCY,
+                 weights: Optional[Dict[str, float]] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_concurrency = max_concurrency
+        self.weights = dict(weights or {})
+        self.clock = clock
+        self.running = 0
+        self._vtime = 0.0
+        self._heap: List[list] = []
+        self._order = itertools.count()
+        self._queues: Dict[str, _PoolQueue] = {}
+
+    def _queue(self, maas_pool: str) -> _PoolQueue:
+        queue = self._queues.get(maas_pool)
+        if queue is None:
+            queue = self._queues[maas_pool] = _PoolQueue(self.weights.get(maas_pool, DEFAULT_POOL_WRITE_WEIGHT))
+        return queue
+
+    def set_weight(self, maas_pool: str, weight: float):
+        self.weights[maas_pool] = weight
+        self._queue(maas_pool).weight = weight
+
+    def _grant(self, queue: _PoolQueue, waited: float):
+        self.running += 1
+        queue.running += 1
+        queue.admitted += 1
+        queue.wait_total += waited
+        queue.wait_max = max(queue.wait_max, waited)
+
+    def _dispatch(self):
+        while self.running < self.max_concurrency and self._heap:
+            start, _, maas_pool, future, enqueued = heapq.heappop(self._heap)
+            if future.done():
+                # The waiter was cancelled while queued
+                continue
+            queue = self._queues[maas_pool]
+            queue.queued -= 1
+            self._vtime = start
+            self._grant(queue, self.clock() - enqueued)
+            future.set_result(None)
+
+    async def acquire(self, maas_pool: str, cost: float = DEFAULT_WRITE_COST):
+        queue = self._queue(maas_pool)
+        start = max(self._vtime, queue.finish)
+        queue.finish = start + cost / queue.weight
+
+        if self.running < self.max_concurrency and not self._heap:
+            self._vtime = start
+            self._grant(queue, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, [start, next(self._order), maas_pool, future, self.clock()])
+        queue.queued += 1
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation landed; hand the slot on
+                self.release(maas_pool)
+            else:
+                queue.queued -= 1
+            raise
+
+    def release(self, maas_pool: str):
+        self.running -= 1
+        self._queues[maas_pool].running -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, maas_pool: str, cost: float = DEFAULT_WRITE_COST) -> AsyncIterator[None]:
+        if _holding_slot.get():
+            yield
+            return
+
+        await self.acquire(maas_pool, cost)
+        token = _holding_slot.set(True)
+        try:
+            yield
+        finally:
+            _holding_slot.reset(token)
+            self.release(maas_pool)
+
+    def queue_depth(self, maas_pool: str) -> int:
+        queue = self._queues.get(maas_pool)
+        return queue.queued if queue is not None else 0
+
+    def metrics(self) -> Dict[str, Any]:
+        pools = {
+            maas_pool: {
+                'weight': queue.weight,
+                'queued': queue.queued,
+                'running': queue.running,
+                'admitted': queue.admitted,
+                'average_wait_ms': queue.wait_total / queue.admitted * 1000 if queue.admitted else 0.0,
+                'max_wait_ms': queue.wait_max * 1000,
+            }
+            for maas_pool, queue in self._queues.items()
+        }
+        return {'max_concurrency': self.max_concurrency, 'running': self.running,
+                'queued': sum(queue.queued for queue in self._queues.values()), 'pools': pools}
+
+
+def scheduled_write(method):
+    """
+    Run a `JobService` mutation in a write slot of its pool, taken from the `maas_pool`
+    argument or from the `job` being written.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        maas_pool = arguments.get("maas_pool") or arguments["job"].maas_pool
+        async with self.scheduler.slot(maas_pool):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+write_scheduler = WriteScheduler(config["write_scheduler.max_concurrency"], config["write_scheduler.pool_weights"])
@@ -13,6 +13,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 async def init_beanie_db():
     # Import models here to ensure env vars are set before config is loaded
     from models.db_schemas.api_keys import ApiKey
+    from models.db_schemas.collector_loads import CollectorLoadSample
+    from models.db_schemas.collector_views import CollectorView
+    from models.db_schemas.idempotency_records import IdempotencyRecord
     from models.db_schemas.jobs import (
         BaseJob,
         BlackboxJob,
@@ -20,6 +23,11 @@ async def init_beanie_db():
         HttpJob,
         KubernetesJob,
     )
+    from models.db_schemas.job_stats import JobStats
+    from models.db_schemas.job_targets import JobTarget
+    from models.db_schemas.job_tombstones import JobTombstone
+    from models.db_schemas.operations import Operation, OperationItem
+    from models.db_schemas.pool_sequences import PoolSequence
 
     try:
         client = AsyncMongoMockClient()
@@ -32,6 +40,15 @@ async def init_beanie_db():
                 KubernetesJob,
                 HttpJob,
                 ApiKey,
+                JobTombstone,
+                PoolSequence,
+                JobStats,
+                CollectorView,
+                CollectorLoadSample,
+                JobTarget,
+                IdempotencyRecord,
+                Operation,
+                OperationItem,
             ],
         )
     except Exception as e:
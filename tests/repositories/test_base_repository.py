@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+import pytest
+from pymongo.errors import AutoReconnect, DuplicateKeyError
+
+from exceptions.circuit_open_error import CircuitOpenError
+from models.db_schemas.job_stats import JobStats
+from repositories.base_repository import BaseRepository
+from utils.circuit_breaker import CircuitBreaker
+from utils.fault_injection import FaultInjector
+
+
+class FlakyRepository(BaseRepository[JobStats]):
+    def __init__(self, injector: FaultInjector):
+        super().__init__(JobStats)
+        self.injector = injector
+
+    async def get_value(self):
+        await self.injector.maybe_fail()
+        return "value"
+
+    async def insert_value(self):
+        await self.injector.maybe_fail()
+        return await self.get_value()
+
+
+@pytest.fixture
+def breaker():
+    breaker = CircuitBreaker("mongo", failure_types=(AutoReconnect,), failure_threshold=2)
+    with patch("repositories.base_repository.mongo_breaker", breaker), patch("utils.retry.asyncio.sleep"):
+        yield breaker
+
+
+@pytest.mark.asyncio
+async def test_reads_are_retried_writes_are_not(breaker):
+    repo = FlakyRepository(FaultInjector())
+    repo.injector.fail_next(1, AutoReconnect)
+
+    assert await repo.get_value() == "value"
+
+    repo.injector.fail_next(1, AutoReconnect)
+    with pytest.raises(AutoReconnect):
+        await repo.insert_value()
+
+
+@pytest.mark.asyncio
+async def test_nested_calls_count_once_and_open_circuit_fails_fast(breaker):
+    repo = FlakyRepository(FaultInjector())
+    await repo.insert_value()
+    repo.injector.fail_next(1, lambda: DuplicateKeyError("dup"))
+    with pytest.raises(DuplicateKeyError):
+        await repo.insert_value()
+
+    repo.injector.fail_next(3, AutoReconnect)
+    for _ in range(2):
+        with pytest.raises(AutoReconnect):
+            await repo.insert_value()
+    calls = repo.injector.calls
+
+    with pytest.raises(CircuitOpenError):
+        await repo.get_value()
+    assert repo.injector.calls == calls
+    assert breaker.transitions == {'closed->open': 1}
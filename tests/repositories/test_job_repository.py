@@ -0,0 +1,209 @@
+from unittest.mock import patch
+
+import pytest
+from pymongo.errors import ConnectionFailure
+
+from enums.change_types import ChangeType
+from exceptions.job_modified_error import JobModifiedError
+from models.db_schemas.jobs import BaseJob, GeneralJob, HttpJob
+from repositories.job_repository import JobRepository
+
+
+def _job(job_name: str, collector_cluster: str = "ocp4-col1") -> GeneralJob:
+    return GeneralJob(
+        job_name=job_name,
+        maas_pool="maas-pool1",
+        collector_cluster=collector_cluster,
+        targets=["t1"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_raw_returns_plain_dict(init_beanie_db):
+    repo = JobRepository()
+    await repo.create(_job("raw-job"))
+
+    job = await repo.get_raw("raw-job", "maas-pool1", "ocp4-col1")
+
+    assert isinstance(job, dict)
+    assert job["targets"] == ["t1"]
+    assert "_class_id" not in job
+
+
+@pytest.mark.asyncio
+async def test_get_version_tracks_revision(init_beanie_db):
+    repo = JobRepository()
+    job = await repo.create(_job("versioned-job"))
+    before = await repo.get_version("versioned-job", "maas-pool1", "ocp4-col1")
+
+    await repo.save(job)
+    after = await repo.get_version("versioned-job", "maas-pool1", "ocp4-col1")
+
+    assert set(after) == {"_id", "revision"}
+    assert after["revision"] == before["revision"] + 1
+
+
+@pytest.mark.asyncio
+async def test_get_changes_includes_upserts_and_tombstones(init_beanie_db):
+    repo = JobRepository()
+    first = await repo.create(_job("first"))
+    await repo.create(_job("second"))
+    await repo.create(_job("elsewhere", collector_cluster="ocp4-col2"))
+    await repo.delete(first)
+
+    changes, has_more = await repo.get_changes("maas-pool1", "ocp4-col1", since=0, limit=10)
+
+    assert [(c["job_name"], c["action"]) for c in changes] == [
+        ("second", ChangeType.UPSERT),
+        ("first", ChangeType.DELETE),
+    ]
+    assert changes[0]["seq"] < changes[1]["seq"]
+    assert not has_more
+
+
+@pytest.mark.asyncio
+async def test_get_changes_pages_with_cursor(init_beanie_db):
+    repo = JobRepository()
+    for i in range(3):
+        await repo.create(_job(f"job-{i}"))
+
+    page, has_more = await repo.get_changes("maas-pool1", "ocp4-col1", since=0, limit=2)
+    rest, rest_has_more = await repo.get_changes("maas-pool1", "ocp4-col1", since=page[-1]["seq"], limit=2)
+
+    assert [c["job_name"] for c in page] == ["job-0", "job-1"]
+    assert has_more
+    assert [c["job_name"] for c in rest] == ["job-2"]
+    assert not rest_has_more
+
+
+@pytest.mark.asyncio
+async def test_get_changes_idle_pool(init_beanie_db):
+    repo = JobRepository()
+    await repo.create(_job("only"))
+    current = await repo.sequences.current("maas-pool1")
+
+    assert await repo.get_changes("maas-pool1", "ocp4-col1", since=current, limit=10) == ([], False)
+
+
+@pytest.mark.asyncio
+async def test_get_changes_waits_for_writes_still_in_flight(init_beanie_db):
+    repo = JobRepository()
+    await repo.create(_job("before"))
+
+    # A write holding a lower seq commits after a later write; a reader must not step past it
+    async with repo.sequences.reserve("maas-pool1") as slow_seq:
+        later = await repo.create(_job("later"))
+        changes, _ = await repo.get_changes("maas-pool1", "ocp4-col1", since=0, limit=10)
+        assert [c["job_name"] for c in changes] == ["before"]
+        assert later.seq > slow_seq
+
+    changes, _ = await repo.get_changes("maas-pool1", "ocp4-col1", since=changes[-1]["seq"], limit=10)
+    assert [c["job_name"] for c in changes] == ["later"]
+
+
+@pytest.mark.asyncio
+async def test_expired_sequence_lease_stops_holding_the_feed(init_beanie_db):
+    repo = JobRepository()
+    await repo.create(_job("only"))
+    await repo.sequences.next("maas-pool1", 1, "crashed-writer")
+    await repo.sequences.collection.update_one({"_id": "maas-pool1"}, {"$set": {"leases.crashed-writer.expires": 0}})
+
+    changes, _ = await repo.get_changes("maas-pool1", "ocp4-col1", since=0, limit=10)
+
+    assert [c["job_name"] for c in changes] == ["only"]
+    assert (await repo.sequences.collection.find_one({"_id": "maas-pool1"}))["leases"] == {}
+
+
+@pytest.mark.asyncio
+async def test_update_moving_job_leaves_tombstone(init_beanie_db):
+    repo = JobRepository()
+    job = await repo.create(_job("mover"))
+
+    await repo.update(job, {"collector_cluster": "ocp4-col2"})
+
+    old_changes, _ = await repo.get_changes("maas-pool1", "ocp4-col1", since=0, limit=10)
+    new_changes, _ = await repo.get_changes("maas-pool1", "ocp4-col2", since=0, limit=10)
+    assert [c["action"] for c in old_changes] == [ChangeType.DELETE]
+    assert [c["action"] for c in new_changes] == [ChangeType.UPSERT]
+
+
+@pytest.mark.asyncio
+async def test_label_terms_follow_writes(init_beanie_db):
+    repo = JobRepository()
+    job = _job("labelled")
+    job.labels = {"team": "payments"}
+    await repo.create(job)
+    assert job.label_terms == ["team", "team=payments"]
+
+    await repo.update(job, {"labels": {"team": "search"}})
+    stored = await repo.collection.find_one({"job_name": "labelled"})
+    assert stored["label_terms"] == ["team", "team=search"]
+
+
+@pytest.mark.asyncio
+async def test_find_by_labels(init_beanie_db):
+    repo = JobRepository()
+    for name, labels in [("a", {"team": "payments"}), ("b", {"team": "search"}), ("c", None)]:
+        job = _job(name)
+        job.labels = labels
+        await repo.create(job)
+
+    equal = await repo.find_by_labels("maas-pool1", {"label_terms": "team=payments"}, None, 10)
+    not_equal = await repo.find_by_labels("maas-pool1", {"label_terms": {"$ne": "team=payments"}}, None, 10)
+
+    assert [job["job_name"] for job in equal] == ["a"]
+    assert [job["job_name"] for job in not_equal] == ["b", "c"]
+    assert "label_terms" not in equal[0]
+
+
+@pytest.mark.asyncio
+async def test_name_search_fields_and_queries(init_beanie_db):
+    repo = JobRepository()
+    for name in ["Node-Exporter", "node-agent", "my-node-exporter"]:
+        await repo.create(_job(name))
+    await repo.create(GeneralJob(job_name="node-other", maas_pool="maas-pool2", collector_cluster="ocp4-col1", targets=["t1"]))
+
+    prefix = await repo.search_by_name_prefix(["maas-pool1"], "node", 10)
+    substring = await repo.search_by_name_ngrams(["maas-pool1"], ["exp", "xpo"], 10)
+
+    assert [job["job_name"] for job in prefix] == ["node-agent", "Node-Exporter"]
+    assert {job["job_name"] for job in substring} == {"Node-Exporter", "my-node-exporter"}
+    assert sorted(await repo.get_pools()) == ["maas-pool1", "maas-pool2"]
+
+
+@pytest.mark.asyncio
+async def test_replace_with_another_type_is_a_single_write(init_beanie_db):
+    repo = JobRepository()
+    job = await repo.create(_job("typed-job"))
+    replacement = HttpJob(job_name="typed-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1",
+                          endpoints=["http://sd/targets"])
+
+    with patch.object(repo.collection, "replace_one", side_effect=ConnectionFailure("primary stepped down")):
+        with pytest.raises(ConnectionFailure):
+            await repo.replace(job, replacement)
+    assert isinstance(await repo.get(job_name="typed-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1"),
+                      GeneralJob)
+
+    await repo.replace(job, replacement)
+    stored = await BaseJob.find_all(with_children=True).to_list()
+    assert [(type(stored_job), stored_job.id, stored_job.revision) for stored_job in stored] == [(HttpJob, job.id, 1)]
+
+
+@pytest.mark.asyncio
+async def test_writes_over_a_stale_revision_are_rejected(init_beanie_db):
+    repo = JobRepository()
+    await repo.create(_job("contended"))
+    first = await repo.get(job_name="contended", maas_pool="maas-pool1", collector_cluster="ocp4-col1")
+    second = await repo.get(job_name="contended", maas_pool="maas-pool1", collector_cluster="ocp4-col1")
+
+    await repo.update(first, {"targets": ["t2"]})
+    with pytest.raises(JobModifiedError):
+        await repo.update(second, {"targets": ["t3"]})
+    second.targets.append("t3")
+    with pytest.raises(JobModifiedError):
+        await repo.save(second)
+
+    stored = await repo.collection.find_one({"job_name": "contended"})
+    assert (stored["targets"], stored["revision"], first.revision) == (["t2"], 1, 1)
+    await repo.save(first)
+    assert (await repo.collection.find_one({"job_name": "contended"}))["revision"] == 2
@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from enums.idempotency_status import IdempotencyStatus
+from exceptions.idempotency_key_in_progress_error import IdempotencyKeyInProgressError
+from exceptions.idempotency_key_reused_error import IdempotencyKeyReusedError
+from models.response_schemas.response_detail import ResponseDetail
+from repositories.idempotency_repository import IdempotencyRepository
+from services.idempotency_service import IdempotencyCache, IdempotencyService
+
+
+class Operation:
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.calls = 0
+        self.fail = fail
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("produce failed")
+        return ResponseDetail(detail=f"done {self.calls}")
+
+
+@pytest.fixture
+def service(init_beanie_db):
+    return IdempotencyService(IdempotencyRepository(), IdempotencyCache())
+
+
+@pytest.mark.asyncio
+async def test_repeat_is_replayed_from_the_first_attempt(service):
+    operation = Operation()
+
+    first = await service.run("key-1", "scope", "fp", operation)
+    second = await service.run("key-1", "scope", "fp", operation)
+    other_scope = await service.run("key-1", "other", "fp", operation)
+
+    assert first == (ResponseDetail(detail="done 1"), False)
+    assert second == ({'detail': "done 1"}, True)
+    assert other_scope[1] is False
+    assert operation.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_survives_the_front_cache(service):
+    operation = Operation()
+    await service.run("key-1", "scope", "fp", operation)
+
+    fresh = IdempotencyService(IdempotencyRepository(), IdempotencyCache())
+
+    assert await fresh.run("key-1", "scope", "fp", operation) == ({'detail': "done 1"}, True)
+    with pytest.raises(IdempotencyKeyReusedError):
+        await fresh.run("key-1", "scope", "other-fp", operation)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_on_the_first(service):
+    operation = Operation(delay=0.01)
+
+    results = await asyncio.gather(*(service.run("key-1", "scope", "fp", operation) for _ in range(5)))
+
+    assert operation.calls == 1
+    assert [replayed for _, replayed in results].count(False) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_is_not_stored(service):
+    with pytest.raises(RuntimeError):
+        await service.run("key-1", "scope", "fp", Operation(fail=True))
+
+    result, replayed = await service.run("key-1", "scope", "fp", Operation())
+
+    assert (result.detail, replayed) == ("done 1", False)
+
+
+@pytest.mark.asyncio
+async def test_claim_held_by_another_replica(service):
+    repo = IdempotencyRepository()
+    await repo.claim("scope:key-1", "fp")
+    service.wait_timeout = 0.0
+
+    with pytest.raises(IdempotencyKeyInProgressError):
+        await service.run("key-1", "scope", "fp", Operation())
+
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    await repo.collection.update_one({'key': "scope:key-1"}, {'$set': {'created_at': stale}})
+
+    assert (await service.run("key-1", "scope", "fp", Operation()))[1] is False
+    assert (await repo.get("scope:key-1"))['status'] == IdempotencyStatus.COMPLETED.value
@@ -3,13 +3,18 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from fastapi import HTTPException
 
+from enums.event_actions import EventActions
 from enums.job_type import JobType
 from exceptions.collector_not_in_pool_error import CollectorNotInPoolError
+from exceptions.invalid_shard_count_error import InvalidShardCountError
 from exceptions.job_name_exists_error import JobNameExistsError
 from exceptions.job_not_exist_error import JobNotExistsError
 from exceptions.produce_failure_error import ProduceFailureError
+from exceptions.scrape_rate_quota_exceeded_error import ScrapeRateQuotaExceededError
+from exceptions.sharded_job_move_error import ShardedJobMoveError
 from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
 from models.db_schemas.jobs import GeneralJob
+from models.general.pools.quotas import PoolQuotas
 from models.validation_schemas.create_schemas.jobs import GeneralJobCreate
 from models.validation_schemas.update_schemas.jobs import GeneralJobUpdate
 from services.job_service import JobService
@@ -22,12 +27,19 @@ def mock_repo():
 
 @pytest.fixture
 def mock_pool_repo():
+    pool_repo = AsyncMock()
+    pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"], quotas=None)
+    return pool_repo
+
+
+@pytest.fixture
+def mock_stats_repo():
     return AsyncMock()
 
 
 @pytest.fixture
-def job_service(mock_repo, mock_pool_repo):
-    service = JobService(mock_repo, mock_pool_repo)
+def job_service(mock_repo, mock_pool_repo, mock_stats_repo):
+    service = JobService(mock_repo, mock_pool_repo, mock_stats_repo)
     # Mock producer
     service.producer = AsyncMock()
     return service
@@ -43,7 +55,7 @@ async def test_create_job_success(
     init_beanie_db, job_service, mock_repo, mock_pool_repo
 ):
     # Setup
-    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"])
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"], quotas=None)
     mock_repo.get.return_value = None  # Job does not exist
 
     job_data = GeneralJobCreate(
@@ -71,7 +83,7 @@ async def test_create_job_success(
 async def test_create_job_exists(
     init_beanie_db, job_service, mock_repo, mock_pool_repo
 ):
-    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"])
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"], quotas=None)
     mock_repo.get.return_value = GeneralJob(
         job_name="test-job",
         maas_pool="maas-pool1",
@@ -116,7 +128,7 @@ async def test_create_job_collector_not_in_pool(
 ):
     # Setup - mock pool check to return False (collector not in pool)
     # Mock pool_repo.get to return a pool that DOES NOT contain the collector
-    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["other-cluster"])
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["other-cluster"], quotas=None)
 
     job_data = GeneralJobCreate(
         job_name="test-job",
@@ -136,7 +148,7 @@ async def test_create_job_collector_not_in_pool(
 async def test_create_job_produce_failure(
     init_beanie_db, job_service, mock_repo, mock_pool_repo
 ):
-    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"])
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"], quotas=None)
     mock_repo.get.return_value = None
     mock_repo.create = AsyncMock()
     mock_repo.delete = AsyncMock()
@@ -706,3 +718,410 @@ async def test_delete_label_produce_failure(init_beanie_db, job_service, mock_re
 
         assert "k" in mock_job.labels
         assert mock_repo.save.call_count == 2
+
+
+# ==========================================
+# RAW GET TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_get_raw_masks_password(job_service, mock_repo):
+    mock_repo.get_raw.return_value = {
+        "job_name": "test-job",
+        "maas_pool": "maas-pool1",
+        "collector_cluster": "ocp4-col1",
+        "job_type": JobType.GENERAL,
+        "targets": ["t1"],
+        "basic_auth": {"username": "user", "password": "encrypted"},
+    }
+
+    job = await job_service.get_raw(
+        "test-job", "maas-pool1", "ocp4-col1", ["maas-pool1"], False
+    )
+
+    assert job["basic_auth"]["password"] == "*****"
+    mock_repo.get_raw.assert_called_once_with(
+        job_name="test-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_raw_not_found(job_service, mock_repo):
+    mock_repo.get_raw.return_value = None
+
+    with pytest.raises(JobNotExistsError):
+        await job_service.get_raw(
+            "test-job", "maas-pool1", "ocp4-col1", ["maas-pool1"], False
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_raw_unauthorized(job_service, mock_repo):
+    with pytest.raises(UnauthorizedApiKeyError):
+        await job_service.get_raw(
+            "test-job", "maas-pool1", "ocp4-col1", ["other-pool"], False
+        )
+    mock_repo.get_raw.assert_not_called()
+
+
+# ==========================================
+# ETAG TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_get_etag_success(job_service, mock_repo):
+    mock_repo.get_version.return_value = {"_id": "abc", "revision": 4}
+
+    etag = await job_service.get_etag(
+        "test-job", "maas-pool1", "ocp4-col1", ["maas-pool1"], False
+    )
+
+    assert etag == '"abc-4"'
+    mock_repo.get_raw.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_etag_not_found(job_service, mock_repo):
+    mock_repo.get_version.return_value = None
+
+    with pytest.raises(JobNotExistsError):
+        await job_service.get_etag(
+            "test-job", "maas-pool1", "ocp4-col1", ["maas-pool1"], False
+        )
+
+
+# ==========================================
+# CHANGE FEED TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_get_changes_masks_and_advances_cursor(job_service, mock_repo):
+    mock_repo.get_changes.return_value = (
+        [
+            {
+                "seq": 7,
+                "action": "upsert",
+                "job_name": "test-job",
+                "job_type": JobType.GENERAL,
+                "job": {"_id": "abc", "basic_auth": {"username": "u", "password": "p"}},
+            },
+            {"seq": 9, "action": "delete", "job_name": "gone", "job_type": None, "job": None},
+        ],
+        True,
+    )
+
+    response = await job_service.get_changes(
+        "maas-pool1", "ocp4-col1", 5, 2, ["maas-pool1"], False
+    )
+
+    assert response["next_cursor"] == 9
+    assert response["has_more"]
+    assert response["changes"][0]["job"] == {"basic_auth": {"username": "u", "password": "*****"}}
+
+
+@pytest.mark.asyncio
+async def test_get_changes_empty_keeps_cursor(job_service, mock_repo):
+    mock_repo.get_changes.return_value = ([], False)
+
+    response = await job_service.get_changes(
+        "maas-pool1", "ocp4-col1", 5, 100, ["maas-pool1"], False
+    )
+
+    assert response == {"changes": [], "next_cursor": 5, "has_more": False}
+
+
+# ==========================================
+# LABEL SELECTOR TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_by_selector(job_service, mock_repo):
+    mock_repo.find_by_labels.return_value = [{"_id": "abc", "job_name": "test-job"}]
+
+    jobs = await job_service.list_jobs(
+        "maas-pool1", "team=payments", None, 10, ["maas-pool1"], False
+    )
+
+    assert jobs == [{"job_name": "test-job"}]
+    mock_repo.find_by_labels.assert_called_once_with(
+        maas_pool="maas-pool1",
+        selector_filter={"label_terms": "team=payments"},
+        collector_cluster=None,
+        limit=10,
+    )
+
+
+# ==========================================
+# NAME SEARCH TESTS
+# ==========================================
+
+
+def _search_hit(job_name, maas_pool="maas-pool1"):
+    return {
+        "job_name": job_name,
+        "maas_pool": maas_pool,
+        "collector_cluster": "ocp4-col1",
+        "job_type": "general",
+        "job_name_lower": job_name.lower(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_scoped_to_authorized_pools(job_service, mock_repo):
+    mock_repo.search_by_name_prefix.return_value = [_search_hit("node-a")]
+    mock_repo.search_by_name_ngrams.return_value = [_search_hit("my-node-a"), _search_hit("node-a")]
+
+    results = await job_service.search(
+        "Node", None, 10, ["maas-pool1", "maas-pool2"], False
+    )
+
+    assert [r["job_name"] for r in results] == ["node-a", "my-node-a"]
+    mock_repo.search_by_name_prefix.assert_called_once_with(
+        ["maas-pool1", "maas-pool2"], "node", 50
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_short_query_skips_ngrams(job_service, mock_repo):
+    mock_repo.search_by_name_prefix.return_value = []
+
+    await job_service.search("no", "maas-pool1", 10, ["maas-pool1"], False)
+
+    mock_repo.search_by_name_ngrams.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_unauthorized_pool(job_service):
+    with pytest.raises(UnauthorizedApiKeyError):
+        await job_service.search("node", "maas-pool1", 10, ["other-pool"], False)
+
+
+# ==========================================
+# STATS TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_create_job_records_stats(
+    init_beanie_db, job_service, mock_repo, mock_pool_repo, mock_stats_repo
+):
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1"], quotas=None)
+    mock_repo.get.return_value = None
+    job_data = GeneralJobCreate(
+        job_name="test-job",
+        maas_pool="maas-pool1",
+        collector_cluster="ocp4-col1",
+        targets=["t1", "t2"],
+    )
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock()
+        await job_service.create(job_data, ["maas-pool1"], False)
+
+    maas_pool, collector_cluster, delta = mock_stats_repo.increment.call_args.args
+    assert (maas_pool, collector_cluster, delta.jobs, delta.targets) == (
+        "maas-pool1",
+        "ocp4-col1",
+        1,
+        2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_target_produce_failure_skips_stats(
+    init_beanie_db, job_service, mock_repo, mock_stats_repo
+):
+    mock_repo.get.return_value = GeneralJob(
+        job_name="test-job",
+        maas_pool="maas-pool1",
+        collector_cluster="ocp4-col1",
+        targets=["t1"],
+    )
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event.side_effect = ProduceFailureError("Kafka error")
+        with pytest.raises(ProduceFailureError):
+            await job_service.add_target(
+                "test-job", "maas-pool1", "ocp4-col1", "t2", ["maas-pool1"], False
+            )
+
+    mock_stats_repo.increment.assert_not_called()
+
+
+# ==========================================
+# PLACEMENT TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_create_job_without_collector_is_placed(
+    init_beanie_db, job_service, mock_repo, mock_pool_repo, mock_stats_repo
+):
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1", "ocp4-col2"], quotas=None)
+    mock_stats_repo.get_collectors.return_value = [
+        {"collector_cluster": "ocp4-col1", "job_count": 3, "scrape_rate": 5.0},
+        {"collector_cluster": "ocp4-col2", "job_count": 1, "scrape_rate": 1.0},
+    ]
+    mock_repo.get.return_value = None
+    job_data = GeneralJobCreate(job_name="test-job", maas_pool="maas-pool1", targets=["t1"])
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock()
+        await job_service.create(job_data, ["maas-pool1"], False)
+
+    assert mock_repo.create.call_args.args[0].collector_cluster == "ocp4-col2"
+    assert mock_producer.send_event.call_args.args[2] == "ocp4-col2"
+    assert "placement" not in mock_producer.send_event.call_args.args[5]
+
+
+def test_create_schema_rejects_placement_with_collector():
+    with pytest.raises(ValueError):
+        GeneralJobCreate(job_name="test-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1",
+                         targets=["t1"], placement="least_loaded")
+
+
+# ==========================================
+# SHARDING TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_create_sharded_job_sends_one_event_per_shard(
+    init_beanie_db, job_service, mock_repo, mock_pool_repo
+):
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1", "ocp4-col2", "ocp4-col3"], quotas=None)
+    mock_repo.get.return_value = None
+    targets = [f"host-{i}:9100" for i in range(60)]
+    job_data = GeneralJobCreate(job_name="test-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1",
+                                targets=targets, shards=3)
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock()
+        await job_service.create(job_data, ["maas-pool1"], False)
+
+    assert mock_repo.create.call_args.args[0].shard_collectors == ["ocp4-col1", "ocp4-col2", "ocp4-col3"]
+    calls = [call.args for call in mock_producer.send_event.call_args_list]
+    assert sorted(args[2] for args in calls) == ["ocp4-col1", "ocp4-col2", "ocp4-col3"]
+    assert all(args[4] == f"test-job~{args[2]}" for args in calls)
+    assert sorted(target for args in calls for target in args[5]["targets"]) == sorted(targets)
+
+
+@pytest.mark.asyncio
+async def test_create_sharded_job_more_shards_than_collectors(
+    init_beanie_db, job_service, mock_repo, mock_pool_repo
+):
+    mock_pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1", "ocp4-col2"], quotas=None)
+    mock_repo.get.return_value = None
+    job_data = GeneralJobCreate(job_name="test-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1",
+                                targets=["t1"], shards=3)
+
+    with pytest.raises(InvalidShardCountError):
+        await job_service.create(job_data, ["maas-pool1"], False)
+    mock_repo.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_add_target_to_sharded_job_only_updates_its_shard(
+    init_beanie_db, job_service, mock_repo
+):
+    mock_repo.get.return_value = GeneralJob(
+        job_name="test-job",
+        maas_pool="maas-pool1",
+        collector_cluster="ocp4-col1",
+        targets=[f"host-{i}:9100" for i in range(30)],
+        shard_collectors=["ocp4-col1", "ocp4-col2", "ocp4-col3"],
+    )
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock()
+        await job_service.add_target(
+            "test-job", "maas-pool1", "ocp4-col1", "new-host:9100", ["maas-pool1"], False
+        )
+
+    mock_producer.send_event.assert_called_once()
+    action, _, collector_cluster, _, job_name, data = mock_producer.send_event.call_args.args
+    assert action == EventActions.UPDATE
+    assert job_name == f"test-job~{collector_cluster}"
+    assert "new-host:9100" in data["targets"]
+
+
+@pytest.mark.asyncio
+async def test_sharded_job_produce_failure_reverts_sent_shards(
+    init_beanie_db, job_service, mock_repo
+):
+    mock_repo.get.return_value = GeneralJob(
+        job_name="test-job",
+        maas_pool="maas-pool1",
+        collector_cluster="ocp4-col1",
+        targets=[f"host-{i}:9100" for i in range(30)],
+        shard_collectors=["ocp4-col1", "ocp4-col2", "ocp4-col3"],
+    )
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock(side_effect=[None, ProduceFailureError("Kafka error"), None])
+        with pytest.raises(ProduceFailureError):
+            await job_service.add_label(
+                "test-job", "maas-pool1", "ocp4-col1", {"env": "prod"}, ["maas-pool1"], False
+            )
+
+    first, _, revert = [call.args for call in mock_producer.send_event.call_args_list]
+    assert revert[2] == first[2]
+    assert "env" in first[5]["labels"] and "env" not in (revert[5]["labels"] or {})
+
+
+@pytest.mark.asyncio
+async def test_move_sharded_job_is_rejected(init_beanie_db, job_service, mock_repo):
+    job = GeneralJob(job_name="test-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1",
+                     targets=["t1", "t2"], shard_collectors=["ocp4-col1", "ocp4-col2"])
+
+    with pytest.raises(ShardedJobMoveError):
+        await job_service.move_job(job, "ocp4-col2")
+    mock_repo.update.assert_not_called()
+
+
+# ==========================================
+# QUOTA TESTS
+# ==========================================
+
+
+@pytest.mark.asyncio
+async def test_add_target_over_quota_is_rejected_before_writing(
+    init_beanie_db, job_service, mock_repo, mock_pool_repo, mock_stats_repo
+):
+    pool = MagicMock(collector_clusters=["ocp4-col1"], quotas=PoolQuotas(collector_max_scrape_rate=1.0))
+    pool.name = "maas-pool1"
+    mock_pool_repo.get.return_value = pool
+    mock_stats_repo.get_collectors.return_value = [
+        {"collector_cluster": "ocp4-col1", "job_count": 1, "scrape_rate": 1.0},
+    ]
+    mock_repo.get.return_value = GeneralJob(
+        job_name="test-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1", targets=["t1"]
+    )
+
+    with patch("services.job_service.producer") as mock_producer:
+        with pytest.raises(ScrapeRateQuotaExceededError):
+            await job_service.add_target(
+                "test-job", "maas-pool1", "ocp4-col1", "t2", ["maas-pool1"], False
+            )
+        mock_producer.send_event.assert_not_called()
+
+    mock_repo.save.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_label_change_skips_quota_check(init_beanie_db, job_service, mock_repo, mock_pool_repo):
+    mock_repo.get.return_value = GeneralJob(
+        job_name="test-job", maas_pool="maas-pool1", collector_cluster="ocp4-col1", targets=["t1"]
+    )
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock()
+        await job_service.add_label(
+            "test-job", "maas-pool1", "ocp4-col1", {"env": "prod"}, ["maas-pool1"], False
+        )
+
+    mock_pool_repo.get.assert_not_called()
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
+from models.validation_schemas.create_schemas.load_reports import CollectorLoadReport
+from repositories.load_repository import LoadRepository
+from services.load_service import LoadService, LoadTracker
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _values(duration: float):
+    return {"scrape_duration_seconds": duration, "samples_per_second": 100.0, "memory_bytes": 2e9}
+
+
+def test_tracker_summarizes_recent_reports_per_collector():
+    clock = FakeClock()
+    tracker = LoadTracker(capacity=16, clock=clock)
+    tracker.record("maas-pool1", "ocp4-col1", _values(5.0))
+    clock.now += 100
+    tracker.record("maas-pool1", "ocp4-col1", _values(1.0))
+    tracker.record("maas-pool1", "ocp4-col2", _values(2.0))
+    tracker.record("maas-pool2", "ocp4-col3", _values(3.0))
+
+    summaries = tracker.summarize("maas-pool1", window_seconds=60)
+
+    assert set(summaries) == {"ocp4-col1", "ocp4-col2"}
+    assert summaries["ocp4-col1"]["reports"] == 1
+    assert summaries["ocp4-col1"]["scrape_duration_seconds"]["max"] == 1.0
+    assert summaries["ocp4-col1"]["last_report"] == datetime.fromtimestamp(clock.now, tz=timezone.utc)
+
+
+def test_tracker_downsample_covers_each_interval_once():
+    clock = FakeClock()
+    tracker = LoadTracker(capacity=16, clock=clock)
+    clock.now += 1
+    tracker.record("maas-pool1", "ocp4-col1", _values(1.0))
+    tracker.record("maas-pool1", "ocp4-col1", _values(3.0))
+    clock.now += 1
+
+    samples = tracker.downsample()
+
+    assert len(samples) == 1
+    assert samples[0]["reports"] == 2
+    assert samples[0]["scrape_duration_seconds"]["mean"] == 2.0
+    assert "last_report" not in samples[0]
+    assert tracker.downsample() == []
+
+
+def test_tracker_expires_idle_collectors():
+    clock = FakeClock()
+    tracker = LoadTracker(capacity=16, idle_expiry=60, clock=clock)
+    tracker.record("maas-pool1", "ocp4-col1", _values(1.0))
+    clock.now += 120
+    tracker.record("maas-pool1", "ocp4-col2", _values(1.0))
+
+    tracker.expire()
+
+    assert set(tracker.summarize("maas-pool1", 3600)) == {"ocp4-col2"}
+
+
+@pytest.mark.asyncio
+async def test_flush_persists_samples_only_when_enabled():
+    clock = FakeClock()
+    repo = AsyncMock()
+    tracker = LoadTracker(capacity=16, flush_interval=3600, clock=clock)
+    service = LoadService(repo, tracker, persist=True)
+    clock.now += 1
+    service.report("maas-pool1", "ocp4-col1", CollectorLoadReport(**_values(1.0)), ["maas-pool1"], False)
+    clock.now += 1
+
+    await tracker.flush()
+    await tracker.stop()
+
+    samples = repo.insert_samples.call_args_list[0].args[0]
+    assert [sample["collector_cluster"] for sample in samples] == ["ocp4-col1"]
+
+
+@pytest.mark.asyncio
+async def test_report_unauthorized():
+    service = LoadService(AsyncMock(), LoadTracker())
+
+    with pytest.raises(UnauthorizedApiKeyError):
+        service.report("maas-pool1", "ocp4-col1", CollectorLoadReport(**_values(1.0)), ["other-pool"], False)
+
+
+@pytest.mark.asyncio
+async def test_history_roundtrip(init_beanie_db):
+    repo = LoadRepository()
+    # Recent times, old samples would be dropped by the TTL index
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(minutes=10)
+    await repo.insert_samples([
+        {"maas_pool": "maas-pool1", "collector_cluster": "ocp4-col1",
+         "time": start + timedelta(minutes=minute), "reports": minute}
+        for minute in range(5)
+    ])
+
+    history = await repo.get_history("maas-pool1", "ocp4-col1", start + timedelta(minutes=1), 2)
+
+    assert [sample["reports"] for sample in history] == [3, 4]
+    assert "collector_cluster" not in history[0]
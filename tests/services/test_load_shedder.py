@@ -0,0 +1,73 @@
+import pytest
+
+from enums.request_priority import RequestPriority
+from services.load_shedder import LoadShedder
+
+
+@pytest.fixture
+def shedder():
+    shedder = LoadShedder(target=0.01, interval=1.0, max_in_flight=100, min_in_flight=10, clock=lambda: 0.0)
+    shedder._ensure_monitoring = lambda: None
+    return shedder
+
+
+def test_short_lag_burst_is_tolerated(shedder):
+    shedder.observe_lag(0.5, now=0.0)
+    shedder.observe_lag(0.5, now=0.5)
+
+    assert not shedder.dropping
+    assert shedder.admit(RequestPriority.LOW) is None
+
+
+def test_sustained_lag_sheds_low_priority_first(shedder):
+    shedder.observe_lag(0.5, now=0.0)
+    shedder.observe_lag(0.5, now=1.0)
+
+    assert shedder.dropping
+    assert shedder.admit(RequestPriority.LOW) is not None
+    assert shedder.admit(RequestPriority.CRITICAL) is None
+
+
+def test_drop_probability_follows_lag(shedder):
+    for now in range(40):
+        shedder.observe_lag(0.5, now=float(now))
+
+    assert shedder.drop_probability == 0.95
+    shed = sum(shedder.admit(RequestPriority.NORMAL) is not None for _ in range(200))
+    assert shed > 150
+
+    shedder.observe_lag(0.0, now=41.0)
+
+    assert not shedder.dropping
+    assert shedder.drop_probability == pytest.approx(0.9)
+    # Low priority work waits until the normal traffic is fully let back in
+    assert shedder.admit(RequestPriority.LOW) is not None
+
+
+def test_recovery_stops_shedding_and_regrows_limit(shedder):
+    for _ in range(50):
+        shedder.admit(RequestPriority.CRITICAL)
+    shedder.observe_lag(0.5, now=0.0)
+    shedder.observe_lag(0.5, now=1.0)
+    limit = shedder.limit
+
+    shedder.observe_lag(0.0, now=1.5)
+
+    assert limit == 40
+    assert not shedder.dropping
+    assert shedder.limit > limit
+
+
+def test_in_flight_limits(shedder):
+    shedder.limit = 20
+    admitted = [shedder.admit(RequestPriority.NORMAL) for _ in range(10)]
+
+    assert admitted == [None] * 10
+    assert shedder.admit(RequestPriority.LOW) is not None
+    for _ in range(10):
+        shedder.admit(RequestPriority.NORMAL)
+    assert shedder.admit(RequestPriority.NORMAL) is not None
+    assert shedder.admit(RequestPriority.CRITICAL) is None
+
+    shedder.release(RequestPriority.CRITICAL)
+    assert shedder.metrics()['in_flight'] == {'critical': 0, 'normal': 20, 'low': 0}
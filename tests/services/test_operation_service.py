@@ -0,0 +1,230 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from pymongo.errors import ConnectionFailure
+
+from config.constants.operations import MAX_OPERATION_ATTEMPTS
+from enums.operation_kind import OperationKind
+from enums.operation_state import OperationState
+from exceptions.operation_not_found_error import OperationNotFoundError
+from exceptions.unauthorized_api_key import UnauthorizedApiKeyError
+from models.db_schemas.operations import Operation
+from repositories.operation_repository import OperationRepository
+from services.operation_runner import OperationContext, OperationRunner
+from services.operation_service import OperationService
+
+
+class BatchHandler:
+    """Processes params['items'] in batches of two, checkpointing the next index; can pause after a batch."""
+
+    def __init__(self, pause_after: int = None):
+        self.pause_after = pause_after
+        self.paused = asyncio.Event()
+        self.started_from = []
+
+    async def __call__(self, context: OperationContext):
+        items = context.params['items']
+        start = context.checkpoint or 0
+        self.started_from.append(start)
+        for index in range(start, len(items), 2):
+            batch = items[index:index + 2]
+            results = [{'key': item, 'status': 'failed' if item.startswith('bad') else 'created'} for item in batch]
+            await context.save(index + len(batch), results, total=len(items))
+            if self.pause_after is not None and index + len(batch) >= self.pause_after:
+                self.paused.set()
+                await asyncio.Event().wait()
+        return {'processed': len(items)}
+
+
+async def _wait_for(service: OperationService, operation_id: str, state: OperationState):
+    for _ in range(200):
+        operation = await service.get(operation_id, [], True)
+        if operation['state'] == state:
+            return operation
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"operation never reached {state}")
+
+
+@pytest.fixture
+def runner(init_beanie_db):
+    return OperationRunner(workers=2, poll_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_operation_runs_in_background_and_records_items(runner):
+    runner.register(OperationKind.REBUILD_STATS, BatchHandler())
+    service = OperationService(OperationRepository(), runner)
+
+    submitted = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1", {'items': ['a', 'bad', 'c']})
+    operation = await _wait_for(service, submitted['id'], OperationState.COMPLETED)
+    items = await service.get_items(submitted['id'], None, 2, ["maas-pool1"], False)
+    rest = await service.get_items(submitted['id'], items['next'], 2, ["maas-pool1"], False)
+    await runner.stop()
+
+    assert submitted['state'] == OperationState.QUEUED
+    assert operation['progress'] == {'total': 3, 'done': 2, 'failed': 1}
+    assert operation['result'] == {'processed': 3}
+    assert [item['key'] for item in items['items'] + rest['items']] == ['a', 'bad', 'c']
+    assert rest['next'] is None
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_and_unknown_kind(runner):
+    async def broken(context):
+        raise RuntimeError("boom")
+
+    runner.register(OperationKind.REBUILD_STATS, broken)
+    service = OperationService(OperationRepository(), runner)
+
+    failed = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1")
+    unknown = await service.submit(OperationKind.REBUILD_VIEWS, "maas-pool1")
+
+    assert (await _wait_for(service, failed['id'], OperationState.FAILED))['error'] == "boom"
+    assert "No handler" in (await _wait_for(service, unknown['id'], OperationState.FAILED))['error']
+    await runner.stop()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_operation_resumes_from_checkpoint(runner):
+    handler = BatchHandler(pause_after=2)
+    runner.register(OperationKind.REBUILD_STATS, handler)
+    service = OperationService(OperationRepository(), runner)
+    submitted = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1", {'items': ['a', 'b', 'c', 'd', 'e']})
+    await asyncio.wait_for(handler.paused.wait(), 1)
+
+    await runner.stop()
+    assert (await service.get(submitted['id'], [], True))['state'] == OperationState.QUEUED
+
+    handler.pause_after = None
+    restarted = OperationRunner({OperationKind.REBUILD_STATS: handler}, workers=1, poll_interval=0.01)
+    restarted.start()
+    operation = await _wait_for(service, submitted['id'], OperationState.COMPLETED)
+    await restarted.stop()
+
+    assert handler.started_from == [0, 2]
+    assert operation['progress']['done'] == 5
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_taken_over(init_beanie_db):
+    repo = OperationRepository()
+    service = OperationService(repo, OperationRunner(workers=0))
+    submitted = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1")
+    await repo.claim_next("dead-replica", 60)
+
+    assert await repo.claim_next("other", 60) is None
+    await repo.collection.update_one({}, {'$set': {'lease_until': datetime.now(timezone.utc) - timedelta(seconds=1)}})
+    claimed = await repo.claim_next("other", 60)
+
+    assert str(claimed['_id']) == submitted['id']
+    assert not await repo.save_progress(claimed['_id'], "dead-replica", 1, 0, 0, None, 60)
+
+
+@pytest.mark.asyncio
+async def test_failed_lease_renewal_is_retried(init_beanie_db):
+    repo = OperationRepository()
+    outcomes = [ConnectionFailure("primary stepped down")]
+
+    async def flaky_renew(*args):
+        if outcomes:
+            raise outcomes.pop()
+        return True
+
+    repo.renew = AsyncMock(side_effect=flaky_renew)
+    finished = asyncio.Event()
+
+    async def slow(context):
+        await asyncio.sleep(0.1)
+        finished.set()
+        return {'done': True}
+
+    runner = OperationRunner({OperationKind.REBUILD_STATS: slow}, workers=1, lease_seconds=0.09,
+                             poll_interval=0.01, repo=repo)
+    service = OperationService(repo, runner)
+    submitted = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1")
+    operation = await _wait_for(service, submitted['id'], OperationState.COMPLETED)
+    await runner.stop()
+
+    assert finished.is_set()
+    assert operation['result'] == {'done': True}
+    assert repo.renew.await_count >= 2
+
+
+@pytest.mark.asyncio
+async def test_handler_is_cancelled_when_the_lease_is_lost(init_beanie_db):
+    repo = OperationRepository()
+    cancelled = asyncio.Event()
+
+    async def endless(context):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    runner = OperationRunner({OperationKind.REBUILD_STATS: endless}, workers=1, lease_seconds=0.03,
+                             poll_interval=0.01, repo=repo)
+    service = OperationService(repo, runner)
+    submitted = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1")
+    await _wait_for(service, submitted['id'], OperationState.RUNNING)
+    await repo.collection.update_one({}, {'$set': {'owner': "other-replica"}})
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await runner.stop()
+
+    operation = await repo.collection.find_one({})
+    assert (operation['state'], operation['owner']) == (OperationState.RUNNING.value, "other-replica")
+
+
+@pytest.mark.asyncio
+async def test_operation_interrupted_too_often_is_failed(init_beanie_db):
+    repo = OperationRepository()
+    runner = OperationRunner({OperationKind.REBUILD_STATS: BatchHandler()}, workers=1, poll_interval=0.01)
+    service = OperationService(repo, runner)
+    submitted = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1", {'items': ['a']})
+    await repo.collection.update_one({}, {'$set': {'attempts': MAX_OPERATION_ATTEMPTS}})
+
+    operation = await _wait_for(service, submitted['id'], OperationState.FAILED)
+    await runner.stop()
+
+    assert operation['error'] == f"Gave up after {MAX_OPERATION_ATTEMPTS} interrupted attempts"
+    assert operation['progress']['done'] == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_keeps_claiming_after_finish_fails(init_beanie_db):
+    repo = OperationRepository()
+    runner = OperationRunner(workers=1, poll_interval=0.01, repo=repo)
+    runner.register(OperationKind.REBUILD_STATS, BatchHandler())
+    service = OperationService(repo, runner)
+    finish = repo.finish
+
+    async def finish_once_failing(*args, **kwargs):
+        repo.finish = finish
+        raise ConnectionFailure("primary stepped down")
+
+    repo.finish = finish_once_failing
+    first, second = [await repo.create(Operation(kind=OperationKind.REBUILD_STATS, maas_pool="maas-pool1",
+                                                 params={'items': [item]})) for item in ('a', 'b')]
+    runner.start()
+    operation = await _wait_for(service, str(second.id), OperationState.COMPLETED)
+    await runner.stop()
+
+    assert operation['result'] == {'processed': 1}
+    assert (await service.get(str(first.id), [], True))['state'] == OperationState.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_status_is_only_visible_to_the_pool(init_beanie_db):
+    service = OperationService(OperationRepository(), OperationRunner(workers=0))
+    pool_operation = await service.submit(OperationKind.REBUILD_STATS, "maas-pool1")
+    admin_operation = await service.submit(OperationKind.REBUILD_STATS)
+
+    assert (await service.get(pool_operation['id'], ["maas-pool1"], False))['kind'] == OperationKind.REBUILD_STATS
+    with pytest.raises(UnauthorizedApiKeyError):
+        await service.get(pool_operation['id'], ["maas-pool2"], False)
+    with pytest.raises(OperationNotFoundError):
+        await service.get(admin_operation['id'], ["maas-pool1"], False)
+    with pytest.raises(OperationNotFoundError):
+        await service.get("not-an-id", [], True)
@@ -0,0 +1,59 @@
+import random
+from unittest.mock import AsyncMock
+
+import pytest
+
+from enums.placement_strategy import PlacementStrategy
+from exceptions.no_collector_available_error import NoCollectorAvailableError
+from services.placement_service import PlacementService, PowerOfTwoPlacement
+from utils.hash_ring import hash_ring
+
+COLLECTORS = ["ocp4-col1", "ocp4-col2", "ocp4-col3"]
+
+
+@pytest.fixture
+def mock_repo():
+    repo = AsyncMock()
+    repo.get_collectors.side_effect = lambda maas_pool, collectors: [
+        stats for stats in [
+            {"collector_cluster": "ocp4-col1", "job_count": 5, "scrape_rate": 10.0},
+            {"collector_cluster": "ocp4-col2", "job_count": 9, "scrape_rate": 2.0},
+        ] if stats["collector_cluster"] in collectors
+    ]
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_treats_missing_counters_as_empty(mock_repo):
+    service = PlacementService(mock_repo)
+
+    assert await service.place("maas-pool1", COLLECTORS, "job", PlacementStrategy.LEAST_LOADED) == "ocp4-col3"
+    assert await service.place("maas-pool1", COLLECTORS[:2], "job", PlacementStrategy.LEAST_LOADED) == "ocp4-col2"
+
+
+@pytest.mark.asyncio
+async def test_power_of_two_reads_only_two_collectors(mock_repo):
+    service = PlacementService(mock_repo)
+    service.policies[PlacementStrategy.POWER_OF_TWO] = PowerOfTwoPlacement(random.Random(1))
+
+    chosen = await service.place("maas-pool1", COLLECTORS, "job", PlacementStrategy.POWER_OF_TWO)
+
+    sampled = mock_repo.get_collectors.call_args.args[1]
+    assert len(sampled) == 2
+    assert chosen in sampled
+
+
+@pytest.mark.asyncio
+async def test_consistent_hash_skips_counters(mock_repo):
+    service = PlacementService(mock_repo)
+
+    chosen = await service.place("maas-pool1", COLLECTORS, "job-a", PlacementStrategy.CONSISTENT_HASH)
+
+    assert chosen == hash_ring(tuple(sorted(COLLECTORS))).node_for("job-a")
+    mock_repo.get_collectors.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_empty_pool_raises(mock_repo):
+    with pytest.raises(NoCollectorAvailableError):
+        await PlacementService(mock_repo).place("maas-pool1", [], "job", PlacementStrategy.LEAST_LOADED)
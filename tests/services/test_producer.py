@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from aiokafka.errors import KafkaConnectionError, RequestTimedOutError
+
+import producer as producer_module
+from enums.circuit_state import CircuitState
+from exceptions.circuit_open_error import CircuitOpenError
+from exceptions.produce_failure_error import ProduceFailureError
+from producer import KafkaProducer
+from utils.circuit_breaker import CircuitBreaker
+from utils.fault_injection import FaultyKafkaClient
+
+
+@pytest.fixture
+def client():
+    kafka_producer = KafkaProducer()
+    client = FaultyKafkaClient()
+    breaker = CircuitBreaker("kafka", failure_types=producer_module.kafka_breaker.failure_types, failure_threshold=3)
+    with patch.object(kafka_producer, "_producer", client), patch("producer.kafka_breaker", breaker), \
+            patch("utils.retry.asyncio.sleep"):
+        yield client
+
+
+async def _send():
+    await KafkaProducer().send_event("create", "maas-pool1", "collector1", "general", "job1",
+                                     {"update_time": datetime.now(timezone.utc)})
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried(client):
+    client.injector.fail_next(2, KafkaConnectionError)
+
+    await _send()
+
+    topic, key, value = client.sent[0]
+    assert key == b"maas-pool1"
+    assert b'"action":"create"' in value
+    assert producer_module.kafka_breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(client):
+    client.injector.fail_next(3, KafkaConnectionError)
+
+    with pytest.raises(ProduceFailureError):
+        await _send()
+    with pytest.raises(CircuitOpenError):
+        KafkaProducer().check_available()
+    with pytest.raises(ProduceFailureError):
+        await _send()
+
+    assert client.injector.calls == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [asyncio.TimeoutError, RequestTimedOutError])
+async def test_attempt_that_may_have_been_written_is_not_sent_again(client, error):
+    client.injector.fail_next(1, error)
+
+    with pytest.raises(ProduceFailureError):
+        await _send()
+
+    assert client.injector.calls == 1
@@ -0,0 +1,218 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from enums.operation_kind import OperationKind
+from enums.operation_state import OperationState
+from exceptions.produce_failure_error import ProduceFailureError
+from models.db_schemas.jobs import BaseJob, GeneralJob
+from models.db_schemas.operations import Operation
+from models.general.pools.quotas import PoolQuotas
+from repositories.job_repository import JobRepository
+from repositories.operation_repository import OperationRepository
+from repositories.stats_repository import StatsRepository
+from services.operation_handlers import import_params, register_operation_handlers
+from services.operation_runner import OperationRunner
+from services.operation_service import OperationService
+from services.stats_service import StatsSnapshot
+from utils.scrape_cost import JobLoad
+
+CONFIG = """
+scrape_configs:
+  - job_name: node
+    scrape_interval: 30s
+    static_configs:
+      - targets: ['host-1:9100', 'host-2:9100']
+        labels: {team: infra}
+  - job_name: pods
+    kubernetes_sd_configs:
+      - role: pod
+        namespaces: {names: [ns1]}
+  - job_name: discovery
+    http_sd_configs:
+      - url: http://sd.example/targets
+        refresh_interval: 2m
+  - job_name: bad-interval
+    scrape_interval: 5s
+    static_configs:
+      - targets: ['host-3:9100']
+  - job_name: node
+    static_configs:
+      - targets: ['host-4:9100']
+  - job_name: federate
+    honor_labels: true
+    static_configs:
+      - targets: ['prometheus:9090']
+"""
+
+
+@pytest.fixture
+def pool():
+    pool = MagicMock(collector_clusters=["ocp4-col1", "ocp4-col2"], quotas=None)
+    pool.name = "maas-pool1"
+    return pool
+
+
+@pytest.fixture
+def runner(init_beanie_db, pool):
+    runner = OperationRunner(workers=1, poll_interval=0.01)
+    register_operation_handlers(runner)
+    pool_repo = AsyncMock()
+    pool_repo.get.return_value = pool
+    with patch("services.operation_handlers.PoolRepository", return_value=pool_repo), \
+            patch("services.job_service.producer") as producer:
+        producer.send_event = AsyncMock()
+        runner.producer = producer
+        yield runner
+
+
+async def _import(runner, config, collector_cluster=None, placement=None):
+    service = OperationService(OperationRepository(), runner)
+    submitted = await service.submit_for_pool(OperationKind.IMPORT_PROMETHEUS_CONFIG, "maas-pool1",
+                                              import_params(config, collector_cluster, placement), ["maas-pool1"], False)
+    for _ in range(500):
+        operation = await service.get(submitted['id'], [], True)
+        if operation['state'] in (OperationState.COMPLETED, OperationState.FAILED):
+            items = await service.get_items(submitted['id'], None, 1000, [], True)
+            await runner.stop()
+            return operation, {item['key']: item for item in items['items']}
+        await asyncio.sleep(0.01)
+    raise AssertionError("import never finished")
+
+
+@pytest.mark.asyncio
+async def test_import_creates_jobs_and_reports_each_entry(runner):
+    operation, items = await _import(runner, CONFIG)
+
+    assert operation['state'] == OperationState.COMPLETED
+    assert operation['progress'] == {'total': 6, 'done': 3, 'failed': 3}
+    assert {key: item['status'] for key, item in items.items()} == {
+        'node': 'created', 'pods': 'created', 'discovery': 'created',
+        'bad-interval': 'failed', 'node#4': 'failed', 'federate': 'failed'}
+    assert items['node#4']['detail'] == "Duplicate job_name node"
+    assert "scrape_interval" in items['bad-interval']['detail']
+    assert "honor_labels" in items['federate']['detail']
+
+    jobs = {job.job_name: job for job in await BaseJob.find_all(with_children=True).to_list()}
+    assert jobs['node'].targets == ['host-1:9100', 'host-2:9100']
+    assert jobs['node'].labels == {'team': 'infra'}
+    assert jobs['pods'].namespaces == ['ns1']
+    assert jobs['discovery'].refresh_interval == 120
+    assert sorted(job.seq for job in jobs.values()) == [1, 2, 3]
+    assert runner.producer.send_event.await_count == 3
+    assert (await StatsRepository().get("maas-pool1"))['job_count'] == 3
+
+
+@pytest.mark.asyncio
+async def test_uploaded_config_is_stored_encrypted_and_dropped_when_done(runner):
+    params = import_params(CONFIG, None, None)
+    assert "scrape_configs" not in params['config']
+
+    operation, _ = await _import(runner, CONFIG)
+
+    stored = await Operation.get_pymongo_collection().find_one({})
+    assert operation['state'] == OperationState.COMPLETED
+    assert 'params' not in stored
+
+
+@pytest.mark.asyncio
+async def test_import_spreads_a_batch_over_collectors(runner):
+    config = "scrape_configs:\n" + "".join(
+        f"  - job_name: job-{i}\n    static_configs:\n      - targets: ['host-{i}:9100']\n" for i in range(10))
+
+    operation, _ = await _import(runner, config)
+
+    collectors = [job.collector_cluster for job in await BaseJob.find_all(with_children=True).to_list()]
+    assert operation['progress']['done'] == 10
+    assert collectors.count("ocp4-col1") == collectors.count("ocp4-col2") == 5
+
+
+@pytest.mark.asyncio
+async def test_reimport_skips_existing_jobs(runner):
+    await JobRepository().create(GeneralJob(job_name="node", maas_pool="maas-pool1", collector_cluster="ocp4-col2",
+                                            targets=["other:9100"]))
+
+    operation, items = await _import(runner, CONFIG, collector_cluster="ocp4-col1")
+
+    assert items['node'] == {'key': 'node', 'status': 'skipped', 'detail': "Job node already exists on ocp4-col2"}
+    assert {job.collector_cluster for job in await BaseJob.find_all(with_children=True).to_list()} == \
+        {"ocp4-col1", "ocp4-col2"}
+    assert operation['progress']['done'] == 3
+
+
+@pytest.mark.asyncio
+async def test_quota_and_produce_failures_reject_single_jobs(runner, pool):
+    async def send_event(action, maas_pool, collector_cluster, job_type, job_name, data):
+        if job_name == "pods":
+            raise ProduceFailureError("kafka down")
+
+    pool.quotas = PoolQuotas(max_jobs=2)
+    runner.producer.send_event.side_effect = send_event
+
+    operation, items = await _import(runner, CONFIG)
+
+    assert items['node']['status'] == 'created'
+    assert items['pods'] == {'key': 'pods', 'status': 'failed', 'detail': "kafka down"}
+    assert items['discovery']['status'] == 'failed'
+    assert "job quota exceeded" in items['discovery']['detail']
+    assert [job.job_name for job in await BaseJob.find_all(with_children=True).to_list()] == ['node']
+
+
+@pytest.mark.asyncio
+async def test_batch_reserves_its_quota_against_writes_after_its_snapshot(runner, pool):
+    pool.quotas = PoolQuotas(max_jobs=2)
+    stats = StatsRepository()
+    snapshot = StatsSnapshot([])
+    # Another import committed a job after this batch read the counters
+    await stats.increment("maas-pool1", "ocp4-col2", JobLoad(jobs=1, targets=1, scrape_rate=1.0))
+
+    with patch("services.job_service.StatsService.snapshot", AsyncMock(return_value=snapshot)):
+        operation, items = await _import(runner, CONFIG)
+
+    assert [items[key]['status'] for key in ('node', 'pods', 'discovery')] == ['created', 'failed', 'failed']
+    assert "job quota exceeded" in items['pods']['detail']
+    assert (await stats.get("maas-pool1"))["job_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_after_the_checkpoint(runner):
+    config = "scrape_configs:\n" + "".join(
+        f"  - job_name: job-{i}\n    static_configs:\n      - targets: ['host-{i}:9100']\n" for i in range(4))
+    with patch("services.operation_handlers.IMPORT_BATCH_SIZE", 2):
+        operation = await OperationRepository().create(Operation(
+            kind=OperationKind.IMPORT_PROMETHEUS_CONFIG, maas_pool="maas-pool1", params=import_params(config, None, None),
+            checkpoint=2))
+        service = OperationService(OperationRepository(), runner)
+        runner.notify()
+        for _ in range(500):
+            status = await service.get(str(operation.id), [], True)
+            if status['state'] == OperationState.COMPLETED:
+                break
+            await asyncio.sleep(0.01)
+        await runner.stop()
+
+    names = sorted(job.job_name for job in await BaseJob.find_all(with_children=True).to_list())
+    assert names == ['job-2', 'job-3']
+    assert status['progress'] == {'total': 4, 'done': 2, 'failed': 0}
+
+
+@pytest.mark.asyncio
+async def test_jobs_inserted_before_a_bulk_write_error_are_finished(runner):
+    insert_many = BaseJob.insert_many
+
+    async def partial_insert(documents, **kwargs):
+        await insert_many([documents[0], documents[2]])
+        raise BulkWriteError({'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': "duplicate key"}],
+                              'nInserted': 2})
+
+    with patch.object(BaseJob, "insert_many", side_effect=partial_insert):
+        operation, items = await _import(runner, CONFIG)
+
+    assert {key: item['status'] for key, item in items.items() if key in ('node', 'pods', 'discovery')} == {
+        'node': 'created', 'pods': 'failed', 'discovery': 'created'}
+    assert items['pods']['detail'] == "duplicate key"
+    assert operation['progress'] == {'total': 6, 'done': 2, 'failed': 4}
+    assert runner.producer.send_event.await_count == 2
+    assert (await StatsRepository().get("maas-pool1"))['job_count'] == 2
@@ -0,0 +1,115 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config.constants.jobs import POOL_TOTAL_KEY
+from exceptions.job_quota_exceeded_error import JobQuotaExceededError
+from exceptions.scrape_rate_quota_exceeded_error import ScrapeRateQuotaExceededError
+from models.general.pools.quotas import PoolQuotas
+from repositories.stats_repository import StatsRepository
+from services.quota_service import QuotaService
+from utils.scrape_cost import JobLoad, job_footprints
+
+
+def _pool(**quotas):
+    pool = MagicMock(collector_clusters=["ocp4-col1", "ocp4-col2"], quotas=PoolQuotas(**quotas))
+    pool.name = "maas-pool1"
+    return pool
+
+
+@pytest.fixture
+async def service(init_beanie_db):
+    stats_repo = StatsRepository()
+    await stats_repo.increment("maas-pool1", "ocp4-col1", JobLoad(jobs=3, targets=30, scrape_rate=90.0))
+    await stats_repo.increment("maas-pool1", "ocp4-col2", JobLoad(jobs=1, targets=10, scrape_rate=10.0))
+    return QuotaService(stats_repo)
+
+
+@pytest.mark.asyncio
+async def test_within_quota_is_admitted(service):
+    pool = _pool(max_jobs=5, max_scrape_rate=200, collector_max_jobs=4, collector_max_scrape_rate=100)
+
+    await service.check(pool, {"ocp4-col1": JobLoad(jobs=1, targets=2, scrape_rate=10.0)})
+
+
+@pytest.mark.asyncio
+async def test_pool_job_quota(service):
+    pool = _pool(max_jobs=4)
+
+    with pytest.raises(JobQuotaExceededError) as error:
+        await service.check(pool, {"ocp4-col2": JobLoad(jobs=1, targets=1, scrape_rate=1.0)})
+
+    assert error.value.remaining == 0
+    assert "0 of 4 left" in str(error.value)
+
+
+@pytest.mark.asyncio
+async def test_collector_scrape_rate_quota(service):
+    pool = _pool(collector_max_scrape_rate=100)
+
+    await service.check(pool, {"ocp4-col2": JobLoad(jobs=0, targets=50, scrape_rate=50.0)})
+    with pytest.raises(ScrapeRateQuotaExceededError) as error:
+        await service.check(pool, {"ocp4-col1": JobLoad(jobs=0, targets=20, scrape_rate=20.0)})
+
+    assert error.value.remaining == pytest.approx(10.0)
+
+
+@pytest.mark.asyncio
+async def test_shrinking_over_quota_is_admitted(service):
+    pool = _pool(max_scrape_rate=10)
+
+    await service.check(pool, {"ocp4-col1": JobLoad(jobs=0, targets=-10, scrape_rate=-30.0)})
+
+
+@pytest.mark.asyncio
+async def test_usage_reports_remaining_budget(service):
+    pool = _pool(max_jobs=10, collector_max_scrape_rate=100)
+
+    usage = await service.get_usage(pool)
+
+    assert usage["jobs"] == {"limit": 10, "used": 4, "remaining": 6}
+    assert usage["scrape_rate"] is None
+    assert usage["collectors"]["ocp4-col1"]["scrape_rate"]["remaining"] == pytest.approx(10.0)
+
+
+@pytest.mark.asyncio
+async def test_sharded_job_takes_one_job_of_the_pool_quota(init_beanie_db):
+    service = QuotaService(StatsRepository())
+    job = {"maas_pool": "maas-pool1", "collector_cluster": "ocp4-col1", "targets": [f"t{i}" for i in range(30)],
+           "shard_collectors": ["ocp4-col1", "ocp4-col2", "ocp4-col3"]}
+    deltas = {footprint.collector_cluster: footprint.load for footprint in job_footprints(job)}
+
+    await service.reserve(_pool(max_jobs=2), deltas)
+
+    assert (await service.repo.get("maas-pool1"))["job_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reservation_rechecks_when_another_write_took_the_headroom(service):
+    get_collectors = service.repo.get_collectors
+    raced = []
+
+    async def read_then_race(*args):
+        counters = await get_collectors(*args)
+        if not raced:
+            raced.append(True)
+            await service.repo.increment("maas-pool1", "ocp4-col1", JobLoad(jobs=1))
+        return counters
+
+    with patch.object(service.repo, "get_collectors", side_effect=read_then_race):
+        with pytest.raises(JobQuotaExceededError):
+            await service.reserve(_pool(max_jobs=5), {"ocp4-col2": JobLoad(jobs=1, targets=1, scrape_rate=1.0)})
+
+    assert (await service.repo.get("maas-pool1"))["job_count"] == 5
+    assert (await service.repo.get("maas-pool1", "ocp4-col2"))["job_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reservation_that_no_longer_fits_applies_nothing(service):
+    bounds = [("ocp4-col2", JobLoad(jobs=1, targets=1, scrape_rate=1.0), None, None),
+              (POOL_TOTAL_KEY, JobLoad(jobs=1, targets=1, scrape_rate=1.0), 4, None)]
+
+    assert not await service.repo.reserve("maas-pool1", bounds)
+
+    assert (await service.repo.get("maas-pool1", "ocp4-col2"))["job_count"] == 1
+    assert (await service.repo.get("maas-pool1"))["job_count"] == 4
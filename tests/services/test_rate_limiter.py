@@ -0,0 +1,63 @@
+import pytest
+
+from services.rate_limiter import InMemoryRateLimitBackend, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_buckets_are_independent_per_key():
+    limiter = RateLimiter(clock=FakeClock())
+
+    assert limiter.check("key:a", 1.0, 1).allowed
+    assert not limiter.check("key:a", 1.0, 1).allowed
+    assert limiter.check("key:b", 1.0, 1).allowed
+
+
+def test_configure_and_refund():
+    limiter = RateLimiter(clock=FakeClock())
+    limiter.check("key:a", 1.0, 1)
+
+    limiter.configure("key:a", 5.0, 3)
+    limiter.refund("key:a")
+
+    assert limiter.limits("key:a") == (5.0, 3)
+    assert limiter.check("key:a", 5.0, 3).remaining == 0
+    assert limiter.limits("key:missing") is None
+
+
+def test_full_buckets_are_evicted_first():
+    clock = FakeClock()
+    limiter = RateLimiter(max_buckets=2, clock=clock)
+    limiter.check("key:a", 1.0, 1)
+    clock.now = 10.0
+    limiter.check("key:b", 1.0, 1)
+
+    limiter.check("key:c", 1.0, 1)
+
+    assert len(limiter) == 2
+    assert limiter.limits("key:a") is None
+
+
+@pytest.mark.asyncio
+async def test_replicas_share_consumption_through_backend():
+    backend = InMemoryRateLimitBackend()
+    clock = FakeClock()
+    first = RateLimiter(backend, clock=clock)
+    second = RateLimiter(backend, clock=clock)
+    second.check("key:a", 1.0, 4)
+    await second.sync()
+
+    for _ in range(3):
+        assert first.check("key:a", 1.0, 4).allowed
+    await first.sync()
+    await second.sync()
+
+    assert not second.check("key:a", 1.0, 4).allowed
+    await first.stop()
+    await second.stop()
@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from enums.rebalance_state import RebalanceState
+from exceptions.produce_failure_error import ProduceFailureError
+from exceptions.rebalance_in_progress_error import RebalanceInProgressError
+from models.db_schemas.jobs import GeneralJob
+from repositories.job_repository import JobRepository
+from services.job_service import JobService
+from services.rebalance_service import RebalanceRunner, RebalanceService
+
+
+@pytest.fixture
+def repo(init_beanie_db):
+    return JobRepository()
+
+
+@pytest.fixture
+def service(repo):
+    pool_repo = AsyncMock()
+    pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1", "ocp4-col2"], quotas=None)
+    job_service = JobService(repo, pool_repo, AsyncMock())
+    return RebalanceService(repo, job_service, RebalanceRunner())
+
+
+async def _seed(repo, collector_cluster, count):
+    for i in range(count):
+        await repo.create(GeneralJob(job_name=f"{collector_cluster}-job-{i}", maas_pool="maas-pool1",
+                                     collector_cluster=collector_cluster, scrape_interval=60, targets=["a"] * 60))
+
+
+async def _wait(service):
+    await asyncio.wait_for(service.runner._tasks["maas-pool1"], 1)
+    return service.status("maas-pool1")
+
+
+@pytest.mark.asyncio
+async def test_plan_is_a_dry_run(repo, service):
+    await _seed(repo, "ocp4-col1", 4)
+
+    plan = await service.plan("maas-pool1", 0.1, 10)
+
+    assert plan["loads_before"] == {"ocp4-col1": 4.0, "ocp4-col2": 0.0}
+    assert plan["loads_after"] == {"ocp4-col1": 2.0, "ocp4-col2": 2.0}
+    assert len(plan["moves"]) == 2
+    assert len(await repo.find_by_collector("maas-pool1", "ocp4-col1")) == 4
+
+
+@pytest.mark.asyncio
+async def test_start_moves_jobs_as_delete_create_pairs(repo, service):
+    await _seed(repo, "ocp4-col1", 4)
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock()
+        await service.start("maas-pool1", 0.1, 10, interval=0)
+        status = await _wait(service)
+
+    assert status["state"] == RebalanceState.COMPLETED
+    assert status["completed"] == 2
+    assert len(await repo.find_by_collector("maas-pool1", "ocp4-col2")) == 2
+    actions = [(call.args[0].value, call.args[2]) for call in mock_producer.send_event.call_args_list]
+    assert actions == [("delete", "ocp4-col1"), ("create", "ocp4-col2")] * 2
+
+
+@pytest.mark.asyncio
+async def test_stale_move_is_skipped(repo, service):
+    await _seed(repo, "ocp4-col1", 2)
+    plan = await service.plan("maas-pool1", 0.1, 10)
+    await repo.delete(await repo.get(plan["moves"][0]["job_name"], "maas-pool1", "ocp4-col1"))
+    status = {"maas_pool": "maas-pool1", "plan": plan, "completed": 0, "skipped": 0}
+
+    await service.execute(status, 0)
+
+    assert status["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_produce_failure_rolls_back_and_fails_run(repo, service):
+    await _seed(repo, "ocp4-col1", 2)
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock(side_effect=[None, ProduceFailureError("kafka down"), None])
+        await service.start("maas-pool1", 0.1, 10, interval=0)
+        status = await _wait(service)
+
+    assert status["state"] == RebalanceState.FAILED
+    assert len(await repo.find_by_collector("maas-pool1", "ocp4-col1")) == 2
+    # The delete already reached the source collector, so the job is re-created there
+    assert mock_producer.send_event.call_args.args[0].value == "create"
+    assert mock_producer.send_event.call_args.args[2] == "ocp4-col1"
+
+
+@pytest.mark.asyncio
+async def test_one_run_per_pool(repo, service):
+    await _seed(repo, "ocp4-col1", 2)
+
+    with patch("services.job_service.producer") as mock_producer:
+        mock_producer.send_event = AsyncMock()
+        await service.start("maas-pool1", 0.1, 10, interval=10)
+        with pytest.raises(RebalanceInProgressError):
+            await service.start("maas-pool1", 0.1, 10)
+        await service.runner.stop()
+
+    assert service.status("maas-pool1")["state"] == RebalanceState.CANCELLED
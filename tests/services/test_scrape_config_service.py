@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from models.db_schemas.jobs import GeneralJob
+from models.general.jobs.basic_auth import BasicAuth
+from repositories.job_repository import JobRepository
+from services.scrape_config_service import ScrapeConfigCache, ScrapeConfigService
+from utils.security import security_manager
+
+
+def _job(job_name, collector_cluster="ocp4-col1", **kwargs):
+    return GeneralJob(job_name=job_name, maas_pool="maas-pool1", collector_cluster=collector_cluster,
+                      targets=["host:9100"], **kwargs)
+
+
+@pytest.fixture
+def repo(init_beanie_db):
+    return JobRepository()
+
+
+@pytest.fixture
+def service(repo):
+    return ScrapeConfigService(repo, ScrapeConfigCache(revalidate_interval=0))
+
+
+@pytest.mark.asyncio
+async def test_render_decrypts_basic_auth(repo, service):
+    job = _job("job-b", basic_auth=BasicAuth(username="user", password="secret"))
+    job.basic_auth.password = security_manager.encrypt("secret")
+    await repo.create(job)
+    await repo.create(_job("job-a"))
+
+    rendered = await service.render("maas-pool1", "ocp4-col1")
+    scrape_configs = yaml.safe_load(rendered.body)["scrape_configs"]
+
+    assert [config["job_name"] for config in scrape_configs] == ["job-a", "job-b"]
+    assert scrape_configs[1]["basic_auth"] == {"username": "user", "password": "secret"}
+
+
+@pytest.mark.asyncio
+async def test_render_is_cached_until_collector_changes(repo, service):
+    await repo.create(_job("job-a"))
+    first = await service.render("maas-pool1", "ocp4-col1")
+
+    with patch.object(repo, "find_by_collector", wraps=repo.find_by_collector) as find:
+        assert await service.render("maas-pool1", "ocp4-col1") is first
+
+        # A change on another collector of the same pool keeps the cached bytes
+        await repo.create(_job("job-other", collector_cluster="ocp4-col2"))
+        assert await service.render("maas-pool1", "ocp4-col1") is first
+        find.assert_not_called()
+
+        await repo.create(_job("job-b"))
+        second = await service.render("maas-pool1", "ocp4-col1")
+        find.assert_called_once()
+
+    assert second.etag != first.etag
+    assert b"job-b" in second.body
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_render(repo, service):
+    job = await repo.create(_job("job-a"))
+    await service.render("maas-pool1", "ocp4-col1")
+
+    await repo.delete(job)
+    rendered = await service.render("maas-pool1", "ocp4-col1")
+
+    assert yaml.safe_load(rendered.body) == {"scrape_configs": []}
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_skips_database(repo):
+    service = ScrapeConfigService(repo, ScrapeConfigCache(revalidate_interval=60))
+    await repo.create(_job("job-a"))
+    first = await service.render("maas-pool1", "ocp4-col1")
+
+    with patch.object(repo.sequences, "current", side_effect=AssertionError("database touched")):
+        assert await service.render("maas-pool1", "ocp4-col1") is first
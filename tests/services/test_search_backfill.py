@@ -0,0 +1,80 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from enums.operation_kind import OperationKind
+from enums.operation_state import OperationState
+from models.db_schemas.jobs import GeneralJob
+from repositories.job_repository import SEARCH_FIELDS, JobRepository
+from repositories.operation_repository import OperationRepository
+from services.operation_handlers import register_operation_handlers
+from services.operation_runner import OperationRunner
+from services.operation_service import OperationService
+
+
+async def _store_before_search_fields(repo: JobRepository, job_name: str, labels=None, maas_pool="maas-pool1"):
+    await repo.create(GeneralJob(job_name=job_name, maas_pool=maas_pool, collector_cluster="ocp4-col1",
+                                 targets=["t1"], labels=labels))
+    await repo.collection.update_one({'job_name': job_name, 'maas_pool': maas_pool},
+                                     {'$unset': {field: "" for field in SEARCH_FIELDS}})
+
+
+async def _backfill(maas_pool: str):
+    runner = OperationRunner(workers=1, poll_interval=0.01)
+    register_operation_handlers(runner)
+    service = OperationService(OperationRepository(), runner)
+    submitted = await service.submit(OperationKind.BACKFILL_SEARCH_FIELDS, maas_pool)
+    for _ in range(500):
+        operation = await service.get(submitted['id'], [], True)
+        if operation['state'] in (OperationState.COMPLETED, OperationState.FAILED):
+            await runner.stop()
+            return operation
+        await asyncio.sleep(0.01)
+    raise AssertionError("backfill never finished")
+
+
+@pytest.mark.asyncio
+async def test_jobs_stored_before_the_search_fields_are_found_after_the_backfill(init_beanie_db):
+    repo = JobRepository()
+    for job_name, labels in [("a", {"team": "payments"}), ("b", {"team": "search"}), ("c", None)]:
+        await _store_before_search_fields(repo, job_name, labels)
+    await _store_before_search_fields(repo, "other-pool", {"team": "payments"}, maas_pool="maas-pool2")
+    assert await repo.find_by_labels("maas-pool1", {"label_terms": "team=payments"}, None, 10) == []
+
+    with patch("services.operation_handlers.SEARCH_BACKFILL_BATCH_SIZE", 2):
+        operation = await _backfill("maas-pool1")
+
+    assert operation['state'] == OperationState.COMPLETED
+    assert operation['result'] == {'updated': 3}
+    found = await repo.find_by_labels("maas-pool1", {"label_terms": "team=payments"}, None, 10)
+    assert [job["job_name"] for job in found] == ["a"]
+    assert "label_terms" not in await repo.collection.find_one({'maas_pool': "maas-pool2"})
+
+
+@pytest.mark.asyncio
+async def test_backfill_leaves_jobs_rewritten_meanwhile_alone(init_beanie_db):
+    repo = JobRepository()
+    await _store_before_search_fields(repo, "a", {"team": "payments"})
+    job = await repo.get(job_name="a", maas_pool="maas-pool1", collector_cluster="ocp4-col1")
+    await repo.update(job, {"labels": {"team": "search"}})
+
+    assert await repo.backfill_search_fields("maas-pool1", None, 10) == (None, 0)
+    stored = await repo.collection.find_one({'job_name': "a"})
+    assert stored["label_terms"] == ["team", "team=search"]
+
+
+@pytest.mark.asyncio
+async def test_name_search_finds_backfilled_jobs(init_beanie_db):
+    repo = JobRepository()
+    for job_name in ["Node-Exporter", "node-agent"]:
+        await _store_before_search_fields(repo, job_name)
+    assert await repo.search_by_name_prefix(["maas-pool1"], "node", 10) == []
+
+    operation = await _backfill("maas-pool1")
+
+    assert operation['result'] == {'updated': 2}
+    prefix = await repo.search_by_name_prefix(["maas-pool1"], "node", 10)
+    substring = await repo.search_by_name_ngrams(["maas-pool1"], ["exp", "xpo"], 10)
+    assert [job["job_name"] for job in prefix] == ["node-agent", "Node-Exporter"]
+    assert [job["job_name"] for job in substring] == ["Node-Exporter"]
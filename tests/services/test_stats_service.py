@@ -0,0 +1,110 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from config.constants.jobs import POOL_TOTAL_KEY
+from models.db_schemas.jobs import GeneralJob
+from repositories.job_repository import JobRepository
+from repositories.stats_repository import StatsRepository
+from services.stats_service import StatsService
+from utils.scrape_cost import JobFootprint, JobLoad
+
+
+def _footprint(collector_cluster="ocp4-col1", targets=2):
+    return JobFootprint("maas-pool1", collector_cluster, JobLoad(1, targets, targets / 60))
+
+
+@pytest.fixture
+def mock_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def stats_service(mock_repo):
+    return StatsService(mock_repo, AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_apply_change_same_collector_increments_delta(stats_service, mock_repo):
+    await stats_service.apply_change(_footprint(targets=2), _footprint(targets=3))
+
+    mock_repo.increment.assert_called_once_with(
+        "maas-pool1", "ocp4-col1", JobLoad(0, 1, 3 / 60 - 2 / 60)
+    )
+
+
+@pytest.mark.asyncio
+async def test_apply_change_noop_skips_write(stats_service, mock_repo):
+    await stats_service.apply_change(_footprint(), _footprint())
+
+    mock_repo.increment.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_apply_change_move_between_collectors(stats_service, mock_repo):
+    await stats_service.apply_change(_footprint("ocp4-col1"), _footprint("ocp4-col2"))
+
+    assert mock_repo.increment.call_count == 2
+    assert mock_repo.increment.call_args_list[0].args[1] == "ocp4-col1"
+    assert mock_repo.increment.call_args_list[0].args[2].jobs == -1
+    assert mock_repo.increment.call_args_list[1].args[1] == "ocp4-col2"
+
+
+@pytest.mark.asyncio
+async def test_apply_change_swallows_repo_errors(stats_service, mock_repo):
+    mock_repo.increment.side_effect = RuntimeError("mongo down")
+
+    await stats_service.apply_change(None, _footprint())
+
+
+@pytest.mark.asyncio
+async def test_increment_and_read_pool_stats(init_beanie_db):
+    service = StatsService(StatsRepository(), JobRepository())
+
+    await service.apply_change(None, _footprint("ocp4-col1", targets=6))
+    await service.apply_change(None, _footprint("ocp4-col2", targets=4))
+    await service.apply_change(_footprint("ocp4-col2", targets=4), None)
+
+    stats = await service.get_pool_stats("maas-pool1")
+
+    assert stats["totals"]["job_count"] == 1
+    assert stats["totals"]["target_count"] == 6
+    assert stats["collectors"]["ocp4-col2"]["job_count"] == 0
+    assert POOL_TOTAL_KEY not in stats["collectors"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_from_jobs_in_batches(init_beanie_db):
+    job_repo = JobRepository()
+    for i in range(5):
+        await job_repo.create(
+            GeneralJob(
+                job_name=f"job-{i}",
+                maas_pool="maas-pool1",
+                collector_cluster=f"ocp4-col{i % 2}",
+                scrape_interval=30,
+                targets=["a", "b", "c"],
+            )
+        )
+    service = StatsService(StatsRepository(), job_repo)
+    await service.apply_change(None, _footprint(targets=1000))
+
+    await service.rebuild("maas-pool1", batch_size=2)
+    stats = await service.get_pool_stats("maas-pool1")
+
+    assert stats["totals"] == {"job_count": 5, "target_count": 15, "scrape_rate": 0.5}
+    assert stats["collectors"]["ocp4-col0"]["job_count"] == 3
+    assert set(stats["collectors"]) == {"ocp4-col0", "ocp4-col1"}
+
+
+@pytest.mark.asyncio
+async def test_replace_pool_overwrites_in_place_and_drops_stale_collectors(init_beanie_db):
+    repo = StatsRepository()
+    await repo.increment("maas-pool1", "ocp4-gone", JobLoad(2, 20, 1.0))
+    await repo.increment("maas-pool2", "ocp4-col1", JobLoad(1, 1, 0.1))
+
+    await repo.replace_pool("maas-pool1", {"ocp4-col1": JobLoad(3, 30, 0.5)})
+
+    assert {d["collector_cluster"]: d["job_count"] for d in await repo.get_pool("maas-pool1")} == \
+        {"ocp4-col1": 3, POOL_TOTAL_KEY: 3}
+    assert (await repo.get("maas-pool2"))["job_count"] == 1
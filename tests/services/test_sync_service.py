@@ -0,0 +1,210 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from enums.event_actions import EventActions
+from enums.operation_kind import OperationKind
+from enums.operation_state import OperationState
+from exceptions.collector_not_in_pool_error import CollectorNotInPoolError
+from exceptions.invalid_desired_state_error import InvalidDesiredStateError
+from exceptions.produce_failure_error import ProduceFailureError
+from models.db_schemas.jobs import BaseJob, GeneralJob, HttpJob
+from models.db_schemas.operations import Operation
+from models.validation_schemas.create_schemas.jobs import GeneralJobCreate, HttpJobCreate
+from repositories.job_repository import JobRepository
+from repositories.operation_repository import OperationRepository
+from repositories.sequence_repository import SequenceRepository
+from services.job_service import JobService
+from services.operation_handlers import register_operation_handlers, sync_params
+from services.operation_runner import OperationRunner
+from services.operation_service import OperationService
+from services.sync_service import SyncService
+
+
+@pytest.fixture
+def producer():
+    with patch("services.job_service.producer") as producer:
+        producer.send_event = AsyncMock()
+        yield producer
+
+
+@pytest.fixture
+def service(init_beanie_db, producer):
+    repo = JobRepository()
+    pool_repo = AsyncMock()
+    pool_repo.get.return_value = MagicMock(collector_clusters=["ocp4-col1", "ocp4-col2"], quotas=None)
+    return SyncService(repo, JobService(repo, pool_repo))
+
+
+def general(job_name, targets, **fields):
+    return GeneralJobCreate(job_name=job_name, maas_pool="maas-pool1", targets=targets, **fields)
+
+
+def desired_set():
+    return [
+        general("node", ["host-1:9100"], labels={"team": "infra"}),
+        general("secured", ["host-2:9100"], basic_auth={"username": "user", "password": "secret"}),
+        general("sharded", ["a:1", "b:1", "c:1"], shards=2),
+        HttpJobCreate(job_name="discovery", maas_pool="maas-pool1", endpoints=["http://sd/targets"]),
+    ]
+
+
+async def stored_jobs():
+    return {job.job_name: job for job in await BaseJob.find_all(with_children=True).to_list()}
+
+
+def sent(producer):
+    return sorted((call.args[0], call.args[2], call.args[4]) for call in producer.send_event.await_args_list)
+
+
+async def sync(service, jobs, apply=False):
+    method = service.apply if apply else service.plan
+    return await method("maas-pool1", "ocp4-col1", jobs, ["maas-pool1"], False)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_set_plans_and_applies_without_writes(service, producer):
+    await sync(service, desired_set(), apply=True)
+    seq = await SequenceRepository().current("maas-pool1")
+    producer.send_event.reset_mock()
+
+    plan = await sync(service, desired_set())
+    applied = await sync(service, desired_set(), apply=True)
+
+    assert plan == {'maas_pool': "maas-pool1", 'collector_cluster': "ocp4-col1",
+                    'create': [], 'update': [], 'delete': [], 'unchanged': 4}
+    assert applied['results'] == []
+    assert producer.send_event.await_count == 0
+    assert await SequenceRepository().current("maas-pool1") == seq
+    assert {job.revision for job in (await stored_jobs()).values()} == {0}
+
+
+@pytest.mark.asyncio
+async def test_plan_is_the_minimal_diff(service):
+    await sync(service, desired_set(), apply=True)
+    jobs = desired_set()
+    jobs[0].targets.append("host-9:9100")
+    jobs[1].basic_auth.password = "rotated"
+    del jobs[2]
+    jobs.append(general("new", ["host-3:9100"]))
+
+    plan = await sync(service, jobs)
+
+    assert (plan['create'], plan['update'], plan['delete'], plan['unchanged']) == \
+        (["new"], ["node", "secured"], ["sharded"], 1)
+
+
+@pytest.mark.asyncio
+async def test_apply_sends_one_event_per_changed_job(service, producer):
+    await sync(service, desired_set()[:2], apply=True)
+    producer.send_event.reset_mock()
+    jobs = [general("node", ["host-1:9100", "host-9:9100"]), general("new", ["host-3:9100"])]
+
+    applied = await sync(service, jobs, apply=True)
+
+    assert [(result['job_name'], result['action'], result['status']) for result in applied['results']] == [
+        ("secured", "delete", "deleted"), ("node", "update", "updated"), ("new", "create", "created")]
+    assert sent(producer) == [(EventActions.CREATE, "ocp4-col1", "new"), (EventActions.DELETE, "ocp4-col1", "secured"),
+                              (EventActions.UPDATE, "ocp4-col1", "node")]
+    stored = await stored_jobs()
+    assert sorted(stored) == ["new", "node"]
+    assert stored['node'].targets == ["host-1:9100", "host-9:9100"]
+    assert stored['node'].labels is None
+    assert stored['node'].revision == 1
+    assert (await sync(service, jobs))['unchanged'] == 2
+
+
+@pytest.mark.asyncio
+async def test_type_change_reaches_collectors_as_delete_and_create(service, producer):
+    await sync(service, [general("discovery", ["host-1:9100"])], apply=True)
+    producer.send_event.reset_mock()
+
+    await sync(service, [HttpJobCreate(job_name="discovery", maas_pool="maas-pool1",
+                                       endpoints=["http://sd/targets"])], apply=True)
+
+    assert [call.args[0] for call in producer.send_event.await_args_list] == [EventActions.DELETE, EventActions.CREATE]
+    job = (await stored_jobs())['discovery']
+    assert isinstance(job, HttpJob)
+    assert not hasattr(job, "targets")
+
+
+@pytest.mark.asyncio
+async def test_failed_update_is_rolled_back_and_retried_by_the_next_apply(service, producer):
+    await sync(service, [general("node", ["host-1:9100"])], apply=True)
+    producer.send_event.side_effect = ProduceFailureError("kafka down")
+    jobs = [general("node", ["host-2:9100"])]
+
+    applied = await sync(service, jobs, apply=True)
+
+    assert applied['results'] == [{'job_name': "node", 'action': "update", 'status': "failed",
+                                   'detail': "kafka down"}]
+    assert (await stored_jobs())['node'].targets == ["host-1:9100"]
+    assert (await sync(service, jobs))['update'] == ["node"]
+
+
+@pytest.mark.asyncio
+async def test_jobs_stored_without_a_hash_are_compared_and_backfilled(service, producer):
+    job = GeneralJob(job_name="node", maas_pool="maas-pool1", collector_cluster="ocp4-col1", targets=["host-1:9100"])
+    await JobRepository().create(job)
+    await BaseJob.get_pymongo_collection().update_one({'_id': job.id}, {'$unset': {'content_hash': ""}})
+
+    plan = await sync(service, [general("node", ["host-1:9100"])])
+    await sync(service, [general("node", ["host-1:9100"])], apply=True)
+
+    assert plan['unchanged'] == 1
+    assert producer.send_event.await_count == 0
+    assert (await stored_jobs())['node'].content_hash == JobRepository.content_hash(job.model_dump())
+
+
+@pytest.mark.asyncio
+async def test_other_collectors_are_left_alone(service):
+    await sync(service, [general("node", ["host-1:9100"])], apply=True)
+
+    plan = await service.plan("maas-pool1", "ocp4-col2", [], ["maas-pool1"], False)
+
+    assert plan['delete'] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("jobs, reason", [
+    ([general("node", ["a:1"]), general("node", ["b:1"])], "duplicate job_name node"),
+    ([GeneralJobCreate(job_name="node", maas_pool="maas-pool2", targets=["a:1"])], "belongs to pool maas-pool2"),
+    ([general("node", ["a:1"], collector_cluster="ocp4-col2")], "is placed on ocp4-col2"),
+])
+async def test_invalid_desired_sets_are_rejected(service, jobs, reason):
+    with pytest.raises(InvalidDesiredStateError, match=reason):
+        await sync(service, jobs)
+
+
+@pytest.mark.asyncio
+async def test_collector_must_belong_to_the_pool(service):
+    with pytest.raises(CollectorNotInPoolError):
+        await service.plan("maas-pool1", "ocp4-col9", [], ["maas-pool1"], False)
+
+
+@pytest.mark.asyncio
+async def test_apply_runs_as_an_operation_with_the_set_stored_encrypted(service, producer):
+    await sync(service, [general("gone", ["host-9:9100"])], apply=True)
+    runner = OperationRunner(workers=1, poll_interval=0.01)
+    register_operation_handlers(runner)
+    operations = OperationService(OperationRepository(), runner)
+
+    with patch("services.operation_handlers.PoolRepository", return_value=service.job_service.pool_service.repo):
+        params = sync_params("maas-pool1", "ocp4-col1", desired_set())
+        submitted = await operations.submit_for_pool(OperationKind.SYNC_COLLECTOR, "maas-pool1", params,
+                                                     ["maas-pool1"], False)
+        assert "secret" not in (await Operation.get_pymongo_collection().find_one({}))['params']['jobs']
+        for _ in range(500):
+            operation = await operations.get(submitted['id'], [], True)
+            if operation['state'] in (OperationState.COMPLETED, OperationState.FAILED):
+                break
+            await asyncio.sleep(0.01)
+        await runner.stop()
+
+    items = await operations.get_items(submitted['id'], None, 100, [], True)
+    assert operation['state'] == OperationState.COMPLETED
+    assert operation['progress'] == {'total': 5, 'done': 5, 'failed': 0}
+    assert {item['key']: item['status'] for item in items['items']} == {
+        'gone': "deleted", 'node': "created", 'secured': "created", 'sharded': "created", 'discovery': "created"}
+    assert (await stored_jobs())['secured'].basic_auth.password != "secret"
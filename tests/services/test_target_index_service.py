@@ -0,0 +1,99 @@
+import pytest
+
+from models.db_schemas.jobs import GeneralJob
+from repositories.job_repository import JobRepository
+from services.target_index_service import TargetIndexService
+
+
+def _job(job_name, targets, collector_cluster="ocp4-col1", **kwargs):
+    return GeneralJob(job_name=job_name, maas_pool="maas-pool1", collector_cluster=collector_cluster,
+                      targets=targets, **kwargs)
+
+
+@pytest.fixture
+def repo(init_beanie_db):
+    return JobRepository()
+
+
+@pytest.fixture
+def service(repo):
+    return TargetIndexService(repo.targets, repo)
+
+
+def _jobs(result):
+    return [(job["collector_cluster"], job["job_name"]) for job in result["jobs"]]
+
+
+@pytest.mark.asyncio
+async def test_lookup_follows_job_writes(repo, service):
+    job = await repo.create(_job("job-a", ["Host1:9100", "host2:9100"]))
+    await repo.create(_job("job-b", ["host1:9100"], collector_cluster="ocp4-col2"))
+
+    result = await service.find_jobs(["maas-pool1"], " HOST1:9100 ", 10)
+    assert result["target"] == "host1:9100"
+    assert _jobs(result) == [("ocp4-col1", "job-a"), ("ocp4-col2", "job-b")]
+
+    job.targets = ["host2:9100", "host3:9100"]
+    await repo.save(job)
+    assert _jobs(await service.find_jobs(["maas-pool1"], "host1:9100", 10)) == [("ocp4-col2", "job-b")]
+    assert _jobs(await service.find_jobs(["maas-pool1"], "host3:9100", 10)) == [("ocp4-col1", "job-a")]
+
+    await repo.update(job, {"job_name": "job-renamed", "collector_cluster": "ocp4-col3"})
+    assert _jobs(await service.find_jobs(["maas-pool1"], "host2:9100", 10)) == [("ocp4-col3", "job-renamed")]
+
+    await repo.delete(job)
+    assert await service.find_jobs(["maas-pool1"], "host2:9100", 10) == {"target": "host2:9100", "jobs": []}
+    assert await service.find_jobs(["other-pool"], "host1:9100", 10) == {"target": "host1:9100", "jobs": []}
+
+
+@pytest.mark.asyncio
+async def test_duplicates_per_collector(repo, service):
+    await repo.create(_job("job-a", ["host1:9100", "host2:9100"]))
+    await repo.create(_job("job-b", ["HOST1:9100", "host3:9100"]))
+    await repo.create(_job("job-c", ["host2:9100"], collector_cluster="ocp4-col2"))
+
+    report = await service.get_duplicates("maas-pool1", "ocp4-col1", 10)
+
+    assert report["duplicates"] == [{"target": "host1:9100", "jobs": ["job-a", "job-b"]}]
+    assert (await service.get_duplicates("maas-pool1", "ocp4-col2", 10))["duplicates"] == []
+
+
+@pytest.mark.asyncio
+async def test_sharded_job_targets_point_to_their_shard(repo, service):
+    targets = [f"host{i}:9100" for i in range(20)]
+    await repo.create(_job("job-s", targets, shard_collectors=["ocp4-col1", "ocp4-col2"]))
+
+    collectors = {_jobs(await service.find_jobs(["maas-pool1"], target, 10))[0][0] for target in targets}
+
+    assert collectors == {"ocp4-col1", "ocp4-col2"}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_restores_index(repo, service):
+    await repo.create(_job("job-a", ["host1:9100"]))
+    await repo.create(_job("job-b", ["host1:9100"]))
+    await repo.targets.collection.delete_many({})
+
+    await service.rebuild("maas-pool1", batch_size=1)
+
+    report = await service.get_duplicates("maas-pool1", "ocp4-col1", 10)
+    assert report["duplicates"] == [{"target": "host1:9100", "jobs": ["job-a", "job-b"]}]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_drift_in_place(repo, service):
+    kept = await repo.create(_job("job-a", ["host1:9100", "host2:9100"]))
+    orphan = await repo.create(_job("job-gone", ["host3:9100"]))
+    await orphan.delete()
+    entries = repo.targets.collection
+    await entries.update_one({"target": "host2:9100"}, {"$set": {"collector_cluster": "ocp4-col9"}})
+    await entries.insert_one({"job_id": kept.id, "maas_pool": "maas-pool1", "collector_cluster": "ocp4-col1",
+                              "job_name": "job-a", "target": "stale:9100"})
+    untouched = await entries.find_one({"target": "host1:9100"})
+
+    await service.rebuild("maas-pool1", batch_size=1)
+
+    stored = await entries.find({}, {"_id": 0, "target": 1, "collector_cluster": 1}).to_list(length=None)
+    assert sorted((entry["target"], entry["collector_cluster"]) for entry in stored) == [
+        ("host1:9100", "ocp4-col1"), ("host2:9100", "ocp4-col1")]
+    assert (await entries.find_one({"target": "host1:9100"}))["_id"] == untouched["_id"]
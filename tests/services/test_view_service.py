@@ -0,0 +1,115 @@
+import pytest
+
+from models.db_schemas.jobs import GeneralJob, KubernetesJob
+from repositories.job_repository import JobRepository
+from repositories.view_repository import CollectorViewRepository, view_chunk
+from services.view_service import CollectorViewService
+
+
+def _job(job_name, collector_cluster="ocp4-col1", targets=None):
+    return GeneralJob(job_name=job_name, maas_pool="maas-pool1", collector_cluster=collector_cluster,
+                      targets=targets or ["host:9100"])
+
+
+@pytest.fixture
+def views(init_beanie_db):
+    return CollectorViewRepository()
+
+
+@pytest.fixture
+def repo(views):
+    return JobRepository(views=views)
+
+
+@pytest.fixture
+def service(views, repo):
+    return CollectorViewService(views, repo)
+
+
+@pytest.mark.asyncio
+async def test_view_follows_job_writes(repo, service):
+    job = await repo.create(_job("job-a"))
+    await repo.create(KubernetesJob(job_name="job-k8s", maas_pool="maas-pool1", collector_cluster="ocp4-col1",
+                                    namespaces=["ns1"]))
+
+    jobs = await service.get_jobs("maas-pool1", "ocp4-col1")
+    assert jobs[0] == {"job_name": "job-a", "job_type": "general", **job.to_event_data()}
+    assert jobs[1]["job_type"] == "kubernetes_sd"
+
+    job.targets.append("host2:9100")
+    await repo.save(job)
+    jobs = await service.get_jobs("maas-pool1", "ocp4-col1")
+    assert jobs[0]["targets"] == ["host:9100", "host2:9100"]
+
+    await repo.delete(job)
+    assert [j["job_name"] for j in await service.get_jobs("maas-pool1", "ocp4-col1")] == ["job-k8s"]
+
+
+@pytest.mark.asyncio
+async def test_view_follows_collector_move(repo, service):
+    job = await repo.create(_job("job-a"))
+
+    await repo.update(job, {"collector_cluster": "ocp4-col2"})
+
+    assert await service.get_jobs("maas-pool1", "ocp4-col1") == []
+    assert [j["job_name"] for j in await service.get_jobs("maas-pool1", "ocp4-col2")] == ["job-a"]
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_write_is_ignored(views):
+    await views.put("maas-pool1", "ocp4-col1", "job-a", {"seq": 5, "job_type": "general", "job": {"targets": ["new"]}})
+    await views.put("maas-pool1", "ocp4-col1", "job-a", {"seq": 3, "job_type": "general", "job": {"targets": ["old"]}})
+    await views.remove("maas-pool1", "ocp4-col1", "job-a", 4)
+
+    jobs = await views.get_jobs("maas-pool1", "ocp4-col1")
+    assert jobs == [{"job_name": "job-a", "job_type": "general", "targets": ["new"]}]
+
+
+@pytest.mark.asyncio
+async def test_shard_of_a_collector_with_dots_in_its_name(views):
+    entry = {"seq": 1, "job_type": "general", "job": {"targets": ["host:9100"]}}
+    await views.put("maas-pool1", "ocp4-eu.prod", "web~ocp4-eu.prod", entry)
+    await views.replace_pool("maas-pool2", {("ocp4-eu.prod", view_chunk("web~ocp4-eu.prod")): {"web~ocp4-eu.prod": entry}})
+
+    for maas_pool in ("maas-pool1", "maas-pool2"):
+        jobs = await views.get_jobs(maas_pool, "ocp4-eu.prod")
+        assert [job["job_name"] for job in jobs] == ["web~ocp4-eu.prod"]
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_spread_over_chunks(repo, views):
+    for i in range(20):
+        await repo.create(_job(f"job-{i}"))
+
+    chunks = {view_chunk(f"job-{i}") for i in range(20)}
+    assert await views.collection.count_documents({"maas_pool": "maas-pool1"}) == len(chunks)
+    assert len(await views.get_jobs("maas-pool1", "ocp4-col1")) == 20
+
+
+@pytest.mark.asyncio
+async def test_rebuild_from_jobs(init_beanie_db, views, service):
+    unviewed = JobRepository()
+    await unviewed.create(_job("job-a"))
+    await unviewed.create(_job("job-b", collector_cluster="ocp4-col2"))
+    await views.put("maas-pool1", "ocp4-col3", "job-gone", {"seq": 1, "job_type": "general", "job": {}})
+
+    await service.rebuild("maas-pool1", batch_size=1)
+
+    assert [j["job_name"] for j in await service.get_jobs("maas-pool1", "ocp4-col1")] == ["job-a"]
+    assert [j["job_name"] for j in await service.get_jobs("maas-pool1", "ocp4-col2")] == ["job-b"]
+    assert await service.get_jobs("maas-pool1", "ocp4-col3") == []
+
+
+@pytest.mark.asyncio
+async def test_catch_up_replays_changes_after_snapshot(init_beanie_db, views, service):
+    unviewed = JobRepository()
+    job = await unviewed.create(_job("job-a"))
+    since = await unviewed.sequences.current("maas-pool1")
+    await service.rebuild("maas-pool1")
+
+    # Writes that land while a rebuild scans are replayed from the change feed
+    await unviewed.create(_job("job-b"))
+    await unviewed.delete(job)
+    assert await service._catch_up("maas-pool1", since, 1) == 2
+
+    assert [j["job_name"] for j in await service.get_jobs("maas-pool1", "ocp4-col1")] == ["job-b"]
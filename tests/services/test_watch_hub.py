@@ -0,0 +1,136 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from enums.change_types import ChangeType
+from services.watch_hub import HEARTBEAT, OVERFLOW, JobWatchHub
+
+
+def _change(seq, collector_cluster="ocp4-col1", action=ChangeType.UPSERT, shard_collectors=None):
+    return {
+        "seq": seq,
+        "action": action,
+        "job_name": f"job-{seq}",
+        "collector_cluster": collector_cluster,
+        "job_type": "general",
+        "shard_collectors": shard_collectors,
+    }
+
+
+@pytest.fixture
+def mock_repo():
+    repo = MagicMock()
+    repo.sequences.current = AsyncMock(return_value=0)
+    repo.get_changes = AsyncMock(return_value=([], False))
+    return repo
+
+
+def _hub(repo, **kwargs):
+    return JobWatchHub(repo=repo, poll_interval=0.01, **kwargs)
+
+
+async def _next(stream):
+    return await asyncio.wait_for(stream.__anext__(), 1)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_filters_by_collector(mock_repo):
+    batches = [([_change(1), _change(2, "ocp4-col2")], False)]
+    mock_repo.get_changes.side_effect = lambda *a, **k: batches.pop(0) if batches else ([], False)
+    hub = _hub(mock_repo)
+
+    all_jobs = hub.stream(await hub.subscribe("maas-pool1"))
+    col2_only = hub.stream(await hub.subscribe("maas-pool1", "ocp4-col2"))
+
+    assert b"id: 1\n" in await _next(all_jobs)
+    assert b"id: 2\n" in await _next(all_jobs)
+    assert b"id: 2\n" in await _next(col2_only)
+    assert hub.subscriber_count("maas-pool1") == 2
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_shard_collectors_receive_their_sharded_jobs(mock_repo):
+    sharded = ["ocp4-col1", "ocp4-col2"]
+    batches = [([_change(1, shard_collectors=sharded), _change(2), _change(3, action=ChangeType.DELETE,
+                                                                              shard_collectors=sharded)], False)]
+    mock_repo.get_changes.side_effect = lambda *a, **k: batches.pop(0) if batches else ([], False)
+    hub = _hub(mock_repo)
+
+    shard = hub.stream(await hub.subscribe("maas-pool1", "ocp4-col2"))
+
+    assert b"id: 1\n" in await _next(shard)
+    assert b"id: 3\n" in await _next(shard)
+    resumed = await hub.subscribe("maas-pool1", "ocp4-col2", last_event_id=0)
+    assert [event.seq for event in resumed.backlog] == [1, 3]
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_single_poller_per_pool(mock_repo):
+    hub = _hub(mock_repo)
+
+    await hub.subscribe("maas-pool1")
+    await hub.subscribe("maas-pool1")
+    await asyncio.sleep(0.05)
+
+    pool_wide_polls = [c for c in mock_repo.get_changes.call_args_list if c.args[1] is None]
+    assert len(pool_wide_polls) <= 6
+    assert len(hub._feeds) == 1
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped(mock_repo):
+    batches = [([_change(seq) for seq in range(1, 6)], False)]
+    mock_repo.get_changes.side_effect = lambda *a, **k: batches.pop(0) if batches else ([], False)
+    hub = _hub(mock_repo, buffer_size=2)
+
+    subscription = await hub.subscribe("maas-pool1")
+    await asyncio.sleep(0.05)
+
+    assert subscription.dropped
+    assert hub.subscriber_count("maas-pool1") == 0
+    assert await _next(hub.stream(subscription)) == OVERFLOW
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_resume_from_history(mock_repo):
+    batches = [([_change(1), _change(2), _change(3)], False)]
+    mock_repo.get_changes.side_effect = lambda *a, **k: batches.pop(0) if batches else ([], False)
+    hub = _hub(mock_repo)
+    await hub.subscribe("maas-pool1")
+    await asyncio.sleep(0.05)
+
+    resumed = hub.stream(await hub.subscribe("maas-pool1", last_event_id=1))
+
+    assert b"id: 2\n" in await _next(resumed)
+    assert b"id: 3\n" in await _next(resumed)
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_resume_before_history_reads_change_feed(mock_repo):
+    mock_repo.sequences.current.return_value = 10
+    mock_repo.get_changes.side_effect = lambda pool, collector, since, *a, **k: (
+        ([_change(4), _change(9)], False) if since == 2 else ([], False)
+    )
+    hub = _hub(mock_repo)
+
+    resumed = hub.stream(await hub.subscribe("maas-pool1", "ocp4-col1", last_event_id=2))
+
+    assert b"id: 4\n" in await _next(resumed)
+    assert b"id: 9\n" in await _next(resumed)
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_when_idle(mock_repo):
+    hub = _hub(mock_repo, heartbeat_interval=0.01)
+
+    stream = hub.stream(await hub.subscribe("maas-pool1"))
+
+    assert await _next(stream) == HEARTBEAT
+    await hub.stop()
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from services.write_scheduler import WriteScheduler, scheduled_write
+
+
+async def _run(scheduler: WriteScheduler, maas_pool: str, order: list, gate: asyncio.Event):
+    async with scheduler.slot(maas_pool):
+        order.append(maas_pool)
+        await gate.wait()
+
+
+async def _drain(tasks, gate: asyncio.Event):
+    gate.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_quiet_pool_overtakes_saturated_pool():
+    scheduler = WriteScheduler(max_concurrency=1)
+    order, gate = [], asyncio.Event()
+    tasks = [asyncio.create_task(_run(scheduler, "heavy", order, gate)) for _ in range(10)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_run(scheduler, "quiet", order, gate)))
+    await asyncio.sleep(0)
+
+    assert scheduler.queue_depth("heavy") == 9
+    await _drain(tasks, gate)
+
+    assert order[:3] == ["heavy", "quiet", "heavy"]
+
+
+@pytest.mark.asyncio
+async def test_weights_split_slots():
+    scheduler = WriteScheduler(max_concurrency=1, weights={"big": 2.0})
+    order, gate = [], asyncio.Event()
+    blocker = asyncio.create_task(_run(scheduler, "other", order, gate))
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(_run(scheduler, pool, order, gate)) for _ in range(4) for pool in ("big", "small")]
+    await asyncio.sleep(0)
+
+    await _drain([blocker, *tasks], gate)
+
+    assert order[1:7].count("big") == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_frees_its_place():
+    scheduler = WriteScheduler(max_concurrency=1)
+    order, gate = [], asyncio.Event()
+    first = asyncio.create_task(_run(scheduler, "a", order, gate))
+    waiter = asyncio.create_task(_run(scheduler, "b", order, gate))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    await _drain([first], gate)
+
+    metrics = scheduler.metrics()
+    assert (metrics['running'], metrics['queued'], metrics['pools']['b']['admitted']) == (0, 0, 0)
+    async with scheduler.slot("b"):
+        assert scheduler.running == 1
+
+
+@pytest.mark.asyncio
+async def test_nested_scheduled_calls_share_the_slot():
+    class Service:
+        def __init__(self):
+            self.scheduler = WriteScheduler(max_concurrency=1)
+
+        @scheduled_write
+        async def outer(self, maas_pool: str):
+            return await self.inner(maas_pool=maas_pool)
+
+        @scheduled_write
+        async def inner(self, maas_pool: str):
+            return self.scheduler.running
+
+    service = Service()
+
+    assert await asyncio.wait_for(service.outer("pool"), timeout=1) == 1
+    assert service.scheduler.metrics()['pools']['pool']['admitted'] == 1
@@ -0,0 +1,92 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from starlette.requests import Request
+
+from exceptions.rate_limit_exceeded_error import RateLimitExceededError
+from models.db_schemas.api_keys import ApiKey
+from services.rate_limiter import RateLimiter
+from utils.authorization import get_api_key, get_collector_api_key
+
+SCARCE = {"rate": 0.001, "burst": 1}
+
+
+def _request(maas_pool=None, path_params=None) -> Request:
+    query = f"maas_pool={maas_pool}".encode() if maas_pool else b""
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": query,
+                    "path_params": path_params or {}})
+
+
+@pytest.fixture
+def limiter():
+    with patch("utils.authorization.rate_limiter", RateLimiter()) as limiter:
+        yield limiter
+
+
+@pytest.mark.asyncio
+async def test_key_limit_applies_from_the_first_request(init_beanie_db, limiter):
+    service = AsyncMock()
+    service.validate_key.return_value = ApiKey(key="hash", maas_pools=["maas-pool1"], rate_limit=0.001, rate_burst=1)
+
+    request = _request()
+    await get_api_key(request, "raw-key", service)
+    assert request.state.rate_limit.remaining == 0
+
+    with pytest.raises(RateLimitExceededError) as error:
+        await get_api_key(_request(), "raw-key", service)
+
+    assert error.value.decision.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_keys_get_no_bucket(init_beanie_db, limiter):
+    service = AsyncMock()
+    service.validate_key.return_value = None
+
+    for i in range(3):
+        assert await get_api_key(_request("maas-pool1"), f"made-up-{i}", service) is None
+
+    assert len(limiter) == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_limit_only_charges_authorized_keys(init_beanie_db, limiter):
+    service = AsyncMock()
+    service.validate_key.return_value = ApiKey(key="hash", maas_pools=["maas-pool1"])
+
+    with patch("utils.authorization.POOL_RATE_LIMITS", {"maas-pool1": {"pool": SCARCE}, "other-pool": {"pool": SCARCE}}):
+        await get_api_key(_request("other-pool"), "raw-key", service)
+        await get_api_key(_request("other-pool"), "raw-key", service)
+        await get_api_key(_request("maas-pool1"), "raw-key", service)
+        with pytest.raises(RateLimitExceededError):
+            await get_api_key(_request("maas-pool1"), "raw-key", service)
+
+    assert limiter.limits("pool:other-pool") is None
+
+
+@pytest.mark.asyncio
+async def test_pool_key_override_gives_keys_a_budget_of_their_own_on_the_pool(init_beanie_db, limiter):
+    service = AsyncMock()
+    service.validate_key.return_value = ApiKey(key="hash", maas_pools=["maas-pool1", "maas-pool2"])
+
+    with patch("utils.authorization.POOL_RATE_LIMITS", {"maas-pool1": {"key": SCARCE}}):
+        await get_api_key(_request("maas-pool1"), "raw-key", service)
+        with pytest.raises(RateLimitExceededError):
+            await get_api_key(_request("maas-pool1"), "raw-key", service)
+        await get_api_key(_request("maas-pool2"), "raw-key", service)
+
+    assert limiter.limits("key:hash@maas-pool1") == (0.001, 1)
+    assert limiter.limits("key:hash") == (50, 100)
+
+
+@pytest.mark.asyncio
+async def test_collector_load_reports_have_their_own_bucket(init_beanie_db, limiter):
+    service = AsyncMock()
+    service.validate_key.return_value = ApiKey(key="hash", maas_pools=["maas-pool1"])
+
+    with patch("utils.authorization.POOL_RATE_LIMITS", {"maas-pool1": {"pool": SCARCE, "key": SCARCE}}):
+        for _ in range(5):
+            await get_collector_api_key(_request("maas-pool1", {"collector_cluster": "ocp4-col1"}), "raw-key", service)
+        await get_api_key(_request("maas-pool1"), "raw-key", service)
+
+    assert limiter.limits("collector_load:maas-pool1/ocp4-col1") == (1, 10)
@@ -0,0 +1,88 @@
+import pytest
+
+from enums.circuit_state import CircuitState
+from exceptions.circuit_open_error import CircuitOpenError
+from utils.circuit_breaker import CircuitBreaker
+from utils.fault_injection import FaultInjector
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_types=(ConnectionError,), failure_threshold=2, reset_timeout=5.0, clock=clock)
+
+
+async def _ok():
+    return "ok"
+
+
+async def _fail(injector: FaultInjector, breaker: CircuitBreaker, count: int):
+    injector.fail_next(count, ConnectionError)
+    for _ in range(count):
+        with pytest.raises(ConnectionError):
+            await breaker.call(injector.wrap(_ok))
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures_and_fails_fast(breaker):
+    injector = FaultInjector()
+    await _fail(injector, breaker, 2)
+
+    with pytest.raises(CircuitOpenError) as error:
+        await breaker.call(injector.wrap(_ok))
+
+    assert error.value.retry_after == 5.0
+    assert injector.calls == 2
+    assert breaker.metrics()['rejected'] == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens(breaker, clock):
+    injector = FaultInjector()
+    await _fail(injector, breaker, 2)
+    clock.now = 5.0
+
+    await _fail(injector, breaker, 1)
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now = 10.0
+    assert await breaker.call(_ok) == "ok"
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.transitions == {'closed->open': 1, 'open->half_open': 2, 'half_open->open': 1,
+                                   'half_open->closed': 1}
+
+
+@pytest.mark.asyncio
+async def test_only_one_probe_while_half_open(breaker, clock):
+    await _fail(FaultInjector(), breaker, 2)
+    clock.now = 5.0
+
+    breaker.before_call()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_other_errors_prove_the_dependency_is_up(breaker):
+    injector = FaultInjector()
+    await _fail(injector, breaker, 1)
+    injector.fail_next(1, lambda: ValueError("duplicate"))
+
+    with pytest.raises(ValueError):
+        await breaker.call(injector.wrap(_ok))
+    await _fail(injector, breaker, 1)
+
+    assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,37 @@
+from utils.content_hash import job_content_hash
+
+JOB = {'job_name': "node", 'job_type': "general", 'targets': ["a:1"], 'labels': {'team': "infra"},
+       'maas_pool': "maas-pool1", 'collector_cluster': "ocp4-col1"}
+
+
+def test_placement_and_bookkeeping_do_not_count():
+    moved = {**JOB, 'collector_cluster': "ocp4-col2", 'revision': 3, 'seq': 17, 'label_terms': ["team=infra"]}
+
+    assert job_content_hash(moved) == job_content_hash(JOB)
+
+
+def test_unset_fields_and_key_order_do_not_count():
+    reordered = dict(reversed(list({**JOB, 'metrics_path': None}.items())))
+
+    assert job_content_hash(reordered) == job_content_hash(JOB)
+    assert job_content_hash({**JOB, 'labels': {}}) == job_content_hash({k: v for k, v in JOB.items() if k != 'labels'})
+
+
+def test_content_changes_the_hash():
+    assert job_content_hash({**JOB, 'targets': ["a:1", "b:1"]}) != job_content_hash(JOB)
+    assert job_content_hash({**JOB, 'job_type': "blackbox"}) != job_content_hash(JOB)
+
+
+def test_shards_count_by_number_not_collectors():
+    placed = {**JOB, 'shard_collectors': ["ocp4-col1", "ocp4-col2"]}
+
+    assert job_content_hash(placed) == job_content_hash({**JOB, 'shards': 2})
+    assert job_content_hash(placed) != job_content_hash(JOB)
+
+
+def test_password_is_compared_in_plaintext():
+    job = {**JOB, 'basic_auth': {'username': "user", 'password': "ciphertext-1"}}
+    reencrypted = {**JOB, 'basic_auth': {'username': "user", 'password': "ciphertext-2"}}
+
+    assert job_content_hash(job, "secret") == job_content_hash(reencrypted, "secret")
+    assert job_content_hash(job, "secret") != job_content_hash(job, "rotated")
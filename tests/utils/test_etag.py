@@ -0,0 +1,29 @@
+from utils.etag import content_etag, etag_matches, job_etag
+
+
+def test_job_etag_is_strong_and_quoted():
+    etag = job_etag("65f0c0ffee", 3)
+
+    assert etag == '"65f0c0ffee-3"'
+    assert not etag.startswith("W/")
+
+
+def test_etag_matches_single_and_list():
+    etag = job_etag("abc", 1)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other-1", {etag}', etag)
+    assert not etag_matches(job_etag("abc", 2), etag)
+
+
+def test_etag_matches_weak_and_wildcard():
+    etag = job_etag("abc", 1)
+
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+
+
+def test_content_etag_is_stable_per_body():
+    assert content_etag(b"a") == content_etag(b"a")
+    assert content_etag(b"a") != content_etag(b"b")
+    assert content_etag(b"a").startswith('"')
@@ -0,0 +1,41 @@
+import pytest
+
+from utils.hash_ring import HashRing, hash_ring
+
+
+def test_node_for_is_deterministic():
+    ring = HashRing(["ocp4-a", "ocp4-b", "ocp4-c"])
+
+    assert ring.node_for("job-1") == HashRing(["ocp4-c", "ocp4-b", "ocp4-a"]).node_for("job-1")
+    assert len(ring) == 3
+
+
+def test_keys_spread_over_nodes():
+    ring = HashRing(["ocp4-a", "ocp4-b", "ocp4-c"])
+    counts = {}
+    for i in range(3000):
+        node = ring.node_for(f"job-{i}")
+        counts[node] = counts.get(node, 0) + 1
+
+    assert set(counts) == {"ocp4-a", "ocp4-b", "ocp4-c"}
+    assert min(counts.values()) > 600
+
+
+def test_adding_a_node_only_moves_its_share():
+    keys = [f"job-{i}" for i in range(3000)]
+    before = HashRing(["ocp4-a", "ocp4-b", "ocp4-c"])
+    after = HashRing(["ocp4-a", "ocp4-b", "ocp4-c", "ocp4-d"])
+
+    moved = [key for key in keys if before.node_for(key) != after.node_for(key)]
+
+    assert all(after.node_for(key) == "ocp4-d" for key in moved)
+    assert len(moved) < len(keys) / 2
+
+
+def test_empty_ring_raises():
+    with pytest.raises(ValueError):
+        HashRing([]).node_for("job")
+
+
+def test_hash_ring_is_shared_per_node_set():
+    assert hash_ring(("ocp4-a", "ocp4-b")) is hash_ring(("ocp4-a", "ocp4-b"))
@@ -0,0 +1,46 @@
+import pytest
+
+from exceptions.invalid_label_selector_error import InvalidLabelSelectorError
+from utils.label_selector import label_terms, parse_label_selector
+
+
+def test_label_terms():
+    assert label_terms({"team": "payments", "env": "prod"}) == [
+        "team",
+        "env",
+        "team=payments",
+        "env=prod",
+    ]
+    assert label_terms(None) == []
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        ("team=payments", {"label_terms": "team=payments"}),
+        ("team==payments", {"label_terms": "team=payments"}),
+        ("team!=payments", {"label_terms": {"$ne": "team=payments"}}),
+        ("team", {"label_terms": "team"}),
+        ("!team", {"label_terms": {"$ne": "team"}}),
+        ("env in (prod, staging)", {"label_terms": {"$in": ["env=prod", "env=staging"]}}),
+        ("env notin (dev)", {"label_terms": {"$nin": ["env=dev"]}}),
+    ],
+)
+def test_single_requirement(selector, expected):
+    assert parse_label_selector(selector) == expected
+
+
+def test_multiple_requirements_are_anded():
+    assert parse_label_selector("team=payments,env in (a,b),!legacy") == {
+        "$and": [
+            {"label_terms": "team=payments"},
+            {"label_terms": {"$in": ["env=a", "env=b"]}},
+            {"label_terms": {"$ne": "legacy"}},
+        ]
+    }
+
+
+@pytest.mark.parametrize("selector", ["", "team=", "te am=x", "env in ()", "team=pay,", "bad$key"])
+def test_invalid_selectors(selector):
+    with pytest.raises(InvalidLabelSelectorError):
+        parse_label_selector(selector)
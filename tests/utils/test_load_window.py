@@ -0,0 +1,41 @@
+from utils.load_window import LoadWindow, percentile, summarize_values
+
+
+def _report(value: float):
+    return {"scrape_duration_seconds": value, "samples_per_second": value * 10, "memory_bytes": value * 100}
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_summarize_values():
+    assert summarize_values([3.0, 1.0, 2.0], (50,)) == {"mean": 2.0, "max": 3.0, "p50": 2.0}
+
+
+def test_window_keeps_only_the_latest_reports():
+    window = LoadWindow(capacity=4)
+    for second in range(1, 7):
+        window.add(float(second), _report(second))
+
+    summary = window.summarize(0.0, (50,))
+
+    assert len(window) == 4
+    assert window.last_report == 6.0
+    assert summary["reports"] == 4
+    assert summary["scrape_duration_seconds"]["max"] == 6.0
+    assert summary["samples_per_second"]["mean"] == 45.0
+
+
+def test_window_summarize_since():
+    window = LoadWindow(capacity=8)
+    for second in range(1, 6):
+        window.add(float(second), _report(second))
+
+    assert window.summarize(3.0, (50,))["reports"] == 2
+    assert window.summarize(5.0, (50,)) is None
+    assert LoadWindow(capacity=8).summarize(0.0, (50,)) is None
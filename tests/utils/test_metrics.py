@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.routing import APIRoute
+from prometheus_client import REGISTRY
+from pymongo.errors import DuplicateKeyError
+
+from models.db_schemas.job_stats import JobStats
+from producer import KafkaProducer
+from repositories.base_repository import BaseRepository
+from services.idempotency_service import IdempotencyCache
+from utils.fault_injection import FaultInjector, FaultyKafkaClient
+from utils.metrics import RequestMetricsMiddleware, render_metrics, route_label
+from utils.security import SecurityManager
+
+
+class TimedRepository(BaseRepository[JobStats]):
+    def __init__(self):
+        super().__init__(JobStats)
+        self.injector = FaultInjector()
+
+    async def insert_value(self):
+        await self.injector.maybe_fail()
+        return await self.get_value()
+
+    async def get_value(self):
+        return "value"
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_route_label_is_the_path_template():
+    route = APIRoute("/v1/jobs/{job_name}", endpoint=lambda job_name: None)
+
+    assert route_label({"route": route}) == "/v1/jobs/{job_name}"
+    assert route_label({}) == "unmatched"
+
+
+@pytest.mark.asyncio
+async def test_requests_are_timed_by_route_template_and_status():
+    route = APIRoute("/v1/jobs/{job_name}", endpoint=lambda job_name: None)
+
+    async def app(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 404})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    labels = {"method": "GET", "route": "/v1/jobs/{job_name}", "status": "404"}
+    before = sample("maas_http_request_duration_seconds_count", **labels)
+    await RequestMetricsMiddleware(app)({"type": "http", "method": "GET"}, None, send)
+
+    assert sample("maas_http_request_duration_seconds_count", **labels) == before + 1
+    assert sample("maas_http_requests_in_flight") == 0
+
+
+@pytest.mark.asyncio
+async def test_repository_calls_are_timed_once_by_outcome():
+    labels = {"repository": "TimedRepository", "method": "insert_value"}
+    before = sample("maas_mongo_operation_duration_seconds_count", **labels, outcome="ok")
+    repo = TimedRepository()
+
+    await repo.insert_value()
+    repo.injector.fail_next(1, lambda: DuplicateKeyError("dup"))
+    with pytest.raises(DuplicateKeyError):
+        await repo.insert_value()
+
+    assert sample("maas_mongo_operation_duration_seconds_count", **labels, outcome="ok") == before + 1
+    assert sample("maas_mongo_operation_duration_seconds_count", **labels, outcome="error") >= 1
+    assert sample("maas_mongo_operation_duration_seconds_count", repository="TimedRepository",
+                  method="get_value", outcome="ok") == 0
+
+
+@pytest.mark.asyncio
+async def test_produce_latency_and_in_flight():
+    before = sample("maas_kafka_produce_duration_seconds_count", outcome="ok")
+    with patch.object(KafkaProducer(), "_producer", FaultyKafkaClient()):
+        await KafkaProducer().send_event("create", "maas-pool1", "collector1", "general", "job1", {})
+
+    assert sample("maas_kafka_produce_duration_seconds_count", outcome="ok") == before + 1
+    assert sample("maas_kafka_produce_in_flight") == 0
+
+
+def test_encryption_is_timed():
+    before = sample("maas_crypto_duration_seconds_count", operation="decrypt")
+    manager = SecurityManager("Tl9K-DqB_FvT_Hw-yQoyZzJz_ZzJz_ZzJz_ZzJz_ZzI=")
+
+    assert manager.decrypt(manager.encrypt("secret")) == "secret"
+    assert sample("maas_crypto_duration_seconds_count", operation="decrypt") == before + 1
+
+
+def test_cache_lookups_are_counted():
+    cache = IdempotencyCache()
+    cache.put("key", "fingerprint", {})
+
+    cache.get("key")
+    cache.get("other")
+
+    assert cache.lookups == {'hit': 1, 'miss': 1}
+
+
+def test_scrape_includes_state_read_at_collection():
+    body = render_metrics().decode()
+
+    assert 'maas_circuit_breaker_open{breaker="mongo"} 0.0' in body
+    assert 'maas_cache_lookups_total{cache="hash_ring",result="hit"}' in body
+    assert 'maas_cache_lookups_total{cache="scrape_config",result="revalidated"}' in body
+    assert 'maas_admitted_requests_in_flight{priority="critical"}' in body
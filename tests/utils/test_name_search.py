@@ -0,0 +1,45 @@
+from enums.name_match import NameMatch
+from utils.name_search import name_ngrams, normalize_name, rank_name_matches
+
+
+def _candidate(job_name, maas_pool="maas-pool1"):
+    return {
+        "job_name": job_name,
+        "maas_pool": maas_pool,
+        "collector_cluster": "ocp4-col1",
+        "job_type": "general",
+        "job_name_lower": normalize_name(job_name),
+    }
+
+
+def test_name_ngrams():
+    assert name_ngrams("Node-Exp") == ["-ex", "de-", "e-e", "exp", "nod", "ode"]
+    assert name_ngrams("ab") == []
+
+
+def test_rank_orders_exact_prefix_substring():
+    candidates = [
+        _candidate("my-node-exporter"),
+        _candidate("node-exporter-long"),
+        _candidate("Node"),
+        _candidate("node-x"),
+    ]
+
+    ranked = rank_name_matches("node", candidates, 10)
+
+    assert [(r["job_name"], r["match"]) for r in ranked] == [
+        ("Node", NameMatch.EXACT),
+        ("node-x", NameMatch.PREFIX),
+        ("node-exporter-long", NameMatch.PREFIX),
+        ("my-node-exporter", NameMatch.SUBSTRING),
+    ]
+    assert "job_name_lower" not in ranked[0]
+
+
+def test_rank_drops_false_positives_duplicates_and_caps():
+    candidates = [_candidate("abc-xyz-abd"), _candidate("abcd"), _candidate("abcd"), _candidate("abce")]
+
+    ranked = rank_name_matches("abc", candidates, 2)
+
+    assert [r["job_name"] for r in ranked] == ["abcd", "abce"]
+    assert rank_name_matches("bcx", [_candidate("abc-xbc")], 5) == []
@@ -0,0 +1,109 @@
+import io
+
+import pytest
+import yaml
+
+from enums.job_type import JobType
+from exceptions.import_too_large_error import ImportTooLargeError
+from exceptions.invalid_prometheus_config_error import InvalidPrometheusConfigError
+from utils.prometheus_config import decode_config, iter_scrape_configs, map_scrape_config, parse_duration
+from utils.scrape_config import render_scrape_config
+
+CONFIG = """
+global:
+  scrape_interval: 30s
+x-defaults: &defaults
+  scrape_interval: 1m
+scrape_configs:
+  - job_name: node
+    <<: *defaults
+    static_configs:
+      - targets: ['host-1:9100', 'host-2:9100']
+        labels: {team: infra}
+  - job_name: pods
+    kubernetes_sd_configs:
+      - role: pod
+        namespaces: {names: [ns1, ns2]}
+rule_files: []
+"""
+
+
+def test_iter_scrape_configs_yields_entries_and_skips_other_sections():
+    entries = list(iter_scrape_configs(io.StringIO(CONFIG)))
+
+    assert [entry["job_name"] for entry in entries] == ["node", "pods"]
+    assert entries[0]["scrape_interval"] == "1m"
+
+
+def test_iter_scrape_configs_yields_entries_before_a_syntax_error():
+    entries = iter_scrape_configs("scrape_configs:\n  - job_name: a\n  - [")
+
+    assert next(entries) == {"job_name": "a"}
+    with pytest.raises(yaml.YAMLError):
+        next(entries)
+
+
+def test_iter_scrape_configs_of_empty_document():
+    assert list(iter_scrape_configs("")) == []
+    assert list(iter_scrape_configs("global: {}")) == []
+
+
+def test_parse_duration():
+    assert parse_duration("30s") == 30
+    assert parse_duration("1m30s") == 90
+    assert parse_duration("2h") == 7200
+    assert parse_duration("2000ms") == 2
+    with pytest.raises(ValueError):
+        parse_duration("1500ms")
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+
+def test_map_static_config():
+    job = map_scrape_config({"job_name": "node", "scrape_interval": "1m", "scheme": "https",
+                             "basic_auth": {"username": "user", "password": "secret"},
+                             "static_configs": [{"targets": ["a:1"], "labels": {"team": "infra"}},
+                                                {"targets": ["b:1"], "labels": {"team": "infra"}}]})
+
+    assert job == {"job_type": JobType.GENERAL, "job_name": "node", "targets": ["a:1", "b:1"], "certs": True,
+                   "scrape_interval": 60, "basic_auth": {"username": "user", "password": "secret"},
+                   "labels": {"team": "infra"}}
+
+
+@pytest.mark.parametrize("job", [
+    {"job_name": "pods", "job_type": "kubernetes_sd", "namespaces": ["ns1"], "role": "pod",
+     "labels": {"env": "prod"}},
+    {"job_name": "sd", "job_type": "http_sd", "endpoints": ["http://sd/targets"], "refresh_interval": 120,
+     "certs": True, "labels": {"env": "prod"}},
+    {"job_name": "node", "job_type": "general", "targets": ["a:1"], "metrics_path": "/metrics",
+     "scrape_interval": 30, "scrape_timeout": 10},
+])
+def test_map_is_the_inverse_of_render(job):
+    mapped = map_scrape_config(render_scrape_config(job))
+
+    assert {**mapped, "job_type": mapped["job_type"].value} == job
+
+
+@pytest.mark.parametrize("scrape_config, reason", [
+    ({"job_name": "a"}, "Exactly one of"),
+    ({"job_name": "a", "static_configs": [], "http_sd_configs": []}, "Exactly one of"),
+    ({"job_name": "a", "static_configs": [], "honor_labels": True}, "honor_labels"),
+    ({"job_name": "a", "static_configs": [{"targets": ["a"], "labels": {"x": "1"}}, {"targets": ["b"]}]},
+     "different labels"),
+    ({"job_name": "a", "kubernetes_sd_configs": [{"role": "pod"}],
+      "relabel_configs": [{"source_labels": ["__x"], "target_label": "y"}]}, "constant label"),
+    ({"job_name": "a", "static_configs": ["a:1"]}, "Malformed static_configs"),
+    ({"job_name": "a", "static_configs": [], "basic_auth": {"username": "u", "password_file": "/p"}},
+     "inline password"),
+])
+def test_map_rejects_what_a_job_cannot_represent(scrape_config, reason):
+    with pytest.raises(ValueError, match=reason):
+        map_scrape_config(scrape_config)
+
+
+def test_decode_config():
+    assert decode_config(b"scrape_configs: []") == "scrape_configs: []"
+    with pytest.raises(ImportTooLargeError):
+        decode_config(b"x" * 11, limit=10)
+    with pytest.raises(InvalidPrometheusConfigError):
+        decode_config(b"\xff\xfe")
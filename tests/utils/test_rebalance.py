@@ -0,0 +1,58 @@
+from utils.rebalance import JobCost, plan_moves
+
+
+def _jobs(collector_cluster, costs, prefix=None):
+    prefix = prefix or collector_cluster
+    return [JobCost(f"{prefix}-{i}", collector_cluster, cost) for i, cost in enumerate(costs)]
+
+
+def test_balanced_pool_needs_no_moves():
+    jobs = _jobs("a", [1, 1]) + _jobs("b", [1, 1])
+
+    moves, loads = plan_moves(jobs, ["a", "b"], 0.1, 10)
+
+    assert moves == []
+    assert loads == {"a": 2, "b": 2}
+
+
+def test_moves_bring_collectors_within_tolerance():
+    jobs = _jobs("a", [4, 3, 2, 2, 1]) + _jobs("b", []) + _jobs("c", [])
+
+    moves, loads = plan_moves(jobs, ["a", "b", "c"], 0.1, 10)
+
+    mean = 12 / 3
+    assert all(mean * 0.9 <= load <= mean * 1.1 for load in loads.values())
+    assert all(move.source == "a" for move in moves)
+    assert len(moves) <= 3
+
+
+def test_move_cap_is_respected():
+    jobs = _jobs("a", [1] * 20) + _jobs("b", [])
+
+    moves, _ = plan_moves(jobs, ["a", "b"], 0.0, 3)
+
+    assert len(moves) == 3
+
+
+def test_name_conflicts_are_never_planned():
+    jobs = [JobCost("shared", "a", 4), JobCost("shared", "b", 0.5)]
+
+    moves, _ = plan_moves(jobs, ["a", "b"], 0.1, 10)
+
+    assert moves == []
+
+
+def test_oversized_job_is_not_moved_back_and_forth():
+    jobs = _jobs("a", [10]) + _jobs("b", [])
+
+    moves, loads = plan_moves(jobs, ["a", "b"], 0.1, 10)
+
+    assert moves == []
+    assert loads == {"a": 10, "b": 0}
+
+
+def test_jobs_on_unknown_collectors_are_ignored():
+    moves, loads = plan_moves(_jobs("gone", [3]), ["a", "b"], 0.1, 10)
+
+    assert moves == []
+    assert loads == {"a": 0, "b": 0}
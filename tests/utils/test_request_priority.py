@@ -0,0 +1,20 @@
+from enums.request_priority import RequestPriority
+from utils.request_priority import request_priority
+
+
+def test_collector_reads_are_critical():
+    assert request_priority("GET", "/v1/collectors/c1/scrape_config") == RequestPriority.CRITICAL
+    assert request_priority("GET", "/v1/jobs/watch") == RequestPriority.CRITICAL
+    assert request_priority("POST", "/v1/collectors/c1/load") == RequestPriority.NORMAL
+
+
+def test_admin_is_low_priority():
+    assert request_priority("POST", "/v1/admin/rebalance/pool") == RequestPriority.LOW
+    assert request_priority("GET", "/v1/admin/load-shedding") == RequestPriority.NORMAL
+    assert request_priority("PUT", "/v1/jobs/general/job") == RequestPriority.NORMAL
+
+
+def test_bulk_job_writes_are_low_priority():
+    assert request_priority("POST", "/v1/jobs/import") == RequestPriority.LOW
+    assert request_priority("POST", "/v1/jobs/sync/apply") == RequestPriority.LOW
+    assert request_priority("POST", "/v1/jobs/sync/plan") == RequestPriority.NORMAL
@@ -0,0 +1,34 @@
+import pytest
+
+from utils.fault_injection import FaultInjector
+from utils.retry import retry_async
+
+
+async def _ok():
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_until_success():
+    injector = FaultInjector()
+    injector.fail_next(2, ConnectionError)
+
+    result = await retry_async(injector.wrap(_ok), 3, lambda e: isinstance(e, ConnectionError), base_delay=0.001)
+
+    assert (result, injector.calls) == ("ok", 3)
+
+
+@pytest.mark.asyncio
+async def test_attempts_are_bounded_and_permanent_errors_are_not_retried():
+    injector = FaultInjector()
+    injector.fail_next(5, ConnectionError)
+
+    with pytest.raises(ConnectionError):
+        await retry_async(injector.wrap(_ok), 3, lambda e: isinstance(e, ConnectionError), base_delay=0.001)
+    assert injector.calls == 3
+
+    injector.reset()
+    injector.fail_next(1, ValueError)
+    with pytest.raises(ValueError):
+        await retry_async(injector.wrap(_ok), 3, lambda e: isinstance(e, ConnectionError), base_delay=0.001)
+    assert injector.calls == 4
@@ -0,0 +1,61 @@
+import yaml
+
+from utils.scrape_config import dump_scrape_configs, render_scrape_config
+
+
+def test_render_general_job():
+    job = {
+        "job_name": "node",
+        "job_type": "general",
+        "scrape_interval": 30,
+        "targets": ["host-1:9100"],
+        "labels": {"team": "infra"},
+        "certs": True,
+        "basic_auth": {"username": "user", "password": "ciphertext"},
+    }
+
+    config = render_scrape_config(job, "plain")
+
+    assert config == {
+        "job_name": "node",
+        "scrape_interval": "30s",
+        "basic_auth": {"username": "user", "password": "plain"},
+        "scheme": "https",
+        "static_configs": [{"targets": ["host-1:9100"], "labels": {"team": "infra"}}],
+    }
+
+
+def test_render_omits_basic_auth_without_password():
+    job = {"job_name": "node", "job_type": "general", "targets": ["a"],
+           "basic_auth": {"username": "user", "password": "ciphertext"}}
+
+    assert "basic_auth" not in render_scrape_config(job)
+
+
+def test_render_blackbox_job():
+    job = {"job_name": "probe", "job_type": "blackbox", "targets": ["https://example.com"],
+           "host": "blackbox:9115", "module": "http_2xx"}
+
+    config = render_scrape_config(job)
+
+    assert config["metrics_path"] == "/probe"
+    assert config["params"] == {"module": ["http_2xx"]}
+    assert config["relabel_configs"][-1] == {"target_label": "__address__", "replacement": "blackbox:9115"}
+
+
+def test_render_service_discovery_jobs():
+    kubernetes = render_scrape_config({"job_name": "k8s", "job_type": "kubernetes_sd", "role": "pod",
+                                       "namespaces": ["ns1"], "labels": {"env": "prod"}})
+    http = render_scrape_config({"job_name": "sd", "job_type": "http_sd", "endpoints": ["http://sd/targets"],
+                                 "refresh_interval": 60})
+
+    assert kubernetes["kubernetes_sd_configs"] == [{"role": "pod", "namespaces": {"names": ["ns1"]}}]
+    assert kubernetes["relabel_configs"] == [{"target_label": "env", "replacement": "prod"}]
+    assert http["http_sd_configs"] == [{"url": "http://sd/targets", "refresh_interval": "60s"}]
+    assert "relabel_configs" not in http
+
+
+def test_dump_scrape_configs_is_valid_yaml():
+    body = dump_scrape_configs([render_scrape_config({"job_name": "node", "job_type": "general", "targets": ["a"]})])
+
+    assert yaml.safe_load(body) == {"scrape_configs": [{"job_name": "node", "static_configs": [{"targets": ["a"]}]}]}
@@ -0,0 +1,43 @@
+import pytest
+
+from config.constants.jobs import DEFAULT_SCRAPE_INTERVAL
+from models.db_schemas.jobs import GeneralJob
+from utils.scrape_cost import JobLoad, job_footprint, job_footprints, job_load, target_count
+
+
+def test_target_count_per_job_kind():
+    assert target_count({"targets": ["a", "b"]}) == 2
+    assert target_count({"endpoints": ["http://sd"]}) == 1
+    assert target_count({"namespaces": ["ns1", "ns2", "ns3"]}) == 3
+    assert target_count({}) == 0
+
+
+def test_job_load_uses_scrape_interval():
+    assert job_load({"targets": ["a"] * 60, "scrape_interval": 30}) == JobLoad(1, 60, 2.0)
+    assert job_load({"targets": ["a"] * 60}).scrape_rate == pytest.approx(60 / DEFAULT_SCRAPE_INTERVAL)
+
+
+def test_job_load_arithmetic():
+    assert JobLoad(1, 10, 1.0) - JobLoad(1, 4, 0.5) == JobLoad(0, 6, 0.5)
+    assert -JobLoad(1, 2, 0.5) == JobLoad(-1, -2, -0.5)
+
+
+def test_job_footprint_from_model():
+    job = GeneralJob(job_name="j", maas_pool="maas-pool1", collector_cluster="ocp4-col1", targets=["a", "b"])
+
+    footprint = job_footprint(job)
+
+    assert footprint.maas_pool == "maas-pool1"
+    assert footprint.collector_cluster == "ocp4-col1"
+    assert footprint.load.targets == 2
+    assert job_footprint(None) is None
+
+
+def test_sharded_job_counts_once_and_splits_its_targets():
+    job = {"maas_pool": "maas-pool1", "collector_cluster": "ocp4-b", "targets": [f"host-{i}:9100" for i in range(30)],
+           "shard_collectors": ["ocp4-a", "ocp4-b", "ocp4-c"]}
+
+    footprints = job_footprints(job)
+
+    assert {f.collector_cluster: f.load.jobs for f in footprints} == {"ocp4-a": 0, "ocp4-b": 1, "ocp4-c": 0}
+    assert sum(f.load.targets for f in footprints) == 30
@@ -0,0 +1,57 @@
+import re
+
+from config.constants.jobs import JOB_NAME_REGEX
+from utils.sharding import assign_targets, choose_shard_collectors, is_sharded, shard_for, shard_job_name, shard_payloads
+
+COLLECTORS = ["ocp4-a", "ocp4-b", "ocp4-c", "ocp4-d"]
+
+
+def test_choose_shard_collectors_keeps_home():
+    chosen = choose_shard_collectors("job-1", COLLECTORS, "ocp4-c", 3)
+
+    assert len(chosen) == 3
+    assert "ocp4-c" in chosen
+    assert chosen == sorted(chosen)
+    assert chosen == choose_shard_collectors("job-1", list(reversed(COLLECTORS)), "ocp4-c", 3)
+
+
+def test_assign_targets_covers_every_target_once():
+    targets = [f"host-{i}:9100" for i in range(100)]
+
+    shards = assign_targets(targets, ["ocp4-a", "ocp4-b"])
+
+    assert sorted(shards["ocp4-a"] + shards["ocp4-b"]) == sorted(targets)
+    assert shards["ocp4-a"] and shards["ocp4-b"]
+
+
+def test_adding_a_target_only_changes_one_shard():
+    targets = [f"host-{i}:9100" for i in range(100)]
+    job = {"job_name": "job-1", "targets": targets}
+
+    before = shard_payloads(job, COLLECTORS)
+    after = shard_payloads({**job, "targets": targets + ["new-host:9100"]}, COLLECTORS)
+
+    assert len([c for c in COLLECTORS if before.get(c) != after.get(c)]) == 1
+
+
+def test_shard_payloads_skip_empty_shards():
+    payloads = shard_payloads({"job_name": "job-1", "targets": ["only-host:9100"]}, COLLECTORS)
+
+    assert len(payloads) == 1
+    (collector_cluster, payload), = payloads.items()
+    assert payload["job_name"] == shard_job_name("job-1", collector_cluster)
+
+
+def test_shard_for():
+    unsharded = {"job_name": "job-1", "targets": ["t1"]}
+    sharded = {"job_name": "job-1", "targets": ["t1", "t2", "t3"], "shard_collectors": ["ocp4-a", "ocp4-b"]}
+
+    assert shard_for(unsharded, "ocp4-a") is unsharded
+    assert not is_sharded(unsharded) and is_sharded(sharded)
+    shards = [shard_for(sharded, c) for c in ["ocp4-a", "ocp4-b"]]
+    assert sorted(t for shard in shards if shard for t in shard["targets"]) == ["t1", "t2", "t3"]
+
+
+def test_a_job_cannot_be_named_like_a_shard():
+    assert re.fullmatch(JOB_NAME_REGEX, "web")
+    assert not re.fullmatch(JOB_NAME_REGEX, shard_job_name("web", "ocp4-c1"))
@@ -0,0 +1,33 @@
+from utils.token_bucket import TokenBucket, retry_after_header
+
+
+def test_bucket_allows_burst_then_refills():
+    bucket = TokenBucket(rate=2.0, capacity=3, now=0.0)
+
+    assert [bucket.consume(0.0).allowed for _ in range(4)] == [True, True, True, False]
+
+    denied = bucket.consume(0.0)
+    assert denied.retry_after == 0.5
+    assert bucket.consume(0.5).allowed
+    assert bucket.is_full(10.0)
+
+
+def test_decision_reports_remaining_and_reset():
+    bucket = TokenBucket(rate=1.0, capacity=10, now=0.0)
+
+    decision = bucket.consume(0.0)
+
+    assert (decision.limit, decision.remaining, decision.reset) == (10, 9, 1.0)
+
+
+def test_reconfigure_caps_tokens():
+    bucket = TokenBucket(rate=1.0, capacity=10, now=0.0)
+
+    bucket.reconfigure(rate=1.0, capacity=2)
+
+    assert bucket.consume(0.0).remaining == 1
+
+
+def test_retry_after_header_rounds_up():
+    assert retry_after_header(0.01) == "1"
+    assert retry_after_header(2.2) == "3"
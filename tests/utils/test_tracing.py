@@ -0,0 +1,141 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.routing import APIRoute
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.trace import SpanKind, StatusCode
+
+from models.db_schemas.job_stats import JobStats
+from producer import KafkaProducer
+from repositories.base_repository import BaseRepository
+from services.base_service import BaseService
+from utils.fault_injection import FaultyKafkaClient
+from utils.tracing import TracingMiddleware, configure_tracing, memory_exporter, sampler, tracer
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+class TracedRepository(BaseRepository[JobStats]):
+    def __init__(self):
+        super().__init__(JobStats)
+
+    async def get_value(self):
+        return await self.find_value()
+
+    async def find_value(self):
+        return "value"
+
+    async def insert_value(self):
+        raise ValueError("rejected")
+
+
+class TracedService(BaseService[JobStats, TracedRepository]):
+    async def get(self):
+        return await self.repo.get_value()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def memory_tracing():
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        configure_tracing(1.0, "memory")
+
+
+@pytest.fixture(autouse=True)
+def spans():
+    memory_exporter.clear()
+    yield
+    memory_exporter.clear()
+
+
+def finished(name):
+    return next(span for span in memory_exporter.get_finished_spans() if span.name == name)
+
+
+@pytest.mark.asyncio
+async def test_service_and_repository_calls_are_nested_spans():
+    assert await TracedService(TracedRepository()).get() == "value"
+
+    service, repository = finished("TracedService.get"), finished("TracedRepository.get_value")
+    assert repository.parent.span_id == service.context.span_id
+    assert repository.kind == SpanKind.CLIENT
+    assert repository.attributes["db.operation.name"] == "get_value"
+    # A repository method called by another one is part of the outer call's span
+    assert [span.name for span in memory_exporter.get_finished_spans()] == \
+        ["TracedRepository.get_value", "TracedService.get"]
+
+
+@pytest.mark.asyncio
+async def test_failed_repository_call_is_an_error_span():
+    with pytest.raises(ValueError):
+        await TracedRepository().insert_value()
+
+    span = finished("TracedRepository.insert_value")
+    assert span.status.status_code == StatusCode.ERROR
+    assert span.events[0].name == "exception"
+
+
+@pytest.mark.asyncio
+async def test_trace_context_is_sent_in_kafka_headers():
+    client = FaultyKafkaClient()
+    with patch.object(KafkaProducer(), "_producer", client):
+        with tracer.start_as_current_span("request") as parent:
+            await KafkaProducer().send_event("create", "maas-pool1", "collector1", "general", "job1", {})
+
+    produce = next(span for span in memory_exporter.get_finished_spans() if span.kind == SpanKind.PRODUCER)
+    assert produce.parent.span_id == parent.get_span_context().span_id
+    traceparent = dict(client.sent_headers[0])["traceparent"].decode()
+    assert traceparent.startswith(f"00-{format(produce.context.trace_id, '032x')}-{format(produce.context.span_id, '016x')}-")
+
+
+@pytest.mark.asyncio
+async def test_request_span_continues_the_callers_trace_under_the_route_template():
+    route = APIRoute("/v1/jobs/{job_name}", endpoint=lambda job_name: None)
+
+    async def app(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/v1/jobs/job1",
+             "headers": [(b"traceparent", f"00-{TRACE_ID}-00f067aa0ba902b7-01".encode())]}
+    await TracingMiddleware(app)(scope, None, send)
+
+    span = finished("GET /v1/jobs/{job_name}")
+    assert format(span.context.trace_id, "032x") == TRACE_ID
+    assert span.kind == SpanKind.SERVER
+    assert span.attributes["http.response.status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_unsampled_request_records_no_spans():
+    async def app(scope, receive, send):
+        await TracedService(TracedRepository()).get()
+        await send({"type": "http.response.start", "status": 200})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/v1/jobs/job1",
+             "headers": [(b"traceparent", f"00-{TRACE_ID}-00f067aa0ba902b7-00".encode())]}
+    await TracingMiddleware(app)(scope, None, send)
+
+    assert memory_exporter.get_finished_spans() == ()
+
+
+def test_sampling_ratio_applies_to_new_traces_only():
+    provider = TracerProvider(sampler=sampler(0.0))
+    unsampled = provider.get_tracer("test")
+
+    with unsampled.start_as_current_span("root") as root:
+        assert not root.is_recording()
+    with tracer.start_as_current_span("caller"):
+        with unsampled.start_as_current_span("child") as child:
+            assert child.is_recording()
+
+
+def test_unknown_exporter_is_rejected():
+    with pytest.raises(ValueError):
+        configure_tracing(1.0, "otlp")
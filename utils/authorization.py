@@ -1,12 +1,19 @@
-from typing import Optional
-from fastapi import HTTPException, Depends, status
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException, Depends, Request, status
 from fastapi.security import APIKeyHeader
+from exceptions.rate_limit_exceeded_error import RateLimitExceededError
 from services.api_key_service import APIKeyService
+from services.rate_limiter import rate_limiter
 from repositories.api_key_repository import ApiKeyRepository
 from models.db_schemas.api_keys import ApiKey
+from config import config
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+RATE_LIMITS_ENABLED = config["rate_limits.enabled"]
+# Per-pool overrides of the `key` and `pool` limits: maas_pool -> {scope: {rate, burst}}
+POOL_RATE_LIMITS = config["rate_limits.pools"]
+
 async def get_api_key_repo() -> ApiKeyRepository:
     return ApiKeyRepository()
 
@@ -14,12 +21,78 @@ async def get_api_key_service(api_key_repo: ApiKeyRepository = Depends(get_api_k
     return APIKeyService(api_key_repo)
 
 
-async def get_api_key(api_key: str = Depends(api_key_header),
-                        service: APIKeyService = Depends(get_api_key_service)) -> Optional[ApiKey]:
+def _pool_override(maas_pool: Optional[str], scope: str) -> Optional[Dict[str, Any]]:
+    return (POOL_RATE_LIMITS.get(maas_pool) or {}).get(scope) if maas_pool else None
+
+
+def configured_limits(scope: str, maas_pool: Optional[str] = None) -> Tuple[float, int]:
+    """Rate and burst of `scope` ("key", "pool" or "collector_load") on `maas_pool`, from its override or the defaults."""
+    limits = _pool_override(maas_pool, scope) or config[f"rate_limits.{scope}"]
+    return limits["rate"], limits["burst"]
+
+
+def _admit(request: Request, bucket: str, scope: str, rate: float, burst: int):
+    decision = rate_limiter.check(bucket, rate, burst)
+    if not decision.allowed:
+        raise RateLimitExceededError(scope, decision)
+
+    # The most constrained bucket of the request is the one reported in the RateLimit-* headers
+    current = getattr(request.state, "rate_limit", None)
+    if current is None or decision.remaining < current.remaining:
+        request.state.rate_limit = decision
+
+
+def _authorized_pool(request: Request, key_obj: ApiKey) -> Optional[str]:
+    """The pool the request is about, if the key is allowed on it; only such keys may spend its budget."""
+    maas_pool = request.path_params.get("maas_pool") or request.query_params.get("maas_pool")
+    if maas_pool and (key_obj.is_admin or maas_pool in key_obj.maas_pools):
+        return maas_pool
+    return None
+
+
+async def _authenticate(api_key: Optional[str], service: APIKeyService) -> Optional[ApiKey]:
     if not api_key:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="API key is required")
 
-    key_obj = await service.validate_key(api_key)
+    return await service.validate_key(api_key)
+
+
+async def get_api_key(request: Request, api_key: str = Depends(api_key_header),
+                        service: APIKeyService = Depends(get_api_key_service)) -> Optional[ApiKey]:
+    key_obj = await _authenticate(api_key, service)
+    # Buckets are made for known keys only, so made-up keys cannot fill the limiter
+    if not RATE_LIMITS_ENABLED or not key_obj:
+        return key_obj
+
+    maas_pool = _authorized_pool(request, key_obj)
+    key_bucket = f"key:{key_obj.key}"
+    if _pool_override(maas_pool, "key"):
+        key_bucket = f"{key_bucket}@{maas_pool}"
+    rate, burst = configured_limits("key", maas_pool)
+    _admit(request, key_bucket, "API key", key_obj.rate_limit or rate, key_obj.rate_burst or burst)
+
+    if maas_pool:
+        try:
+            _admit(request, f"pool:{maas_pool}", f"pool {maas_pool}", *configured_limits("pool", maas_pool))
+        except RateLimitExceededError:
+            rate_limiter.refund(key_bucket)
+            raise
+
+    return key_obj
+
+
+async def get_collector_api_key(request: Request, api_key: str = Depends(api_key_header),
+                                service: APIKeyService = Depends(get_api_key_service)) -> Optional[ApiKey]:
+    """
+    `get_api_key` for collector telemetry. Collectors report on a schedule, so their reports are
+    limited per collector and spend neither the key's nor the pool's budget.
+    """
+    key_obj = await _authenticate(api_key, service)
+    maas_pool = _authorized_pool(request, key_obj) if RATE_LIMITS_ENABLED and key_obj else None
+    if maas_pool:
+        collector_cluster = request.path_params["collector_cluster"]
+        _admit(request, f"collector_load:{maas_pool}/{collector_cluster}", f"collector {collector_cluster}",
+               *configured_limits("collector_load", maas_pool))
 
     return key_obj
 
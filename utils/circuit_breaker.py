@@ -0,0 +1,127 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+from config.constants.resilience import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT_SECONDS
+from enums.circuit_state import CircuitState
+from exceptions.circuit_open_error import CircuitOpenError
+from utils.logger import create_logger
+
+logger = create_logger("circuit_breaker")
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker. After `failure_threshold` failures in a row the circuit opens
+    and calls fail immediately with `CircuitOpenError`; after `reset_timeout` a single probe is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+
+    Only `failure_types` count as failures. Any other exception means the dependency answered,
+    so it counts as a success.
+    """
+
+    def __init__(self, name: str, failure_types: Tuple[Type[BaseException], ...] = (Exception,),
+                 failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_types = failure_types
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {}
+        self.last_error: Optional[str] = None
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _transition(self, state: CircuitState):
+        key = f"{self.state.value}->{state.value}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        if state == CircuitState.OPEN:
+            self._opened_at = self.clock()
+            logger.warning(f"Circuit {self.name} opened after {self.failures} failures: {self.last_error}")
+        elif state == CircuitState.CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = state
+
+    def retry_after(self) -> float:
+        if self.state == CircuitState.CLOSED:
+            return 0.0
+        return max(self._opened_at + self.reset_timeout - self.clock(), 0.0)
+
+    def _reject(self):
+        self.rejected += 1
+        raise CircuitOpenError(self.name, self.retry_after() or self.reset_timeout)
+
+    def raise_if_open(self):
+        """Fail fast before starting work that needs the dependency, without taking the probe."""
+        if self.state == CircuitState.OPEN and self.retry_after() > 0:
+            self._reject()
+
+    def before_call(self):
+        if self.state == CircuitState.OPEN:
+            if self.retry_after() > 0:
+                self._reject()
+            self._transition(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probing:
+                self._reject()
+            self._probing = True
+
+    def record_success(self):
+        self._probing = False
+        self.failures = 0
+        if self.state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self, error: BaseException):
+        self._probing = False
+        self.failures += 1
+        self.last_error = str(error) or type(error).__name__
+        if self.state == CircuitState.HALF_OPEN or \
+                (self.state == CircuitState.CLOSED and self.failures >= self.failure_threshold):
+            self._transition(CircuitState.OPEN)
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        self.before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except self.failure_types as e:
+            self.record_failure(e)
+            raise
+        except Exception:
+            self.record_success()
+            raise
+        except BaseException:
+            # Cancelled: says nothing about the dependency, just free the probe
+            self._probing = False
+            raise
+        self.record_success()
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'rejected': self.rejected,
+            'transitions': dict(self.transitions),
+            'last_error': self.last_error,
+            'retry_after': self.retry_after(),
+        }
+
+
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    breaker = circuit_breakers.get(name)
+    if breaker is None:
+        breaker = circuit_breakers[name] = CircuitBreaker(name, **kwargs)
+    return breaker
+
+
+def circuit_breaker_metrics() -> List[Dict[str, Any]]:
+    return [breaker.metrics() for breaker in circuit_breakers.values()]
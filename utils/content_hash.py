@@ -0,0 +1,32 @@
+import hashlib
+import hmac
+import json
+from typing import Any, Dict, Optional
+from config import config
+
+# Bookkeeping, placement and derived fields; everything else is what a job is asked to scrape
+NON_CONTENT_FIELDS = {'_id', '_class_id', 'id', 'revision_id', 'maas_pool', 'collector_cluster', 'time_created',
+                      'update_time', 'revision', 'seq', 'label_terms', 'job_name_lower', 'name_ngrams',
+                      'content_hash', 'shard_collectors', 'shards', 'placement'}
+
+_PASSWORD_KEY = config["security"]["secret_key"].encode()
+
+
+def job_content_hash(job: Dict[str, Any], password: Optional[str] = None) -> str:
+    """
+    Digest of a job's content, equal for a stored job and a create request asking for the same
+    thing. `job` is in stored form; `password` is the plaintext basic_auth password, which only
+    enters the digest keyed with the secret key. A sharded job counts its shards, not where they are.
+    """
+    content = {key: value for key, value in job.items()
+               if key not in NON_CONTENT_FIELDS and value is not None and value != {}}
+    shards = len(job.get('shard_collectors') or []) or job.get('shards')
+    if shards:
+        content['shards'] = shards
+    if content.get('basic_auth'):
+        content['basic_auth'] = {
+            'username': content['basic_auth']['username'],
+            'password': hmac.new(_PASSWORD_KEY, (password or '').encode(), hashlib.sha256).hexdigest(),
+        }
+    body = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
@@ -0,0 +1,26 @@
+import hashlib
+from typing import Any
+
+
+def job_etag(job_id: Any, revision: int) -> str:
+    """Strong ETag for a job; the document id keeps a re-created job from reusing an old tag."""
+    return f'"{job_id}-{revision}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2), so a W/ prefix is ignored."""
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag derived from the bytes themselves, so every process agrees on it."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
@@ -0,0 +1,62 @@
+import asyncio
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Tuple
+
+
+class FaultInjector:
+    """Scripted failures and latency for a dependency call, to exercise breakers and retries."""
+
+    def __init__(self):
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.error_factory: Callable[[], BaseException] = lambda: ConnectionError("injected fault")
+        self.calls = 0
+        self._scripted: Deque[BaseException] = deque()
+
+    def fail_next(self, count: int, error: Callable[[], BaseException]):
+        self._scripted.extend(error() for _ in range(count))
+
+    def fail_randomly(self, rate: float, error: Callable[[], BaseException]):
+        self.error_rate = rate
+        self.error_factory = error
+
+    def reset(self):
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self._scripted.clear()
+
+    async def maybe_fail(self):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._scripted:
+            raise self._scripted.popleft()
+        if self.error_rate and random.random() < self.error_rate:
+            raise self.error_factory()
+
+    def wrap(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        async def wrapper(*args, **kwargs):
+            await self.maybe_fail()
+            return await func(*args, **kwargs)
+        return wrapper
+
+
+class FaultyKafkaClient:
+    """Stand-in for `AIOKafkaProducer` that records what it sent and fails as its injector says."""
+
+    def __init__(self, injector: Optional[FaultInjector] = None):
+        self.injector = injector or FaultInjector()
+        self.sent: List[Tuple[str, bytes, bytes]] = []
+        self.sent_headers: List[List[Tuple[str, bytes]]] = []
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def send_and_wait(self, topic: str, value: bytes = None, key: bytes = None, headers=None, **kwargs):
+        await self.injector.maybe_fail()
+        self.sent.append((topic, key, value))
+        self.sent_headers.append(headers or [])
@@ -0,0 +1,38 @@
+import hashlib
+from bisect import bisect
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+DEFAULT_VIRTUAL_NODES = 64
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes. Adding or removing a node only remaps the keys
+    that land on that node's arcs, about 1/N of them.
+    """
+
+    def __init__(self, nodes: Iterable[str], virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{node}#{replica}"), node) for node in set(nodes) for replica in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def __len__(self) -> int:
+        return len(set(self._nodes))
+
+    def node_for(self, key: str) -> str:
+        if not self._nodes:
+            raise ValueError("Hash ring has no nodes")
+        return self._nodes[bisect(self._hashes, _hash(key)) % len(self._nodes)]
+
+
+@lru_cache(maxsize=256)
+def hash_ring(nodes: Tuple[str, ...], virtual_nodes: int = DEFAULT_VIRTUAL_NODES) -> HashRing:
+    """Shared ring per node set, so a lookup is a bisect instead of a rebuild."""
+    return HashRing(nodes, virtual_nodes)
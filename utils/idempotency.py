@@ -0,0 +1,12 @@
+import hashlib
+from typing import Iterable, Tuple
+
+
+def request_fingerprint(method: str, path: str, query: Iterable[Tuple[str, str]], body: bytes) -> str:
+    """Identifies what a request asks for, so a reused Idempotency-Key with a different payload is caught."""
+    digest = hashlib.sha256()
+    digest.update(f"{method} {path}\n".encode())
+    for name, value in sorted(query):
+        digest.update(f"{name}={value}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
@@ -0,0 +1,8 @@
+from typing import Any
+
+
+def job_field(job: Any, name: str) -> Any:
+    """A field of a job given either as a document or as its raw dict, None when unset."""
+    if isinstance(job, dict):
+        return job.get(name)
+    return getattr(job, name, None)
@@ -0,0 +1,88 @@
+import re
+from typing import Any, Dict, List, Optional
+from config.constants.jobs import LABEL_REGEX, LABEL_VALUE_REGEX
+from exceptions.invalid_label_selector_error import InvalidLabelSelectorError
+
+LABEL_TERMS_FIELD = "label_terms"
+
+_KEY_PATTERN = re.compile(LABEL_REGEX)
+_VALUE_PATTERN = re.compile(LABEL_VALUE_REGEX)
+_SET_REQUIREMENT = re.compile(r"^(\S+)\s+(in|notin)\s+\((.*)\)$")
+_EQUALITY_REQUIREMENT = re.compile(r"^([^!=\s]+)\s*(==|=|!=)\s*(\S+)$")
+
+
+def label_terms(labels: Optional[Dict[str, str]]) -> List[str]:
+    """
+    Indexable form of a label dict: every key on its own (for exists checks) plus every
+    `key=value` pair. Keys can't contain '=' (LABEL_REGEX), so the encoding is unambiguous.
+    """
+    if not labels:
+        return []
+
+    terms = list(labels.keys())
+    terms.extend(f"{key}={value}" for key, value in labels.items())
+    return terms
+
+
+def _split_requirements(selector: str) -> List[str]:
+    requirements, depth, current = [], 0, []
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            requirements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    requirements.append("".join(current).strip())
+    return requirements
+
+
+def _check_key(selector: str, key: str) -> str:
+    if not _KEY_PATTERN.match(key):
+        raise InvalidLabelSelectorError(selector, f"invalid label key {key!r}")
+    return key
+
+
+def _check_value(selector: str, value: str) -> str:
+    if not _VALUE_PATTERN.match(value):
+        raise InvalidLabelSelectorError(selector, f"invalid label value {value!r}")
+    return value
+
+
+def _requirement_filter(selector: str, requirement: str) -> Dict[str, Any]:
+    match = _SET_REQUIREMENT.match(requirement)
+    if match:
+        key, operator, raw_values = match.groups()
+        _check_key(selector, key)
+        values = [_check_value(selector, value.strip()) for value in raw_values.split(",") if value.strip()]
+        if not values:
+            raise InvalidLabelSelectorError(selector, f"empty value set for {key!r}")
+        terms = [f"{key}={value}" for value in values]
+        return {LABEL_TERMS_FIELD: {"$in" if operator == "in" else "$nin": terms}}
+
+    match = _EQUALITY_REQUIREMENT.match(requirement)
+    if match:
+        key, operator, value = match.groups()
+        term = f"{_check_key(selector, key)}={_check_value(selector, value)}"
+        return {LABEL_TERMS_FIELD: {"$ne": term} if operator == "!=" else term}
+
+    if requirement.startswith("!"):
+        return {LABEL_TERMS_FIELD: {"$ne": _check_key(selector, requirement[1:].strip())}}
+
+    return {LABEL_TERMS_FIELD: _check_key(selector, requirement)}
+
+
+def parse_label_selector(selector: str) -> Dict[str, Any]:
+    """
+    Translate a Kubernetes-style label selector (`k=v`, `k!=v`, `k in (a,b)`, `k notin (a,b)`,
+    `k`, `!k`) into a Mongo filter over the multikey `label_terms` array.
+    """
+    requirements = _split_requirements(selector)
+    if not all(requirements):
+        raise InvalidLabelSelectorError(selector, "empty requirement")
+
+    filters = [_requirement_filter(selector, requirement) for requirement in requirements]
+    return filters[0] if len(filters) == 1 else {"$and": filters}
@@ -0,0 +1,65 @@
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+LOAD_METRICS = ('scrape_duration_seconds', 'samples_per_second', 'memory_bytes')
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_values(values: List[float], percentiles: Iterable[int]) -> Dict[str, float]:
+    ordered = sorted(values)
+    summary = {'mean': sum(ordered) / len(ordered), 'max': ordered[-1]}
+    summary.update({f'p{q}': percentile(ordered, q) for q in percentiles})
+    return summary
+
+
+class LoadWindow:
+    """
+    Fixed-size ring buffer of one collector's most recent load reports, stored as one flat
+    array per metric. Adding a report is O(1) and never allocates; aggregates are only
+    computed when someone asks for them.
+    """
+    __slots__ = ('capacity', '_times', '_values', '_next', '_count')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._times = array('d', [0.0]) * capacity
+        self._values = {metric: array('d', [0.0]) * capacity for metric in LOAD_METRICS}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_report(self) -> Optional[float]:
+        return self._times[(self._next - 1) % self.capacity] if self._count else None
+
+    def add(self, timestamp: float, values: Dict[str, float]):
+        self._times[self._next] = timestamp
+        for metric in LOAD_METRICS:
+            self._values[metric][self._next] = values[metric]
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _indexes_since(self, since: float) -> List[int]:
+        """Buffer slots reported after `since`, oldest first."""
+        start = (self._next - self._count) % self.capacity
+        indexes = [(start + offset) % self.capacity for offset in range(self._count)]
+        return [index for index in indexes if self._times[index] > since]
+
+    def summarize(self, since: float, percentiles: Iterable[int]) -> Optional[Dict[str, object]]:
+        indexes = self._indexes_since(since)
+        if not indexes:
+            return None
+
+        summary: Dict[str, object] = {'reports': len(indexes), 'last_report': self._times[indexes[-1]]}
+        for metric in LOAD_METRICS:
+            values = self._values[metric]
+            summary[metric] = summarize_values([values[index] for index in indexes], percentiles)
+        return summary
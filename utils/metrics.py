@@ -0,0 +1,138 @@
+import time
+from typing import Any, Dict, Iterator
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from enums.circuit_state import CircuitState
+from utils.circuit_breaker import circuit_breakers
+from utils.hash_ring import hash_ring
+
+# Mongo and Kafka calls are mostly sub-10ms; the tail up to the client timeouts is what matters
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Fernet is pure CPU and takes microseconds; a slow call means the event loop was starved
+CRYPTO_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "maas_http_request_duration_seconds", "Time to answer an HTTP request, by route template and status",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("maas_http_requests_in_flight", "HTTP requests being answered")
+
+MONGO_OPERATION_DURATION = Histogram(
+    "maas_mongo_operation_duration_seconds", "Time of a repository call, retries included",
+    ["repository", "method", "outcome"], buckets=LATENCY_BUCKETS)
+
+KAFKA_PRODUCE_DURATION = Histogram(
+    "maas_kafka_produce_duration_seconds", "Time to produce one job event, retries included",
+    ["outcome"], buckets=LATENCY_BUCKETS)
+KAFKA_PRODUCE_IN_FLIGHT = Gauge("maas_kafka_produce_in_flight", "Job events waiting for a broker acknowledgement")
+
+CRYPTO_DURATION = Histogram(
+    "maas_crypto_duration_seconds", "Time of a basic_auth password encryption or decryption",
+    ["operation"], buckets=CRYPTO_BUCKETS)
+
+JOB_BATCH_SIZE = Histogram(
+    "maas_job_batch_size", "Jobs written per batch of an import or sync", ["operation"], buckets=BATCH_SIZE_BUCKETS)
+JOB_BATCH_FAILURES = Counter(
+    "maas_job_batch_failures_total", "Jobs of a batch that were rejected or rolled back", ["operation"])
+
+
+def _families():
+    return (
+        GaugeMetricFamily("maas_circuit_breaker_open", "1 while a dependency's circuit is open", labels=["breaker"]),
+        CounterMetricFamily("maas_circuit_breaker_rejected", "Calls failed fast by an open circuit",
+                            labels=["breaker"]),
+        GaugeMetricFamily("maas_admitted_requests_in_flight", "Requests admitted by the load shedder, by priority",
+                          labels=["priority"]),
+        CounterMetricFamily("maas_shed_requests", "Requests rejected by the load shedder, by priority",
+                            labels=["priority"]),
+        GaugeMetricFamily("maas_event_loop_lag_seconds", "Last sampled event-loop lag", labels=[]),
+        CounterMetricFamily("maas_cache_lookups", "Lookups of an in-process cache, by result",
+                            labels=["cache", "result"]),
+    )
+
+
+class StateCollector(Collector):
+    """
+    Counters and state the service already keeps in memory, read when scraped instead of
+    mirrored into metrics on every call: circuit breakers, load shedding and cache lookups.
+    """
+
+    def describe(self) -> Iterator:
+        return iter(_families())
+
+    def collect(self) -> Iterator:
+        # Imported here: these services import the repositories, which import this module
+        from services.idempotency_service import idempotency_cache
+        from services.load_shedder import load_shedder
+        from services.scrape_config_service import scrape_config_cache
+
+        breaker_open, breaker_rejected, in_flight, shed, lag, cache_lookups = _families()
+        for breaker in list(circuit_breakers.values()):
+            breaker_open.add_metric([breaker.name], float(breaker.state != CircuitState.CLOSED))
+            breaker_rejected.add_metric([breaker.name], breaker.rejected)
+        for priority, count in load_shedder.in_flight_by_priority.items():
+            in_flight.add_metric([priority.value], count)
+        for priority, count in load_shedder.shed.items():
+            shed.add_metric([priority.value], count)
+        lag.add_metric([], load_shedder.lag)
+
+        ring_cache = hash_ring.cache_info()
+        lookups = {
+            'hash_ring': {'hit': ring_cache.hits, 'miss': ring_cache.misses},
+            'idempotency': idempotency_cache.lookups,
+            'scrape_config': scrape_config_cache.lookups,
+        }
+        for cache, results in lookups.items():
+            for result, count in results.items():
+                cache_lookups.add_metric([cache, result], count)
+        return iter((breaker_open, breaker_rejected, in_flight, shed, lag, cache_lookups))
+
+
+REGISTRY.register(StateCollector())
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """The matched route's path template, so `/v1/jobs/{job_name}` is one series whatever the job."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    Latency and in-flight count of HTTP requests. A request is timed to the start of its response,
+    so a streamed watch counts its time to first byte rather than the life of the stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        observed = False
+
+        def observe(status_code: int):
+            nonlocal observed
+            observed = True
+            HTTP_REQUEST_DURATION.labels(scope["method"], route_label(scope), str(status_code)) \
+                .observe(time.perf_counter() - started)
+
+        async def send_timed(message):
+            if message["type"] == "http.response.start":
+                observe(message["status"])
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            if not observed:
+                observe(500)
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Optional
+from config.constants.jobs import NAME_NGRAM_SIZE
+from enums.name_match import NameMatch
+
+_MATCH_RANK = {NameMatch.EXACT: 0, NameMatch.PREFIX: 1, NameMatch.SUBSTRING: 2}
+
+
+def normalize_name(name: str) -> str:
+    return name.strip().lower()
+
+
+def name_ngrams(name: str) -> List[str]:
+    """Distinct n-grams of the normalized name; a substring query must hit all of its own n-grams."""
+    normalized = normalize_name(name)
+    return sorted({normalized[i:i + NAME_NGRAM_SIZE] for i in range(len(normalized) - NAME_NGRAM_SIZE + 1)})
+
+
+def classify_match(query: str, normalized_name: str) -> Optional[NameMatch]:
+    if normalized_name == query:
+        return NameMatch.EXACT
+    if normalized_name.startswith(query):
+        return NameMatch.PREFIX
+    if query in normalized_name:
+        return NameMatch.SUBSTRING
+    return None
+
+
+def rank_name_matches(query: str, candidates: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """
+    Drop n-gram false positives and order the rest exact > prefix > substring,
+    then shorter names first, keeping only the first `limit`.
+    """
+    matches, seen = [], set()
+    for candidate in candidates:
+        key = (candidate["maas_pool"], candidate["collector_cluster"], candidate["job_name"])
+        match = classify_match(query, candidate["job_name_lower"])
+        if match is None or key in seen:
+            continue
+        seen.add(key)
+        matches.append({**candidate, "match": match})
+
+    matches.sort(key=lambda m: (_MATCH_RANK[m["match"]], len(m["job_name_lower"]), m["job_name_lower"]))
+    for match in matches:
+        del match["job_name_lower"]
+    return matches[:limit]
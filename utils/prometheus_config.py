@@ -0,0 +1,184 @@
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import MappingEndEvent, MappingStartEvent, SequenceEndEvent, SequenceStartEvent
+from yaml.resolver import Resolver
+from config.constants.imports import MAX_IMPORT_BYTES
+from enums.job_type import JobType
+from exceptions.import_too_large_error import ImportTooLargeError
+from exceptions.invalid_prometheus_config_error import InvalidPrometheusConfigError
+
+try:
+    from yaml.cyaml import CParser as _Parser
+except ImportError:
+    from yaml.parser import Parser
+    from yaml.reader import Reader
+    from yaml.scanner import Scanner
+
+    class _Parser(Reader, Scanner, Parser):
+        def __init__(self, stream):
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+
+_DURATION_PATTERN = re.compile(r"^(?:(\d+)h)?(?:(\d+)m(?!s))?(?:(\d+)s)?(?:(\d+)ms)?$")
+SD_KINDS = ('static_configs', 'kubernetes_sd_configs', 'http_sd_configs')
+# The keys `render_scrape_config` emits; anything else has no job field to land in
+COMMON_KEYS = {'job_name', 'scrape_interval', 'scrape_timeout', 'basic_auth', 'metrics_path', 'scheme',
+               'relabel_configs'}
+
+
+class _StreamLoader(_Parser, Composer, SafeConstructor, Resolver):
+    """libyaml events composed one node at a time, so only the entry being read is ever held in memory."""
+
+    def __init__(self, stream):
+        _Parser.__init__(self, stream)
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+
+    def next_value(self) -> Any:
+        return self.construct_document(self.compose_node(None, None))
+
+
+def decode_config(body: bytes, limit: int = MAX_IMPORT_BYTES) -> str:
+    if len(body) > limit:
+        raise ImportTooLargeError(len(body), limit)
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError:
+        raise InvalidPrometheusConfigError("not UTF-8 text")
+
+
+def iter_scrape_configs(stream) -> Iterator[Any]:
+    """
+    Yield the entries of a prometheus.yml `scrape_configs` list one at a time, as the document is
+    parsed. Other top-level sections are skipped; a malformed document raises `yaml.YAMLError`
+    once the parser reaches the broken part, after the entries before it were yielded.
+    """
+    loader = _StreamLoader(stream)
+    try:
+        loader.get_event()  # StreamStart
+        if not loader.check_event(yaml.DocumentStartEvent):
+            return
+        loader.get_event()
+        if not loader.check_event(MappingStartEvent):
+            raise yaml.YAMLError("Prometheus config must be a mapping")
+        loader.get_event()
+
+        while not loader.check_event(MappingEndEvent):
+            key = loader.next_value()
+            if key != 'scrape_configs' or not loader.check_event(SequenceStartEvent):
+                loader.next_value()
+                continue
+            loader.get_event()
+            while not loader.check_event(SequenceEndEvent):
+                yield loader.next_value()
+            loader.get_event()
+    finally:
+        loader.dispose()
+
+
+def parse_duration(value: Any) -> int:
+    """Whole seconds of a Prometheus duration such as `30s`, `1m` or `1m30s`."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    match = _DURATION_PATTERN.match(str(value)) if value else None
+    if not match or not any(match.groups()):
+        raise ValueError(f"Invalid duration: {value}")
+    hours, minutes, seconds, millis = (int(group or 0) for group in match.groups())
+    if millis % 1000:
+        raise ValueError(f"Duration {value} is not a whole number of seconds")
+    return hours * 3600 + minutes * 60 + seconds + millis // 1000
+
+
+def _relabel_labels(relabel_configs: Optional[List[Dict[str, Any]]]) -> Dict[str, str]:
+    """Inverse of the relabeling `render_scrape_config` attaches job labels with; other rules are unsupported."""
+    labels = {}
+    for rule in relabel_configs or []:
+        if not isinstance(rule, dict) or set(rule) != {'target_label', 'replacement'}:
+            raise ValueError("Only relabel_configs that set a constant label are supported")
+        labels[rule['target_label']] = str(rule['replacement'])
+    return labels
+
+
+def _static(scrape_config: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    if scrape_config.get('relabel_configs'):
+        raise ValueError("relabel_configs are not supported with static_configs")
+    targets, labels = [], None
+    for static_config in scrape_config['static_configs'] or []:
+        targets.extend(static_config.get('targets') or [])
+        group_labels = {key: str(value) for key, value in (static_config.get('labels') or {}).items()}
+        if labels is not None and group_labels != labels:
+            raise ValueError("static_configs with different labels can't be imported as one job")
+        labels = group_labels
+    job = {'job_type': JobType.GENERAL, 'targets': targets,
+           'metrics_path': scrape_config.get('metrics_path'), 'certs': scrape_config.get('scheme') == 'https' or None}
+    return job, labels or {}
+
+
+def _kubernetes(scrape_config: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    if scrape_config.get('scheme') == 'https':
+        raise ValueError("https is not supported with kubernetes_sd_configs")
+    namespaces, roles = [], set()
+    for sd_config in scrape_config['kubernetes_sd_configs'] or []:
+        roles.add(sd_config.get('role'))
+        namespaces.extend((sd_config.get('namespaces') or {}).get('names') or [])
+    if len(roles) > 1:
+        raise ValueError("kubernetes_sd_configs with different roles can't be imported as one job")
+    job = {'job_type': JobType.KUBERNETES_SD, 'role': roles.pop() if roles else None, 'namespaces': namespaces,
+           'metrics_path': scrape_config.get('metrics_path')}
+    return job, _relabel_labels(scrape_config.get('relabel_configs'))
+
+
+def _http(scrape_config: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    sd_configs = scrape_config['http_sd_configs'] or []
+    refresh_intervals = {sd_config.get('refresh_interval') for sd_config in sd_configs}
+    if len(refresh_intervals) > 1:
+        raise ValueError("http_sd_configs with different refresh intervals can't be imported as one job")
+    refresh_interval = refresh_intervals.pop() if refresh_intervals else None
+    job = {'job_type': JobType.HTTP_SD, 'endpoints': [sd_config.get('url') for sd_config in sd_configs],
+           'refresh_interval': parse_duration(refresh_interval) if refresh_interval else None,
+           'metrics_path': scrape_config.get('metrics_path'), 'certs': scrape_config.get('scheme') == 'https' or None}
+    return job, _relabel_labels(scrape_config.get('relabel_configs'))
+
+
+_MAPPERS = {'static_configs': _static, 'kubernetes_sd_configs': _kubernetes, 'http_sd_configs': _http}
+
+
+def map_scrape_config(scrape_config: Any) -> Dict[str, Any]:
+    """
+    Translate one `scrape_configs` entry into the body of a job create request, the inverse of
+    `render_scrape_config`. Entries that can't be represented as a single job raise ValueError;
+    field-level validation is left to the create schemas.
+    """
+    if not isinstance(scrape_config, dict):
+        raise ValueError("scrape_configs entry must be a mapping")
+    kinds = [kind for kind in SD_KINDS if kind in scrape_config]
+    if len(kinds) != 1:
+        raise ValueError(f"Exactly one of {', '.join(SD_KINDS)} is required")
+    unsupported = sorted(set(scrape_config) - COMMON_KEYS - set(kinds))
+    if unsupported:
+        raise ValueError(f"Unsupported scrape config fields: {', '.join(map(str, unsupported))}")
+    if scrape_config.get('scheme') not in (None, 'http', 'https'):
+        raise ValueError(f"Unsupported scheme: {scrape_config['scheme']}")
+
+    try:
+        job, labels = _MAPPERS[kinds[0]](scrape_config)
+    except (AttributeError, TypeError):
+        raise ValueError(f"Malformed {kinds[0]}")
+    job['job_name'] = scrape_config.get('job_name')
+    for field in ('scrape_interval', 'scrape_timeout'):
+        if scrape_config.get(field) is not None:
+            job[field] = parse_duration(scrape_config[field])
+    basic_auth = scrape_config.get('basic_auth')
+    if basic_auth is not None:
+        if not isinstance(basic_auth, dict) or 'password' not in basic_auth:
+            raise ValueError("basic_auth must have a username and an inline password")
+        job['basic_auth'] = {'username': basic_auth.get('username'), 'password': basic_auth['password']}
+    if labels:
+        job['labels'] = labels
+
+    return {key: value for key, value in job.items() if value is not None}
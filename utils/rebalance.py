@@ -0,0 +1,89 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+# Neighbours inspected around the ideal cost before giving up on a donor/receiver pair
+MAX_CANDIDATE_PROBES = 32
+
+
+class JobCost(NamedTuple):
+    job_name: str
+    collector_cluster: str
+    cost: float
+    # Sharded jobs load their collectors but are pinned to them
+    movable: bool = True
+
+
+class JobMove(NamedTuple):
+    job_name: str
+    source: str
+    target: str
+    cost: float
+
+
+def _balanced(loads: Dict[str, float], donor: str, receiver: str, lower: float, upper: float) -> bool:
+    return loads[donor] <= upper and loads[receiver] >= lower
+
+
+def _pick(candidates: List[Tuple[float, str]], want: float, limit: float, taken: Set[str]) -> int:
+    """Index of the job whose cost is closest to `want`, strictly below `limit` and not named in `taken`."""
+    center = bisect_left(candidates, (want, ""))
+    best, best_distance = -1, None
+    for index in range(max(0, center - MAX_CANDIDATE_PROBES), min(len(candidates), center + MAX_CANDIDATE_PROBES)):
+        cost, job_name = candidates[index]
+        if cost <= 0 or cost >= limit or job_name in taken:
+            continue
+        distance = abs(cost - want)
+        if best_distance is None or distance < best_distance:
+            best, best_distance = index, distance
+    return best
+
+
+def plan_moves(jobs: Iterable[JobCost], collector_clusters: List[str], tolerance: float,
+               max_moves: int) -> Tuple[List[JobMove], Dict[str, float]]:
+    """
+    Greedy plan that repeatedly moves, from the most to the least loaded collector, the job
+    whose cost best closes the gap to the mean. Each move strictly narrows the spread, so the
+    plan stops as soon as every collector is within `tolerance` of the mean or no job helps.
+    Returns the moves and the projected per-collector loads after them.
+    """
+    loads: Dict[str, float] = {collector_cluster: 0.0 for collector_cluster in collector_clusters}
+    candidates: Dict[str, List[Tuple[float, str]]] = {collector_cluster: [] for collector_cluster in collector_clusters}
+    names: Dict[str, Set[str]] = {collector_cluster: set() for collector_cluster in collector_clusters}
+
+    for job in jobs:
+        if job.collector_cluster not in loads:
+            continue
+        loads[job.collector_cluster] += job.cost
+        names[job.collector_cluster].add(job.job_name)
+        if job.movable:
+            candidates[job.collector_cluster].append((job.cost, job.job_name))
+
+    moves: List[JobMove] = []
+    if len(loads) < 2:
+        return moves, loads
+
+    for collector_candidates in candidates.values():
+        collector_candidates.sort()
+    mean = sum(loads.values()) / len(loads)
+    lower, upper = mean * (1 - tolerance), mean * (1 + tolerance)
+
+    while len(moves) < max_moves:
+        donor = max(loads, key=lambda collector_cluster: (loads[collector_cluster], collector_cluster))
+        receiver = min(loads, key=lambda collector_cluster: (loads[collector_cluster], collector_cluster))
+        if _balanced(loads, donor, receiver, lower, upper):
+            break
+
+        want = min(loads[donor] - mean, mean - loads[receiver])
+        index = _pick(candidates[donor], want, loads[donor] - loads[receiver], names[receiver])
+        if index < 0:
+            break
+
+        cost, job_name = candidates[donor].pop(index)
+        names[donor].discard(job_name)
+        insort(candidates[receiver], (cost, job_name))
+        names[receiver].add(job_name)
+        loads[donor] -= cost
+        loads[receiver] += cost
+        moves.append(JobMove(job_name, donor, receiver, cost))
+
+    return moves, loads
@@ -0,0 +1,24 @@
+from typing import List, Optional, Tuple
+from enums.request_priority import RequestPriority
+
+# First match wins: (method or None for any, path prefix, priority)
+PRIORITY_RULES: List[Tuple[Optional[str], str, RequestPriority]] = [
+    ("GET", "/v1/collectors/", RequestPriority.CRITICAL),
+    # Overload is exactly when the scrape of /metrics is needed
+    ("GET", "/metrics", RequestPriority.CRITICAL),
+    ("GET", "/v1/jobs/changes", RequestPriority.CRITICAL),
+    ("GET", "/v1/jobs/watch", RequestPriority.CRITICAL),
+    ("GET", "/v1/admin/load-shedding", RequestPriority.NORMAL),
+    (None, "/v1/admin/", RequestPriority.LOW),
+    # Bulk writes run as operations; queuing one can wait out the overload
+    ("POST", "/v1/jobs/import", RequestPriority.LOW),
+    ("POST", "/v1/jobs/sync/apply", RequestPriority.LOW),
+]
+
+
+def request_priority(method: str, path: str) -> RequestPriority:
+    """Collectors' reads are what keeps scraping going; admin and bulk work can be retried later."""
+    for rule_method, prefix, priority in PRIORITY_RULES:
+        if (rule_method is None or rule_method == method) and path.startswith(prefix):
+            return priority
+    return RequestPriority.NORMAL
@@ -0,0 +1,20 @@
+import json
+from datetime import datetime
+from typing import Any
+from bson import ObjectId
+from starlette.responses import JSONResponse
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class RawJSONResponse(JSONResponse):
+    """JSON response for plain stored documents, bypassing FastAPI's response_model re-validation."""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(content, default=_json_default, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,21 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+from config.constants.resilience import RETRY_BASE_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS
+
+T = TypeVar("T")
+
+
+async def retry_async(operation: Callable[[], Awaitable[T]], attempts: int, is_retriable: Callable[[Exception], bool],
+                      base_delay: float = RETRY_BASE_DELAY_SECONDS, max_delay: float = RETRY_MAX_DELAY_SECONDS) -> T:
+    """
+    Run `operation` up to `attempts` times while it fails with a retriable error, sleeping a
+    "full jitter" exponential backoff in between so that callers failing together don't retry together.
+    """
+    for attempt in range(attempts):
+        try:
+            return await operation()
+        except Exception as e:
+            if attempt == attempts - 1 or not is_retriable(e):
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
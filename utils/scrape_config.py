@@ -0,0 +1,93 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import yaml
+from enums.job_type import JobType
+
+BLACKBOX_DEFAULT_PROBE_PATH = "/probe"
+
+
+def _duration(seconds: Optional[int]) -> Optional[str]:
+    return f"{seconds}s" if seconds else None
+
+
+def _relabel_labels(labels: Optional[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Service-discovered targets have no static label block, so job labels are attached by relabeling."""
+    return [{'target_label': key, 'replacement': value} for key, value in sorted((labels or {}).items())]
+
+
+def _static_configs(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    static_config: Dict[str, Any] = {'targets': list(job['targets'])}
+    if job.get('labels'):
+        static_config['labels'] = dict(sorted(job['labels'].items()))
+    return [static_config]
+
+
+def _general(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'metrics_path': job.get('metrics_path'),
+        'scheme': 'https' if job.get('certs') else None,
+        'static_configs': _static_configs(job),
+    }
+
+
+def _blackbox(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'metrics_path': job.get('probe_path') or BLACKBOX_DEFAULT_PROBE_PATH,
+        'params': {'module': [job['module']]},
+        'static_configs': _static_configs(job),
+        'relabel_configs': [
+            {'source_labels': ['__address__'], 'target_label': '__param_target'},
+            {'source_labels': ['__param_target'], 'target_label': 'instance'},
+            {'target_label': '__address__', 'replacement': job['host']},
+        ],
+    }
+
+
+def _kubernetes(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'metrics_path': job.get('metrics_path'),
+        'kubernetes_sd_configs': [{'role': job.get('role') or 'pod', 'namespaces': {'names': list(job['namespaces'])}}],
+        'relabel_configs': _relabel_labels(job.get('labels')) or None,
+    }
+
+
+def _http(job: Dict[str, Any]) -> Dict[str, Any]:
+    refresh_interval = _duration(job.get('refresh_interval'))
+    return {
+        'metrics_path': job.get('metrics_path'),
+        'scheme': 'https' if job.get('certs') else None,
+        'http_sd_configs': [
+            {'url': endpoint, 'refresh_interval': refresh_interval} if refresh_interval else {'url': endpoint}
+            for endpoint in job['endpoints']
+        ],
+        'relabel_configs': _relabel_labels(job.get('labels')) or None,
+    }
+
+
+_RENDERERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    JobType.GENERAL.value: _general,
+    JobType.BLACKBOX.value: _blackbox,
+    JobType.KUBERNETES_SD.value: _kubernetes,
+    JobType.HTTP_SD.value: _http,
+}
+
+
+def render_scrape_config(job: Dict[str, Any], password: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build a Prometheus `scrape_configs` entry from a raw stored job. `password` is the already
+    decrypted basic_auth password; the stored ciphertext is never rendered.
+    """
+    scrape_config: Dict[str, Any] = {
+        'job_name': job['job_name'],
+        'scrape_interval': _duration(job.get('scrape_interval')),
+        'scrape_timeout': _duration(job.get('scrape_timeout')),
+    }
+    if job.get('basic_auth') and password is not None:
+        scrape_config['basic_auth'] = {'username': job['basic_auth']['username'], 'password': password}
+    scrape_config.update(_RENDERERS[job['job_type']](job))
+
+    return {key: value for key, value in scrape_config.items() if value is not None}
+
+
+def dump_scrape_configs(scrape_configs: Iterable[Dict[str, Any]]) -> bytes:
+    return yaml.safe_dump({'scrape_configs': list(scrape_configs)}, sort_keys=False,
+                          default_flow_style=False).encode()
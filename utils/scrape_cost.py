@@ -0,0 +1,85 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from config.constants.jobs import DEFAULT_SCRAPE_INTERVAL
+from utils.job_fields import job_field
+from utils.sharding import assign_targets
+
+TARGET_FIELDS = ("targets", "endpoints", "namespaces")
+
+
+class JobLoad(NamedTuple):
+    jobs: int = 0
+    targets: int = 0
+    scrape_rate: float = 0.0
+
+    def __add__(self, other: "JobLoad") -> "JobLoad":
+        return JobLoad(self.jobs + other.jobs, self.targets + other.targets, self.scrape_rate + other.scrape_rate)
+
+    def __sub__(self, other: "JobLoad") -> "JobLoad":
+        return JobLoad(self.jobs - other.jobs, self.targets - other.targets, self.scrape_rate - other.scrape_rate)
+
+    def __neg__(self) -> "JobLoad":
+        return JobLoad(-self.jobs, -self.targets, -self.scrape_rate)
+
+
+class JobFootprint(NamedTuple):
+    maas_pool: str
+    collector_cluster: str
+    load: JobLoad
+
+
+def target_count(job: Any) -> int:
+    """
+    Static targets for general/blackbox jobs. Service-discovery jobs don't know their
+    targets up front, so each endpoint/namespace is counted as one.
+    """
+    for field in TARGET_FIELDS:
+        value = job_field(job, field)
+        if value:
+            return len(value)
+    return 0
+
+
+def job_load(job: Any) -> JobLoad:
+    """Estimated cost of one job: its targets and the scrapes/sec they generate."""
+    targets = target_count(job)
+    scrape_interval = job_field(job, "scrape_interval") or DEFAULT_SCRAPE_INTERVAL
+    return JobLoad(jobs=1, targets=targets, scrape_rate=targets / scrape_interval)
+
+
+def job_footprint(job: Any) -> Optional[JobFootprint]:
+    if job is None:
+        return None
+    return JobFootprint(job_field(job, "maas_pool"), job_field(job, "collector_cluster"), job_load(job))
+
+
+def job_footprints(job: Any) -> List[JobFootprint]:
+    """
+    Footprint per collector the job runs on. A sharded job costs each collector only its shard's
+    targets, and counts as one job, on its home collector.
+    """
+    if job is None:
+        return []
+    shard_collectors = job_field(job, "shard_collectors")
+    if not shard_collectors:
+        return [job_footprint(job)]
+
+    scrape_interval = job_field(job, "scrape_interval")
+    home = job_field(job, "collector_cluster")
+    return [
+        JobFootprint(job_field(job, "maas_pool"), collector_cluster,
+                     job_load({"targets": targets, "scrape_interval": scrape_interval})
+                     ._replace(jobs=int(collector_cluster == home)))
+        for collector_cluster, targets in assign_targets(job_field(job, "targets"), shard_collectors).items()
+    ]
+
+
+def footprint_deltas(before: Iterable[JobFootprint], after: Iterable[JobFootprint]) -> Dict[Tuple[str, str], JobLoad]:
+    """Net load change per (pool, collector) when a job goes from `before` to `after`; unchanged collectors are left out."""
+    deltas: Dict[Tuple[str, str], JobLoad] = {}
+    for footprint in before:
+        key = (footprint.maas_pool, footprint.collector_cluster)
+        deltas[key] = deltas.get(key, JobLoad()) - footprint.load
+    for footprint in after:
+        key = (footprint.maas_pool, footprint.collector_cluster)
+        deltas[key] = deltas.get(key, JobLoad()) + footprint.load
+    return {key: delta for key, delta in deltas.items() if delta != JobLoad()}
@@ -1,18 +1,23 @@
 from cryptography.fernet import Fernet
 
 from config import config
+from utils.metrics import CRYPTO_DURATION
+
+_encrypt_latency = CRYPTO_DURATION.labels("encrypt")
+_decrypt_latency = CRYPTO_DURATION.labels("decrypt")
 
 
 class SecurityManager:
     def __init__(self, key: str):
-        print(key)
         self._cypher_suite = Fernet(key.encode())
 
     def encrypt(self, plain_text: str) -> str:
-        return self._cypher_suite.encrypt(plain_text.encode()).decode()
+        with _encrypt_latency.time():
+            return self._cypher_suite.encrypt(plain_text.encode()).decode()
 
     def decrypt(self, cipher_text: str) -> str:
-        return self._cypher_suite.decrypt(cipher_text.encode()).decode()
+        with _decrypt_latency.time():
+            return self._cypher_suite.decrypt(cipher_text.encode()).decode()
 
 
 security_manager = SecurityManager(config["security"]["secret_key"])
@@ -0,0 +1,57 @@
+import hashlib
+from typing import Any, Dict, List, Optional
+from config.constants.jobs import SHARD_NAME_SEPARATOR
+from utils.hash_ring import hash_ring
+from utils.job_fields import job_field
+
+SHARDED_FIELD = "shard_collectors"
+
+
+def is_sharded(job: Any) -> bool:
+    return bool(job_field(job, SHARDED_FIELD))
+
+
+def shard_job_name(job_name: str, collector_cluster: str) -> str:
+    """Name a shard is delivered under, so it never collides with a regular job on that collector."""
+    return f"{job_name}{SHARD_NAME_SEPARATOR}{collector_cluster}"
+
+
+def choose_shard_collectors(job_name: str, collector_clusters: List[str], home: str, count: int) -> List[str]:
+    """
+    The home collector plus the `count - 1` others ranking highest for this job name
+    (rendezvous hashing), so different sharded jobs spread over different collector sets.
+    """
+    others = sorted(
+        (collector_cluster for collector_cluster in set(collector_clusters) if collector_cluster != home),
+        key=lambda collector_cluster: hashlib.blake2b(f"{job_name}/{collector_cluster}".encode(), digest_size=8).digest(),
+    )
+    return sorted([home, *others[:count - 1]])
+
+
+def assign_targets(targets: List[str], shard_collectors: List[str]) -> Dict[str, List[str]]:
+    """Split targets over the shard collectors on a consistent hash ring; order within a shard is kept."""
+    ring = hash_ring(tuple(sorted(shard_collectors)))
+    shards: Dict[str, List[str]] = {collector_cluster: [] for collector_cluster in shard_collectors}
+    for target in targets:
+        shards[ring.node_for(target)].append(target)
+    return shards
+
+
+def shard_payloads(job: Optional[Dict[str, Any]], shard_collectors: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-collector copies of a job dict (stored or event form) holding only that collector's
+    targets, under the shard name. Collectors left without targets get no shard.
+    """
+    if not job:
+        return {}
+    return {
+        collector_cluster: {**job, 'job_name': shard_job_name(job['job_name'], collector_cluster), 'targets': targets}
+        for collector_cluster, targets in assign_targets(job['targets'], shard_collectors).items() if targets
+    }
+
+
+def shard_for(job: Dict[str, Any], collector_cluster: str) -> Optional[Dict[str, Any]]:
+    """The job as one collector scrapes it: itself when unsharded, else that collector's shard or None."""
+    if not is_sharded(job):
+        return job
+    return shard_payloads(job, job[SHARDED_FIELD]).get(collector_cluster)
@@ -0,0 +1,25 @@
+from typing import Any, Dict
+from utils.job_fields import job_field
+from utils.sharding import assign_targets
+
+
+def normalize_target(target: str) -> str:
+    return target.strip().lower()
+
+
+def target_placements(job: Any) -> Dict[str, str]:
+    """
+    Normalized target -> collector that scrapes it, for a job model or raw dict. A sharded
+    job spreads its targets over its shard collectors; jobs without static targets have none.
+    """
+    targets = job_field(job, 'targets') or []
+    shard_collectors = job_field(job, 'shard_collectors')
+    if not shard_collectors:
+        collector_cluster = job_field(job, 'collector_cluster')
+        return {normalize_target(target): collector_cluster for target in targets}
+
+    return {
+        normalize_target(target): collector_cluster
+        for collector_cluster, shard_targets in assign_targets(targets, shard_collectors).items()
+        for target in shard_targets
+    }
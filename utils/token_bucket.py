@@ -0,0 +1,56 @@
+import math
+from typing import NamedTuple
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the bucket is full again, and until the next request would be admitted
+    reset: float
+    retry_after: float
+
+
+class TokenBucket:
+    """Classic token bucket refilled lazily from the caller's clock; `tokens` may go negative after a sync."""
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: int, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def consume(self, now: float, cost: float = 1.0) -> RateLimitDecision:
+        self._refill(now)
+        allowed = self.tokens >= cost
+        if allowed:
+            self.tokens -= cost
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=self.capacity,
+            remaining=max(int(self.tokens), 0),
+            reset=(self.capacity - self.tokens) / self.rate,
+            retry_after=0.0 if allowed else (cost - self.tokens) / self.rate,
+        )
+
+    def refund(self, cost: float = 1.0):
+        self.tokens = min(self.capacity, self.tokens + cost)
+
+    def reconfigure(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(self.tokens, capacity)
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(math.ceil(seconds), 1))
@@ -0,0 +1,113 @@
+import contextlib
+import functools
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, Sampler, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from utils.metrics import route_label
+
+ENCODING_FORMAT = 'utf-8'
+
+tracer = trace.get_tracer("maas")
+# Finished spans of the "memory" exporter, for tests and local debugging
+memory_exporter = InMemorySpanExporter()
+# Even a no-op span costs a context switch on every call; this costs nothing
+_NO_SPAN = contextlib.nullcontext()
+_configured = False
+
+
+def sampler(sample_ratio: float) -> Sampler:
+    """Sample a ratio of new traces, but always follow the caller's decision so a trace is never cut in half."""
+    return ParentBased(TraceIdRatioBased(sample_ratio))
+
+
+def configure_tracing(sample_ratio: float, exporter: str, file_path: Optional[str] = None) -> TracerProvider:
+    """
+    Install the process-wide tracer provider. `exporter` is "memory" (spans kept in `memory_exporter`)
+    or "file" (one JSON span per line appended to `file_path`). Only the first call takes effect.
+    """
+    global _configured
+    provider = TracerProvider(sampler=sampler(sample_ratio))
+    if exporter == "memory":
+        provider.add_span_processor(SimpleSpanProcessor(memory_exporter))
+    elif exporter == "file":
+        out = open(file_path, "a", encoding=ENCODING_FORMAT)
+        provider.add_span_processor(BatchSpanProcessor(
+            ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")))
+    else:
+        raise ValueError(f"Unknown tracing exporter: {exporter}")
+    trace.set_tracer_provider(provider)
+    _configured = True
+    return provider
+
+
+def start_span(name: str, kind: SpanKind = SpanKind.INTERNAL,
+               attributes: Optional[Dict[str, Any]] = None) -> ContextManager:
+    """
+    A span made current for the `with` block, or nothing when tracing is off or the trace was not
+    sampled: the sampler would drop a child of an unsampled span anyway, after paying for it.
+    """
+    if not _configured:
+        return _NO_SPAN
+    parent = trace.get_current_span().get_span_context()
+    if parent.is_valid and not parent.trace_flags.sampled:
+        return _NO_SPAN
+    return tracer.start_as_current_span(name, kind=kind, attributes=attributes)
+
+
+def traced(name: str, kind: SpanKind = SpanKind.INTERNAL):
+    """Run a coroutine function inside a span; the span records and re-raises whatever it raises."""
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            with start_span(name, kind):
+                return await method(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def kafka_headers() -> List[Tuple[str, bytes]]:
+    """The current trace context as Kafka record headers, so a consumer can continue the trace."""
+    if not _configured:
+        return []
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    return [(key, value.encode(ENCODING_FORMAT)) for key, value in carrier.items()]
+
+
+class TracingMiddleware:
+    """
+    A server span per HTTP request, continuing the caller's trace when it sends a `traceparent`.
+    The span is renamed to the matched route template once routing has run.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        method = scope["method"]
+        with tracer.start_as_current_span(
+                method, context=propagate.extract(carrier), kind=SpanKind.SERVER,
+                attributes={"http.request.method": method, "url.path": scope["path"]}) as span:
+
+            async def send_traced(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_traced)
+            finally:
+                route = route_label(scope)
+                span.set_attribute("http.route", route)
+                span.update_name(f"{method} {route}")
+